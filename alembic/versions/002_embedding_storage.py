@@ -0,0 +1,78 @@
+"""Store embeddings with the configured dimensions and type
+
+Revision ID: 002_embedding_storage
+Revises: 001_add_indexes
+Create Date: 2026-10-19 10:00:00.000000
+
+Converts every embedding column to TARGET_STORAGE(TARGET_DIMENSIONS) - fixed
+values, the defaults of EMBEDDING_STORAGE and LLM_EMBEDDING_DIMENSIONS, so
+the schema doesn't depend on the environment the migration runs under - and
+adds an HNSW cosine index on providers.embedding when that width is
+indexable (vector <= 2000 dims, halfvec <= 4000). Needs pgvector >= 0.7.
+
+Other widths or storage: set the two settings and run
+scripts/backfill_embeddings.py, which converts the columns (re-runnable)
+and re-embeds providers. Shrinking is done in place - text-embedding-3
+embeddings are matryoshka-trained, so the shorter embedding is the
+re-normalized prefix of the stored one. Growing can't be derived from the
+stored values: those columns are cleared and re-embedded.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.platform.database.vectors import EMBEDDING_COLUMNS, is_indexable, vector_index_sql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002_embedding_storage'
+down_revision: Union[str, None] = '001_add_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ORIGINAL_DIMENSIONS = 3072
+TARGET_STORAGE = "vector"
+TARGET_DIMENSIONS = 3072
+
+
+def _current_dimensions(table: str, column: str) -> int:
+    # pgvector keeps the declared dimensions in atttypmod
+    return op.get_bind().execute(sa.text(
+        "SELECT atttypmod FROM pg_attribute "
+        "WHERE attrelid = CAST(:table AS regclass) AND attname = :column"
+    ), {"table": table, "column": column}).scalar()
+
+
+def _convert(table: str, column: str, storage: str, dimensions: int) -> None:
+    current = _current_dimensions(table, column)
+    target = f"{storage}({dimensions})"
+    if current is not None and dimensions <= current:
+        using = f"l2_normalize(subvector({column}::vector, 1, {dimensions}))::{target}"
+    else:
+        using = f"NULL::{target}"
+    op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {target} USING {using}")
+
+
+def upgrade() -> None:
+    """Convert embedding columns and index providers.embedding."""
+    storage = TARGET_STORAGE
+    dimensions = TARGET_DIMENSIONS
+
+    op.execute("DROP INDEX IF EXISTS idx_providers_embedding")
+    for table, column in EMBEDDING_COLUMNS:
+        _convert(table, column, storage, dimensions)
+
+    if is_indexable(dimensions, storage):
+        op.execute(vector_index_sql("providers", "embedding", storage))
+
+
+def downgrade() -> None:
+    """Back to vector(3072) (cleared unless the columns were never shrunk)."""
+    op.execute("DROP INDEX IF EXISTS idx_providers_embedding")
+    for table, column in EMBEDDING_COLUMNS:
+        if _current_dimensions(table, column) == ORIGINAL_DIMENSIONS:
+            using = f"{column}::vector({ORIGINAL_DIMENSIONS})"
+        else:
+            using = f"NULL::vector({ORIGINAL_DIMENSIONS})"
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE vector({ORIGINAL_DIMENSIONS}) USING {using}")
@@ -0,0 +1,29 @@
+"""Track which index text each provider embedding was built from
+
+Revision ID: 003_provider_embedding_hash
+Revises: 002_embedding_storage
+Create Date: 2026-10-19 12:00:00.000000
+
+Adds providers.embedding_text_hash, sha256 of (model, dimensions, index
+text). Existing rows start NULL, so the first re-embed of each provider
+recomputes its embedding once; after that unchanged profiles are skipped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_provider_embedding_hash'
+down_revision: Union[str, None] = '002_embedding_storage'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('providers', sa.Column('embedding_text_hash', sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('providers', 'embedding_text_hash')
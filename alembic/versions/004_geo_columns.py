@@ -0,0 +1,81 @@
+"""Normalized location columns on providers and service requests
+
+Revision ID: 004_geo_columns
+Revises: 003_provider_embedding_hash
+Create Date: 2026-10-19 14:00:00.000000
+
+Adds city_key, lat, lng, geohash and the radius (service_radius_km /
+max_distance_km) derived from the location JSON - the models keep them in
+sync on write from now on - plus the indexes the matching filters use:
+(status, city_key) and a text_pattern_ops btree on geohash for the prefix
+scans of a radius search. Existing rows are backfilled in id-ordered batches.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.platform.database.geo import location_columns
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004_geo_columns'
+down_revision: Union[str, None] = '003_provider_embedding_hash'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = {
+    # table: radius field in the location JSON (and its column)
+    'providers': 'service_radius_km',
+    'service_requests': 'max_distance_km',
+}
+BATCH_SIZE = 1000
+
+
+def _backfill(table: str, radius_field: str) -> None:
+    bind = op.get_bind()
+    update = sa.text(
+        f"UPDATE {table} SET city_key = :city_key, lat = :lat, lng = :lng, "
+        f"geohash = :geohash, {radius_field} = :radius WHERE id = :id"
+    )
+    last_id = None
+    while True:
+        where, params = ("WHERE id > :last_id ", {"last_id": last_id}) if last_id is not None else ("", {})
+        rows = bind.execute(
+            sa.text(f"SELECT id, location FROM {table} {where}ORDER BY id LIMIT :limit"),
+            {**params, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        values = []
+        for row_id, location in rows:
+            columns = location_columns(location, radius_field)
+            columns["radius"] = columns.pop(radius_field)
+            values.append({"id": row_id, **columns})
+        bind.execute(update, values)
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    for table, radius_field in TABLES.items():
+        op.add_column(table, sa.Column('city_key', sa.String(255), nullable=True))
+        op.add_column(table, sa.Column('lat', sa.Float(), nullable=True))
+        op.add_column(table, sa.Column('lng', sa.Float(), nullable=True))
+        op.add_column(table, sa.Column('geohash', sa.String(12), nullable=True))
+        op.add_column(table, sa.Column(radius_field, sa.Float(), nullable=True))
+        _backfill(table, radius_field)
+
+    op.create_index('idx_providers_status_city_key', 'providers', ['status', 'city_key'], unique=False, if_not_exists=True)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_providers_geohash ON providers(geohash text_pattern_ops)")
+    op.create_index('idx_requests_city_key', 'service_requests', ['city_key'], unique=False, if_not_exists=True)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_requests_geohash ON service_requests(geohash text_pattern_ops)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_requests_geohash")
+    op.execute("DROP INDEX IF EXISTS idx_requests_city_key")
+    op.execute("DROP INDEX IF EXISTS idx_providers_geohash")
+    op.execute("DROP INDEX IF EXISTS idx_providers_status_city_key")
+    for table, radius_field in TABLES.items():
+        for column in ('city_key', 'lat', 'lng', 'geohash', radius_field):
+            op.drop_column(table, column)
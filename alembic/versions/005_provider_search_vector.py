@@ -0,0 +1,40 @@
+"""Full-text search vector on providers
+
+Revision ID: 005_provider_search_vector
+Revises: 004_geo_columns
+Create Date: 2026-10-19 16:00:00.000000
+
+Adds providers.search_vector (weighted tsvector of business name, service
+names, specializations and bio), the triggers that maintain it on provider
+and service writes, a GIN index, and fills it for existing providers.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from src.platform.database.search import DROP_SEARCH_VECTOR_DDL, SEARCH_VECTOR_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005_provider_search_vector'
+down_revision: Union[str, None] = '004_geo_columns'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('providers', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    for statement in SEARCH_VECTOR_DDL:
+        op.execute(statement)
+    # Fire the trigger once per existing provider
+    op.execute("UPDATE providers SET business_name = business_name")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_providers_search_vector ON providers USING GIN(search_vector)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_providers_search_vector")
+    for statement in DROP_SEARCH_VECTOR_DDL:
+        op.execute(statement)
+    op.drop_column('providers', 'search_vector')
@@ -0,0 +1,65 @@
+"""Request <-> provider match table
+
+Revision ID: 006_request_matches
+Revises: 005_provider_search_vector
+Create Date: 2026-10-19 18:00:00.000000
+
+Adds request_matches (one row per provider a request was matched to) with
+the lead inbox indexes, and fills it from service_requests.matched_providers:
+score is the reciprocal of the provider's position in the list, matched_at
+the request's created_at.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006_request_matches'
+down_revision: Union[str, None] = '005_provider_search_vector'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'request_matches',
+        sa.Column('request_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('service_requests.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('provider_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('providers.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('matched_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('status', sa.String(50), nullable=False),
+    )
+    op.execute("""
+        INSERT INTO request_matches (request_id, provider_id, score, matched_at, status)
+        SELECT m.request_id, m.provider_id::uuid, 1.0 / m.position, m.matched_at, m.status
+        FROM (
+            SELECT r.id AS request_id, e.value AS provider_id, e.position,
+                   coalesce(r.created_at, now()) AS matched_at, coalesce(r.status, 'pending') AS status
+            FROM service_requests r
+            CROSS JOIN LATERAL json_array_elements_text(
+                CASE WHEN json_typeof(r.matched_providers::json) = 'array' THEN r.matched_providers::json ELSE '[]' END
+            ) WITH ORDINALITY AS e(value, position)
+            WHERE e.value ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+        ) m
+        JOIN providers p ON p.id = m.provider_id::uuid
+        ON CONFLICT DO NOTHING
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_request_matches_provider_status "
+        "ON request_matches(provider_id, status, matched_at DESC, request_id DESC)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_request_matches_provider "
+        "ON request_matches(provider_id, matched_at DESC, request_id DESC)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_request_matches_provider")
+    op.execute("DROP INDEX IF EXISTS idx_request_matches_provider_status")
+    op.drop_table('request_matches')
@@ -0,0 +1,38 @@
+"""Mark already-matched requests "matched"
+
+Revision ID: 007_matched_status
+Revises: 006_request_matches
+Create Date: 2026-10-19 19:00:00.000000
+
+Matching now runs on the worker and moves a request from "matching" to
+"matched" when its matches are recorded; open leads are the "matched" ones.
+Requests matched inline before this change are still "matching" - move the
+ones with matches, and their request_matches rows, to "matched".
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007_matched_status'
+down_revision: Union[str, None] = '006_request_matches'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        UPDATE service_requests SET status = 'matched'
+        WHERE status = 'matching' AND EXISTS (SELECT 1 FROM request_matches m WHERE m.request_id = service_requests.id)
+    """)
+    op.execute("""
+        UPDATE request_matches SET status = 'matched'
+        WHERE status = 'matching'
+          AND request_id IN (SELECT id FROM service_requests WHERE status = 'matched')
+    """)
+
+
+def downgrade() -> None:
+    op.execute("UPDATE request_matches SET status = 'matching' WHERE status = 'matched'")
+    op.execute("UPDATE service_requests SET status = 'matching' WHERE status = 'matched'")
@@ -0,0 +1,135 @@
+"""
+Re-embed every active provider, e.g. after switching embedding model.
+
+Walks active providers in id order (keyset pagination) and re-embeds each
+batch through reembed_providers: one batched embedding call per batch, and
+providers whose embedding_text_hash already matches (model, dimensions,
+index text) are skipped. That makes the run idempotent - after the
+column conversion below clears the columns, or with --model set to
+a new model, everything is embedded once; a rerun embeds nothing.
+
+Progress (the last id done) is written to --state-file after each batch, so
+an interrupted run resumes from there instead of re-reading the table.
+--force re-embeds even unchanged providers.
+
+The embedding columns are first converted to EMBEDDING_STORAGE(
+LLM_EMBEDDING_DIMENSIONS) if the DB declares anything else (see
+database/vectors.py; re-runnable, a no-op when they already match), so
+changing either setting is: update the env, run this script. --dimensions
+must match LLM_EMBEDDING_DIMENSIONS; --convert-only stops after the columns.
+Consumer preference embeddings are rebuilt by MemoryService the next time
+the preferences change.
+
+Needs a reachable Postgres (DATABASE_URL). Usage:
+
+    python scripts/backfill_embeddings.py --model openai/text-embedding-3-small \\
+        --batch-size 100 --state-file .backfill_state.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Optional
+
+from src.platform.config import settings
+from src.platform.database import SessionLocal, engine
+from src.platform.database.vectors import convert_embedding_columns
+from src.platform.models.provider import Provider
+from src.platform.services.embeddings import EmbeddingService
+from src.platform.services.provider_embeddings import reembed_providers
+
+
+def _read_state(path: Optional[str]) -> Optional[str]:
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f).get("last_id")
+
+
+def _write_state(path: Optional[str], last_id, totals: dict) -> None:
+    if not path:
+        return
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"last_id": str(last_id), **totals}, f)
+    os.replace(tmp, path)
+
+
+async def backfill(
+    service: EmbeddingService,
+    batch_size: int,
+    limit: int = 0,
+    force: bool = False,
+    state_file: Optional[str] = None,
+) -> dict:
+    last_id = _read_state(state_file)
+    with SessionLocal() as db:
+        query = db.query(Provider.id).filter(Provider.status == "active")
+        if last_id is not None:
+            query = query.filter(Provider.id > last_id)
+        remaining = query.count()
+    if limit:
+        remaining = min(remaining, limit)
+    if last_id is not None:
+        print(f"resuming after {last_id}")
+
+    totals = {"embedded": 0, "skipped": 0, "missing": 0}
+    done = 0
+    start = time.perf_counter()
+    while not limit or done < limit:
+        with SessionLocal() as db:
+            query = db.query(Provider.id).filter(Provider.status == "active")
+            if last_id is not None:
+                query = query.filter(Provider.id > last_id)
+            size = min(batch_size, limit - done) if limit else batch_size
+            ids = [row[0] for row in query.order_by(Provider.id).limit(size).all()]
+        if not ids:
+            break
+
+        stats = await reembed_providers(ids, service=service, force=force)
+        for key, value in stats.items():
+            totals[key] += value
+        done += len(ids)
+        last_id = ids[-1]
+        _write_state(state_file, last_id, totals)
+
+        elapsed = time.perf_counter() - start
+        eta = elapsed / done * max(remaining - done, 0)
+        print(f"{done}/{remaining} providers  embedded {totals['embedded']}  "
+              f"unchanged {totals['skipped']}  {done / elapsed:.1f}/s  eta {eta:.0f}s")
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=None, help="embedding model (default LLM_EMBEDDING_MODEL)")
+    parser.add_argument("--dimensions", type=int, default=None, help="default LLM_EMBEDDING_DIMENSIONS")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=0, help="stop after this many providers (0 = all)")
+    parser.add_argument("--force", action="store_true", help="re-embed providers whose text is unchanged")
+    parser.add_argument("--state-file", default=None, help="progress file to resume from")
+    parser.add_argument("--convert-only", action="store_true", help="convert the embedding columns, don't re-embed")
+    args = parser.parse_args()
+
+    service = EmbeddingService(args.model, args.dimensions)
+    if service.dimensions != settings.LLM_EMBEDDING_DIMENSIONS:
+        raise SystemExit(f"--dimensions {service.dimensions} doesn't match "
+                         f"LLM_EMBEDDING_DIMENSIONS={settings.LLM_EMBEDDING_DIMENSIONS}")
+
+    with engine.begin() as conn:
+        converted = convert_embedding_columns(conn)
+    for table, column in converted:
+        print(f"converted {table}.{column} to {settings.EMBEDDING_STORAGE}({settings.LLM_EMBEDDING_DIMENSIONS})")
+    if args.convert_only:
+        return
+
+    start = time.perf_counter()
+    totals = asyncio.run(backfill(service, args.batch_size, args.limit, args.force, args.state_file))
+    print(f"embedded {totals['embedded']} providers ({totals['skipped']} unchanged) in "
+          f"{time.perf_counter() - start:.1f}s ({service.model}, {service.dimensions} dims)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: sync SessionLocal vs AsyncSessionLocal on the chat hydration path.
+
+Runs N concurrent "turns" (consumer lookup + MemoryService.get_consumer_context)
+and measures throughput plus event-loop lag - how late a 5ms ticker wakes up
+while the turns are running. With the sync session every query blocks the
+loop, so the ticker (standing in for every other request on the worker) stalls.
+
+Needs a reachable Postgres (DATABASE_URL). Usage:
+
+    python scripts/bench_async_db.py --turns 200 --concurrency 50 --query-delay-ms 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from uuid import uuid4
+
+from sqlalchemy import select, text
+
+from src.platform.database import SessionLocal, AsyncSessionLocal
+from src.platform.models.consumer import Consumer
+from src.platform.services.memory_service import MemoryService
+
+
+async def loop_lag_monitor(samples: list, stop: asyncio.Event, interval: float = 0.005):
+    """Record how late each tick fires relative to its scheduled time."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, time.perf_counter() - start - interval))
+
+
+async def sync_turn(consumer_id, delay: float):
+    with SessionLocal() as db:
+        if delay:
+            db.execute(text("SELECT pg_sleep(:d)"), {"d": delay})
+        db.query(Consumer).filter(Consumer.id == consumer_id).first()
+        await MemoryService(db).get_consumer_context(consumer_id)
+
+
+async def async_turn(consumer_id, delay: float):
+    async with AsyncSessionLocal() as db:
+        if delay:
+            await db.execute(text("SELECT pg_sleep(:d)"), {"d": delay})
+        (await db.execute(select(Consumer).where(Consumer.id == consumer_id))).scalars().first()
+        await MemoryService(db).get_consumer_context(consumer_id)
+
+
+async def run(label: str, turn, consumer_id, turns: int, concurrency: int, delay: float):
+    lag_samples = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(loop_lag_monitor(lag_samples, stop))
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            await turn(consumer_id, delay)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(turns)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor
+
+    lag_ms = sorted(s * 1000 for s in lag_samples) or [0.0]
+    p99 = lag_ms[min(len(lag_ms) - 1, int(len(lag_ms) * 0.99))]
+    print(f"[{label}] {turns} turns in {elapsed:.2f}s -> {turns / elapsed:.1f} turns/s")
+    print(f"[{label}] loop lag: mean {statistics.mean(lag_ms):.1f}ms  p99 {p99:.1f}ms  max {lag_ms[-1]:.1f}ms  ticks {len(lag_samples)}")
+    return turns / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--query-delay-ms", type=float, default=5.0,
+                        help="Extra server-side latency per turn (pg_sleep) to mimic a remote DB")
+    args = parser.parse_args()
+    delay = args.query_delay_ms / 1000
+
+    # Seed one consumer so both paths hit real rows
+    consumer_id = uuid4()
+    with SessionLocal() as db:
+        db.add(Consumer(id=consumer_id, name="bench"))
+        db.commit()
+
+    try:
+        print("--- Chat hydration: sync vs async session ---")
+        sync_tps = await run("sync ", sync_turn, consumer_id, args.turns, args.concurrency, delay)
+        async_tps = await run("async", async_turn, consumer_id, args.turns, args.concurrency, delay)
+        print(f"\nThroughput: {async_tps / sync_tps:.1f}x")
+    finally:
+        with SessionLocal() as db:
+            db.query(Consumer).filter(Consumer.id == consumer_id).delete()
+            db.commit()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
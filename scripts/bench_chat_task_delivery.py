@@ -0,0 +1,85 @@
+"""
+Benchmark: async chat result delivery, polling vs long-poll.
+
+Simulates --tasks async chat turns finishing after a random 1..--max-turn-s
+seconds. The polling client asks for the result every --poll-interval
+seconds (one GET /chat/task/{id} each: a request through the rate limiter
+plus a result lookup); the long-poll client holds GET /chat/task/{id}/wait
+open (services/chat_tasks.py, real Redis pub/sub) and re-issues it after
+each --wait-timeout.
+
+Reports delivery latency (result available -> client has it) and requests
+per task for each path. Needs Redis at REDIS_URL.
+
+Usage:
+    python scripts/bench_chat_task_delivery.py --tasks 200 --poll-interval 1 --max-turn-s 6
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from uuid import uuid4
+
+from src.platform.services.chat_tasks import chat_task_results, outcome
+
+
+async def run(args, long_poll: bool):
+    latencies, requests = [], []
+
+    async def one_task():
+        task_id = str(uuid4())
+        finish_in = random.uniform(1, args.max_turn_s)
+        done_at = {}
+
+        async def worker():
+            await asyncio.sleep(finish_in)
+            done_at["t"] = time.perf_counter()
+            await chat_task_results.publish(task_id, None, outcome(task_id, result={"message": "ok"}))
+
+        async def client():
+            count = 0
+            while True:
+                count += 1
+                if long_poll:
+                    result = chat_task_results.stored(task_id) or \
+                        await chat_task_results.wait_for_result(task_id, args.wait_timeout)
+                else:
+                    result = chat_task_results.stored(task_id)
+                    if result is None:
+                        await asyncio.sleep(args.poll_interval)
+                if result is not None:
+                    latencies.append(time.perf_counter() - done_at["t"])
+                    requests.append(count)
+                    return
+
+        await asyncio.gather(worker(), client())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_task() for _ in range(args.tasks)))
+    return time.perf_counter() - start, sorted(latencies), requests
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--max-turn-s", type=float, default=6, help="turns take 1..N seconds")
+    parser.add_argument("--poll-interval", type=float, default=1)
+    parser.add_argument("--wait-timeout", type=float, default=25)
+    args = parser.parse_args()
+
+    if chat_task_results.redis_client is None or not chat_task_results.redis_client.ping():
+        raise SystemExit("Redis not reachable at REDIS_URL")
+
+    print(f"--- {args.tasks} tasks, turns 1-{args.max_turn_s:.0f}s, poll every {args.poll_interval}s ---")
+    for name, long_poll in (("polling", False), ("long-poll", True)):
+        random.seed(7)
+        elapsed, latencies, requests = asyncio.run(run(args, long_poll))
+        print(f"[{name:9}] {elapsed:6.2f}s  delivery p50 {statistics.median(latencies) * 1000:7.1f}ms  "
+              f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:7.1f}ms  "
+              f"requests/task {statistics.mean(requests):5.2f}")
+
+
+if __name__ == "__main__":
+    main()
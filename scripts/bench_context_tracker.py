@@ -0,0 +1,164 @@
+"""
+Benchmark: ConversationContext cost over a long session.
+
+Replays a 200-turn consumer session the way handle_chat + concierge_node use
+the context each turn (rebuild from the session dict, load profile, apply
+extraction, summary + missing fields for the prompt, sync back) and compares
+the compact __slots__ implementation against the previous pydantic model,
+reproduced inline below as the baseline.
+
+Usage:
+    python scripts/bench_context_tracker.py --turns 200
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from src.platform.services.context_tracker import (
+    ConversationContext,
+    ContextSource,
+    INTENT_OPTIONAL,
+    INTENT_REQUIREMENTS,
+)
+
+
+# --- Baseline: the pydantic model this replaced (unbounded facts_log) ---
+
+class LegacyKnownFact(BaseModel):
+    key: str
+    value: Any
+    source: ContextSource
+    confidence: float = 1.0
+    timestamp: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+
+class LegacyConversationContext(BaseModel):
+    user_id: Optional[str] = None
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    default_location: Optional[str] = None
+    service_type: Optional[str] = None
+    location: Optional[str] = None
+    address: Optional[str] = None
+    city: Optional[str] = None
+    budget_min: Optional[float] = None
+    budget_max: Optional[float] = None
+    timing: Optional[str] = None
+    preferred_date: Optional[str] = None
+    preferred_time: Optional[str] = None
+    preferences: Dict[str, Any] = {}
+    business_name: Optional[str] = None
+    years_experience: Optional[int] = None
+    services_offered: List[str] = []
+    service_radius_km: Optional[int] = None
+    portfolio_photos: List[str] = []
+    bio: Optional[str] = None
+    facts_log: List[LegacyKnownFact] = []
+
+    def update_from_profile(self, profile: dict) -> None:
+        for key in ("name", "email", "phone", "default_location", "preferences"):
+            if profile.get(key):
+                if key == "preferences":
+                    self.preferences = {**self.preferences, **profile[key]}
+                else:
+                    setattr(self, key, profile[key])
+                self.facts_log.append(LegacyKnownFact(key=key, value=profile[key], source=ContextSource.PROFILE))
+            if profile.get("default_location") and not self.location:
+                self.location = profile["default_location"]
+
+    def update_from_extraction(self, extracted: dict, source: ContextSource) -> None:
+        for key, value in extracted.items():
+            if value is not None and hasattr(self, key):
+                setattr(self, key, value)
+                self.facts_log.append(LegacyKnownFact(key=key, value=value, source=source))
+            if key == "city" and not self.location:
+                self.location = value
+
+    def get_known_summary(self) -> Dict[str, Any]:
+        data = self.dict()
+        if (data.get("city") or data.get("address")) and not data.get("location"):
+            data["location"] = data.get("city") or data.get("address")
+        return {k: v for k, v in data.items() if v is not None and v != [] and v != {} and k != "facts_log"}
+
+    def get_missing_required(self, intent: str) -> List[str]:
+        known = self.get_known_summary()
+        return [f for f in INTENT_REQUIREMENTS.get(intent, []) if f not in known]
+
+    def get_missing_optional(self, intent: str) -> List[str]:
+        known = self.get_known_summary()
+        return [f for f in INTENT_OPTIONAL.get(intent, []) if f not in known]
+
+
+PROFILE = {"name": "Maya Chen", "email": "maya@example.com", "default_location": "Brooklyn", "preferences": {"stylist_gender": "any"}}
+SESSION_EXTRAS = {"session_id": "bench", "role": "consumer", "media": [], "gathered_info": {}, "consumer_profile": PROFILE}
+
+
+def extraction_for(turn: int) -> Dict[str, Any]:
+    # Mostly repeated facts with the occasional correction, like a real session
+    return {
+        "service_type": "haircut",
+        "city": "Brooklyn",
+        "budget_max": 60 + (turn % 5) * 5,
+        "timing": "this_week" if turn % 7 else "asap",
+    }
+
+
+def replay(cls, turns: int, concierge_passes: int):
+    session_context: Dict[str, Any] = dict(SESSION_EXTRAS)
+    t_build = t_summary = 0.0
+    start = time.perf_counter()
+    for turn in range(turns):
+        t0 = time.perf_counter()
+        ctx = cls(**session_context)
+        t_build += time.perf_counter() - t0
+
+        ctx.update_from_profile(PROFILE)
+        ctx.update_from_extraction(extraction_for(turn), ContextSource.CURRENT_MESSAGE)
+
+        t0 = time.perf_counter()
+        ctx.get_known_summary()  # chat_context_check log line
+        t_summary += time.perf_counter() - t0
+        session_context.update(ctx.dict())
+
+        # concierge_node rebuilds once per pass (tool loops re-enter it)
+        for _ in range(concierge_passes):
+            t0 = time.perf_counter()
+            c = cls(**session_context)
+            t_build += time.perf_counter() - t0
+            t0 = time.perf_counter()
+            c.get_known_summary()
+            c.get_missing_required("service_request")
+            c.get_missing_optional("service_request")
+            t_summary += time.perf_counter() - t0
+    total = time.perf_counter() - start
+    facts = len(session_context["facts_log"])
+    size = len(json.dumps(session_context, default=str))
+    return total, t_build, t_summary, facts, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--concierge-passes", type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"--- ConversationContext: {args.turns}-turn session, {args.concierge_passes} concierge passes/turn ---")
+    results = {}
+    for label, cls in (("pydantic (old)", LegacyConversationContext), ("slots (new)", ConversationContext)):
+        total, build, summary, facts, size = replay(cls, args.turns, args.concierge_passes)
+        results[label] = total
+        print(f"[{label:15}] total {total * 1000:8.1f}ms  build {build * 1000:7.1f}ms  "
+              f"summary+missing {summary * 1000:7.1f}ms  facts_log {facts:5}  session {size / 1024:7.1f}KB")
+
+    old, new = results["pydantic (old)"], results["slots (new)"]
+    print(f"\nSpeedup: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: local embedding backends, offline.
+
+Embeds a synthetic provider corpus (business name, bio, services and
+specializations built from a beauty-services vocabulary) with a local
+backend, then runs service-type queries against it and reports embedding
+throughput, per-batch latency and precision@k - the share of the top k
+providers that actually offer the queried service. An API baseline is
+given as the time the same batches would take at --api-ms per call.
+
+Usage:
+    python scripts/bench_embedding_backends.py --providers 5000 --model local/hashing
+    python scripts/bench_embedding_backends.py --model local/sentence-transformers/all-MiniLM-L6-v2 --dimensions 384
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import numpy as np
+
+from src.platform.services.embedding_cache import EmbeddingCache
+from src.platform.services.embeddings import EmbeddingService
+
+SERVICES = {
+    "box braids": ["knotless braids", "protective styles", "twists"],
+    "silk press": ["natural hair", "heat styling", "blowout"],
+    "balayage": ["hair color", "highlights", "toner"],
+    "fade": ["barber", "skin fade", "beard trim"],
+    "gel manicure": ["nail art", "pedicure", "acrylic nails"],
+    "facial": ["skincare", "hydrafacial", "extractions"],
+    "lash extensions": ["volume lashes", "lash lift", "brow tint"],
+    "locs": ["loc retwist", "starter locs", "interlocking"],
+}
+FILLER = ["licensed", "friendly", "studio", "years of experience", "appointments", "walk-ins welcome", "Brooklyn"]
+
+
+def corpus(providers: int, seed: int):
+    rnd = random.Random(seed)
+    names = list(SERVICES)
+    rows = []
+    for n in range(providers):
+        offered = rnd.sample(names, rnd.randint(1, 2))
+        words = [w for s in offered for w in [s, *rnd.sample(SERVICES[s], 2)]] + rnd.sample(FILLER, 3)
+        rnd.shuffle(words)
+        rows.append((f"Studio {n} " + ", ".join(words), set(offered)))
+    return rows
+
+
+async def run(args):
+    service = EmbeddingService(args.model, args.dimensions)
+    service.cache = EmbeddingCache(redis_client=False)
+    service.cache.enabled = False
+    rows = corpus(args.providers, args.seed)
+
+    latencies = []
+    vectors = []
+    start = time.perf_counter()
+    for first in range(0, len(rows), args.batch_size):
+        batch_start = time.perf_counter()
+        vectors.extend(await service.get_embeddings_batch([text for text, _ in rows[first:first + args.batch_size]]))
+        latencies.append(time.perf_counter() - batch_start)
+    elapsed = time.perf_counter() - start
+    matrix = np.asarray(vectors, dtype=np.float32)
+
+    precisions = []
+    for query in SERVICES:
+        embedding = np.asarray(await service.get_embedding(query), dtype=np.float32)
+        top = np.argsort(-(matrix @ embedding))[:args.k]
+        precisions.append(np.mean([query in rows[i][1] for i in top]))
+    return elapsed, latencies, float(np.mean(precisions))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="local/hashing")
+    parser.add_argument("--dimensions", type=int, default=1024)
+    parser.add_argument("--providers", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--api-ms", type=float, default=250, help="assumed round trip of a hosted batch call")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    elapsed, latencies, precision = asyncio.run(run(args))
+    batches = len(latencies)
+    latencies.sort()
+    print(f"--- {args.providers} providers, {args.model}, {args.dimensions} dims, batches of {args.batch_size} ---")
+    print(f"local: {elapsed:6.2f}s  {args.providers / elapsed:8.0f} texts/s  "
+          f"batch p50 {latencies[batches // 2] * 1000:6.1f}ms  p95 {latencies[int(batches * 0.95) - 1] * 1000:6.1f}ms")
+    print(f"API at {args.api_ms:.0f}ms/call: {batches * args.api_ms / 1000:6.2f}s for the same {batches} batches")
+    print(f"precision@{args.k} over {len(SERVICES)} service queries: {precision:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: concurrent get_embedding calls with and without micro-batching.
+
+Fires bursts of concurrent single-text get_embedding calls (request
+creations, profile and preference updates arriving together) at a stubbed
+embedding API. Each API call costs a fixed round trip plus a small per-item
+cost, and at most --connections calls can be in flight at once, like an
+HTTP pool under a provider rate limit. Reports wall time, API calls and
+per-call latency percentiles for one call per text vs EmbeddingBatcher.
+
+Usage:
+    python scripts/bench_embedding_batcher.py --calls 500 --burst 50 --api-ms 60
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.platform.services.embedding_batcher import EmbeddingBatcher
+from src.platform.services.embedding_cache import EmbeddingCache
+from src.platform.services.embeddings import EmbeddingService
+
+
+def fake_api(round_trip: float, per_item: float, connections: int, calls: list):
+    pool = None
+
+    async def aembedding(model, input, **kwargs):
+        nonlocal pool
+        pool = pool or asyncio.Semaphore(connections)
+        async with pool:
+            calls.append(len(input))
+            await asyncio.sleep(round_trip + per_item * len(input))
+        return SimpleNamespace(usage=None, data=[{"embedding": [0.0] * 8} for _ in input])
+    return aembedding
+
+
+async def run(args, batched: bool):
+    service = EmbeddingService()
+    service.dimensions = 8
+    service.cache = EmbeddingCache(redis_client=False)
+    service.cache.enabled = False
+    service.batcher = EmbeddingBatcher(service._embed_many, args.max_items, args.max_wait_ms) if batched else None
+
+    calls, latencies = [], []
+
+    async def one(n):
+        start = time.perf_counter()
+        await service.get_embedding(f"provider profile {n}")
+        latencies.append(time.perf_counter() - start)
+
+    api = fake_api(args.api_ms / 1000, args.item_ms / 1000, args.connections, calls)
+    with patch("src.platform.services.embedding_backends.litellm.aembedding", api):
+        start = time.perf_counter()
+        for first in range(0, args.calls, args.burst):
+            await asyncio.gather(*(one(n) for n in range(first, min(first + args.burst, args.calls))))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    return elapsed, len(calls), statistics.median(latencies), p95
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--burst", type=int, default=50)
+    parser.add_argument("--api-ms", type=float, default=60)
+    parser.add_argument("--item-ms", type=float, default=0.2)
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--max-items", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"--- {args.calls} calls in bursts of {args.burst}, API {args.api_ms:.0f}ms + "
+          f"{args.item_ms}ms/item, {args.connections} connections ---")
+    for label, batched in (("one per call", False), ("micro-batched", True)):
+        elapsed, api_calls, p50, p95 = asyncio.run(run(args, batched))
+        print(f"[{label:13}] {elapsed:6.2f}s  {api_calls:4} API calls  "
+              f"p50 {p50 * 1000:6.1f}ms  p95 {p95 * 1000:6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
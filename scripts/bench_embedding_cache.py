@@ -0,0 +1,86 @@
+"""
+Benchmark: EmbeddingService with and without the embedding cache.
+
+Replays a matching + preference-update workload - "{service_type}
+{description}" search texts drawn with a Zipf skew (a few popular requests,
+a long tail) plus repeated preference summaries - against a stubbed
+embedding API with a fixed latency, and reports hit rate, mean latency per
+embedding and the spend the cache avoided (at LLM_EMBEDDING_3_LARGE_COST).
+
+Usage:
+    python scripts/bench_embedding_cache.py --calls 2000 --api-ms 80
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+from src.platform.services.embedding_cache import EmbeddingCache
+from src.platform.services.embeddings import EmbeddingService
+
+SERVICE_TYPES = ["haircut", "silk press", "balayage", "box braids", "fade", "manicure", "gel nails", "facial"]
+DESCRIPTIONS = ["", "curly hair specialist", "for my wedding", "type 4 hair", "short notice", "kids cut", "trim only"]
+
+
+def workload(calls: int, seed: int):
+    rnd = random.Random(seed)
+    searches = [f"{s} {d}" for s in SERVICE_TYPES for d in DESCRIPTIONS]
+    weights = [1 / (rank + 1) for rank in range(len(searches))]
+    preferences = [f"Budget: {lo}-{lo + 100}, Location: Brooklyn, Timing: weekends" for lo in (50, 80, 100, 150)]
+    texts = []
+    for _ in range(calls):
+        if rnd.random() < 0.7:
+            texts.append(rnd.choices(searches, weights)[0])
+        else:
+            texts.append(rnd.choice(preferences))
+    return texts
+
+
+def fake_api(latency: float, dimensions: int):
+    async def aembedding(model, input, **kwargs):
+        await asyncio.sleep(latency)
+        return SimpleNamespace(
+            usage=SimpleNamespace(prompt_tokens=sum(len(text) // 4 + 1 for text in input)),
+            data=[{"embedding": np.random.default_rng(len(text)).standard_normal(dimensions).tolist()} for text in input],
+        )
+    return aembedding
+
+
+async def run(texts, cache_enabled: bool, latency: float, dimensions: int):
+    service = EmbeddingService()
+    service.dimensions = dimensions
+    service.cache = EmbeddingCache(redis_client=False)
+    service.cache.enabled = cache_enabled
+    with patch("src.platform.services.embedding_backends.litellm.aembedding", fake_api(latency, dimensions)), \
+            patch("src.platform.services.embeddings.SessionLocal"):
+        start = time.perf_counter()
+        for text in texts:
+            await service.get_embedding(text)
+        elapsed = time.perf_counter() - start
+    return elapsed / len(texts), service.cache.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--api-ms", type=float, default=80)
+    parser.add_argument("--dimensions", type=int, default=3072)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = workload(args.calls, args.seed)
+    print(f"--- {args.calls} embeddings, {len(set(texts))} distinct texts, API {args.api_ms:.0f}ms ---")
+    uncached, _ = asyncio.run(run(texts, False, args.api_ms / 1000, args.dimensions))
+    cached, stats = asyncio.run(run(texts, True, args.api_ms / 1000, args.dimensions))
+    print(f"no cache: {uncached * 1000:7.2f}ms per embedding")
+    print(f"cache:    {cached * 1000:7.2f}ms per embedding  hit rate {stats['hit_rate']:.1%}  "
+          f"tokens saved {stats['tokens_saved']}  spend saved ${stats['spend_saved_usd']:.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: recall of truncated / quantized embeddings on the provider corpus.
+
+For each embedding width (matryoshka truncation + re-normalization, what
+LLM_EMBEDDING_DIMENSIONS does) and storage type (float32 = vector, float16 =
+halfvec, int8 = the provider index's PROVIDER_INDEX_DTYPE), ranks the corpus
+for a set of queries and reports recall@k against the full-width float32
+ranking, plus bytes per row and whether pgvector can index that column.
+
+Corpus: the stored provider embeddings (--from-db, needs DATABASE_URL and
+full-width embeddings), queried leave-one-out with sampled providers. Without
+--from-db, a synthetic corpus whose variance decays across dimensions the way
+matryoshka embeddings' does - useful for the quantization numbers, not for
+choosing a width.
+
+Usage:
+    python scripts/bench_embedding_dimensions.py --from-db --queries 200 --k 20
+    python scripts/bench_embedding_dimensions.py --rows 20000 --dims 256,512,1024,1536,3072
+"""
+
+import argparse
+
+import numpy as np
+
+from src.platform.database.vectors import MAX_INDEXED_DIMENSIONS
+
+STORAGE = {"float32": ("vector", 4), "float16": ("halfvec", 2), "int8": (None, 1)}
+
+
+def load_corpus(from_db: bool, rows: int, dim: int, seed: int) -> np.ndarray:
+    if from_db:
+        from src.platform.database import SessionLocal
+        from src.platform.models.provider import Provider
+
+        with SessionLocal() as db:
+            embeddings = [
+                row[0] for row in db.query(Provider.embedding).filter(
+                    Provider.status == "active", Provider.embedding.isnot(None)
+                ).all()
+            ]
+        return np.asarray(embeddings, dtype=np.float32)
+
+    rng = np.random.default_rng(seed)
+    decay = 1.0 / np.sqrt(1.0 + np.arange(dim) / 64.0)
+    topics = rng.standard_normal((200, dim)).astype(np.float32) * decay
+    corpus = topics[rng.integers(0, 200, rows)] + 0.6 * rng.standard_normal((rows, dim), dtype=np.float32) * decay
+    return corpus
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def stored(vectors: np.ndarray, dtype: str) -> np.ndarray:
+    """Round-trip through the storage type, back to float32 for scoring."""
+    if dtype == "int8":
+        scales = np.abs(vectors).max(axis=1, keepdims=True) / 127.0
+        scales[scales == 0] = 1.0
+        return np.round(vectors / scales).astype(np.int8).astype(np.float32) * scales
+    return vectors.astype(dtype).astype(np.float32)
+
+
+def top_k(corpus: np.ndarray, queries: np.ndarray, query_rows: np.ndarray, k: int) -> np.ndarray:
+    scores = queries @ corpus.T
+    scores[np.arange(len(query_rows)), query_rows] = -np.inf  # leave-one-out
+    return np.argpartition(-scores, k, axis=1)[:, :k]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--from-db", action="store_true")
+    parser.add_argument("--rows", type=int, default=20000, help="synthetic corpus size")
+    parser.add_argument("--full-dim", type=int, default=3072)
+    parser.add_argument("--dims", default="256,512,1024,1536,3072")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.from_db, args.rows, args.full_dim, args.seed)
+    if len(corpus) <= args.k:
+        raise SystemExit(f"need more than {args.k} providers with embeddings, found {len(corpus)}")
+    rng = np.random.default_rng(args.seed)
+    query_rows = rng.choice(len(corpus), size=min(args.queries, len(corpus)), replace=False)
+
+    full = normalize(corpus)
+    truth = top_k(full, full[query_rows], query_rows, args.k)
+
+    print(f"--- {len(corpus)} providers, {len(query_rows)} queries, recall@{args.k} vs "
+          f"{corpus.shape[1]}-dim float32 ---")
+    for dim in (int(d) for d in args.dims.split(",")):
+        if dim > corpus.shape[1]:
+            continue
+        truncated = normalize(corpus[:, :dim])
+        for dtype, (column, size) in STORAGE.items():
+            vectors = stored(truncated, dtype)
+            found = top_k(vectors, vectors[query_rows], query_rows, args.k)
+            recall = np.mean([len(set(a) & set(b)) / args.k for a, b in zip(found, truth)])
+            if column is None:
+                where = "provider index only"
+            elif dim <= MAX_INDEXED_DIMENSIONS[column]:
+                where = f"{column}({dim}) + HNSW"
+            else:
+                where = f"{column}({dim}), no index"
+            print(f"[{dim:5} {dtype:7}] recall {recall:.3f}  {dim * size / 1024:5.1f} KB/row  {where}")
+
+
+if __name__ == "__main__":
+    main()
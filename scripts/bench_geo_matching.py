@@ -0,0 +1,102 @@
+"""
+Benchmark: location filter for matching.
+
+Scatters providers around a few metro areas (each point labelled with the
+city whose center is nearest, like a provider's self-reported city) and
+answers radius queries three ways:
+
+    city string   the legacy filter: location->>'city' == request city, a
+                  full scan (no usable index) that ignores distance
+    full scan     exact haversine against every provider
+    geohash       prefix range scans on a sorted geohash column (what the
+                  btree index does) + vectorized haversine refine
+
+Reports time per query, rows examined, and recall of each method against
+the exact radius result - the city filter misses neighbours across city
+lines and returns far-away providers of big cities.
+
+Usage:
+    python scripts/bench_geo_matching.py --providers 100000 --queries 200 --radius 10
+"""
+
+import argparse
+import bisect
+import time
+
+import numpy as np
+
+from src.platform.database.geo import geohash_encode, geohash_prefixes, haversine_km
+
+METROS = {
+    "New York": (40.7128, -74.0060),
+    "Jersey City": (40.7178, -74.0431),
+    "Newark": (40.7357, -74.1724),
+    "Yonkers": (40.9312, -73.8988),
+    "Stamford": (41.0534, -73.5387),
+}
+
+
+def corpus(providers: int, seed: int):
+    rng = np.random.default_rng(seed)
+    centers = np.array(list(METROS.values()))
+    names = list(METROS)
+    picks = rng.integers(0, len(centers), providers)
+    lats = centers[picks, 0] + rng.normal(0, 0.12, providers)
+    lngs = centers[picks, 1] + rng.normal(0, 0.12, providers)
+    nearest = np.argmin(((lats[:, None] - centers[:, 0]) ** 2 + (lngs[:, None] - centers[:, 1]) ** 2), axis=1)
+    cities = [names[i] for i in nearest]
+    return lats, lngs, cities
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--providers", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--radius", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    lats, lngs, cities = corpus(args.providers, args.seed)
+    ids = np.arange(args.providers)
+    geohashes = [geohash_encode(lat, lng) for lat, lng in zip(lats, lngs)]
+    order = np.argsort(geohashes)
+    sorted_hashes = [geohashes[i] for i in order]
+    rng = np.random.default_rng(args.seed + 1)
+    queries = rng.integers(0, args.providers, args.queries)
+
+    totals = {name: [0.0, 0, 0.0] for name in ("city string", "full scan", "geohash")}
+    for q in queries:
+        lat, lng, city = lats[q], lngs[q], cities[q]
+        truth = set(ids[haversine_km(lat, lng, lats, lngs) <= args.radius].tolist())
+
+        start = time.perf_counter()
+        found = {i for i, c in enumerate(cities) if c == city}
+        totals["city string"][0] += time.perf_counter() - start
+        totals["city string"][1] += args.providers
+        totals["city string"][2] += len(found & truth) / len(truth)
+
+        start = time.perf_counter()
+        found = set(ids[haversine_km(lat, lng, lats, lngs) <= args.radius].tolist())
+        totals["full scan"][0] += time.perf_counter() - start
+        totals["full scan"][1] += args.providers
+        totals["full scan"][2] += len(found & truth) / len(truth)
+
+        start = time.perf_counter()
+        ranges = []
+        for prefix in geohash_prefixes(lat, lng, args.radius):
+            lo = bisect.bisect_left(sorted_hashes, prefix)
+            ranges.append(order[lo:bisect.bisect_left(sorted_hashes, prefix + "~", lo)])
+        rows = np.concatenate(ranges)
+        found = set(rows[haversine_km(lat, lng, lats[rows], lngs[rows]) <= args.radius].tolist())
+        totals["geohash"][0] += time.perf_counter() - start
+        totals["geohash"][1] += len(rows)
+        totals["geohash"][2] += len(found & truth) / len(truth)
+
+    print(f"--- {args.providers} providers, {args.queries} queries, radius {args.radius} km ---")
+    for name, (elapsed, examined, recall) in totals.items():
+        print(f"[{name:11}] {elapsed / args.queries * 1000:7.2f}ms/query  "
+              f"{examined / args.queries:9.0f} rows examined  recall {recall / args.queries:.3f}")
+
+
+if __name__ == "__main__":
+    main()
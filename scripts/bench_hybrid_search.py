@@ -0,0 +1,161 @@
+"""
+Benchmark: keyword, full-text, vector and hybrid provider ranking, offline.
+
+Builds a synthetic provider corpus (business name and services weighted A,
+specializations B, bio C, like providers.search_vector) and answers
+"<service type> <specialization>" requests four ways:
+
+    ilike       the legacy keyword fallback: services.name ILIKE
+                '%service type%', a full scan of every row, unranked
+    full-text   inverted index over the weighted words (what the GIN index
+                on search_vector does), ranked by summed weights like
+                ts_rank_cd, top --depth
+    vector      local/hashing embeddings, exact cosine top --depth
+    hybrid      reciprocal rank fusion of full-text and vector
+
+Reports time per query, rows examined and precision@k - the share of the
+top k providers that offer the service *and* the requested specialization.
+
+Usage:
+    python scripts/bench_hybrid_search.py --providers 100000 --queries 200
+"""
+
+import argparse
+import random
+import re
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from src.platform.services.embedding_backends import HashingBackend
+from src.platform.services.matching import RANKING_DEPTH, RRF_K, reciprocal_rank_fusion
+
+SERVICES = {
+    "box braids": ["knotless", "jumbo", "goddess", "bohemian"],
+    "silk press": ["natural hair", "trim", "heat protectant", "blowout"],
+    "balayage": ["highlights", "toner", "blonde", "gloss"],
+    "fade": ["skin fade", "beard trim", "lineup", "taper"],
+    "gel manicure": ["nail art", "pedicure", "acrylic", "chrome"],
+    "facial": ["hydrafacial", "extractions", "acne", "peel"],
+    "lash extensions": ["volume", "lash lift", "brow tint", "classic"],
+    "locs": ["retwist", "starter locs", "interlocking", "loc repair"],
+}
+BIO = ["licensed", "friendly", "studio", "years of experience", "appointments", "walk-ins welcome", "Brooklyn"]
+WEIGHTS = {"A": 1.0, "B": 0.4, "C": 0.2}  # ts_rank's default {0.1, 0.2, 0.4, 1.0} for D..A
+
+_WORD = re.compile(r"\w+")
+
+
+def terms(text: str):
+    # A crude stand-in for the english stemmer: braids/braid, locs/loc
+    return [word[:-1] if len(word) > 3 and word.endswith("s") else word for word in _WORD.findall(text.lower())]
+
+
+def corpus(providers: int, seed: int):
+    rnd = random.Random(seed)
+    names = list(SERVICES)
+    rows = []
+    for n in range(providers):
+        offered = rnd.sample(names, rnd.randint(1, 2))
+        specs = [spec for service in offered for spec in rnd.sample(SERVICES[service], 2)]
+        rows.append({
+            "A": f"Studio {n} " + " ".join(offered),
+            "B": " ".join(specs),
+            "C": " ".join(rnd.sample(BIO, 3)),
+            "offered": set(offered),
+            "specs": set(specs),
+        })
+    return rows
+
+
+def build_index(rows):
+    postings = defaultdict(lambda: defaultdict(float))
+    for i, row in enumerate(rows):
+        for field, weight in WEIGHTS.items():
+            for term in terms(row[field]):
+                postings[term][i] += weight
+    return {
+        term: (np.fromiter(docs.keys(), dtype=np.int64), np.fromiter(docs.values(), dtype=np.float32))
+        for term, docs in postings.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--providers", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dimensions", type=int, default=256)
+    parser.add_argument("--depth", type=int, default=RANKING_DEPTH)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = corpus(args.providers, args.seed)
+    service_names = [row["A"].lower() for row in rows]
+    start = time.perf_counter()
+    index = build_index(rows)
+    backend = HashingBackend("local/hashing")
+    matrix = np.asarray(
+        backend.embed_sync([" ".join((row["A"], row["B"], row["C"])) for row in rows], args.dimensions),
+        dtype=np.float32,
+    )
+    print(f"indexed {args.providers} providers in {time.perf_counter() - start:.1f}s")
+
+    rnd = random.Random(args.seed + 1)
+    queries = []
+    for _ in range(args.queries):
+        service = rnd.choice(list(SERVICES))
+        queries.append((service, rnd.choice(SERVICES[service])))
+
+    totals = {name: [0.0, 0, 0.0] for name in ("ilike", "full-text", "vector", "hybrid")}
+
+    def record(name, elapsed, examined, ranked, service, spec):
+        top = ranked[:args.k]
+        hits = sum(service in rows[i]["offered"] and spec in rows[i]["specs"] for i in top)
+        totals[name][0] += elapsed
+        totals[name][1] += examined
+        totals[name][2] += hits / args.k
+
+    for service, spec in queries:
+        start = time.perf_counter()
+        pattern = service.lower()
+        found = [i for i, name in enumerate(service_names) if pattern in name][:20]
+        record("ilike", time.perf_counter() - start, args.providers, found, service, spec)
+
+        start = time.perf_counter()
+        scores = np.zeros(args.providers, dtype=np.float32)
+        examined = 0
+        for term in dict.fromkeys(terms(f"{service} {spec}")):
+            if term in index:
+                docs, weights = index[term]
+                scores[docs] += weights
+                examined += len(docs)
+        candidates = np.flatnonzero(scores)
+        top = candidates[np.argsort(-scores[candidates], kind="stable")[:args.depth]]
+        lexical = top.tolist()
+        lexical_time = time.perf_counter() - start
+        record("full-text", lexical_time, examined, lexical, service, spec)
+
+        start = time.perf_counter()
+        embedding = np.asarray(backend.embed_sync([f"{service} {spec}"], args.dimensions)[0], dtype=np.float32)
+        similarity = matrix @ embedding
+        top = np.argpartition(-similarity, args.depth)[:args.depth]
+        vector = top[np.argsort(-similarity[top])].tolist()
+        vector_time = time.perf_counter() - start
+        record("vector", vector_time, args.providers, vector, service, spec)
+
+        start = time.perf_counter()
+        fused = reciprocal_rank_fusion([vector, lexical], RRF_K)
+        record("hybrid", lexical_time + vector_time + time.perf_counter() - start,
+               examined + args.providers, fused, service, spec)
+
+    print(f"--- {args.providers} providers, {args.queries} queries, depth {args.depth}, RRF k={RRF_K} ---")
+    for name, (elapsed, examined, precision) in totals.items():
+        print(f"[{name:9}] {elapsed / args.queries * 1000:7.2f}ms/query  "
+              f"{examined / args.queries:9.0f} rows examined  precision@{args.k} {precision / args.queries:.3f}")
+    print("(vector/hybrid rows examined are exact cosine here; the HNSW index reads a few hundred)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Benchmark: compiled intent router vs the per-term substring loops it replaced.
+
+Times each keyword stage of a chat turn: router_node on the user message,
+find_for_service on the user message + assistant reply (chat._consult_specialist)
+and HaircutSpecialist's service-type / style / color / treatment loops over the
+request text + media descriptions. The legacy loops (reproduced inline below)
+rescan the text once per term; the new path is one compiled pass per text
+(match_intents), shared by all the questions asked of it. The router and
+the registry only ask for the best service label, so they use
+route_service, which intersects the text's words with the service terms and
+counts, without building an IntentMatch. The legacy loops stop at the first
+substring hit, so on the long registry text (message + assistant reply)
+tokenizing still costs more than they do; the gain is in the detector stage
+and grows with the length of the request text, which is reported
+separately. "turn" is all three stages of one chat turn.
+
+Also reports routing disagreements, which are the substring misfires
+("cut" in "executive", "hair" in "chair") the word-boundary matcher fixes.
+
+Usage:
+    python scripts/bench_intent_router.py --turns 20000 --media 1,4,16
+"""
+
+import argparse
+import random
+import time
+
+from src.platform.services.intent_router import (
+    COLOR_SERVICES,
+    HAIRCUT_STYLES,
+    TREATMENTS,
+    match_intents,
+    route_service,
+)
+
+
+# --- Baseline: the loops this replaced ---
+
+LEGACY_ROUTER_KEYWORDS = {
+    "haircut": ["hair", "cut", "trim", "color", "fade", "barber", "stylist"],
+    "cleaning": ["clean", "maid", "house", "apartment"],
+    "plumbing": ["plumb", "leak", "pipe", "drain", "faucet"],
+}
+
+LEGACY_REGISTRY_KEYWORDS = {
+    "haircut": ["hair", "cut", "style", "trim", "color", "dye", "highlights", "balayage"],
+    "cleaning": ["clean", "maid", "housekeeping", "tidy"],
+    "plumbing": ["plumb", "pipe", "leak", "drain", "faucet", "toilet"],
+}
+
+
+def legacy_route(text: str, keywords=LEGACY_ROUTER_KEYWORDS):
+    for specialist, terms in keywords.items():
+        if any(term in text for term in terms):
+            return specialist
+    return None
+
+
+def legacy_haircut(text: str):
+    if any(w in text for w in ["color", "dye", "highlight", "balayage", "ombre"]):
+        subtype = "cut_and_color" if any(w in text for w in ["cut", "trim", "style"]) else "color"
+    elif any(w in text for w in ["keratin", "treatment", "conditioning", "repair"]):
+        subtype = "treatment"
+    elif any(w in text for w in ["blowout", "blow dry", "styling"]):
+        subtype = "styling"
+    elif any(w in text for w in ["cut", "trim", "haircut", "bob", "pixie", "layers", "fade"]):
+        subtype = "haircut"
+    else:
+        subtype = "unknown"
+    styles = []
+    for category, items in HAIRCUT_STYLES.items():
+        if category in text:
+            styles.append(category)
+        styles.extend(s for s in items if s in text)
+    colors = [s for items in COLOR_SERVICES.values() for s in items if s in text]
+    treatments = [t for items in TREATMENTS.values() for t in items if t in text]
+    return subtype, set(styles), colors, treatments
+
+
+SCAN = match_intents.__wrapped__  # uncached: measure the scans themselves
+
+
+def compiled_haircut(text: str):
+    match = SCAN(text)
+    match.labels("hair_service"), match.labels("style"), match.terms("style")
+    return match.terms("color"), match.terms("treatment")
+
+
+# stage -> (legacy, compiled, text of the turn it runs on)
+STAGES = {
+    "router": (legacy_route, route_service, lambda t: t[0]),
+    "registry": (
+        lambda text: legacy_route(text, LEGACY_REGISTRY_KEYWORDS),
+        route_service,
+        lambda t: t[0] + " " + t[1],
+    ),
+    "detectors": (legacy_haircut, compiled_haircut, lambda t: t[2]),
+}
+
+
+TEMPLATES = [
+    "I need a {hair} in {city} this weekend, budget around ${budget}",
+    "Can someone fix the {plumb} in my kitchen? It's been dripping since {day}",
+    "Looking for a {clean} for my 2 bedroom apartment on {day}",
+    "Hi! I'm an executive assistant and my boss wants a {hair} before the gala",
+    "My hair is curly and I'd like {hair} plus a keratin treatment",
+    "What's the weather like in {city}?",
+    "Need help moving a couch and a chair to my new place in {city}",
+    "Lifestyle photographer needed for a brand shoot in {city}",
+]
+FILL = {
+    "hair": ["haircut", "balayage", "classic bob", "skin fade", "trim", "curtain bangs and layers"],
+    "plumb": ["leaky faucet", "clogged drain", "burst pipe"],
+    "clean": ["house cleaner", "maid", "deep clean"],
+    "city": ["Brooklyn", "Austin", "Oakland"],
+    "day": ["Monday", "Friday", "yesterday"],
+    "budget": ["60", "150", "300"],
+}
+REPLY = (
+    "Got it! To find the right provider in {city} I just need a couple more details: "
+    "what day and time work best for you, and is there a price range you'd like to stay "
+    "within? If you have a photo of what you're after, feel free to share it - it helps "
+    "providers quote accurately. Once I have that I'll draft the request for you to review."
+)
+MEDIA = (
+    "Photo shows shoulder-length wavy hair, medium density, some frizz at the ends. "
+    "Reference photo shows a textured look with soft face-framing pieces and warm tones."
+)
+
+
+def corpus(n: int, seed: int, media: int = 1):
+    """(user message, assistant reply, service request text) per turn."""
+    rnd = random.Random(seed)
+    turns = []
+    for i in range(n):
+        fill = {k: rnd.choice(v) for k, v in FILL.items()}
+        user = rnd.choice(TEMPLATES).format(**fill) + f" #{i}"
+        turns.append((user, REPLY.format(**fill), f"haircut {user} " + " ".join([MEDIA] * media)))
+    return turns
+
+
+def timed(fn, texts, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=20000)
+    parser.add_argument("--media", default="1,4,16", help="media descriptions per request, comma-separated")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    turns = corpus(args.turns, args.seed)
+    print(f"--- {args.turns} turns, per stage (best of 3) ---")
+    total_old = total_new = 0.0
+    for name, (legacy, compiled, text_of) in STAGES.items():
+        texts = [text_of(t) for t in turns]
+        old, new = timed(lambda x: legacy(x.lower()), texts), timed(compiled, texts)
+        total_old, total_new = total_old + old, total_new + new
+        print(f"[{name:9}] loops {old / len(texts) * 1e6:6.2f}us  compiled {new / len(texts) * 1e6:6.2f}us  "
+              f"{old / new:4.1f}x")
+    print(f"[{'turn':9}] loops {total_old / len(turns) * 1e6:6.2f}us  compiled {total_new / len(turns) * 1e6:6.2f}us  "
+          f"{total_old / total_new:4.1f}x")
+
+    print("\n--- detectors vs request length ---")
+    legacy, compiled, text_of = STAGES["detectors"]
+    for media in (int(m) for m in args.media.split(",")):
+        texts = [text_of(t) for t in corpus(args.turns, args.seed, media)]
+        old, new = timed(lambda x: legacy(x.lower()), texts), timed(compiled, texts)
+        chars = sum(map(len, texts)) // len(texts)
+        print(f"[{chars:5} chars] loops {len(texts) / old:9,.0f}/s  compiled {len(texts) / new:9,.0f}/s  "
+              f"{old / new:4.1f}x")
+
+    changed = [(t[0], legacy_route(t[0].lower()), route_service(t[0])) for t in turns]
+    changed = [c for c in changed if c[1] != c[2]]
+    print(f"\nRouting differs on {len(changed)} of {len(turns)} turns; examples:")
+    seen = set()
+    for message, o, n in changed:
+        key = message.split(" #")[0][:40]
+        if key not in seen:
+            seen.add(key)
+            print(f"  {o!s:9} -> {n!s:9} {message}")
+        if len(seen) >= 5:
+            break
+
+
+if __name__ == "__main__":
+    main()
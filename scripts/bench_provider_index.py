@@ -0,0 +1,104 @@
+"""
+Benchmark: provider index search vs a full scan of provider embeddings.
+
+The baseline is what the pgvector query does without a usable ANN index on
+the 3072-dim column: score every provider, then apply the city / category
+filters and take the top 20. The index applies the filters as bitsets first
+and scores only the survivors (exact), or - for unfiltered searches over
+more than PROVIDER_INDEX_EXACT_MAX rows - only the nearest IVF lists, where
+recall@20 against the full scan is reported too.
+
+Also times a cold start: memory-mapping the saved snapshot vs re-inserting
+every row.
+
+Usage:
+    python scripts/bench_provider_index.py --rows 20000 --dim 3072 --queries 50
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from src.platform.services.provider_index import ProviderIndex
+
+CITIES = ["Brooklyn", "Queens", "Manhattan", "Bronx", "Staten Island", "Jersey City", "Hoboken", "Newark"]
+CATEGORIES = ["hairstylist", "barber", "nail technician", "makeup artist", "esthetician", "massage therapist"]
+
+
+# --- Baseline: score everything, filter afterwards ---
+
+def full_scan(vectors, cities, categories, query, city=None, category=None, k=20):
+    similarity = vectors @ (query / np.linalg.norm(query))
+    keep = np.ones(len(vectors), dtype=bool)
+    if city is not None:
+        keep &= cities == city
+    if category is not None:
+        keep &= np.array([category in c for c in categories])
+    similarity[~keep] = -np.inf
+    top = np.argsort(-similarity)[:k]
+    return [int(i) for i in top if keep[i]]
+
+
+def timed(fn, queries):
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for query in queries:
+            fn(query)
+        best = min(best, (time.perf_counter() - start) / len(queries))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=3072)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    centers = rng.standard_normal((64, args.dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, 64, args.rows)] + 0.5 * rng.standard_normal((args.rows, args.dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    cities = np.array([CITIES[i] for i in rng.integers(0, len(CITIES), args.rows)])
+    categories = [CATEGORIES[i] for i in rng.integers(0, len(CATEGORIES), args.rows)]
+    ids = [str(i) for i in range(args.rows)]
+    queries = [centers[i % 64] + 0.5 * rng.standard_normal(args.dim, dtype=np.float32) for i in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as path:
+        index = ProviderIndex(path=path, enabled=True, exact_max=args.rows // 10, ivf_min_rows=1000)
+        start = time.perf_counter()
+        for i in range(args.rows):
+            index.upsert(ids[i], vectors[i], cities[i], [categories[i]])
+        rebuild = time.perf_counter() - start
+        index.save()
+
+        start = time.perf_counter()
+        cold = ProviderIndex(path=path, enabled=True, exact_max=args.rows // 10)
+        cold.load()
+        load = time.perf_counter() - start
+
+        print(f"--- {args.rows} providers x {args.dim} dims, {args.queries} queries ---")
+        for label, city, category in [
+            ("city + category", "Brooklyn", "barber"),
+            ("category only", None, "hairstylist"),
+            ("unfiltered (IVF)", None, None),
+        ]:
+            old = timed(lambda q: full_scan(vectors, cities, categories, q, city, category), queries)
+            new = timed(lambda q: cold.search(q, city=city, category=category), queries)
+            recall = np.mean([
+                len({int(pid) for pid, _ in cold.search(q, city=city, category=category)}
+                    & set(full_scan(vectors, cities, categories, q, city, category))) / 20
+                for q in queries
+            ])
+            print(f"[{label:17}] full scan {old * 1000:7.2f}ms  index {new * 1000:7.2f}ms  "
+                  f"{old / new:5.1f}x  recall@20 {recall:.2f}")
+
+        print(f"cold start: mmap load {load * 1000:.1f}ms vs re-insert {rebuild * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: request-creation latency with matching inline vs queued.
+
+Simulates POST /requests/ under concurrent load. Both paths pay the same
+stubbed DB insert (--db-ms). Inline matching then waits for the embedding
+round trip (--api-ms, at most --connections in flight, like an HTTP pool
+under a provider rate limit) and the ranking queries (--search-ms) before
+returning; the queued path instead publishes the "match_request" task
+through schedule_matching to an in-memory Celery broker (a real kombu
+publish, no network) and returns.
+
+Reports p50 / p95 / max creation latency per path.
+
+Usage:
+    python scripts/bench_request_creation.py --requests 500 --concurrency 50 --api-ms 250
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from uuid import uuid4
+
+from src.platform.services.request_matches import schedule_matching
+from src.platform.worker import celery_app
+
+
+async def run(args, queued: bool):
+    pool = asyncio.Semaphore(args.connections)
+    gate = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def create():
+        async with gate:
+            start = time.perf_counter()
+            await asyncio.sleep(args.db_ms / 1000)  # insert + commit
+            if queued:
+                schedule_matching(uuid4())
+            else:
+                async with pool:
+                    await asyncio.sleep(args.api_ms / 1000)  # embedding
+                await asyncio.sleep(args.search_ms / 1000)  # vector + full-text ranking, match rows
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(create() for _ in range(args.requests)))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--db-ms", type=float, default=5)
+    parser.add_argument("--api-ms", type=float, default=250, help="embedding API round trip")
+    parser.add_argument("--search-ms", type=float, default=30)
+    parser.add_argument("--connections", type=int, default=20, help="embedding calls in flight at once")
+    args = parser.parse_args()
+
+    celery_app.conf.update(broker_url="memory://", result_backend="cache+memory://", task_always_eager=False)
+
+    print(f"--- {args.requests} creates, {args.concurrency} concurrent, embedding {args.api_ms:.0f}ms "
+          f"({args.connections} connections), search {args.search_ms:.0f}ms ---")
+    for name, queued in (("inline", False), ("queued", True)):
+        elapsed, latencies = asyncio.run(run(args, queued))
+        print(f"[{name:6}] {elapsed:6.2f}s  p50 {statistics.median(latencies) * 1000:7.1f}ms  "
+              f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:7.1f}ms  max {latencies[-1] * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
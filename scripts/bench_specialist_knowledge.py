@@ -0,0 +1,100 @@
+"""
+Benchmark: compiled specialist knowledge vs the per-entry substring loops.
+
+Consults a haircut knowledge base grown to N technical terms (the bundled
+terms plus generated ones), timing the old consult - lower-casing the query
+and checking every term, warning and service type with `in` - against
+SpecialistService's compiled matcher. Also reports how long a (hot) reload
+takes to compile each vocabulary size.
+
+Usage:
+    python scripts/bench_specialist_knowledge.py --consults 5000 --sizes 8,1000,5000
+"""
+
+import argparse
+import copy
+import os
+import random
+import tempfile
+import time
+
+import yaml
+
+from src.platform.services.specialist_service import SpecialistService
+
+BUNDLED = "src/platform/knowledge/haircut.yaml"
+
+QUERIES = [
+    "I need a color correction for my 4C hair, it's long and thick",
+    "Looking for a skin fade with a low taper and a hard part",
+    "Can you do balayage on medium porosity hair? Budget is $200",
+    "Silk press and trim please, my hair is extra long",
+    "What's the process time for a single process color with 20 volume developer?",
+]
+
+
+# --- Baseline: the consult this replaced ---
+
+def legacy_consult(knowledge, query, context=None):
+    terms_found = []
+    for term in knowledge.get("technical_terms", []):
+        if term.lower() in query.lower():
+            terms_found.append(term)
+    warnings = []
+    for key, warning in knowledge.get("warnings", {}).items():
+        if key.replace("_", " ") in query.lower():
+            warnings.append(warning)
+    multiplier = 1.0
+    pricing = knowledge.get("pricing_factors", {})
+    for stype, factor in pricing.get("service_type", {}).items():
+        if stype.replace("_", " ") in query.lower():
+            multiplier *= factor
+    return terms_found, warnings, multiplier
+
+
+def grown(base, size, seed):
+    """The bundled knowledge with generated terms up to `size`."""
+    rnd = random.Random(seed)
+    knowledge = copy.deepcopy(base)
+    words = ["root", "gloss", "bond", "wave", "curl", "tone", "lift", "blend", "line", "weave"]
+    terms = knowledge["technical_terms"]
+    while len(terms) < size:
+        terms.append(f"{rnd.choice(words)}{len(terms)} {rnd.choice(words)}")
+    return knowledge
+
+
+def per_consult(fn, queries, consults):
+    start = time.perf_counter()
+    for i in range(consults):
+        fn(queries[i % len(queries)])
+    return (time.perf_counter() - start) / consults
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--consults", type=int, default=5000)
+    parser.add_argument("--sizes", default="8,1000,5000")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(BUNDLED) as f:
+        base = yaml.safe_load(f)
+
+    print(f"--- {args.consults} consults per vocabulary size ---")
+    for size in (int(s) for s in args.sizes.split(",")):
+        knowledge = grown(base, size, args.seed)
+        with tempfile.TemporaryDirectory() as knowledge_dir:
+            with open(os.path.join(knowledge_dir, "haircut.yaml"), "w") as f:
+                yaml.safe_dump(knowledge, f)
+            start = time.perf_counter()
+            service = SpecialistService(knowledge_dir, reload_interval=-1)
+            load = time.perf_counter() - start
+
+            old = per_consult(lambda q: legacy_consult(knowledge, q), QUERIES, args.consults)
+            new = per_consult(lambda q: service.consult("haircut", q), QUERIES, args.consults)
+        print(f"[{size:5} terms] loops {old * 1e6:8.1f}us  compiled {new * 1e6:6.1f}us  "
+              f"{old / new:6.1f}x  (load + compile {load * 1000:6.1f}ms)")
+
+
+if __name__ == "__main__":
+    main()
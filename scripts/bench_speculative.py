@@ -0,0 +1,108 @@
+"""
+Benchmark: sequential vs speculative specialist + concierge.
+
+Replays specialist-routed turns ("I need a balayage...") through the real
+orchestrator graph with the concierge LLM call and the specialist consult
+replaced by sleeps drawn from the given latency ranges. Reports per-mode
+latency, the latency saved per turn and, for each restart window, how often
+the speculative concierge call was restarted.
+
+Usage:
+    python scripts/bench_speculative.py --turns 100 --llm-ms 600-1800 --specialist-ms 50-1200
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from langchain_core.messages import HumanMessage
+
+from src.platform.config import settings
+from src.platform.services import orchestrator
+from src.platform.services.specialist_service import specialist_service
+
+
+def parse_range(value: str):
+    lo, _, hi = value.partition("-")
+    return float(lo) / 1000, float(hi or lo) / 1000
+
+
+def fake_llm(latency):
+    async def chat_completion(**kwargs):
+        await asyncio.sleep(random.uniform(*latency))
+        message = SimpleNamespace(content="Here's what I'd suggest.", tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+    return chat_completion
+
+
+def fake_consult(latency):
+    real = specialist_service.consult
+
+    def consult(*args, **kwargs):
+        time.sleep(random.uniform(*latency))
+        return real(*args, **kwargs)
+    return consult
+
+
+async def replay(graph, turns: int):
+    latencies = []
+    for i in range(turns):
+        state = {
+            "messages": [HumanMessage(content=f"I need a balayage and a trim, turn {i}")],
+            "context": {},
+            "role": "consumer",
+        }
+        start = time.perf_counter()
+        await graph.ainvoke(state)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def outcomes():
+    from src.platform.metrics import SPECULATIVE_OUTCOMES_TOTAL
+    return {o: SPECULATIVE_OUTCOMES_TOTAL.labels(outcome=o)._value.get() for o in ("restarted", "deferred")}
+
+
+def summary(latencies):
+    ordered = sorted(latencies)
+    return (statistics.mean(latencies) * 1000, ordered[len(ordered) // 2] * 1000,
+            ordered[int(len(ordered) * 0.95) - 1] * 1000)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--llm-ms", default="600-1800")
+    parser.add_argument("--specialist-ms", default="50-1200")
+    parser.add_argument("--windows", default="0,150,300,600")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    llm, spec = parse_range(args.llm_ms), parse_range(args.specialist_ms)
+    print(f"--- {args.turns} specialist turns, LLM {args.llm_ms}ms, specialist {args.specialist_ms}ms ---")
+
+    with patch.object(orchestrator.llm_gateway, "chat_completion", fake_llm(llm)), \
+            patch.object(specialist_service, "consult", fake_consult(spec)):
+        random.seed(args.seed)
+        baseline = await replay(orchestrator.create_orchestrator(speculative=False), args.turns)
+        mean, p50, p95 = summary(baseline)
+        print(f"[sequential        ] mean {mean:7.1f}ms  p50 {p50:7.1f}ms  p95 {p95:7.1f}ms")
+
+        for window in (int(w) for w in args.windows.split(",")):
+            settings.ORCHESTRATOR_SPECULATIVE_RESTART_MS = window
+            before = outcomes()
+            random.seed(args.seed)
+            latencies = await replay(orchestrator.create_orchestrator(speculative=True), args.turns)
+            after = outcomes()
+            restarted = after["restarted"] - before["restarted"]
+            mean_s, p50_s, p95_s = summary(latencies)
+            print(f"[speculative {window:4}ms] mean {mean_s:7.1f}ms  p50 {p50_s:7.1f}ms  p95 {p95_s:7.1f}ms  "
+                  f"saved {mean - mean_s:6.1f}ms/turn  restarts {restarted / args.turns:6.1%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""
+Benchmark: Celery worker tasks per second, asyncio.run per task vs the
+persistent worker loop.
+
+Each simulated task makes --calls HTTP calls to a local upstream (standing
+in for the LLM / embedding APIs) through an httpx.AsyncClient cached per
+event loop, the way LiteLLM caches its clients. The upstream charges
+--handshake-ms for each new connection (TCP + TLS setup to a remote API)
+and --api-ms per response.
+
+  before: each task runs in asyncio.run, so its loop - and the client and
+          connections cached on it - is thrown away afterwards
+  after:  each task is submitted to the worker's persistent loop
+          (worker_loop / _run_async), so connections stay warm
+
+Tasks run one at a time, as in a prefork child.
+
+Usage:
+    python scripts/bench_worker_loop.py --tasks 200 --calls 2 --handshake-ms 40 --api-ms 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+import weakref
+
+import httpx
+
+from src.platform.worker import _run_async, worker_loop
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def client_for_loop() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    if loop not in _clients:
+        _clients[loop] = httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=20))
+    return _clients[loop]
+
+
+def start_upstream(args) -> int:
+    """Keep-alive HTTP server on its own thread; returns its port."""
+    ready = threading.Event()
+    port = {}
+
+    async def handle(reader, writer):
+        await asyncio.sleep(args.handshake_ms / 1000)  # new connection
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                await asyncio.sleep(args.api_ms / 1000)
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: keep-alive\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port["value"] = server.sockets[0].getsockname()[1]
+        ready.set()
+        await server.serve_forever()
+
+    threading.Thread(target=lambda: asyncio.run(serve()), daemon=True).start()
+    ready.wait()
+    return port["value"]
+
+
+def run(args, url: str, persistent: bool):
+    async def task():
+        client = client_for_loop()
+        for _ in range(args.calls):
+            (await client.get(url)).raise_for_status()
+
+    latencies = []
+    worker_loop.enabled = persistent
+    start = time.perf_counter()
+    for _ in range(args.tasks):
+        task_start = time.perf_counter()
+        _run_async(task())
+        latencies.append(time.perf_counter() - task_start)
+    elapsed = time.perf_counter() - start
+    worker_loop.stop()
+    return elapsed, sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--calls", type=int, default=2, help="upstream calls per task")
+    parser.add_argument("--handshake-ms", type=float, default=40, help="cost of opening a connection")
+    parser.add_argument("--api-ms", type=float, default=5, help="upstream response time")
+    args = parser.parse_args()
+
+    url = f"http://127.0.0.1:{start_upstream(args)}/"
+
+    print(f"--- {args.tasks} tasks x {args.calls} calls, handshake {args.handshake_ms:.0f}ms, "
+          f"response {args.api_ms:.0f}ms ---")
+    for name, persistent in (("before", False), ("after", True)):
+        elapsed, latencies = run(args, url, persistent)
+        print(f"[{name:6}] {args.tasks / elapsed:7.1f} tasks/s  p50 {statistics.median(latencies) * 1000:6.1f}ms  "
+              f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,15 @@ from typing import List, Optional, Dict, Any
 from uuid import UUID, uuid4
 from datetime import datetime, time, date
 
-from src.platform.database import SessionLocal
+from src.platform.database import SessionLocal, AsyncSessionLocal
 from src.platform.models.booking import Booking
 from src.platform.models.offer import Offer
 from src.platform.models.provider import Provider
 from src.platform.models.request import ServiceRequest
 from src.platform.models.review import Review
 from src.platform.models.service import Service
-from src.platform.services.matching import MatchingService
+from src.platform.services.notifications import booking_notifications, notifier, offer_notifications
+from src.platform.services.request_matches import DEFAULT_PAGE_SIZE, OPEN_STATUSES, lead_inbox, schedule_matching
 from src.platform.metrics import track_request_created, track_offer_submitted, track_booking_confirmed
 
 # --- Consumer Handlers ---
@@ -25,7 +26,7 @@ async def create_service_request(
     budget: Dict[str, Any],
     media: List[Dict[str, Any]] = []
 ) -> Dict[str, Any]:
-    with SessionLocal() as db:
+    async with AsyncSessionLocal() as db:
         # Create Request
         req = ServiceRequest(
             id=uuid4(),
@@ -41,37 +42,17 @@ async def create_service_request(
             status="matching"
         )
         db.add(req)
-        db.commit()
-        db.refresh(req)
-        
-        # Trigger Matching
-        matcher = MatchingService(db)
-        
-        from src.platform.schemas.request import ServiceRequestCreate, RequestLocation, RequestRequirements, RequestTiming, RequestBudget
-        
-        schema = ServiceRequestCreate(
-            consumer_id=consumer_id,
-            raw_input=raw_input,
-            service_category=service_category,
-            service_type=service_type,
-            requirements=RequestRequirements(**requirements),
-            location=RequestLocation(**location),
-            timing=RequestTiming(**timing),
-            budget=RequestBudget(**budget),
-            media=media
-        )
+        await db.commit()
         
-        matched_ids = await matcher.find_providers(schema)
-        req.matched_providers = [str(uid) for uid in matched_ids]
-        
-        db.commit()
+        # Matching runs on the worker; the consumer and providers are notified when it's done
+        schedule_matching(req.id)
         
         # Track metric
         track_request_created(service_category)
         
         return {
             "status": req.status,
-            "message": f"Successfully posted! I've automatically notified {len(matched_ids)} top-rated providers in your area. You'll start receiving offers very soon."
+            "message": "Successfully posted! I'm matching it with top-rated providers in your area now, and they'll be notified as soon as it's done. You'll start receiving offers very soon."
         }
 
 def get_offers(request_id: UUID) -> Dict[str, Any]:
@@ -148,6 +129,9 @@ def accept_offer(offer_id: UUID, selected_slot: Dict[str, Any]) -> Dict[str, Any
         db.add(booking)
         db.commit()
         
+        for notification in booking_notifications(db, booking):
+            notifier.notify_threadsafe(*notification)
+        
         # Track metric
         track_booking_confirmed(req.service_category)
         
@@ -177,28 +161,31 @@ def submit_review(booking_id: UUID, rating: int, comment: str) -> Dict[str, Any]
 
 # --- Provider Handlers ---
 
-def get_matching_requests(provider_id: UUID) -> List[Dict[str, Any]]:
+def get_matching_requests(
+    provider_id: UUID,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+) -> Dict[str, Any]:
     with SessionLocal() as db:
-        # Find requests where matched_providers contains this provider_id
-        # matched_providers is a JSONB list of strings
-        # Query:
-        requests = db.query(ServiceRequest).filter(
-            ServiceRequest.status == "matching"
-            # In python check for simplicity unless using pg operators
-        ).all()
-        
-        matches = []
-        pid_str = str(provider_id)
-        for r in requests:
-            if r.matched_providers and pid_str in r.matched_providers:
-                matches.append({
+        # Open leads from the provider's request_matches rows, newest first
+        try:
+            requests, next_cursor = lead_inbox(db, provider_id, status="matched", cursor=cursor, limit=limit)
+        except ValueError as e:
+            return {"error": str(e)}
+
+        return {
+            "requests": [
+                {
                     "request_id": str(r.id),
                     "service_type": r.service_type,
                     "location": r.location,
                     "timing": r.timing,
                     "budget": r.budget
-                })
-        return matches
+                }
+                for r in requests
+            ],
+            "next_cursor": next_cursor
+        }
 
 def submit_offer(
     request_id: UUID,
@@ -224,11 +211,14 @@ def submit_offer(
         )
         db.add(offer)
         
-        if req.status == "matching":
+        if req.status in OPEN_STATUSES:
             req.status = "offers_received"
             
         db.commit()
         
+        for notification in offer_notifications(db, offer, req):
+            notifier.notify_threadsafe(*notification)
+        
         # Track metric
         track_offer_submitted(req.service_category)
         
@@ -68,11 +68,13 @@ async def handle_list_tools() -> Sequence[Tool]:
         ),
         Tool(
             name="get_matching_requests",
-            description="Get service requests matching provider's profile.",
+            description="Get service requests matching provider's profile, newest first. Pass next_cursor back as cursor for more.",
             inputSchema={
                 "type": "object",
                 "properties": {
-                    "provider_id": {"type": "string"}
+                    "provider_id": {"type": "string"},
+                    "cursor": {"type": "string"},
+                    "limit": {"type": "integer"}
                 },
                 "required": ["provider_id"]
             }
@@ -132,7 +134,11 @@ async def handle_call_tool(name: str, arguments: Any) -> Sequence[TextContent |
             return [TextContent(type="text", text=str(result))]
             
         elif name == "get_matching_requests":
-            result = handlers.get_matching_requests(UUID(args["provider_id"]))
+            result = handlers.get_matching_requests(
+                UUID(args["provider_id"]),
+                cursor=args.get("cursor"),
+                limit=args.get("limit", handlers.DEFAULT_PAGE_SIZE)
+            )
             return [TextContent(type="text", text=str(result))]
             
         elif name == "submit_offer":
@@ -2,8 +2,11 @@
 Database configuration and session management.
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from typing import Any, Callable, TypeVar, Union
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
 from src.platform.config import settings
 import structlog
@@ -21,6 +24,36 @@ engine = create_engine(
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (asyncpg) for the request hot paths - chat hydration, matching,
+# memory. Same pool sizing as the sync engine; the two pools are independent.
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=5,
+    max_overflow=10,
+)
+
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def _register_vector_codec(dbapi_connection, connection_record):
+    """asyncpg needs the pgvector codec registered on each new connection."""
+    try:
+        from pgvector.asyncpg import register_vector
+        dbapi_connection.run_async(register_vector)
+    except Exception as e:
+        # Extension not installed yet (fresh DB) - vector columns just won't decode
+        logger.warning("pgvector_asyncpg_codec_unavailable", error=str(e))
+
+
+# expire_on_commit=False: attribute access after commit would otherwise
+# trigger an implicit (sync) refresh, which async sessions can't do.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Base class for models
 Base = declarative_base()
 
@@ -34,6 +67,27 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency for getting async database sessions."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+T = TypeVar("T")
+
+
+async def run_in_session(db: Union[Session, AsyncSession], fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run sync ORM code against either session type.
+
+    For an AsyncSession the callable runs via run_sync (greenlet, no thread),
+    so query-building code can be shared between the sync and async paths.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return fn(db, *args, **kwargs)
+
+
 def check_db_connection() -> bool:
     """Check if the database is reachable."""
     from sqlalchemy import text
@@ -0,0 +1,151 @@
+"""
+Location columns and radius search helpers.
+
+Providers and service requests keep their location as free-form JSON; the
+columns derived from it here are what matching filters on:
+
+    city_key   normalized city ("São Paulo " -> "sao paulo"), btree-indexed
+    lat, lng   coordinates, when the location has them
+    geohash    GEOHASH_PRECISION-char geohash of (lat, lng), indexed for prefix scans
+    radius     provider service_radius_km / request max_distance_km
+
+A radius search is a geohash-prefix prefilter - the cells covering the
+circle's bounding box at the finest precision that needs no more than
+MAX_PREFIXES of them, one index range scan each - followed by an exact
+vectorized haversine refine of the candidates it returns.
+"""
+
+import math
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+GEOHASH_PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+# Upper bound on the geohash cells (index range scans) of one radius search
+MAX_PREFIXES = 48
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def city_key(city: Optional[str]) -> str:
+    """Case-, accent- and punctuation-insensitive form of a city name."""
+    if not city:
+        return ""
+    folded = unicodedata.normalize("NFKD", city).encode("ascii", "ignore").decode().casefold()
+    return _NON_ALNUM.sub(" ", folded).strip()
+
+
+def geohash_encode(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, coord = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def _cell_size_km(precision: int, lat: float) -> Tuple[float, float]:
+    """(height, width) of a geohash cell at this precision and latitude."""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    height = 180.0 / (1 << lat_bits) * KM_PER_DEGREE_LAT
+    width = 360.0 / (1 << lng_bits) * KM_PER_DEGREE_LAT * math.cos(math.radians(lat))
+    return height, width
+
+
+def geohash_prefixes(lat: float, lng: float, radius_km: float) -> List[str]:
+    """Geohash prefixes whose cells together cover the circle around (lat, lng)."""
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    dlng = min(radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6)), 180.0)
+    # The finest precision whose cover of the bounding box stays within
+    # MAX_PREFIXES cells (index range scans)
+    precision = 1
+    for candidate in range(GEOHASH_PRECISION, 0, -1):
+        height, width = _cell_size_km(candidate, lat)
+        if (math.ceil(2 * radius_km / height) + 1) * (math.ceil(2 * radius_km / width) + 1) <= MAX_PREFIXES:
+            precision = candidate
+            break
+    # Sample the box at most one cell apart (edges included): every cell
+    # meeting the box holds a sample point
+    height, width = _cell_size_km(precision, lat)
+    lat_steps = math.ceil(2 * radius_km / height)
+    lng_steps = math.ceil(2 * radius_km / width)
+    prefixes = {
+        geohash_encode(
+            max(-90.0, min(90.0, lat - dlat + 2 * dlat * i / lat_steps)),
+            (lng - dlng + 2 * dlng * j / lng_steps + 180.0) % 360.0 - 180.0,
+            precision,
+        )
+        for i in range(lat_steps + 1) for j in range(lng_steps + 1)
+    }
+    return sorted(prefixes)
+
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Great-circle distance from one point to arrays of points."""
+    lat1, lng1 = math.radians(lat), math.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def within_radius(
+    rows: Sequence[Tuple[Any, Optional[float], Optional[float], Optional[float]]],
+    lat: float,
+    lng: float,
+    radius_km: float,
+) -> List[Any]:
+    """
+    Ids from (id, lat, lng, own radius) rows within radius_km of (lat, lng),
+    closest first. A row's own radius (a provider's service_radius_km)
+    narrows the limit for that row; rows without coordinates are kept, after
+    the located ones - the caller only selects them when the city matches.
+    """
+    if not rows:
+        return []
+    ids = [row[0] for row in rows]
+    data = np.array([[row[1], row[2], row[3]] for row in rows], dtype=np.float64)
+    located = ~np.isnan(data[:, 0]) & ~np.isnan(data[:, 1])
+    distance = np.full(len(rows), np.inf)
+    distance[located] = haversine_km(lat, lng, data[located, 0], data[located, 1])
+    limit = np.fmin(radius_km, data[:, 2])  # fmin ignores NaN: no own radius -> radius_km
+    inside = np.flatnonzero(located & (distance <= limit))
+    order = inside[np.argsort(distance[inside], kind="stable")]
+    return [ids[i] for i in order] + [ids[i] for i in np.flatnonzero(~located)]
+
+
+def location_columns(location: Optional[Dict[str, Any]], radius_field: str) -> Dict[str, Any]:
+    """Column values for a provider / request location JSON."""
+    location = location if isinstance(location, dict) else {}
+    coordinates = location.get("coordinates") if isinstance(location.get("coordinates"), dict) else location
+    lat, lng = coordinates.get("lat"), coordinates.get("lng")
+    try:
+        lat, lng = (float(lat), float(lng)) if lat is not None and lng is not None else (None, None)
+    except (TypeError, ValueError):
+        lat, lng = None, None
+    if lat is not None and not (-90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0):
+        lat, lng = None, None
+    radius = location.get(radius_field)
+    return {
+        "city_key": city_key(location.get("city")) or None,
+        "lat": lat,
+        "lng": lng,
+        "geohash": geohash_encode(lat, lng) if lat is not None else None,
+        radius_field: float(radius) if isinstance(radius, (int, float)) else None,
+    }
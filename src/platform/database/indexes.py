@@ -4,6 +4,8 @@ Database indexes for query optimization.
 This module defines indexes that should be created for optimal query performance.
 """
 
+from src.platform.database.vectors import is_indexable, vector_index_sql
+
 # Index definitions for Alembic migrations
 INDEXES = [
     # Providers
@@ -11,6 +13,9 @@ INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_providers_status ON providers(status)",
     "CREATE INDEX IF NOT EXISTS idx_providers_email ON providers(email)",
     "CREATE INDEX IF NOT EXISTS idx_providers_created_at ON providers(created_at DESC)",
+    # Location columns (database/geo.py); text_pattern_ops serves geohash LIKE 'prefix%'
+    "CREATE INDEX IF NOT EXISTS idx_providers_status_city_key ON providers(status, city_key)",
+    "CREATE INDEX IF NOT EXISTS idx_providers_geohash ON providers(geohash text_pattern_ops)",
     
     # Consumers
     "CREATE INDEX IF NOT EXISTS idx_consumers_clerk_id ON consumers(clerk_id)",
@@ -22,6 +27,8 @@ INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_requests_created_at ON service_requests(created_at DESC)",
     "CREATE INDEX IF NOT EXISTS idx_requests_service_category ON service_requests(service_category)",
     "CREATE INDEX IF NOT EXISTS idx_requests_selected_offer_id ON service_requests(selected_offer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_requests_city_key ON service_requests(city_key)",
+    "CREATE INDEX IF NOT EXISTS idx_requests_geohash ON service_requests(geohash text_pattern_ops)",
     
     # Offers
     "CREATE INDEX IF NOT EXISTS idx_offers_provider_id ON offers(provider_id)",
@@ -49,6 +56,10 @@ INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_lead_views_provider_request ON provider_lead_views(provider_id, request_id)",
     "CREATE INDEX IF NOT EXISTS idx_lead_views_request_id ON provider_lead_views(request_id)",
     
+    # Request matches: the lead inbox, with and without a status filter, keyset-ordered
+    "CREATE INDEX IF NOT EXISTS idx_request_matches_provider_status ON request_matches(provider_id, status, matched_at DESC, request_id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_request_matches_provider ON request_matches(provider_id, matched_at DESC, request_id DESC)",
+    
     # Provider Portfolio Photos
     "CREATE INDEX IF NOT EXISTS idx_portfolio_photos_provider_id ON provider_portfolio_photos(provider_id)",
     "CREATE INDEX IF NOT EXISTS idx_portfolio_photos_display_order ON provider_portfolio_photos(provider_id, display_order)",
@@ -67,12 +78,13 @@ GIN_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_requests_requirements_gin ON service_requests USING GIN(requirements)",
     "CREATE INDEX IF NOT EXISTS idx_providers_location_gin ON providers USING GIN(location)",
     "CREATE INDEX IF NOT EXISTS idx_providers_specializations_gin ON providers USING GIN(specializations)",
+    # Full-text matching (database/search.py)
+    "CREATE INDEX IF NOT EXISTS idx_providers_search_vector ON providers USING GIN(search_vector)",
 ]
 
-# Vector indexes for embeddings (pgvector)
-VECTOR_INDEXES = [
-    "CREATE INDEX IF NOT EXISTS idx_providers_embedding ON providers USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100)",
-]
+# Vector indexes for embeddings (pgvector). HNSW on the configured storage
+# type; none when the configured dimensions are too wide to index
+VECTOR_INDEXES = [vector_index_sql("providers", "embedding")] if is_indexable() else []
 
 
 def create_all_indexes(db_session):
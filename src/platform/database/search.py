@@ -0,0 +1,94 @@
+"""
+Full-text search over providers.
+
+providers.search_vector is a weighted tsvector of the same fields the
+embedding is built from:
+
+    A  business name, service names
+    B  specializations
+    C  bio
+
+It is maintained by triggers, so every write path keeps it current: a
+BEFORE INSERT / UPDATE trigger on providers rebuilds it from the row and the
+provider's services, and an AFTER trigger on services touches the owning
+provider(s) when a service is added, renamed, moved or deleted. The GIN
+index on it (indexes.py) serves `search_vector @@ query`.
+
+Installed by migration 005_provider_search_vector, and by create_all on a
+fresh PostgreSQL database (models/service.py).
+"""
+
+import re
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.sql.elements import ColumnElement
+
+SEARCH_CONFIG = "english"
+
+_WORD = re.compile(r"\w+")
+
+SEARCH_VECTOR_DDL = [
+    f"""
+CREATE OR REPLACE FUNCTION providers_search_vector_refresh() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.business_name, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(
+            (SELECT string_agg(name, ' ') FROM services WHERE provider_id = NEW.id), '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(
+            CASE WHEN json_typeof(NEW.specializations::json) = 'array' THEN
+                (SELECT string_agg(value, ' ') FROM json_array_elements_text(NEW.specializations::json))
+            END, '')), 'B') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.bio, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+""",
+    """
+CREATE OR REPLACE FUNCTION services_touch_provider_search_vector() RETURNS trigger AS $$
+BEGIN
+    -- Assigning business_name to itself fires the providers trigger
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE providers SET business_name = business_name WHERE id = OLD.provider_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND (TG_OP = 'INSERT' OR NEW.provider_id IS DISTINCT FROM OLD.provider_id) THEN
+        UPDATE providers SET business_name = business_name WHERE id = NEW.provider_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+""",
+    "DROP TRIGGER IF EXISTS providers_search_vector_update ON providers",
+    """
+CREATE TRIGGER providers_search_vector_update
+    BEFORE INSERT OR UPDATE OF business_name, bio, specializations ON providers
+    FOR EACH ROW EXECUTE FUNCTION providers_search_vector_refresh()
+""",
+    "DROP TRIGGER IF EXISTS services_provider_search_vector_update ON services",
+    """
+CREATE TRIGGER services_provider_search_vector_update
+    AFTER INSERT OR UPDATE OF name, provider_id OR DELETE ON services
+    FOR EACH ROW EXECUTE FUNCTION services_touch_provider_search_vector()
+""",
+]
+
+DROP_SEARCH_VECTOR_DDL = [
+    "DROP TRIGGER IF EXISTS services_provider_search_vector_update ON services",
+    "DROP TRIGGER IF EXISTS providers_search_vector_update ON providers",
+    "DROP FUNCTION IF EXISTS services_touch_provider_search_vector()",
+    "DROP FUNCTION IF EXISTS providers_search_vector_refresh()",
+]
+
+
+def search_query(text: Optional[str]) -> Optional[ColumnElement]:
+    """
+    tsquery matching any word of the text (ranked by how many, and where,
+    they match), or None when it has no words. Words are reduced to \\w+
+    runs, so user text can't inject tsquery syntax.
+    """
+    # "or" is websearch_to_tsquery's operator, and a stopword anyway
+    words = [word for word in dict.fromkeys(_WORD.findall((text or "").lower())) if word != "or"]
+    if not words:
+        return None
+    return func.websearch_to_tsquery(SEARCH_CONFIG, " or ".join(words))
@@ -0,0 +1,153 @@
+"""
+Embedding column storage.
+
+Provider and consumer-memory embeddings are stored with the dimensions and
+type configured by LLM_EMBEDDING_DIMENSIONS and EMBEDDING_STORAGE:
+
+- vector(N): float32, 4 bytes per dimension; pgvector indexes it up to 2000 dims
+- halfvec(N): float16, 2 bytes per dimension; indexable up to 4000 dims
+
+text-embedding-3 models are matryoshka-trained, so a shorter embedding is
+the prefix of the full one, re-normalized - which is also how
+convert_embedding_columns converts existing rows in place.
+
+The models declare their columns from the settings, but the DB keeps
+whatever type it was last converted to: changing either setting means
+running scripts/backfill_embeddings.py, which converts the columns and
+re-embeds what the conversion cleared. The API logs
+embedding_column_mismatch at startup while they disagree.
+"""
+
+import re
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+from pgvector.sqlalchemy import HALFVEC, Vector
+from sqlalchemy import text
+
+from src.platform.config import settings
+
+logger = structlog.get_logger(__name__)
+
+# (table, column) of every embedding column
+EMBEDDING_COLUMNS: List[Tuple[str, str]] = [
+    ("providers", "embedding"),
+    ("consumer_memories", "preference_embedding"),
+]
+
+# Largest dimension pgvector's HNSW / IVFFlat indexes accept per type
+MAX_INDEXED_DIMENSIONS = {"vector": 2000, "halfvec": 4000}
+
+
+def embedding_type(dimensions: Optional[int] = None, storage: Optional[str] = None):
+    """Column type for an embedding column under the current settings."""
+    dimensions = dimensions or settings.LLM_EMBEDDING_DIMENSIONS
+    storage = storage or settings.EMBEDDING_STORAGE
+    if storage == "halfvec":
+        return HALFVEC(dimensions)
+    if storage == "vector":
+        return Vector(dimensions)
+    raise ValueError(f"Unknown EMBEDDING_STORAGE {storage!r} (expected 'vector' or 'halfvec')")
+
+
+def is_indexable(dimensions: Optional[int] = None, storage: Optional[str] = None) -> bool:
+    dimensions = dimensions or settings.LLM_EMBEDDING_DIMENSIONS
+    storage = storage or settings.EMBEDDING_STORAGE
+    return dimensions <= MAX_INDEXED_DIMENSIONS.get(storage, 0)
+
+
+def vector_index_sql(table: str = "providers", column: str = "embedding", storage: Optional[str] = None) -> str:
+    """HNSW cosine index on an embedding column."""
+    storage = storage or settings.EMBEDDING_STORAGE
+    return (
+        f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} "
+        f"ON {table} USING hnsw ({column} {storage}_cosine_ops)"
+    )
+
+
+def truncate_embedding(embedding: Sequence[float], dimensions: int) -> List[float]:
+    """Matryoshka truncation: the first `dimensions` values, L2-normalized."""
+    vector = np.asarray(embedding, dtype=np.float32)[:dimensions]
+    norm = float(np.linalg.norm(vector))
+    if norm > 0:
+        vector = vector / norm
+    return vector.tolist()
+
+
+def column_type(conn, table: str, column: str) -> Optional[Tuple[str, int]]:
+    """Declared (storage, dimensions) of an embedding column, from the Postgres catalog."""
+    declared = conn.execute(text(
+        "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+        "WHERE attrelid = CAST(:table AS regclass) AND attname = :column AND NOT attisdropped"
+    ), {"table": table, "column": column}).scalar()
+    match = re.search(r"(vector|halfvec)\((\d+)\)$", declared or "")
+    return (match.group(1), int(match.group(2))) if match else None
+
+
+def mismatched_columns(
+    conn, dimensions: Optional[int] = None, storage: Optional[str] = None,
+) -> List[Tuple[str, str, Optional[Tuple[str, int]]]]:
+    """(table, column, declared type) of every embedding column not declared as storage(dimensions)."""
+    target = (storage or settings.EMBEDDING_STORAGE, dimensions or settings.LLM_EMBEDDING_DIMENSIONS)
+    mismatched = []
+    for table, column in EMBEDDING_COLUMNS:
+        declared = column_type(conn, table, column)
+        if declared != target:
+            mismatched.append((table, column, declared))
+    return mismatched
+
+
+def convert_embedding_columns(
+    conn, dimensions: Optional[int] = None, storage: Optional[str] = None,
+) -> List[Tuple[str, str]]:
+    """
+    ALTER every embedding column not yet storage(dimensions) to it; a no-op
+    when they all match, so it is safe to re-run. Shrinking keeps the
+    re-normalized prefix; growing can't be derived, so those columns are
+    cleared for re-embedding. The providers index is rebuilt when its column
+    changes (and the new width is indexable). Returns the converted columns.
+    """
+    dimensions = dimensions or settings.LLM_EMBEDDING_DIMENSIONS
+    storage = storage or settings.EMBEDDING_STORAGE
+    embedding_type(dimensions, storage)  # validates storage
+    target = f"{storage}({dimensions})"
+
+    mismatched = mismatched_columns(conn, dimensions, storage)
+    converted = [(table, column) for table, column, _ in mismatched]
+    if ("providers", "embedding") in converted:
+        conn.execute(text("DROP INDEX IF EXISTS idx_providers_embedding"))
+    for table, column, declared in mismatched:
+        if declared is not None and dimensions <= declared[1]:
+            using = f"l2_normalize(subvector({column}::vector, 1, {dimensions}))::{target}"
+        else:
+            using = f"NULL::{target}"
+        conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {target} USING {using}"))
+    if ("providers", "embedding") in converted and is_indexable(dimensions, storage):
+        conn.execute(text(vector_index_sql("providers", "embedding", storage)))
+    return converted
+
+
+def check_embedding_columns(engine) -> List[Tuple[str, str, Optional[Tuple[str, int]]]]:
+    """
+    Startup check: log embedding_column_mismatch for each embedding column
+    the DB declares differently from the settings (writes to it would fail).
+    Returns the mismatched columns; Postgres only, never raises.
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+    try:
+        with engine.connect() as conn:
+            mismatched = mismatched_columns(conn)
+    except Exception as e:
+        logger.warning("embedding_column_check_failed", error=str(e))
+        return []
+    for table, column, declared in mismatched:
+        logger.error(
+            "embedding_column_mismatch",
+            column=f"{table}.{column}",
+            declared=f"{declared[0]}({declared[1]})" if declared else None,
+            expected=f"{settings.EMBEDDING_STORAGE}({settings.LLM_EMBEDDING_DIMENSIONS})",
+            fix="python scripts/backfill_embeddings.py",
+        )
+    return mismatched
@@ -25,6 +25,7 @@ from src.platform.config import settings
 from src.platform.log_config import setup_logging
 import structlog
 from src.platform.database import engine, Base
+from src.platform.database.vectors import check_embedding_columns
 # Import all models to ensure they are registered with Base
 from src.platform.models.provider import Provider, ProviderLeadView
 from src.platform.models.request import ServiceRequest
@@ -57,6 +58,7 @@ if settings.ENVIRONMENT not in ["test", "testing"]:
 
 # Create tables
 Base.metadata.create_all(bind=engine)
+check_embedding_columns(engine)
 
 # Initialize rate limiter with user-based key function
 limiter = Limiter(key_func=get_user_id_for_rate_limit)
@@ -20,6 +20,62 @@ LLM_LATENCY_SECONDS = Histogram(
     ["provider", "model"]
 )
 
+# --- Chat Turn Metrics ---
+# Where a turn spends its time (see services/turn_timing.py)
+ORCHESTRATOR_NODE_SECONDS = Histogram(
+    "proxie_orchestrator_node_seconds",
+    "Latency of orchestrator graph nodes in seconds",
+    ["node"]
+)
+
+TOOL_SECONDS = Histogram(
+    "proxie_tool_seconds",
+    "Latency of agent tool executions in seconds",
+    ["tool"]
+)
+
+CHAT_STAGE_SECONDS = Histogram(
+    "proxie_chat_stage_seconds",
+    "Latency of chat turn stages outside the graph (profile, extraction, session save, ...)",
+    ["stage"]
+)
+
+CHAT_TURN_LLM_CALLS = Histogram(
+    "proxie_chat_turn_llm_calls",
+    "LLM calls made per chat turn",
+    buckets=(0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20)
+)
+
+CHAT_TURN_LOOP_ITERATIONS = Histogram(
+    "proxie_chat_turn_loop_iterations",
+    "Concierge -> tools round trips per chat turn",
+    buckets=(0, 1, 2, 3, 4, 5, 6, 8, 10)
+)
+
+SPECULATIVE_OUTCOMES_TOTAL = Counter(
+    "proxie_speculative_specialist_total",
+    "Speculative specialist + concierge runs by outcome (restarted, deferred)",
+    ["outcome"]
+)
+
+SPECULATIVE_SAVED_SECONDS = Histogram(
+    "proxie_speculative_saved_seconds",
+    "Latency saved by running specialist and concierge in parallel",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+
+# --- Embedding Metrics ---
+EMBEDDING_CACHE_LOOKUPS_TOTAL = Counter(
+    "proxie_embedding_cache_lookups_total",
+    "Embedding cache lookups by result (hit, miss)",
+    ["result"]
+)
+
+EMBEDDING_CACHE_SAVED_USD_TOTAL = Counter(
+    "proxie_embedding_cache_saved_usd_total",
+    "Estimated embedding spend avoided by cache hits, USD"
+)
+
 # --- Business Metrics ---
 # Track lifecycle of service requests
 REQUESTS_CREATED_TOTAL = Counter(
@@ -3,7 +3,7 @@
 from src.platform.models.provider import Provider, ProviderLeadView, ProviderEnrollment
 from src.platform.models.consumer import Consumer
 from src.platform.models.service import Service
-from src.platform.models.request import ServiceRequest
+from src.platform.models.request import ServiceRequest, RequestMatch
 from src.platform.models.offer import Offer
 from src.platform.models.booking import Booking
 from src.platform.models.review import Review
@@ -15,6 +15,7 @@ __all__ = [
     "ProviderEnrollment",
     "Service", 
     "ServiceRequest",
+    "RequestMatch",
     "Offer",
     "Booking",
     "Review",
@@ -4,9 +4,9 @@ import uuid
 from sqlalchemy import Column, String, Integer, DateTime, Text, JSON, DECIMAL, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
-from pgvector.sqlalchemy import Vector
 
 from src.platform.database import Base
+from src.platform.database.vectors import embedding_type
 
 class ConsumerMemory(Base):
     """Persistent memory for a Personal Consumer Agent."""
@@ -29,8 +29,8 @@ class ConsumerMemory(Base):
     total_requests = Column(Integer, default=0)
     avg_rating_given = Column(DECIMAL(3, 2))
     
-    # Embeddings (using 3072 dimensions for text-embedding-3-large)
-    preference_embedding = Column(Vector(3072), nullable=True)
+    # Embeddings (LLM_EMBEDDING_DIMENSIONS wide, stored as EMBEDDING_STORAGE)
+    preference_embedding = Column(embedding_type(), nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
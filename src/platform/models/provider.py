@@ -1,12 +1,14 @@
 """Provider model."""
 
 from sqlalchemy import Column, String, Boolean, Float, Integer, DateTime, Text
-from sqlalchemy.dialects.postgresql import UUID, JSON
+from sqlalchemy.dialects.postgresql import UUID, JSON, TSVECTOR
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
 import uuid
-from pgvector.sqlalchemy import Vector
 
 from src.platform.database import Base
+from src.platform.database.geo import location_columns
+from src.platform.database.vectors import embedding_type
 
 class Provider(Base):
     """A skilled individual offering services."""
@@ -19,8 +21,12 @@ class Provider(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # AI Search
-    # Using 3072 dimensions for text-embedding-3-large
-    embedding = Column(Vector(3072), nullable=True)
+    # LLM_EMBEDDING_DIMENSIONS wide, stored as EMBEDDING_STORAGE (vector / halfvec)
+    embedding = Column(embedding_type(), nullable=True)
+    # sha256 of (model, dimensions, index text) the embedding was built from
+    embedding_text_hash = Column(String(64), nullable=True)
+    # Weighted full-text document, maintained by triggers (database/search.py)
+    search_vector = Column(TSVECTOR, nullable=True)
     
     # Identity
     name = Column(String(255), nullable=False)
@@ -36,6 +42,12 @@ class Provider(Base):
     
     # Location (stored as JSON for flexibility)
     location = Column(JSON)
+    # Derived from location on write (database/geo.py); matching filters on these
+    city_key = Column(String(255))
+    lat = Column(Float)
+    lng = Column(Float)
+    geohash = Column(String(12))
+    service_radius_km = Column(Float)
     
     # Specializations
     specializations = Column(JSON, default=list)
@@ -62,6 +74,12 @@ class Provider(Base):
     # Status
     status = Column(String(50), default="active")
 
+    @validates("location")
+    def _set_location_columns(self, key, location):
+        for column, value in location_columns(location, "service_radius_km").items():
+            setattr(self, column, value)
+        return location
+
 class ProviderLeadView(Base):
     """Tracks when a provider has viewed a specific lead."""
     __tablename__ = "provider_lead_views"
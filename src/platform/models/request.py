@@ -1,11 +1,13 @@
 """Service Request model."""
 
-from sqlalchemy import Column, String, Text, DateTime, JSON
+from sqlalchemy import Column, String, Text, DateTime, JSON, Float, ForeignKey, event, inspect, update
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
 import uuid
 
 from src.platform.database import Base
+from src.platform.database.geo import location_columns
 
 
 class ServiceRequest(Base):
@@ -29,6 +31,12 @@ class ServiceRequest(Base):
     service_type = Column(String(100))
     requirements = Column(JSON)
     location = Column(JSON)
+    # Derived from location on write (database/geo.py)
+    city_key = Column(String(255))
+    lat = Column(Float)
+    lng = Column(Float)
+    geohash = Column(String(12))
+    max_distance_km = Column(Float)
     timing = Column(JSON)
     budget = Column(JSON)
     
@@ -42,3 +50,39 @@ class ServiceRequest(Base):
     
     # Sprint 8: Media support
     media = Column(JSON, default=list)
+
+    @validates("location")
+    def _set_location_columns(self, key, location):
+        for column, value in location_columns(location, "max_distance_km").items():
+            setattr(self, column, value)
+        return location
+
+
+class RequestMatch(Base):
+    """
+    A provider matched to a service request: one row per lead in the
+    provider's inbox, written by services/request_matches.record_matches.
+
+    status mirrors the request's status (kept in step on every request
+    update, below), so an inbox page is one range scan of the
+    (provider_id, status, matched_at, request_id) index.
+    """
+
+    __tablename__ = "request_matches"
+
+    request_id = Column(UUID(as_uuid=True), ForeignKey("service_requests.id", ondelete="CASCADE"), primary_key=True)
+    provider_id = Column(UUID(as_uuid=True), ForeignKey("providers.id", ondelete="CASCADE"), primary_key=True)
+    # Reciprocal rank in the request's match list: 1.0 for the best match
+    score = Column(Float, nullable=False)
+    matched_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    status = Column(String(50), nullable=False)
+
+
+@event.listens_for(ServiceRequest, "after_update")
+def _sync_match_status(mapper, connection, target):
+    if inspect(target).attrs.status.history.has_changes():
+        connection.execute(
+            update(RequestMatch.__table__)
+            .where(RequestMatch.request_id == target.id)
+            .values(status=target.status)
+        )
@@ -1,11 +1,12 @@
 """Service model."""
 
-from sqlalchemy import Column, String, Integer, Float, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, Text, DateTime, ForeignKey, DDL, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
 
 from src.platform.database import Base
+from src.platform.database.search import SEARCH_VECTOR_DDL
 
 
 class Service(Base):
@@ -29,3 +30,9 @@ class Service(Base):
     price_min = Column(Float)
     price_max = Column(Float)
     currency = Column(String(10), default="USD")
+
+
+# providers.search_vector triggers (database/search.py). Installed once both
+# tables exist; migrations install them on existing databases
+for _statement in SEARCH_VECTOR_DDL:
+    event.listen(Service.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
@@ -4,13 +4,15 @@ Chat router for Proxie.
 Handles conversational AI interactions with multi-modal support.
 """
 
-from fastapi import APIRouter, HTTPException, Request, Depends, Header, Query
+from fastapi import APIRouter, HTTPException, Request, Response, Depends, Header, Query
 from typing import Optional
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from src.platform.schemas.chat import ChatRequest, ChatResponse, ChatTaskStatusResponse
 from src.platform.services.chat import chat_service
+from src.platform.services.chat_tasks import chat_task_results
+from src.platform.services import turn_timing
 from src.platform.config import settings
 from src.platform.auth import get_current_user, get_optional_user
 from src.platform.worker import celery_app
@@ -60,7 +62,11 @@ async def verify_chat_api_key(x_api_key: Optional[str] = Header(None)):
     
     **Modes:**
     - **Synchronous (default)**: Returns response immediately (2-5 seconds)
-    - **Asynchronous**: Returns task_id immediately, poll `/chat/task/{task_id}` for result
+    - **Asynchronous**: Returns task_id immediately; wait on `/chat/task/{task_id}/wait`
+      (or listen for `chat:task` in the session room) for the result
+    - **WebSocket**: emit `chat_message` with the same body on the Socket.IO
+      connection instead; progress arrives as `chat:delta` and the reply as
+      `chat:response` in the `session:{session_id}` room
     
     **Authentication:** Optional. Authenticated users get personalized responses.
     
@@ -68,6 +74,10 @@ async def verify_chat_api_key(x_api_key: Optional[str] = Header(None)):
     
     **Query Parameters:**
     - `async_mode`: Set to `true` to enable async processing
+    
+    **Debugging:** With `DEBUG` enabled, send `X-Debug-Timing: 1` to get a
+    `Server-Timing` header breaking the turn down by stage, graph node and
+    tool, plus LLM call and loop iteration counts.
     """,
     responses={
         200: {
@@ -105,6 +115,7 @@ async def verify_chat_api_key(x_api_key: Optional[str] = Header(None)):
 @limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
 async def chat(
     request: Request,
+    response: Response,
     chat_request: ChatRequest,
     user: Optional[Dict[str, Any]] = Depends(get_optional_user),
     async_mode: bool = Query(False, description="Enable async processing via Celery")
@@ -154,7 +165,8 @@ async def chat(
             clerk_id=clerk_id
         )
         
-        # Return task ID immediately
+        # Return task ID immediately; the worker publishes the result
+        # (GET /chat/task/{task_id}/wait, chat:task in the session room)
         return ChatResponse(
             session_id=chat_request.session_id or "",
             message="Processing your message...",
@@ -165,17 +177,21 @@ async def chat(
         )
     else:
         # Process synchronously (original behavior)
-        session_id, response_msg, data, draft, awaiting_approval = await chat_service.handle_chat(
-            message=chat_request.message,
-            session_id=chat_request.session_id,
-            role=chat_request.role,
-            consumer_id=chat_request.consumer_id,
-            provider_id=chat_request.provider_id,
-            enrollment_id=chat_request.enrollment_id,
-            media=chat_request.media,
-            action=chat_request.action,
-            clerk_id=clerk_id
-        )
+        with turn_timing.turn(chat_request.session_id) as timings:
+            session_id, response_msg, data, draft, awaiting_approval = await chat_service.handle_chat(
+                message=chat_request.message,
+                session_id=chat_request.session_id,
+                role=chat_request.role,
+                consumer_id=chat_request.consumer_id,
+                provider_id=chat_request.provider_id,
+                enrollment_id=chat_request.enrollment_id,
+                media=chat_request.media,
+                action=chat_request.action,
+                clerk_id=clerk_id
+            )
+        
+        if settings.DEBUG and request.headers.get("X-Debug-Timing"):
+            response.headers["Server-Timing"] = timings.server_timing()
         
         return ChatResponse(
             session_id=session_id,
@@ -199,8 +215,11 @@ async def get_chat_task_status(
     
     Returns task status and result when completed.
     """
-    task_result = AsyncResult(task_id, app=celery_app)
-    
+    return _task_status(task_id, AsyncResult(task_id, app=celery_app))
+
+
+def _task_status(task_id: str, task_result: AsyncResult) -> ChatTaskStatusResponse:
+    """Status response from the Celery result backend."""
     response_data = {
         "task_id": task_id,
         "status": task_result.state,
@@ -220,3 +239,30 @@ async def get_chat_task_status(
         response_data["progress"] = task_result.info.get("progress", 0)
     
     return ChatTaskStatusResponse(**response_data)
+
+
+@router.get("/task/{task_id}/wait", response_model=ChatTaskStatusResponse)
+@limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
+async def wait_for_chat_task(
+    request: Request,
+    task_id: str,
+    timeout: float = Query(25, gt=0, description="Seconds to wait (capped at CHAT_TASK_WAIT_MAX_SECONDS)"),
+    user: Optional[Dict[str, Any]] = Depends(get_optional_user)
+):
+    """
+    Long-poll for an async chat task: returns as soon as the worker publishes
+    the result, or with the task's current status after `timeout` seconds
+    (call again to keep waiting).
+    """
+    timeout = min(timeout, settings.CHAT_TASK_WAIT_MAX_SECONDS)
+    published = chat_task_results.stored(task_id)
+    if published is None:
+        task_result = AsyncResult(task_id, app=celery_app)
+        # Finished before results were published, or the publish was lost
+        if task_result.ready():
+            return _task_status(task_id, task_result)
+        published = await chat_task_results.wait_for_result(task_id, timeout)
+        if published is None:
+            return ChatTaskStatusResponse(task_id=task_id, status=task_result.state)
+    
+    return ChatTaskStatusResponse(**published)
@@ -1,11 +1,12 @@
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, and_, select
 
-from src.platform.database import get_db
+from src.platform.database import get_db, get_async_db
 from src.platform.models.request import ServiceRequest
 from src.platform.models.offer import Offer
 from src.platform.models.booking import Booking
@@ -13,6 +14,7 @@ from src.platform.models.provider import Provider
 from src.platform.models.consumer import Consumer
 from src.platform.schemas.consumer import ConsumerRequestsResponse
 from src.platform.auth import get_current_user, get_optional_user
+from src.platform.services.profile_cache import profile_cache
 from pydantic import BaseModel, Field
 
 router = APIRouter(
@@ -107,6 +109,7 @@ async def update_consumer_profile(
     
     db.commit()
     db.refresh(consumer)
+    profile_cache.invalidate(consumer_id=str(consumer.id))
     
     return consumer.to_dict()
 
@@ -132,38 +135,46 @@ async def update_consumer_location(
         consumer.default_location = location
     
     db.commit()
+    profile_cache.invalidate(consumer_id=str(consumer_id))
     
     return {"status": "success", "location": location}
 
 @router.get("/me/requests", response_model=ConsumerRequestsResponse)
 async def get_my_requests(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
     Get all requests and bookings for the currently authenticated consumer.
     """
     clerk_id = user.get("sub")
-    consumer = db.query(Consumer).filter(Consumer.clerk_id == clerk_id).first()
+    result = await db.execute(select(Consumer).where(Consumer.clerk_id == clerk_id))
+    consumer = result.scalars().first()
     
     if not consumer:
         # Auto-create profile if authenticated via Clerk but no record exists
         consumer = Consumer(id=uuid4(), clerk_id=clerk_id)
         db.add(consumer)
-        db.commit()
-        db.refresh(consumer)
+        await db.commit()
+        await db.refresh(consumer)
         
-    return get_consumer_requests(consumer.id, db, user)
+    return await get_consumer_requests(consumer.id, db, user)
 
 @router.get("/{consumer_id}/requests", response_model=ConsumerRequestsResponse)
-def get_consumer_requests(
+async def get_consumer_requests(
     consumer_id: UUID, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: Optional[Dict[str, Any]] = Depends(get_optional_user)
 ):
     """
     Get all requests and bookings for a consumer, grouped by status.
     """
+    # The aggregation below is a handful of batched ORM queries; run it on the
+    # async session's connection so the dashboard poll doesn't block the loop.
+    return await db.run_sync(_build_consumer_requests, consumer_id, user)
+
+
+def _build_consumer_requests(db: Session, consumer_id: UUID, user: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     # Security Check
     if user:
         clerk_id = user.get("sub")
@@ -229,8 +240,8 @@ def get_consumer_requests(
             "created_at": req.created_at
         }
         
-        # Inclusion logic: show matching, open, and pending requests
-        is_open = req.status in ["matching", "open", "pending"]
+        # Inclusion logic: show matching, matched, open, and pending requests
+        is_open = req.status in ["matching", "matched", "open", "pending"]
         
         if is_open and offer_count == 0:
             open_requests.append(summary)
@@ -1,6 +1,6 @@
 from typing import List
 from uuid import UUID, uuid4
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import datetime
 
@@ -10,6 +10,8 @@ from src.platform.models.request import ServiceRequest
 from src.platform.models.booking import Booking
 from src.platform.schemas.offer import OfferCreate, OfferResponse, OfferUpdate
 from src.platform.schemas.booking import BookingResponse, BookingLocation
+from src.platform.services.notifications import booking_notifications, notifier, offer_notifications
+from src.platform.services.request_matches import OPEN_STATUSES
 from src.platform.auth import get_current_user, require_role
 from typing import Dict, Any
 
@@ -40,6 +42,7 @@ def list_offers(
 @router.post("/", response_model=OfferResponse, status_code=status.HTTP_201_CREATED)
 def create_offer(
     offer: OfferCreate, 
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     user: Dict[str, Any] = Depends(require_role("provider"))
 ):
@@ -81,15 +84,20 @@ def create_offer(
     db.refresh(db_offer)
     
     # Update request status to offers_received
-    if req.status == "matching":
+    if req.status in OPEN_STATUSES:
         req.status = "offers_received"
         db.commit()
+    
+    # Push offer:new to the consumer once the response is sent
+    for notification in offer_notifications(db, db_offer, req):
+        background_tasks.add_task(notifier.notify, *notification)
         
     return db_offer
 
 @router.put("/{offer_id}/accept", response_model=BookingResponse)
 def accept_offer(
     offer_id: UUID,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     user: Dict[str, Any] = Depends(require_role("consumer"))
 ):
@@ -157,6 +165,8 @@ def accept_offer(
     
     # Refresh to return
     db.refresh(booking)
+    for notification in booking_notifications(db, booking):
+        background_tasks.add_task(notifier.notify, *notification)
     return booking
 
 @router.get("/{offer_id}", response_model=OfferResponse)
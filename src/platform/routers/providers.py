@@ -1,6 +1,6 @@
 from typing import List, Dict, Any
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from src.platform.database import get_db
@@ -13,7 +13,7 @@ from src.platform.schemas.provider import (
 )
 from src.platform.schemas.service import ServiceCreate, ServiceResponse
 from src.platform.auth import get_current_user, require_role, require_ownership
-from src.platform.services.matching import MatchingService
+from src.platform.services.provider_embeddings import reembed_queue
 
 router = APIRouter(
     prefix="/providers",
@@ -41,8 +41,7 @@ def list_providers(
 async def create_provider(
     provider: ProviderCreate, 
     db: Session = Depends(get_db),
-    user: Dict[str, Any] = Depends(get_current_user),
-    background_tasks: BackgroundTasks = BackgroundTasks()
+    user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Create a new provider."""
     # Check if email exists
@@ -60,8 +59,7 @@ async def create_provider(
     db.refresh(new_provider)
 
     # Trigger semantic indexing
-    matcher = MatchingService(db)
-    background_tasks.add_task(matcher.update_provider_embedding, new_provider.id)
+    reembed_queue.schedule(new_provider.id)
 
     return new_provider
 
@@ -78,8 +76,7 @@ async def update_provider(
     provider_id: UUID, 
     provider_update: ProviderUpdate, 
     db: Session = Depends(get_db),
-    user: Dict[str, Any] = Depends(get_current_user),
-    background_tasks: BackgroundTasks = BackgroundTasks()
+    user: Dict[str, Any] = Depends(get_current_user)
 ):
     """Update a provider's information."""
     provider = db.query(Provider).filter(Provider.id == provider_id).first()
@@ -104,8 +101,7 @@ async def update_provider(
     db.refresh(provider)
     
     # Update semantic index
-    matcher = MatchingService(db)
-    background_tasks.add_task(matcher.update_provider_embedding, provider.id)
+    reembed_queue.schedule(provider.id)
     
     return provider
 
@@ -116,8 +112,7 @@ async def create_provider_service(
     provider_id: UUID,
     service: ServiceCreate,
     db: Session = Depends(get_db),
-    user: Dict[str, Any] = Depends(require_role("provider")),
-    background_tasks: BackgroundTasks = BackgroundTasks()
+    user: Dict[str, Any] = Depends(require_role("provider"))
 ):
     """Add a service to a provider."""
     provider = db.query(Provider).filter(Provider.id == provider_id).first()
@@ -136,8 +131,7 @@ async def create_provider_service(
     db.refresh(new_service)
     
     # Update semantic index since offerings changed
-    matcher = MatchingService(db)
-    background_tasks.add_task(matcher.update_provider_embedding, provider_id)
+    reembed_queue.schedule(provider_id)
     
     return new_service
 
@@ -1,13 +1,14 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import cast, String
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 
-from src.platform.database import get_db
+from src.platform.database import get_db, get_async_db, run_in_session
 from src.platform.models.request import ServiceRequest
 from src.platform.schemas.request import ServiceRequestCreate, ServiceRequestResponse
-from src.platform.services.matching import MatchingService
+from src.platform.services.request_matches import OPEN_STATUSES, lead_inbox, schedule_matching
 from src.platform.models.offer import Offer
 from src.platform.schemas.offer import OfferResponse
 from src.platform.auth import get_current_user, require_role, require_ownership
@@ -25,16 +26,17 @@ router = APIRouter(
     status_code=status.HTTP_201_CREATED,
     summary="Create Service Request",
     description="""
-    Create a new service request and immediately trigger the provider matching engine.
+    Create a new service request and queue it for the provider matching engine.
     
     **Process:**
-    1. Request is created with status "matching"
-    2. Matching engine finds suitable providers based on:
+    1. Request is created with status "matching" and returned right away
+    2. A worker runs the matching engine, which finds suitable providers based on:
        - Service category and type
        - Location (city/neighborhood)
        - Specializations and requirements
        - Semantic similarity (using embeddings)
-    3. Matched providers are notified and can view the request
+    3. Request status updates to "matched"; the consumer gets a `request:matched`
+       event and matched providers a `lead:new` event, and can view the request
     4. Request status updates to "offers_received" when providers submit offers
     
     **Authentication:** Requires `consumer` role.
@@ -53,7 +55,7 @@ router = APIRouter(
                         "service_category": "hairstylist",
                         "service_type": "haircut",
                         "status": "matching",
-                        "matched_providers": ["550e8400-e29b-41d4-a716-446655440002"],
+                        "matched_providers": [],
                         "created_at": "2026-01-28T10:00:00Z"
                     }
                 }
@@ -67,7 +69,7 @@ router = APIRouter(
 )
 async def create_request(
     request: ServiceRequestCreate, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: Dict[str, Any] = Depends(require_role("consumer"))
 ):
     """
@@ -98,69 +100,57 @@ async def create_request(
         }]
     )
     db.add(db_request)
-    db.commit()
-    db.refresh(db_request)
+    await db.commit()
+    await db.refresh(db_request)
     
-    # 2. Trigger Matching
-    matcher = MatchingService(db)
-    matched_ids = await matcher.find_providers(request)
-    
-    # 3. Update Request with Matches
-    # specific UUID serialization handling might be needed depending on DB driver, 
-    # but usually list of UUIDs is fine if JSON serializer handles it. 
-    # Safest is to convert to strings.
-    matched_ids_str = [str(uid) for uid in matched_ids]
-    
-    db_request.matched_providers = matched_ids_str
-    if matched_ids:
-        # In a real system, we would notify providers here
-        pass
-        
-    db.commit()
-    db.refresh(db_request)
+    # 2. Queue Matching (the worker records the matches and notifies)
+    schedule_matching(db_request.id)
     
     return db_request
 
 @router.get("/", response_model=List[ServiceRequestResponse])
-def list_requests(
+async def list_requests(
+    response: Response,
     status: str = None, 
     matching_provider_id: UUID = None,
+    cursor: Optional[str] = None,
     skip: int = 0, 
     limit: int = 100, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
     List service requests, optionally filtered by status or matched provider.
-    """
-    query = db.query(ServiceRequest)
-    if status:
-        query = query.filter(ServiceRequest.status == status)
-    
-    if matching_provider_id:
-        # PostgreSQL specific JSONB contains @> ['uuid-string']
-        # For SQLite/Mocks, we'll do literal check
-        pid_str = str(matching_provider_id)
-        # SQLAlchemy simplified check for JSON column
-        query = query.filter(cast(ServiceRequest.matched_providers, String).contains(pid_str))
 
-    requests = query.offset(skip).limit(limit).all()
-    
+    With matching_provider_id this is the provider's lead inbox, newest match
+    first and keyset-paginated: pass the `X-Next-Cursor` response header back
+    as `cursor` for the next page (`skip` is not used).
+    """
     if matching_provider_id:
-        from src.platform.models.provider import ProviderLeadView
         from src.platform.database.query_utils import batch_load_viewed_status
-        
+
+        try:
+            requests, next_cursor = await run_in_session(
+                db, lead_inbox, matching_provider_id, status=status, cursor=cursor, limit=limit
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+
         # Batch load viewed status (fixes N+1 query)
         request_ids = [r.id for r in requests]
-        viewed_ids = batch_load_viewed_status(db, request_ids, matching_provider_id)
-        
-        # We need to add viewed field to response. 
-        # Since response_model is ServiceRequestResponse, we might need a wrapper or dynamic field.
-        # For now, let's just return them and hope the schema allows extra fields or we update schema.
+        viewed_ids = await db.run_sync(batch_load_viewed_status, request_ids, matching_provider_id)
         for r in requests:
             r.viewed_by_current_provider = r.id in viewed_ids
-            
-    return requests
+        return requests
+
+    query = select(ServiceRequest)
+    if status:
+        query = query.where(ServiceRequest.status == status)
+
+    result = await db.execute(query.offset(skip).limit(limit))
+    return result.scalars().all()
 
 @router.get(
     "/{request_id}",
@@ -192,42 +182,22 @@ def get_request(request_id: UUID, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Request not found")
     return req
 
-@router.post("/{request_id}/match", response_model=ServiceRequestResponse)
+@router.post("/{request_id}/match", response_model=ServiceRequestResponse, status_code=status.HTTP_202_ACCEPTED)
 def trigger_matching(request_id: UUID, db: Session = Depends(get_db)):
     """
-    Manually re-trigger matching for a request.
+    Manually re-trigger matching for a request. Matching runs on the worker;
+    the current matches are returned and replaced when it finishes.
     """
     req = db.query(ServiceRequest).filter(ServiceRequest.id == request_id).first()
     if not req:
         raise HTTPException(status_code=404, detail="Request not found")
-        
-    # Reconstruct the schema object for the matcher (partial reconstruction)
-    # This is a bit hacky, ideally matcher takes model or we have a shared DTO
-    # For now, we fetch details from the model.
-    # Note: MatchingService expects ServiceRequestCreate schema currently.
-    # We'll instantiate it from the DB model.
-    
-    from src.platform.schemas.request import RequestRequirements, RequestLocation, RequestTiming, RequestBudget
-    
-    schema = ServiceRequestCreate(
-        consumer_id=req.consumer_id,
-        raw_input=req.raw_input,
-        service_category=req.service_category,
-        service_type=req.service_type,
-        requirements=RequestRequirements(**req.requirements),
-        location=RequestLocation(**req.location),
-        timing=RequestTiming(**req.timing),
-        budget=RequestBudget(**req.budget)
-    )
-    
-    matcher = MatchingService(db)
-    matched_ids = matcher.find_providers(schema)
-    matched_ids_str = [str(uid) for uid in matched_ids]
-    
-    req.matched_providers = matched_ids_str
-    db.commit()
-    db.refresh(req)
+    if req.status not in OPEN_STATUSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot match request in '{req.status}' status."
+        )
     
+    schedule_matching(req.id)
     return req
 
 @router.get("/{request_id}/offers", response_model=List[OfferResponse])
@@ -257,7 +227,8 @@ def update_request(
     user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
-    Update a service request. Only allowed for requests in 'matching' status with no offers.
+    Update a service request. Only allowed for open ('matching' / 'matched') requests with no offers.
+    The request is matched again with the new details.
     """
     from datetime import datetime
     from sqlalchemy.orm.attributes import flag_modified
@@ -271,10 +242,10 @@ def update_request(
     
     # Check if editing is allowed
     offer_count = db.query(Offer).filter(Offer.request_id == request_id).count()
-    if req.status != "matching" or offer_count > 0:
+    if req.status not in OPEN_STATUSES or offer_count > 0:
         raise HTTPException(
             status_code=400, 
-            detail="Cannot edit request. Request must be in 'matching' status with no offers."
+            detail="Cannot edit request. Request must be in 'matching' or 'matched' status with no offers."
         )
     
     # Update allowed fields
@@ -297,6 +268,7 @@ def update_request(
     
     db.commit()
     db.refresh(req)
+    schedule_matching(req.id)
     return req
 
 @router.post("/{request_id}/cancel", response_model=ServiceRequestResponse)
@@ -306,7 +278,7 @@ def cancel_request(
     user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
-    Cancel a service request. Only allowed for requests in 'matching' or 'pending' status.
+    Cancel a service request. Only allowed for requests in 'matching', 'matched' or 'pending' status.
     """
     from datetime import datetime, timezone
     from sqlalchemy.orm.attributes import flag_modified
@@ -319,10 +291,10 @@ def cancel_request(
     require_ownership("request", request_id, user, db)
     
     # Check if cancellation is allowed
-    if req.status not in ["matching", "pending"]:
+    if req.status not in [*OPEN_STATUSES, "pending"]:
         raise HTTPException(
             status_code=400,
-            detail=f"Cannot cancel request in '{req.status}' status. Only 'matching' or 'pending' requests can be canceled."
+            detail=f"Cannot cancel request in '{req.status}' status. Only 'matching', 'matched' or 'pending' requests can be canceled."
         )
     
     # Update status
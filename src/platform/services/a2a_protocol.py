@@ -48,23 +48,12 @@ class A2AProtocol:
         """
         try:
             # 1. Load Provider Context (Business Logic)
-            from src.platform.database import SessionLocal
+            from src.platform.database import AsyncSessionLocal
             from src.platform.services.memory_service import MemoryService
             
-            # Need to handle async DB access carefully if pure SQLAlchemy
-            # For now, we assume get_provider_context is async or safe
-            # Actually get_provider_context IS async in MemoryService
-            
-            # We must use the service. Creating short-lived session.
-            ctx = {}
-            # NOTE: SessionLocal is synchronous. MemoryService uses it.
-            # But get_provider_context calls db.execute which is sync in ORM usually unless AsyncSession.
-            # However, MemoryService.get_provider_context is defined as 'async def'.
-            # Inspecting memory_service.py: it uses `self.db.execute(...)`.
-            # If `self.db` is sync Session, this is blocking code in async function. 
-            # It's fine for MVP but suboptimal.
-            
-            with SessionLocal() as db:
+            # Short-lived async session per provider so the gather() above
+            # actually overlaps the DB round-trips instead of serialising them.
+            async with AsyncSessionLocal() as db:
                 ms = MemoryService(db)
                 ctx = await ms.get_provider_context(UUID(provider_id))
             
@@ -7,6 +7,7 @@ including image/video understanding and specialist consultation.
 
 import json
 import base64
+import asyncio
 import structlog
 from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID, uuid4
@@ -16,14 +17,17 @@ from src.mcp import handlers
 from src.platform.schemas.media import MediaAttachment, StoredMedia
 from src.platform.schemas.chat import DraftRequest
 from src.platform.services.media import media_service
-from src.platform.services.specialists import specialist_registry
+from src.platform.services.specialists import analyze_cached, specialist_registry
 from src.platform.services.suggestions import suggestion_service
 from src.platform.services.llm_gateway import llm_gateway
 from src.platform.services.memory_service import MemoryService
 from src.platform.services.handoff_manager import HandoffManager
 from src.platform.services.session_manager import session_manager
+from src.platform.services.profile_cache import profile_cache
+from src.platform.services.message_store import message_store, to_llm_dict, from_llm_dict
+from src.platform.services import turn_timing
 
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage, ToolMessage
+from langchain_core.messages import BaseMessage
 from src.platform.services.orchestrator import proxie_orchestrator
 
 logger = structlog.get_logger(__name__)
@@ -222,7 +226,8 @@ TOOL_DECLARATIONS = [
         "parameters": {
             "type": "object",
             "properties": {
-                "provider_id": {"type": "string", "description": "The provider ID"}
+                "provider_id": {"type": "string", "description": "The provider ID"},
+                "cursor": {"type": "string", "description": "next_cursor from the previous page, to see older leads"}
             },
             "required": ["provider_id"]
         }
@@ -356,49 +361,11 @@ class ChatService:
 
     def _to_lc_msgs(self, messages: List[Dict]) -> List[BaseMessage]:
         """Convert Proxie/Gemini dict messages to LangChain messages."""
-        lc_msgs = []
-        for m in messages:
-            role = m.get("role")
-            content = m.get("content")
-            if role == "user":
-                lc_msgs.append(HumanMessage(content=content))
-            elif role == "assistant":
-                # Handle tool calls
-                kwargs = {}
-                if "tool_calls" in m:
-                    kwargs["tool_calls"] = m["tool_calls"]
-                lc_msgs.append(AIMessage(content=content or "", additional_kwargs=kwargs))
-            elif role == "tool":
-                lc_msgs.append(ToolMessage(
-                    tool_call_id=m.get("tool_call_id"),
-                    name=m.get("name"),
-                    content=str(m.get("content"))
-                ))
-            elif role == "system":
-                lc_msgs.append(SystemMessage(content=content))
-        return lc_msgs
+        return [m for m in (from_llm_dict(d) for d in messages) if m is not None]
 
     def _from_lc_msgs(self, lc_msgs: List[BaseMessage]) -> List[Dict]:
-        """Convert LangChain messages back to Proxie/Gemini dicts."""
-        messages = []
-        for m in lc_msgs:
-            if isinstance(m, HumanMessage):
-                messages.append({"role": "user", "content": m.content})
-            elif isinstance(m, AIMessage):
-                msg_dict = {"role": "assistant", "content": m.content}
-                if "tool_calls" in m.additional_kwargs:
-                    msg_dict["tool_calls"] = m.additional_kwargs["tool_calls"]
-                messages.append(msg_dict)
-            elif isinstance(m, ToolMessage):
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": m.tool_call_id,
-                    "name": m.name,
-                    "content": m.content
-                })
-            elif isinstance(m, SystemMessage):
-                messages.append({"role": "system", "content": m.content})
-        return messages
+        """Convert LangChain messages back to Proxie/Gemini dicts (cached per message)."""
+        return [d for d in (to_llm_dict(m) for m in lc_msgs) if d is not None]
 
     def _get_model_params(self, role: str, provider_id: Optional[UUID] = None) -> Tuple[str, List[Dict]]:
         """Get specialized model parameters based on role."""
@@ -483,7 +450,30 @@ class ChatService:
     ) -> Tuple[str, str, Optional[Dict], Optional[DraftRequest], bool]:
         """
         Main entry point for handling a chat message.
+
+        Runs the turn inside a TurnTimings scope (spans, stage/node/tool
+        histograms, LLM call and loop counts).
         """
+        with turn_timing.turn(session_id):
+            return await self._handle_chat(
+                message, session_id=session_id, role=role, consumer_id=consumer_id,
+                provider_id=provider_id, enrollment_id=enrollment_id, media=media,
+                action=action, clerk_id=clerk_id
+            )
+
+    async def _handle_chat(
+        self, 
+        message: str, 
+        session_id: Optional[str] = None,
+        role: str = "consumer",
+        consumer_id: Optional[str] = None,
+        provider_id: Optional[str] = None,
+        enrollment_id: Optional[str] = None,
+        media: List[MediaAttachment] = None,
+        action: Optional[str] = None,
+        clerk_id: Optional[str] = None
+    ) -> Tuple[str, str, Optional[Dict], Optional[DraftRequest], bool]:
+        """Handle one chat turn (see handle_chat)."""
         # Load or create session
         session_id, session = self._get_or_create_session(session_id, role, provider_id) # Keep original order for now
         
@@ -510,50 +500,14 @@ class ChatService:
         session["context"]["enrollment_id"] = enrollment_id
         session["context"]["clerk_id"] = clerk_id  # Store clerk_id in context
         
-        if clerk_id:
-            # Load consumer profile using clerk_id
-            from src.platform.database import SessionLocal
-            from src.platform.models.consumer import Consumer
-            with SessionLocal() as db:
-                consumer = db.query(Consumer).filter(Consumer.clerk_id == clerk_id).first()
-                if not consumer and consumer_id:
-                    # Check if the guest record can be "claimed"
-                    guest_consumer = db.query(Consumer).filter(Consumer.id == UUID(str(consumer_id))).first()
-                    if guest_consumer and not guest_consumer.clerk_id:
-                        guest_consumer.clerk_id = clerk_id
-                        db.commit()
-                        db.refresh(guest_consumer)
-                        consumer = guest_consumer
-                        logger.info("guest_profile_claimed", clerk_id=clerk_id, consumer_id=consumer_id)
-                
-                if consumer:
-                    session["context"]["consumer_profile"] = consumer.to_dict()
-                else:
-                    # Create a default profile if not exists
-                    consumer = Consumer(clerk_id=clerk_id)
-                    db.add(consumer)
-                    db.commit()
-                    db.refresh(consumer)
-                    session["context"]["consumer_profile"] = consumer.to_dict()
-                
-                # Update consumer_id context to match the claimed/found record's UUID
-                session["context"]["consumer_id"] = str(consumer.id)
-                consumer_id = str(consumer.id) # Sync local var
-        elif consumer_id:
-            # Fallback to consumer_id if clerk_id not provided
-            from src.platform.database import SessionLocal
-            from src.platform.models.consumer import Consumer
-            with SessionLocal() as db:
-                consumer = db.query(Consumer).filter(Consumer.id == UUID(str(consumer_id))).first()
-                if consumer:
-                    session["context"]["consumer_profile"] = consumer.to_dict()
-                else:
-                    # Create a default profile if not exists
-                    consumer = Consumer(id=UUID(str(consumer_id)))
-                    db.add(consumer)
-                    db.commit()
-                    db.refresh(consumer)
-                    session["context"]["consumer_profile"] = consumer.to_dict()
+        profile_changed = False
+        if clerk_id or consumer_id:
+            with turn_timing.stage("profile"):
+                profile, consumer_id = await self._load_consumer_profile(clerk_id, consumer_id)
+            profile_changed = session["context"].get("consumer_profile") != profile
+            session["context"]["consumer_profile"] = profile
+            # Update consumer_id context to match the claimed/found record's UUID
+            session["context"]["consumer_id"] = consumer_id
         if provider_id:
             session["context"]["provider_id"] = str(provider_id)
         if enrollment_id:
@@ -572,13 +526,15 @@ class ChatService:
             known_facts=context_obj.get_known_summary()
         )
         
-        # 3. Load profile into context if available
-        if "consumer_profile" in session["context"]:
+        # 3. Load profile into context if available (facts persist in the
+        # session, so only re-apply when the profile actually changed)
+        if profile_changed:
             context_obj.update_from_profile(session["context"]["consumer_profile"])
         
         # 4. Extract information from CURRENT message BEFORE responding
         if message:
-            extracted = await self.extract_information(message)
+            with turn_timing.stage("extraction"):
+                extracted = await self.extract_information(message)
             if extracted:
                 context_obj.update_from_extraction(extracted, ContextSource.CURRENT_MESSAGE)
                 # Update legacy gathered_info for backward compatibility with some tools
@@ -662,29 +618,33 @@ class ChatService:
             session["messages"].append({"role": "user", "content": content_list})
             
             # Prepare Context for Orchestrator
+            # (tool_node calls chat_service directly; the context must stay
+            # serializable for the orchestrator checkpoint)
             session["context"]["tools"] = session["tools"]
-            session["context"]["tool_executor"] = lambda name, args: self._execute_tool(name, args, session["context"])
             
-            # Convert existing history to LangChain
-            lc_messages = self._to_lc_msgs(session["messages"])
+            # LangChain view of the history; only messages added since the
+            # last turn are converted
+            lc_messages = message_store.sync(session_id, session["messages"])
             
             # Run Orchestrator (LangGraph)
-            response_text, final_lc_msgs, final_context = await proxie_orchestrator.run(
-                messages=lc_messages,
-                context=session["context"],
-                user_id=clerk_id or consumer_id or provider_id,
-                session_id=session_id,
-                role=role
-            )
+            with turn_timing.stage("orchestrator"):
+                response_text, final_lc_msgs, final_context = await proxie_orchestrator.run(
+                    messages=lc_messages,
+                    context=session["context"],
+                    user_id=clerk_id or consumer_id or provider_id,
+                    session_id=session_id,
+                    role=role
+                )
             
             # Sync back context and history
             session["context"] = final_context
-            session["messages"] = self._from_lc_msgs(final_lc_msgs)
+            session["messages"] = message_store.record(session_id, final_lc_msgs)
             
             # Auto-save relevant info to profile
             if role == "consumer" and (clerk_id or consumer_id):
                  # re-instantiate context to use update logic if needed, but for now just direct save
-                 await self._auto_save_consumer_profile(session["context"], clerk_id or consumer_id)
+                 with turn_timing.stage("profile_save"):
+                     await self._auto_save_consumer_profile(session["context"], clerk_id or consumer_id)
             
             # Structured data and UI hints (legacy support)
             # Find any tool results in history to pull structured data
@@ -694,7 +654,8 @@ class ChatService:
                     structured_data = self._capture_structured_data(m["name"], json.loads(m["content"]), structured_data)
             
             # Consult Specialist if relevant (SpecialistAgent logic)
-            await self._consult_specialist(session["context"], message, response_text, stored_media)
+            with turn_timing.stage("specialist_consult"):
+                await self._consult_specialist(session["context"], message, response_text, stored_media)
             
             # Check if response indicates a draft
             draft = self._detect_draft_in_response(response_text, session["context"])
@@ -707,12 +668,9 @@ class ChatService:
             # Parse UI hints and buttons from final response
             structured_data = self._parse_ui_elements(response_text, structured_data)
             
-            # Cleanup non-serializable items
-            if "tool_executor" in session["context"]:
-                del session["context"]["tool_executor"]
-
             # Save session
-            session_manager.save_session(session_id, session)
+            with turn_timing.stage("session_save"):
+                session_manager.save_session(session_id, session)
             
             return session_id, response_text, structured_data, draft, awaiting_approval
             
@@ -830,8 +788,10 @@ class ChatService:
         # For now, let's assume the assistant_message contains some analysis or we rely on Gemini's vision.
         media_descriptions = context.get("media_descriptions", [])
         
-        # Analyze
-        analysis = await specialist.analyze(
+        # Analyze (reused while the request and its media are unchanged)
+        analysis = await analyze_cached(
+            specialist,
+            media=context.get("media", []),
             service_type=service_type or "unknown",
             description=info.get("description", user_message or ""),
             location=info.get("location", {}),
@@ -906,8 +866,8 @@ class ChatService:
             if name == "recall_preferences":
                 if not consumer_uuid:
                     return {"error": "No user identity found"}
-                from src.platform.database import SessionLocal
-                with SessionLocal() as db:
+                from src.platform.database import AsyncSessionLocal
+                async with AsyncSessionLocal() as db:
                     mem_service = MemoryService(db)
                     ctx = await mem_service.get_consumer_context(consumer_uuid)
                     memory = ctx.get("memory")
@@ -938,8 +898,8 @@ class ChatService:
                     "outcome": "success"
                 }
                 
-                from src.platform.database import SessionLocal
-                with SessionLocal() as db:
+                from src.platform.database import AsyncSessionLocal
+                async with AsyncSessionLocal() as db:
                     mem_service = MemoryService(db)
                     await mem_service.update_consumer_memory(consumer_uuid, interaction)
                 return {"status": "success", "message": "Preferences updated"}
@@ -948,8 +908,8 @@ class ChatService:
                 if not consumer_uuid:
                     return {"error": "No user identity found"}
                 
-                from src.platform.database import SessionLocal
-                with SessionLocal() as db:
+                from src.platform.database import AsyncSessionLocal
+                async with AsyncSessionLocal() as db:
                     mem_service = MemoryService(db)
                     ctx = await mem_service.get_consumer_context(consumer_uuid)
                     bookings = ctx.get("recent_bookings", [])
@@ -1052,13 +1012,14 @@ class ChatService:
             elif name == "get_offers":
                 request_id = params.get("request_id") or context.get("current_request_id")
                 if request_id:
-                    result = handlers.get_offers(UUID(request_id))
+                    result = await asyncio.to_thread(handlers.get_offers, UUID(request_id))
                     context["current_offers"] = result.get("offers", [])
                     return result
                 return {"error": "No request ID available"}
                 
             elif name == "accept_offer":
-                return handlers.accept_offer(
+                return await asyncio.to_thread(
+                    handlers.accept_offer,
                     offer_id=UUID(params["offer_id"]),
                     selected_slot={
                         "date": params["slot_date"],
@@ -1090,7 +1051,9 @@ class ChatService:
                 # Get pricing history
                 history_price = 80 # Default
                 try:
-                    ctx = await self.memory_service.get_provider_context(UUID(provider_id))
+                    from src.platform.database import AsyncSessionLocal
+                    async with AsyncSessionLocal() as db:
+                        ctx = await MemoryService(db).get_provider_context(UUID(provider_id))
                     # Basic logic: avg of last 5 offers
                     recent = ctx.get("recent_offers", [])
                     if recent:
@@ -1152,16 +1115,18 @@ class ChatService:
                 clerk_id = context.get("clerk_id")
                 consumer_id = params.get("consumer_id") or context.get("consumer_id")
                 
-                from src.platform.database import SessionLocal
+                from sqlalchemy import select
+                from src.platform.database import AsyncSessionLocal
                 from src.platform.models.consumer import Consumer
-                with SessionLocal() as db:
+                async with AsyncSessionLocal() as db:
                     # Prefer clerk_id lookup for security
                     if clerk_id:
-                        consumer = db.query(Consumer).filter(Consumer.clerk_id == clerk_id).first()
+                        stmt = select(Consumer).where(Consumer.clerk_id == clerk_id)
                     elif consumer_id:
-                        consumer = db.query(Consumer).filter(Consumer.id == UUID(str(consumer_id))).first()
+                        stmt = select(Consumer).where(Consumer.id == UUID(str(consumer_id)))
                     else:
                         return {"error": "No identity available"}
+                    consumer = (await db.execute(stmt)).scalars().first()
                         
                     if consumer:
                         return consumer.to_dict()
@@ -1171,15 +1136,16 @@ class ChatService:
                 clerk_id = context.get("clerk_id")
                 consumer_id = params.get("consumer_id") or context.get("consumer_id")
                 
-                from src.platform.database import SessionLocal
+                from sqlalchemy import select
+                from src.platform.database import AsyncSessionLocal
                 from src.platform.models.consumer import Consumer
-                with SessionLocal() as db:
+                async with AsyncSessionLocal() as db:
                     # Resolve consumer by clerk_id or internal ID
                     consumer = None
                     if clerk_id:
-                        consumer = db.query(Consumer).filter(Consumer.clerk_id == clerk_id).first()
+                        consumer = (await db.execute(select(Consumer).where(Consumer.clerk_id == clerk_id))).scalars().first()
                     elif consumer_id:
-                        consumer = db.query(Consumer).filter(Consumer.id == UUID(str(consumer_id))).first()
+                        consumer = (await db.execute(select(Consumer).where(Consumer.id == UUID(str(consumer_id))))).scalars().first()
                     
                     if not consumer:
                         # Auto-create profile if authenticated via Clerk
@@ -1195,8 +1161,9 @@ class ChatService:
                         if field in params:
                             setattr(consumer, field, params[field])
                     
-                    db.commit()
-                    db.refresh(consumer)
+                    await db.commit()
+                    await db.refresh(consumer)
+                    profile_cache.invalidate(consumer_id=str(consumer.id))
                     # Update context with new data
                     context["consumer_profile"] = consumer.to_dict()
                     return consumer.to_dict()
@@ -1207,15 +1174,15 @@ class ChatService:
                 if not enrollment_id:
                     return {"error": "No enrollment session active"}
                 
-                from src.platform.database import SessionLocal
+                from src.platform.database import AsyncSessionLocal
                 from src.platform.models.provider import ProviderEnrollment
-                with SessionLocal() as db:
-                    enrollment = db.query(ProviderEnrollment).filter(ProviderEnrollment.id == UUID(enrollment_id)).first()
+                async with AsyncSessionLocal() as db:
+                    enrollment = await db.get(ProviderEnrollment, UUID(enrollment_id))
                     if enrollment:
-                        current_data = enrollment.data or {}
+                        current_data = dict(enrollment.data or {})
                         current_data.update(params)
                         enrollment.data = current_data
-                        db.commit()
+                        await db.commit()
                         return {"status": "success", "updated_fields": list(params.keys())}
                 return {"error": "Enrollment not found"}
 
@@ -1224,10 +1191,10 @@ class ChatService:
                 if not enrollment_id:
                     return {"error": "No enrollment session active"}
                 
-                from src.platform.database import SessionLocal
+                from src.platform.database import AsyncSessionLocal
                 from src.platform.models.provider import ProviderEnrollment
-                with SessionLocal() as db:
-                    enrollment = db.query(ProviderEnrollment).filter(ProviderEnrollment.id == UUID(enrollment_id)).first()
+                async with AsyncSessionLocal() as db:
+                    enrollment = await db.get(ProviderEnrollment, UUID(enrollment_id))
                     if enrollment:
                         return enrollment.data
                 return {"error": "Enrollment not found"}
@@ -1240,21 +1207,24 @@ class ChatService:
                 if not enrollment_id:
                     return {"error": "No enrollment session active"}
                 
-                from src.platform.database import SessionLocal
+                from src.platform.database import AsyncSessionLocal
                 from src.platform.models.provider import ProviderEnrollment
                 from src.platform.services.verification import verification_service
-                with SessionLocal() as db:
-                    enrollment = db.query(ProviderEnrollment).filter(ProviderEnrollment.id == UUID(enrollment_id)).first()
+                async with AsyncSessionLocal() as db:
+                    enrollment = await db.get(ProviderEnrollment, UUID(enrollment_id))
                     if enrollment:
                         enrollment.status = "pending"
-                        db.commit()
-                        return verification_service.process_enrollment(enrollment, db)
+                        await db.commit()
+                        # Verification is sync ORM code; run it on the async session's connection
+                        return await db.run_sync(lambda sync_db: verification_service.process_enrollment(enrollment, sync_db))
                 return {"error": "Enrollment not found"}
 
             elif name == "get_my_leads":
                 provider_id = params.get("provider_id") or context.get("provider_id")
                 if provider_id:
-                    return handlers.get_matching_requests(UUID(provider_id))
+                    return await asyncio.to_thread(
+                        handlers.get_matching_requests, UUID(provider_id), cursor=params.get("cursor")
+                    )
                 return {"error": "No provider ID available"}
                 
             elif name == "get_lead_details":
@@ -1263,13 +1233,13 @@ class ChatService:
                 if request_id:
                     # Mark as viewed if provider is known
                     if provider_id:
-                        handlers.mark_lead_viewed(UUID(provider_id), UUID(request_id))
+                        await asyncio.to_thread(handlers.mark_lead_viewed, UUID(provider_id), UUID(request_id))
                     
                     # Get request with all details
-                    from src.platform.database import SessionLocal
+                    from src.platform.database import AsyncSessionLocal
                     from src.platform.models.request import ServiceRequest
-                    with SessionLocal() as db:
-                        req = db.query(ServiceRequest).filter(ServiceRequest.id == UUID(request_id)).first()
+                    async with AsyncSessionLocal() as db:
+                        req = await db.get(ServiceRequest, UUID(request_id))
                         if req:
                             return {
                                 "id": str(req.id),
@@ -1288,11 +1258,11 @@ class ChatService:
                 provider_id = params.get("provider_id") or context.get("provider_id")
                 if request_id and provider_id:
                     # Fetch req and provider data
-                    from src.platform.database import SessionLocal
+                    from src.platform.database import AsyncSessionLocal
                     from src.platform.models.request import ServiceRequest
-                    with SessionLocal() as db:
-                        req = db.query(ServiceRequest).filter(ServiceRequest.id == UUID(request_id)).first()
-                        provider = handlers.get_provider(UUID(provider_id))
+                    async with AsyncSessionLocal() as db:
+                        req = await db.get(ServiceRequest, UUID(request_id))
+                        provider = await asyncio.to_thread(handlers.get_provider, UUID(provider_id))
                         
                         if req and provider:
                             # Convert to dict
@@ -1301,12 +1271,7 @@ class ChatService:
                                 "budget": req.budget,
                                 "specialist_analysis": req.requirements.get("specialist_analysis") if req.requirements else {}
                             }
-                            # Wrap in async call (we are in sync thread here usually, or need await)
-                            # For simplicity since suggester is sync-like for now:
-                            import asyncio
-                            loop = asyncio.new_event_loop()
-                            suggestion = loop.run_until_complete(suggestion_service.suggest_offer(req_dict, provider))
-                            loop.close()
+                            suggestion = await suggestion_service.suggest_offer(req_dict, provider)
                             return suggestion.dict()
                 return {"error": "Could not generate suggestion"}
 
@@ -1337,7 +1302,8 @@ class ChatService:
                 if not request_id or not provider_id or not price:
                     return {"error": "Missing required fields for offer"}
 
-                return handlers.submit_offer(
+                return await asyncio.to_thread(
+                    handlers.submit_offer,
                     request_id=UUID(request_id),
                     provider_id=UUID(provider_id),
                     price=price,
@@ -1536,21 +1502,73 @@ class ChatService:
             return "Hi! I'm Proxie. Ready to help you manage your business. 📋 Would you like to see your new leads?", None
 
 
+    async def _load_consumer_profile(self, clerk_id: Optional[str], consumer_id: Optional[str]) -> Tuple[Dict[str, Any], str]:
+        """
+        Find (or create) the consumer for this turn and return (profile, consumer_id).
+
+        Prefers clerk_id; a guest record matching consumer_id is claimed if it
+        has no clerk_id yet. Read-through profile_cache first, so most turns
+        never touch the DB.
+        """
+        from sqlalchemy import select
+        from src.platform.database import AsyncSessionLocal
+        from src.platform.models.consumer import Consumer
+
+        cached = profile_cache.get(clerk_id=clerk_id, consumer_id=None if clerk_id else consumer_id)
+        if cached:
+            return cached, cached["id"]
+
+        async with AsyncSessionLocal() as db:
+            if clerk_id:
+                result = await db.execute(select(Consumer).where(Consumer.clerk_id == clerk_id))
+                consumer = result.scalars().first()
+                if not consumer and consumer_id:
+                    # Check if the guest record can be "claimed"
+                    result = await db.execute(select(Consumer).where(Consumer.id == UUID(str(consumer_id))))
+                    guest_consumer = result.scalars().first()
+                    if guest_consumer and not guest_consumer.clerk_id:
+                        guest_consumer.clerk_id = clerk_id
+                        await db.commit()
+                        await db.refresh(guest_consumer)
+                        consumer = guest_consumer
+                        logger.info("guest_profile_claimed", clerk_id=clerk_id, consumer_id=consumer_id)
+                if not consumer:
+                    # Create a default profile if not exists
+                    consumer = Consumer(clerk_id=clerk_id)
+                    db.add(consumer)
+            else:
+                # Fallback to consumer_id if clerk_id not provided
+                result = await db.execute(select(Consumer).where(Consumer.id == UUID(str(consumer_id))))
+                consumer = result.scalars().first()
+                if not consumer:
+                    consumer = Consumer(id=UUID(str(consumer_id)))
+                    db.add(consumer)
+
+            if consumer in db.new:
+                await db.commit()
+                await db.refresh(consumer)
+
+            profile = consumer.to_dict()
+            profile_cache.set(profile, clerk_id=consumer.clerk_id)
+            return profile, str(consumer.id)
+
     async def _auto_save_consumer_profile(self, context_dict: Dict, consumer_id_or_clerk: str):
         """Automatically save relevant extracted info to user profile."""
-        from src.platform.database import SessionLocal
+        from sqlalchemy import select
+        from src.platform.database import AsyncSessionLocal
         from src.platform.models.consumer import Consumer
         from uuid import UUID
         
         try:
-            with SessionLocal() as db:
+            async with AsyncSessionLocal() as db:
                 # Try to find by UUID first (internal id)
                 try:
                     target_id = UUID(consumer_id_or_clerk)
-                    consumer = db.query(Consumer).filter(Consumer.id == target_id).first()
+                    stmt = select(Consumer).where(Consumer.id == target_id)
                 except (ValueError, TypeError):
                     # Fallback to clerk_id
-                    consumer = db.query(Consumer).filter(Consumer.clerk_id == consumer_id_or_clerk).first()
+                    stmt = select(Consumer).where(Consumer.clerk_id == consumer_id_or_clerk)
+                consumer = (await db.execute(stmt)).scalars().first()
                 
                 if consumer:
                     # Update name if missing
@@ -1566,7 +1584,8 @@ class ChatService:
                         existing = consumer.preferences or {}
                         consumer.preferences = {**existing, **context_dict["preferences"]}
                     
-                    db.commit()
+                    await db.commit()
+                    profile_cache.invalidate(consumer_id=str(consumer.id))
                     logger.info("consumer_profile_autosaved", consumer_id=str(consumer.id))
         except Exception as e:
             logger.error(f"Failed to auto-save consumer profile: {e}")
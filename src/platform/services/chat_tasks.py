@@ -0,0 +1,137 @@
+"""
+Proxie Chat Tasks - delivery of async chat results
+
+In async chat mode (FEATURE_ASYNC_CHAT_ENABLED / ?async_mode=true) the turn
+runs in the process_chat_message task. When it finishes the worker
+publishes the outcome instead of waiting to be polled:
+
+    chat_task_result:{task_id}  -> JSON outcome, kept CHAT_TASK_RESULT_TTL seconds
+    chat_task:{task_id}         -> pub/sub channel, the same JSON published once
+    chat:task (Socket.IO)       -> the outcome, to the session:{session_id} room
+
+GET /chat/task/{task_id}/wait blocks on the channel (wait_for_result) and
+answers within milliseconds of completion. The result key covers waiters
+that subscribe after the publish.
+
+An outcome is {"task_id", "status": "SUCCESS" | "FAILURE", "result", "error"}.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, Optional
+
+import redis
+import redis.asyncio as aioredis
+import structlog
+
+from src.platform.config import settings
+from src.platform.services.notifications import notifier
+
+logger = structlog.get_logger(__name__)
+
+
+def _channel(task_id: str) -> str:
+    return f"chat_task:{task_id}"
+
+
+def _result_key(task_id: str) -> str:
+    return f"chat_task_result:{task_id}"
+
+
+def outcome(task_id: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "task_id": task_id,
+        "status": "FAILURE" if error is not None else "SUCCESS",
+        "result": result,
+        "error": error,
+    }
+
+
+class ChatTaskResults:
+    """Publishes finished chat tasks and lets API requests wait for them."""
+
+    def __init__(self, redis_client: Any = None, async_client: Any = None):
+        # One async client (and connection pool) for every waiter; each wait
+        # opens a pub/sub on it, which holds a pooled connection until closed
+        self._async_client = async_client
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        if redis_client is not None:
+            self.redis_client = redis_client
+        else:
+            try:
+                self.redis_client = redis.from_url(settings.REDIS_URL, db=settings.REDIS_CACHE_DB)
+            except Exception as e:
+                logger.error("Failed to connect to Redis for chat task results", error=str(e))
+                self.redis_client = None
+
+    async def publish(self, task_id: str, session_id: Optional[str], data: Dict[str, Any]) -> None:
+        """Store, publish and push a task outcome. Best effort: never raises."""
+        message = json.dumps(data, default=str)
+        if self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline()
+                pipe.set(_result_key(task_id), message, ex=settings.CHAT_TASK_RESULT_TTL)
+                pipe.publish(_channel(task_id), message)
+                pipe.execute()
+            except redis.RedisError as e:
+                logger.warning("chat_task_publish_failed", task_id=task_id, error=str(e))
+        if session_id:
+            try:
+                await notifier.emit("chat:task", {**json.loads(message), "session_id": session_id},
+                                    room=f"session:{session_id}")
+            except Exception as e:
+                logger.warning("chat_task_emit_failed", task_id=task_id, error=str(e))
+
+    def stored(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """The published outcome, if the task finished within CHAT_TASK_RESULT_TTL."""
+        if not self.redis_client:
+            return None
+        try:
+            message = self.redis_client.get(_result_key(task_id))
+        except redis.RedisError as e:
+            logger.warning("chat_task_result_lookup_failed", task_id=task_id, error=str(e))
+            return None
+        return json.loads(message) if message else None
+
+    def async_client(self) -> Any:
+        """The shared async client, rebuilt only if the event loop changed (its connections are loop-bound)."""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or (self._async_loop is not None and self._async_loop is not loop):
+            self._async_client = aioredis.from_url(settings.REDIS_URL)
+            self._async_loop = loop
+        return self._async_client
+
+    async def wait_for_result(self, task_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        The task's outcome once published, or None after timeout seconds. Each
+        waiter holds one pooled pub/sub connection for the length of its wait.
+        """
+        if not self.redis_client:
+            return None
+        pubsub = self.async_client().pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(_channel(task_id))
+            # Published between the caller's check and the subscribe
+            existing = self.stored(task_id)
+            if existing is not None:
+                return existing
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while (remaining := deadline - loop.time()) > 0:
+                message = await pubsub.get_message(timeout=remaining)
+                if message and message.get("type") == "message":
+                    return json.loads(message["data"])
+            return None
+        except (redis.RedisError, OSError) as e:
+            logger.warning("chat_task_wait_failed", task_id=task_id, error=str(e))
+            return None
+        finally:
+            try:
+                # Unsubscribes and returns the connection to the pool
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+
+# Global instance
+chat_task_results = ChatTaskResults()
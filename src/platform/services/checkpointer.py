@@ -0,0 +1,346 @@
+"""
+Proxie Orchestrator Checkpointer - LangGraph state persisted per chat session.
+
+The orchestrator graph is checkpointed under thread_id = session_id, so a turn
+only feeds the graph the new user message and resumes from the stored state
+instead of replaying the whole history as the initial state.
+
+RedisCheckpointSaver keeps just the latest checkpoint per thread (the chat
+never time-travels), write-through to Redis with an in-process copy in front:
+
+    orchestrator:ckpt:{thread_id}:{ns}    -> hash: id, parent, checkpoint, metadata
+    orchestrator:writes:{thread_id}:{ns}  -> hash: {checkpoint_id}|{task_id}|{idx} -> write
+
+A read costs one HGET of the checkpoint id when the local copy is current
+(the common case: the same worker served the previous turn), and a full load
+only when another worker advanced the thread. If Redis is unavailable the
+saver degrades to the local copy, and the orchestrator re-seeds the thread
+from session history whenever the stored messages don't match it.
+
+create_checkpointer() picks the backend from ORCHESTRATOR_CHECKPOINTER
+("redis", "memory" or "none"); test environments always get InMemorySaver.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import redis
+import structlog
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src.platform.config import settings
+
+logger = structlog.get_logger(__name__)
+
+
+def _detach(checkpoint: Checkpoint) -> Checkpoint:
+    """
+    Copy a checkpoint so list channels don't alias the running graph's.
+
+    The messages channel appends in place; without this a cached checkpoint
+    would grow along with the next run that resumed from it.
+    """
+    c = checkpoint.copy()
+    c["channel_values"] = {
+        k: list(v) if isinstance(v, list) else v
+        for k, v in checkpoint["channel_values"].items()
+    }
+    return c
+
+
+class RedisCheckpointSaver(BaseCheckpointSaver):
+    """Latest-checkpoint-per-thread saver backed by Redis with a local tier."""
+
+    def __init__(
+        self,
+        redis_client: Any = None,
+        ttl: Optional[int] = None,
+        max_local: int = 1000,
+    ):
+        super().__init__()
+        self.ttl = ttl or settings.ORCHESTRATOR_CHECKPOINT_TTL
+        self.max_local = max_local
+        self._local: "OrderedDict[Tuple[str, str], CheckpointTuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.redis_loads = 0
+
+        if redis_client is not None:
+            self.redis_client = redis_client
+        else:
+            try:
+                self.redis_client = redis.from_url(settings.REDIS_URL, db=settings.REDIS_CACHE_DB)
+            except Exception as e:
+                logger.error("Failed to connect to Redis for checkpointer", error=str(e))
+                self.redis_client = None
+
+    # --- keys ---
+
+    @staticmethod
+    def _ckpt_key(thread_id: str, ns: str) -> str:
+        return f"orchestrator:ckpt:{thread_id}:{ns}"
+
+    @staticmethod
+    def _writes_key(thread_id: str, ns: str) -> str:
+        return f"orchestrator:writes:{thread_id}:{ns}"
+
+    @staticmethod
+    def _thread(config: RunnableConfig) -> Tuple[str, str]:
+        configurable = config["configurable"]
+        return str(configurable["thread_id"]), configurable.get("checkpoint_ns", "")
+
+    # --- local tier ---
+
+    def _local_get(self, key: Tuple[str, str]) -> Optional[CheckpointTuple]:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                self._local.move_to_end(key)
+            return entry
+
+    def _local_set(self, key: Tuple[str, str], entry: CheckpointTuple) -> None:
+        with self._lock:
+            self._local[key] = entry
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_local:
+                self._local.popitem(last=False)
+
+    @staticmethod
+    def _fresh(entry: CheckpointTuple) -> CheckpointTuple:
+        return entry._replace(checkpoint=_detach(entry.checkpoint), pending_writes=list(entry.pending_writes or []))
+
+    # --- serialization ---
+
+    def _dump(self, value: Any) -> Tuple[bytes, bytes]:
+        type_, data = self.serde.dumps_typed(value)
+        return type_.encode(), data
+
+    def _load(self, type_: bytes, data: bytes) -> Any:
+        return self.serde.loads_typed((type_.decode(), data))
+
+    def _load_from_redis(self, thread_id: str, ns: str) -> Optional[CheckpointTuple]:
+        raw = self.redis_client.hgetall(self._ckpt_key(thread_id, ns))
+        if not raw:
+            return None
+        checkpoint_id = raw[b"id"].decode()
+        parent = raw.get(b"parent", b"").decode() or None
+
+        pending: List[Tuple[str, str, Any]] = []
+        prefix = f"{checkpoint_id}|".encode()
+        writes = self.redis_client.hgetall(self._writes_key(thread_id, ns))
+        for field in sorted(f for f in writes if f.startswith(prefix)):
+            task_id, channel, type_, data = self.serde.loads_typed(("msgpack", writes[field]))
+            pending.append((task_id, channel, self._load(type_, data)))
+
+        self.redis_loads += 1
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": checkpoint_id}},
+            checkpoint=self._load(raw[b"checkpoint_type"], raw[b"checkpoint"]),
+            metadata=self._load(raw[b"metadata_type"], raw[b"metadata"]),
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": parent}}
+                if parent else None
+            ),
+            pending_writes=pending,
+        )
+
+    # --- BaseCheckpointSaver ---
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id, ns = self._thread(config)
+        wanted = get_checkpoint_id(config)
+        local = self._local_get((thread_id, ns))
+
+        entry = local
+        if self.redis_client is not None:
+            try:
+                current = self.redis_client.hget(self._ckpt_key(thread_id, ns), "id")
+                if current is None:
+                    entry = None
+                elif local is None or local.config["configurable"]["checkpoint_id"] != current.decode():
+                    entry = self._load_from_redis(thread_id, ns)
+                    if entry is not None:
+                        self._local_set((thread_id, ns), entry)
+                else:
+                    self.local_hits += 1
+            except Exception as e:
+                logger.warning("checkpointer_redis_read_failed", thread_id=thread_id, error=str(e))
+
+        if entry is None:
+            return None
+        # Only the latest checkpoint is kept
+        if wanted and entry.config["configurable"]["checkpoint_id"] != wanted:
+            return None
+        return self._fresh(entry)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        if config is None or limit == 0:
+            return
+        entry = self.get_tuple(config)
+        if entry is None:
+            return
+        if filter and any(entry.metadata.get(k) != v for k, v in filter.items()):
+            return
+        if before and get_checkpoint_id(before) and entry.checkpoint["id"] >= get_checkpoint_id(before):
+            return
+        yield entry
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id, ns = self._thread(config)
+        parent = config["configurable"].get("checkpoint_id")
+        stored_config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": checkpoint["id"]}}
+        metadata = get_checkpoint_metadata(config, metadata)
+        checkpoint = _detach(checkpoint)
+
+        self._local_set((thread_id, ns), CheckpointTuple(
+            config=stored_config,
+            checkpoint=checkpoint,
+            metadata=metadata,
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": ns, "checkpoint_id": parent}}
+                if parent else None
+            ),
+            pending_writes=[],
+        ))
+
+        if self.redis_client is not None:
+            try:
+                checkpoint_type, checkpoint_data = self._dump(checkpoint)
+                metadata_type, metadata_data = self._dump(metadata)
+                ckpt_key = self._ckpt_key(thread_id, ns)
+                writes_key = self._writes_key(thread_id, ns)
+                pipe = self.redis_client.pipeline()
+                pipe.hset(ckpt_key, mapping={
+                    "id": checkpoint["id"],
+                    "parent": parent or "",
+                    "checkpoint_type": checkpoint_type,
+                    "checkpoint": checkpoint_data,
+                    "metadata_type": metadata_type,
+                    "metadata": metadata_data,
+                })
+                # Writes belong to the checkpoint they were made against
+                pipe.delete(writes_key)
+                pipe.expire(ckpt_key, self.ttl)
+                pipe.execute()
+            except Exception as e:
+                logger.warning("checkpointer_redis_write_failed", thread_id=thread_id, error=str(e))
+
+        return stored_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id, ns = self._thread(config)
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        local = self._local_get((thread_id, ns))
+        if local is not None and local.config["configurable"]["checkpoint_id"] == checkpoint_id:
+            local.pending_writes.extend((task_id, channel, value) for channel, value in writes)
+
+        if self.redis_client is None:
+            return
+        try:
+            mapping = {}
+            for idx, (channel, value) in enumerate(writes):
+                type_, data = self._dump(value)
+                field = f"{checkpoint_id}|{task_id}|{WRITES_IDX_MAP.get(channel, idx):06d}"
+                mapping[field] = self.serde.dumps_typed([task_id, channel, type_, data])[1]
+            if mapping:
+                writes_key = self._writes_key(thread_id, ns)
+                pipe = self.redis_client.pipeline()
+                pipe.hset(writes_key, mapping=mapping)
+                pipe.expire(writes_key, self.ttl)
+                pipe.execute()
+        except Exception as e:
+            logger.warning("checkpointer_redis_write_failed", thread_id=thread_id, error=str(e))
+
+    def delete_thread(self, thread_id: str) -> None:
+        thread_id = str(thread_id)
+        with self._lock:
+            for key in [k for k in self._local if k[0] == thread_id]:
+                del self._local[key]
+        if self.redis_client is None:
+            return
+        try:
+            for pattern in (self._ckpt_key(thread_id, "*"), self._writes_key(thread_id, "*")):
+                for key in self.redis_client.scan_iter(match=pattern):
+                    self.redis_client.delete(key)
+        except Exception as e:
+            logger.warning("checkpointer_redis_delete_failed", thread_id=thread_id, error=str(e))
+
+    # Redis calls here are single round trips, same as the rest of the
+    # services' sync Redis usage, so the async API runs them inline.
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        for entry in self.list(config, filter=filter, before=before, limit=limit):
+            yield entry
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        self.delete_thread(thread_id)
+
+
+def create_checkpointer(backend: Optional[str] = None) -> Optional[BaseCheckpointSaver]:
+    """Build the orchestrator checkpointer for the configured backend."""
+    backend = (backend or settings.ORCHESTRATOR_CHECKPOINTER).lower()
+    if backend == "none":
+        return None
+    if backend == "memory" or settings.ENVIRONMENT in ("test", "testing"):
+        return InMemorySaver()
+    return RedisCheckpointSaver()
@@ -1,9 +1,14 @@
 """
 Context Tracker: Accumulates and tracks all known information about the user
 to prevent redundant questions.
+
+ConversationContext is rebuilt from the session dict several times per turn
+(handle_chat, every concierge pass), so it is a plain __slots__ class rather
+than a pydantic model: construction is a handful of attribute sets, the facts
+log is a capped, de-duplicated ring buffer, and the known-summary / missing
+field computations are memoized until a field changes.
 """
-from typing import Dict, Any, Optional, List
-from pydantic import BaseModel, Field
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Tuple
 from enum import Enum
 from datetime import datetime, timezone
 
@@ -14,55 +19,182 @@ class ContextSource(str, Enum):
     MEDIA_ANALYSIS = "media"      # From specialist image/video analysis
 
 
-class KnownFact(BaseModel):
+# Max facts kept per session. Older entries fall off the front.
+FACTS_LOG_MAX = 50
+
+
+class KnownFact:
     """A single piece of known information"""
-    key: str
-    value: Any
-    source: ContextSource
-    confidence: float = 1.0
-    timestamp: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    __slots__ = ("key", "value", "source", "confidence", "timestamp")
 
+    def __init__(
+        self,
+        key: str,
+        value: Any,
+        source: ContextSource,
+        confidence: float = 1.0,
+        timestamp: Optional[str] = None,
+    ):
+        self.key = key
+        self.value = value
+        self.source = ContextSource(source)
+        self.confidence = confidence
+        self.timestamp = timestamp or datetime.now(timezone.utc).isoformat()
 
-class ConversationContext(BaseModel):
-    """Tracks all known information for a conversation session"""
-    
+    def identity(self) -> Tuple[str, str, str]:
+        # Values can be dicts/lists (preferences, location), so compare by repr
+        return (self.key, self.source.value, repr(self.value))
+
+    def dict(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "value": self.value,
+            "source": self.source.value,
+            "confidence": self.confidence,
+            "timestamp": self.timestamp,
+        }
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, KnownFact) and self.identity() == other.identity()
+
+    def __repr__(self) -> str:
+        return f"KnownFact(key={self.key!r}, value={self.value!r}, source={self.source.value!r})"
+
+
+class FactsLog:
+    """
+    Capped, de-duplicated log of KnownFacts.
+
+    Re-learning the same (key, source, value) - e.g. the profile being loaded
+    on every turn - refreshes the existing entry instead of growing the log.
+    """
+    __slots__ = ("_facts", "maxlen")
+
+    def __init__(self, facts: Optional[Iterable[Any]] = None, maxlen: int = FACTS_LOG_MAX):
+        self._facts: Dict[Tuple[str, str, str], KnownFact] = {}
+        self.maxlen = maxlen
+        for fact in facts or ():
+            self.append(fact)
+
+    def append(self, fact: Any) -> None:
+        if isinstance(fact, dict):
+            fact = KnownFact(**fact)
+        ident = fact.identity()
+        # dicts keep insertion order; pop + re-insert moves it to the end
+        self._facts.pop(ident, None)
+        self._facts[ident] = fact
+        while len(self._facts) > self.maxlen:
+            self._facts.pop(next(iter(self._facts)))
+
+    def __iter__(self) -> Iterator[KnownFact]:
+        return iter(self._facts.values())
+
+    def __len__(self) -> int:
+        return len(self._facts)
+
+    def __getitem__(self, index: int) -> KnownFact:
+        return list(self._facts.values())[index]
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [f.dict() for f in self._facts.values()]
+
+
+# field name -> default. Mutable defaults are copied per instance.
+_FIELDS: Dict[str, Any] = {
     # Core user info
-    user_id: Optional[str] = None
-    name: Optional[str] = None
-    email: Optional[str] = None
-    phone: Optional[str] = None
-    default_location: Optional[str] = None
-    
+    "user_id": None,
+    "name": None,
+    "email": None,
+    "phone": None,
+    "default_location": None,
+
     # Service request info
-    service_type: Optional[str] = None
-    location: Optional[str] = None
-    address: Optional[str] = None
-    city: Optional[str] = None
-    budget_min: Optional[float] = None
-    budget_max: Optional[float] = None
-    timing: Optional[str] = None  # asap, this_week, specific_date
-    preferred_date: Optional[str] = None
-    preferred_time: Optional[str] = None
-    
+    "service_type": None,
+    "location": None,
+    "address": None,
+    "city": None,
+    "budget_min": None,
+    "budget_max": None,
+    "timing": None,  # asap, this_week, specific_date
+    "preferred_date": None,
+    "preferred_time": None,
+
     # Preferences (from conversation or media analysis)
-    preferences: Dict[str, Any] = {}
-    
+    "preferences": {},
+
     # Provider-specific (for enrollment)
-    business_name: Optional[str] = None
-    years_experience: Optional[int] = None
-    services_offered: List[str] = []
-    service_radius_km: Optional[int] = None
-    portfolio_photos: List[str] = []
-    bio: Optional[str] = None
-    
-    # Tracking
-    facts_log: List[KnownFact] = []
-    
+    "business_name": None,
+    "years_experience": None,
+    "services_offered": [],
+    "service_radius_km": None,
+    "portfolio_photos": [],
+    "bio": None,
+}
+
+# Light coercion in place of pydantic validation (LLM extraction sometimes
+# returns numbers as strings)
+_NUMERIC: Dict[str, type] = {
+    "budget_min": float,
+    "budget_max": float,
+    "years_experience": int,
+    "service_radius_km": int,
+}
+
+
+def _coerce(name: str, value: Any) -> Any:
+    target = _NUMERIC.get(name)
+    if target is None or value is None or isinstance(value, target):
+        return value
+    try:
+        return target(float(value)) if target is int else target(value)
+    except (TypeError, ValueError):
+        return value
+
+
+class ConversationContext:
+    """Tracks all known information for a conversation session"""
+
+    __slots__ = tuple(_FIELDS) + ("facts_log", "_summary", "_missing")
+
+    def __init__(self, **data: Any):
+        # Session dicts carry plenty of unrelated keys (session_id, media, ...);
+        # like the old pydantic model, anything that isn't a field is ignored.
+        set_ = object.__setattr__
+        for name, default in _FIELDS.items():
+            value = data.get(name, default)
+            if value is default and isinstance(default, (dict, list)):
+                value = type(default)()
+            set_(self, name, _coerce(name, value))
+        set_(self, "facts_log", FactsLog(data.get("facts_log") or ()))
+        set_(self, "_summary", None)
+        set_(self, "_missing", {})
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _FIELDS:
+            value = _coerce(name, value)
+            if self._summary is not None:
+                object.__setattr__(self, "_summary", None)
+                self._missing.clear()
+        object.__setattr__(self, name, value)
+
+    def __repr__(self) -> str:
+        known = ", ".join(f"{k}={v!r}" for k, v in self.get_known_summary().items())
+        return f"ConversationContext({known})"
+
+    def dict(self) -> Dict[str, Any]:
+        """Plain-dict form for the session store."""
+        data = {name: getattr(self, name) for name in _FIELDS}
+        data["facts_log"] = self.facts_log.to_list()
+        return data
+
+    def _record(self, key: str, value: Any, source: ContextSource) -> None:
+        self.facts_log.append(KnownFact(key=key, value=value, source=source))
+
     def update_from_profile(self, profile: dict) -> None:
         """Load known facts from user profile"""
         mappings = {
             'name': 'name',
-            'email': 'email', 
+            'email': 'email',
             'phone': 'phone',
             'default_location': 'default_location',
             'preferences': 'preferences'
@@ -76,40 +208,28 @@ class ConversationContext(BaseModel):
                     setattr(self, 'preferences', merged)
                 else:
                     setattr(self, context_key, profile[profile_key])
-                
-                self.facts_log.append(KnownFact(
-                    key=context_key,
-                    value=profile[profile_key],
-                    source=ContextSource.PROFILE
-                ))
-            
+
+                self._record(context_key, profile[profile_key], ContextSource.PROFILE)
+
             # Sync default_location to requirement field 'location'
             if profile.get('default_location') and not self.location:
                 self.location = profile['default_location']
-    
+
     def update_from_extraction(self, extracted: dict, source: ContextSource) -> None:
         """Update context from AI extraction"""
         for key, value in extracted.items():
-            if value is not None and hasattr(self, key):
+            if value is not None and key in _FIELDS:
                 current = getattr(self, key)
                 # Only update if not already known (or if from more specific source)
                 # For now, let's say 'current' is more specific than 'conversation'
                 if current is None or current == [] or current == {}:
                     setattr(self, key, value)
-                    self.facts_log.append(KnownFact(
-                        key=key,
-                        value=value,
-                        source=source
-                    ))
+                    self._record(key, value, source)
                 elif source == ContextSource.CURRENT_MESSAGE:
                     # Update if it's from the current message (user correction)
                     setattr(self, key, value)
-                    self.facts_log.append(KnownFact(
-                        key=key,
-                        value=value,
-                        source=source
-                    ))
-            
+                    self._record(key, value, source)
+
             # Cross-sync geographical info
             if key == "city" and not self.location:
                 self.location = value
@@ -117,28 +237,38 @@ class ConversationContext(BaseModel):
                 # If location looks like just a city (no numbers), sync it
                 if value and not any(c.isdigit() for c in str(value)):
                     self.city = value
-    
+
     def get_known_summary(self) -> Dict[str, Any]:
         """Return dict of all known (non-None) values"""
-        data = self.dict()
-        # Synthetic field for requirements check: if we have city or address, we have location
-        if (data.get('city') or data.get('address')) and not data.get('location'):
-            data['location'] = data.get('city') or data.get('address')
-            
-        return {k: v for k, v in data.items() 
-                if v is not None and v != [] and v != {} and k != 'facts_log'}
-    
+        if self._summary is None:
+            summary = {}
+            for name in _FIELDS:
+                v = getattr(self, name)
+                if v is not None and v != [] and v != {}:
+                    summary[name] = v
+            # Synthetic field for requirements check: if we have city or address, we have location
+            if (summary.get('city') or summary.get('address')) and not summary.get('location'):
+                summary['location'] = summary.get('city') or summary.get('address')
+            object.__setattr__(self, "_summary", summary)
+        # Shallow copy so callers can't poison the memo
+        return dict(self._summary)
+
+    def _missing_for(self, kind: str, fields: List[str]) -> List[str]:
+        cache_key = (kind, tuple(fields))
+        missing = self._missing.get(cache_key)
+        if missing is None:
+            known = self._summary if self._summary is not None else self.get_known_summary()
+            missing = [field for field in fields if field not in known]
+            self._missing[cache_key] = missing
+        return list(missing)
+
     def get_missing_required(self, intent: str) -> List[str]:
         """Return list of required fields still missing for given intent"""
-        requirements = INTENT_REQUIREMENTS.get(intent, [])
-        known = self.get_known_summary()
-        return [field for field in requirements if field not in known]
-    
+        return self._missing_for("required", INTENT_REQUIREMENTS.get(intent, []))
+
     def get_missing_optional(self, intent: str) -> List[str]:
         """Return list of optional fields that could improve the request"""
-        optional = INTENT_OPTIONAL.get(intent, [])
-        known = self.get_known_summary()
-        return [field for field in optional if field not in known]
+        return self._missing_for("optional", INTENT_OPTIONAL.get(intent, []))
 
 
 # Define what's required vs optional for each intent
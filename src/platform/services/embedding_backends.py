@@ -0,0 +1,187 @@
+"""
+Proxie Embedding Backends - where EmbeddingService gets its vectors from
+
+LLM_EMBEDDING_MODEL picks the backend by prefix:
+
+    local/hashing          -> HashingBackend: signed feature hashing of words,
+                              word bigrams and character trigrams. No model,
+                              no network, deterministic across processes - for
+                              tests, CI and offline matching benchmarks.
+    local/<model name>     -> SentenceTransformerBackend: a sentence-transformers
+                              model (e.g. local/sentence-transformers/all-MiniLM-L6-v2)
+                              run on CPU in a worker thread. Needs the optional
+                              sentence-transformers package.
+    anything else          -> LiteLLMBackend: litellm.aembedding (OpenAI etc.)
+
+Every backend embeds a whole list of texts per call, so the EmbeddingBatcher
+and get_embeddings_batch batch for local models exactly as for the API.
+"""
+
+import asyncio
+import hashlib
+import math
+import re
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+import litellm
+import numpy as np
+import structlog
+
+from src.platform.config import settings
+
+logger = structlog.get_logger(__name__)
+
+LOCAL_PREFIX = "local/"
+HASHING_MODEL = "local/hashing"
+
+# Models that accept a `dimensions` argument (matryoshka-trained)
+DIMENSIONS_SUPPORTED = ("text-embedding-3",)
+
+
+class EmbeddingBackend(ABC):
+    """Embeds a list of texts; returns (embeddings in input order, prompt tokens billed)."""
+
+    # Usage records are written only for backends that cost money
+    provider = "local"
+    billed = False
+
+    def __init__(self, model: str):
+        self.model = model
+
+    @abstractmethod
+    async def embed(self, texts: List[str], dimensions: int) -> Tuple[List[List[float]], int]:
+        """Embed texts at the given width."""
+        pass
+
+
+class LiteLLMBackend(EmbeddingBackend):
+    """Hosted embedding models through litellm."""
+
+    billed = True
+
+    def __init__(self, model: str):
+        super().__init__(model)
+        self.provider = "openai" if "openai" in model else "unknown"
+        # Ensure OpenAI key is set if using OpenAI model
+        if "openai" in model and not settings.OPENAI_API_KEY:
+            logger.warning("OPENAI_API_KEY not set, embeddings may fail if using OpenAI model")
+
+    def _request_kwargs(self, dimensions: int) -> dict:
+        kwargs = {"api_key": settings.OPENAI_API_KEY if "openai" in self.model else None}
+        if any(name in self.model for name in DIMENSIONS_SUPPORTED):
+            kwargs["dimensions"] = dimensions
+        return kwargs
+
+    async def embed(self, texts: List[str], dimensions: int) -> Tuple[List[List[float]], int]:
+        response = await litellm.aembedding(
+            model=self.model,
+            input=texts,
+            **self._request_kwargs(dimensions)
+        )
+        total_tokens = response.usage.prompt_tokens if getattr(response, "usage", None) else 0
+        data = list(response.data)
+        if all("index" in item for item in data):
+            data.sort(key=lambda item: item["index"])
+        return [item["embedding"] for item in data], total_tokens
+
+
+_WORD = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=65536)
+def _feature(token: str, dimensions: int) -> Tuple[int, float]:
+    """Bucket and sign of a feature. blake2b, not hash(): stable across processes."""
+    digest = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+    return digest % dimensions, 1.0 if digest >> 63 else -1.0
+
+
+class HashingBackend(EmbeddingBackend):
+    """
+    Hashing vectorizer. Words carry the meaning, bigrams the word order and
+    character trigrams the near-misses ("braid" / "braids" / "braiding").
+    Counts are log-scaled and the vector L2-normalized, so cosine similarity
+    behaves like TF cosine over the shared features.
+    """
+
+    # Relative weight of each feature kind (prefix of the feature string)
+    weights = {"w": 1.0, "b": 0.5, "c": 0.3}
+
+    @staticmethod
+    def _features(text: str) -> Dict[str, int]:
+        words = _WORD.findall(text.lower())
+        counts: Dict[str, int] = {}
+        for i, word in enumerate(words):
+            features = [f"w:{word}"]
+            if i:
+                features.append(f"b:{words[i - 1]} {word}")
+            padded = f"<{word}>"
+            features.extend(f"c:{padded[j:j + 3]}" for j in range(len(padded) - 2))
+            for feature in features:
+                counts[feature] = counts.get(feature, 0) + 1
+        return counts
+
+    def embed_sync(self, texts: List[str], dimensions: int) -> List[List[float]]:
+        matrix = np.zeros((len(texts), dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in self._features(text).items():
+                bucket, sign = _feature(feature, dimensions)
+                matrix[row, bucket] += sign * self.weights[feature[0]] * (1.0 + math.log(count))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms > 0, norms, 1.0)
+        return matrix.tolist()
+
+    async def embed(self, texts: List[str], dimensions: int) -> Tuple[List[List[float]], int]:
+        # Microseconds per text: not worth a thread hop
+        return self.embed_sync(texts, dimensions), 0
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """A sentence-transformers model on CPU; each batch is encoded in a worker thread."""
+
+    _models: Dict[str, Any] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, model: str):
+        super().__init__(model)
+        self.name = model[len(LOCAL_PREFIX):]
+        self.batch_size = settings.EMBEDDING_LOCAL_BATCH_SIZE
+
+    def _load(self):
+        with self._lock:
+            if self.name not in self._models:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                except ImportError as e:
+                    raise RuntimeError(
+                        f"LLM_EMBEDDING_MODEL={self.model} needs the sentence-transformers package"
+                    ) from e
+                self._models[self.name] = SentenceTransformer(self.name, device="cpu")
+                logger.info("local_embedding_model_loaded", model=self.name)
+            return self._models[self.name]
+
+    def embed_sync(self, texts: List[str], dimensions: int) -> List[List[float]]:
+        model = self._load()
+        vectors = model.encode(
+            texts, batch_size=self.batch_size, normalize_embeddings=True, convert_to_numpy=True
+        )
+        if vectors.shape[1] < dimensions:
+            raise ValueError(
+                f"{self.name} produces {vectors.shape[1]}-dim embeddings; "
+                f"set LLM_EMBEDDING_DIMENSIONS <= {vectors.shape[1]}"
+            )
+        return vectors.tolist()
+
+    async def embed(self, texts: List[str], dimensions: int) -> Tuple[List[List[float]], int]:
+        return await asyncio.to_thread(self.embed_sync, texts, dimensions), 0
+
+
+def get_backend(model: str) -> EmbeddingBackend:
+    """The backend for an LLM_EMBEDDING_MODEL value."""
+    if model == HASHING_MODEL:
+        return HashingBackend(model)
+    if model.startswith(LOCAL_PREFIX):
+        return SentenceTransformerBackend(model)
+    return LiteLLMBackend(model)
@@ -0,0 +1,98 @@
+"""
+Proxie Embedding Batcher - coalesces concurrent single-text embedding calls
+
+Request creation, provider profile updates and preference updates each call
+EmbeddingService.get_embedding with one text, so a burst of them is a burst
+of one-item HTTP calls (each paying the round trip and counting against the
+provider's request rate limit). The batcher parks each call on a future and
+sends everything that arrives within EMBEDDING_BATCH_MAX_WAIT_MS - or as soon
+as EMBEDDING_BATCH_MAX_ITEMS are waiting - as one batched call, then resolves
+each caller's future with its own vector.
+
+Errors are isolated per item: if a batch fails, its texts are retried one
+by one, so a single bad input (e.g. over the model's token limit) fails
+only its own caller.
+
+State is per event loop (futures and timers are loop-bound). The API and
+each Celery worker process run one long-lived loop, so the batcher stays
+warm across requests and tasks; a call from a different loop (a script's
+asyncio.run, the eager-mode fallback thread) starts fresh state there.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+EmbedMany = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+class EmbeddingBatcher:
+    """Collects get_embedding calls into batched embed_many calls."""
+
+    def __init__(self, embed_many: EmbedMany, max_items: int, max_wait_ms: float):
+        self.embed_many = embed_many
+        self.max_items = max(1, max_items)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, text: str) -> List[float]:
+        """Embedding of one text, sent with whatever else arrives in the window."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First call, or the previous loop is gone (and its futures with it)
+            self._loop, self._pending, self._timer = loop, [], None
+        future = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        # Callers cancelled while waiting don't need an embedding
+        batch = [(text, future) for text, future in batch if not future.done()]
+        if not batch:
+            return
+        task = self._loop.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = dict(zip(texts, await self.embed_many(texts)))
+            errors = {}
+        except Exception as e:
+            if len(texts) == 1:
+                results, errors = {}, {texts[0]: e}
+            else:
+                logger.warning("embedding_batch_failed_retrying_items", size=len(texts), error=str(e))
+                outcomes = await asyncio.gather(
+                    *(self.embed_many([text]) for text in texts), return_exceptions=True
+                )
+                results = {t: o[0] for t, o in zip(texts, outcomes) if not isinstance(o, BaseException)}
+                errors = {t: o for t, o in zip(texts, outcomes) if isinstance(o, BaseException)}
+
+        for text, future in batch:
+            if future.done():
+                continue
+            if text in results:
+                future.set_result(results[text])
+            else:
+                future.set_exception(errors.get(text) or RuntimeError("embedding missing from batch response"))
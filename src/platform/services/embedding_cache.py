@@ -0,0 +1,177 @@
+"""
+Proxie Embedding Cache - content-hash cache in front of EmbeddingService
+
+find_providers embeds "{service_type} {description}" on every call and
+MemoryService re-embeds the same preference summary on every preference
+update; both are a network round trip and embedding spend for a vector we
+already computed. Embeddings are a pure function of (model, dimensions,
+text), so the key is a hash of exactly that and entries never go stale.
+
+Two tiers, like the profile and analysis caches:
+
+- In-process LRU
+- Redis (shared across workers and the Celery worker)
+
+Vectors are stored as packed float16 (half the bytes of float32, and well
+below the noise that matters for cosine ranking), prefixed with the prompt
+tokens the embedding cost, which is what a hit saves.
+
+Layout:
+    embedding:{sha256(model, dimensions, text)} -> uint32 tokens + float16[dimensions]
+"""
+
+import hashlib
+import struct
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import redis
+import structlog
+
+from src.platform.config import settings
+from src.platform.metrics import EMBEDDING_CACHE_LOOKUPS_TOTAL, EMBEDDING_CACHE_SAVED_USD_TOTAL
+from src.platform.services.usage import LLMUsageService
+
+logger = structlog.get_logger(__name__)
+
+_HEADER = struct.Struct("<I")
+
+
+def pack_embedding(embedding: Sequence[float], tokens: int = 0) -> bytes:
+    return _HEADER.pack(tokens) + np.asarray(embedding, dtype=np.float16).tobytes()
+
+
+def unpack_embedding(raw: bytes) -> Tuple[List[float], int]:
+    (tokens,) = _HEADER.unpack_from(raw)
+    vector = np.frombuffer(raw, dtype=np.float16, offset=_HEADER.size)
+    return vector.astype(np.float32).tolist(), tokens
+
+
+class EmbeddingCache:
+    """Two-tier (LRU + Redis) cache of embeddings by content hash."""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[int] = None, redis_client: Any = None):
+        self.enabled = settings.EMBEDDING_CACHE_ENABLED
+        self.max_entries = max_entries or settings.EMBEDDING_CACHE_MAX_ENTRIES
+        self.ttl = ttl or settings.EMBEDDING_CACHE_TTL
+
+        self._local: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        self.spend_saved = 0.0
+
+        if redis_client is not None:
+            self.redis_client = redis_client
+        else:
+            try:
+                self.redis_client = redis.from_url(settings.REDIS_URL, db=settings.REDIS_CACHE_DB)
+            except Exception as e:
+                logger.error("Failed to connect to Redis for embedding cache", error=str(e))
+                self.redis_client = None
+
+    @staticmethod
+    def key(model: str, dimensions: int, text: str) -> str:
+        digest = hashlib.sha256(f"{model}\x00{dimensions}\x00{text}".encode()).hexdigest()
+        return f"embedding:{digest}"
+
+    def _local_set(self, key: str, raw: bytes) -> None:
+        with self._lock:
+            self._local[key] = raw
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def get_many(self, model: str, dimensions: int, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Cached embedding per text, None for misses."""
+        if not self.enabled:
+            return [None] * len(texts)
+        keys = [self.key(model, dimensions, text) for text in texts]
+        found: List[Optional[bytes]] = []
+        with self._lock:
+            for key in keys:
+                raw = self._local.get(key)
+                if raw is not None:
+                    self._local.move_to_end(key)
+                found.append(raw)
+
+        missing = [i for i, raw in enumerate(found) if raw is None]
+        if missing and self.redis_client:
+            try:
+                for i, raw in zip(missing, self.redis_client.mget([keys[i] for i in missing])):
+                    if raw:
+                        found[i] = raw
+                        self._local_set(keys[i], raw)
+            except Exception as e:
+                logger.error("Embedding cache read error", error=str(e))
+
+        results: List[Optional[List[float]]] = []
+        tokens = 0
+        for raw in found:
+            if raw is None:
+                results.append(None)
+                continue
+            embedding, entry_tokens = unpack_embedding(raw)
+            results.append(embedding)
+            tokens += entry_tokens
+
+        hits = len(texts) - results.count(None)
+        self._record(model, hits, len(texts) - hits, tokens)
+        return results
+
+    def get(self, model: str, dimensions: int, text: str) -> Optional[List[float]]:
+        return self.get_many(model, dimensions, [text])[0]
+
+    def set_many(self, model: str, dimensions: int, items: Sequence[Tuple[str, Sequence[float], int]]) -> None:
+        """Store (text, embedding, prompt tokens) entries."""
+        if not self.enabled or not items:
+            return
+        entries = [(self.key(model, dimensions, text), pack_embedding(embedding, tokens))
+                   for text, embedding, tokens in items]
+        for key, raw in entries:
+            self._local_set(key, raw)
+        if self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline()
+                for key, raw in entries:
+                    pipe.setex(key, self.ttl, raw)
+                pipe.execute()
+            except Exception as e:
+                logger.error("Embedding cache write error", error=str(e))
+
+    def set(self, model: str, dimensions: int, text: str, embedding: Sequence[float], tokens: int = 0) -> None:
+        self.set_many(model, dimensions, [(text, embedding, tokens)])
+
+    def _record(self, model: str, hits: int, misses: int, tokens: int) -> None:
+        self.hits += hits
+        self.misses += misses
+        if hits:
+            saved = LLMUsageService(db=None).calculate_cost(model, tokens, 0)
+            self.tokens_saved += tokens
+            self.spend_saved += saved
+            EMBEDDING_CACHE_LOOKUPS_TOTAL.labels(result="hit").inc(hits)
+            EMBEDDING_CACHE_SAVED_USD_TOTAL.inc(saved)
+        if misses:
+            EMBEDDING_CACHE_LOOKUPS_TOTAL.labels(result="miss").inc(misses)
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "tokens_saved": self.tokens_saved,
+            "spend_saved_usd": round(self.spend_saved, 6),
+            "local_entries": len(self._local),
+        }
+
+
+# Global instance
+embedding_cache = EmbeddingCache()
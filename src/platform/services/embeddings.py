@@ -2,14 +2,18 @@
 Proxie Embedding Service - AI Vector Generation
 
 Integrated with LiteLLM to provide high-performance embeddings 
-using OpenAI's text-embedding-3-large by default.
+using OpenAI's text-embedding-3-large by default. LLM_EMBEDDING_MODEL=local/...
+selects an in-process CPU backend instead (see embedding_backends.py).
 """
 
-import litellm
 import structlog
 from typing import List, Optional
 from src.platform.config import settings
 from src.platform.database import SessionLocal
+from src.platform.database.vectors import truncate_embedding
+from src.platform.services.embedding_backends import EmbeddingBackend, get_backend
+from src.platform.services.embedding_batcher import EmbeddingBatcher
+from src.platform.services.embedding_cache import embedding_cache
 from src.platform.services.usage import LLMUsageService
 
 logger = structlog.get_logger(__name__)
@@ -17,67 +21,87 @@ logger = structlog.get_logger(__name__)
 class EmbeddingService:
     """Service for generating vector embeddings from text."""
     
-    def __init__(self):
-        self.model = settings.LLM_EMBEDDING_MODEL
-        # Ensure OpenAI key is set if using OpenAI model
-        if "openai" in self.model and not settings.OPENAI_API_KEY:
-            logger.warning("OPENAI_API_KEY not set, embeddings may fail if using OpenAI model")
+    def __init__(self, model: Optional[str] = None, dimensions: Optional[int] = None):
+        self.model = model or settings.LLM_EMBEDDING_MODEL
+        self.dimensions = dimensions or settings.LLM_EMBEDDING_DIMENSIONS
+        self.cache = embedding_cache
+        # Concurrent get_embedding calls share one backend call
+        self.batcher = EmbeddingBatcher(
+            self._embed_many, settings.EMBEDDING_BATCH_MAX_ITEMS, settings.EMBEDDING_BATCH_MAX_WAIT_MS
+        ) if settings.EMBEDDING_BATCH_ENABLED else None
+        self._backend: Optional[EmbeddingBackend] = None
+
+    @property
+    def backend(self) -> EmbeddingBackend:
+        """Backend for the current model (rebuilt if the model is switched)."""
+        if self._backend is None or self._backend.model != self.model:
+            self._backend = get_backend(self.model)
+        return self._backend
+
+    def _fit(self, embedding: List[float]) -> List[float]:
+        """Truncate embeddings from models that ignore `dimensions` to the column width."""
+        if len(embedding) > self.dimensions:
+            return truncate_embedding(embedding, self.dimensions)
+        return embedding
 
     async def get_embedding(self, text: str) -> List[float]:
         """Generate an embedding for a single string."""
         if not text:
             return []
-            
+
+        cached = self.cache.get(self.model, self.dimensions, text)
+        if cached is not None:
+            return cached
+
         try:
-            response = await litellm.aembedding(
-                model=self.model,
-                input=[text],
-                api_key=settings.OPENAI_API_KEY if "openai" in self.model else None
-            )
-            
-            # Record Usage
-            if hasattr(response, 'usage') and response.usage:
-                with SessionLocal() as db:
-                    LLMUsageService(db).record_usage(
-                        provider="openai" if "openai" in self.model else "unknown",
-                        model=self.model,
-                        prompt_tokens=response.usage.prompt_tokens,
-                        completion_tokens=0,
-                        feature="embedding"
-                    )
-                    
-            return response.data[0]["embedding"]
+            if self.batcher is not None:
+                return await self.batcher.submit(text)
+            return (await self._embed_many([text]))[0]
         except Exception as e:
             logger.error("Failed to generate embedding", model=self.model, error=str(e))
             raise e
 
     async def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for a list of strings in one call."""
+        """Generate embeddings for a list of strings in one call (cached texts are skipped)."""
         if not texts:
             return []
-            
+
+        results = self.cache.get_many(self.model, self.dimensions, texts)
+        missing = list(dict.fromkeys(text for text, embedding in zip(texts, results) if embedding is None))
+        if not missing:
+            return results
+
         try:
-            response = await litellm.aembedding(
-                model=self.model,
-                input=texts,
-                api_key=settings.OPENAI_API_KEY if "openai" in self.model else None
-            )
-            
-            # Record Usage
-            if hasattr(response, 'usage') and response.usage:
-                with SessionLocal() as db:
-                    LLMUsageService(db).record_usage(
-                        provider="openai" if "openai" in self.model else "unknown",
-                        model=self.model,
-                        prompt_tokens=response.usage.prompt_tokens,
-                        completion_tokens=0,
-                        feature="embedding_batch"
-                    )
-                    
-            return [item["embedding"] for item in response.data]
+            embedded = dict(zip(missing, await self._embed_many(missing)))
+            return [embedding if embedding is not None else embedded[text] for text, embedding in zip(texts, results)]
         except Exception as e:
             logger.error("Failed to generate batch embeddings", model=self.model, error=str(e))
             raise e
 
+    async def _embed_many(self, texts: List[str]) -> List[List[float]]:
+        """One backend call for the given (uncached) texts; records usage and caches the results."""
+        backend = self.backend
+        embeddings, total_tokens = await backend.embed(texts, self.dimensions)
+
+        # Record Usage
+        if total_tokens and backend.billed:
+            with SessionLocal() as db:
+                LLMUsageService(db).record_usage(
+                    provider=backend.provider,
+                    model=self.model,
+                    prompt_tokens=total_tokens,
+                    completion_tokens=0,
+                    feature="embedding_batch" if len(texts) > 1 else "embedding"
+                )
+
+        embeddings = [self._fit(embedding) for embedding in embeddings]
+        # The API reports tokens per call; attribute them by text length
+        total_chars = sum(len(text) for text in texts) or 1
+        self.cache.set_many(self.model, self.dimensions, [
+            (text, embedding, round(total_tokens * len(text) / total_chars))
+            for text, embedding in zip(texts, embeddings)
+        ])
+        return embeddings
+
 # Global instance
 embedding_service = EmbeddingService()
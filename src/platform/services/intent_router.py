@@ -0,0 +1,268 @@
+"""
+Proxie Intent Router - one compiled matcher over one service taxonomy.
+
+router_node, SpecialistRegistry.find_for_service and the HaircutSpecialist
+detectors used to keep their own keyword lists and loop `term in text` over
+each of them. Besides rescanning the text once per term, substring checks
+misfire ("cut" in "executive", "style" in "lifestyle", "hair" in "chair").
+
+TAXONOMY is the single source: namespace -> label -> terms. It is compiled
+into one word / phrase index (terms plus their plural and verb forms), and
+match_intents(text) returns every (namespace, label, term) hit from a single
+normalization of the text. Results are
+memoized per text, since one turn asks several questions of the same message.
+route_service (router_node, the registry) only needs the best service
+label, so it skips building the match: IntentMatcher.best intersects the
+text's words with that namespace's terms and counts.
+"""
+
+import string
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# --- Taxonomy ---
+
+# Service categories that have (or may get) a specialist. Order breaks ties.
+SERVICE_KEYWORDS: Dict[str, List[str]] = {
+    "haircut": [
+        "hair", "haircut", "cut", "cutting", "trim", "color", "colour", "dye", "fade",
+        "barber", "stylist", "style", "styling", "highlights", "balayage",
+    ],
+    "cleaning": ["clean", "maid", "housekeeping", "tidy", "house", "apartment"],
+    "plumbing": ["plumb", "leak", "leaky", "pipe", "drain", "faucet", "toilet"],
+}
+
+# Haircut styles knowledge base
+HAIRCUT_STYLES = {
+    "bob": ["classic bob", "a-line bob", "inverted bob", "lob (long bob)", "asymmetric bob"],
+    "pixie": ["classic pixie", "long pixie", "undercut pixie", "textured pixie"],
+    "layers": ["long layers", "short layers", "face-framing layers", "choppy layers"],
+    "bangs": ["curtain bangs", "side-swept bangs", "blunt bangs", "wispy bangs", "baby bangs"],
+    "fade": ["low fade", "mid fade", "high fade", "skin fade", "drop fade"],
+    "undercut": ["disconnected undercut", "undercut with design"],
+    "shag": ["modern shag", "70s shag", "wolf cut"],
+    "other": ["trim", "shape up", "taper", "mullet", "buzz cut"],
+}
+
+# Color services
+COLOR_SERVICES = {
+    "highlights": ["foil highlights", "balayage", "babylights", "partial highlights", "full highlights"],
+    "lowlights": ["lowlights"],
+    "full_color": ["single process", "all-over color", "root touch-up"],
+    "creative": ["ombre", "sombre", "color melt", "fantasy color", "vivid color"],
+    "corrective": ["color correction", "toner", "gloss"],
+}
+
+# Treatments
+TREATMENTS = {
+    "keratin": ["keratin treatment", "Brazilian blowout", "smoothing treatment"],
+    "conditioning": ["deep conditioning", "hair mask", "hot oil treatment"],
+    "repair": ["bond repair", "Olaplex treatment", "K18 treatment"],
+    "scalp": ["scalp treatment", "scalp detox"],
+}
+
+# Cues for the primary hair service (HaircutSpecialist._detect_service_type)
+HAIR_SERVICE_CUES = {
+    "color": ["color", "colour", "dye", "highlight", "balayage", "ombre"],
+    "cut": ["cut", "trim", "style"],
+    "treatment": ["keratin", "treatment", "conditioning", "repair"],
+    "styling": ["blowout", "blow dry", "styling"],
+    "haircut": ["cut", "trim", "haircut", "bob", "pixie", "layers", "fade"],
+}
+
+
+def _styles_with_categories() -> Dict[str, List[str]]:
+    # A style category's own name counts as a hit ("a bob"), except "other"
+    return {
+        category: ([] if category == "other" else [category]) + styles
+        for category, styles in HAIRCUT_STYLES.items()
+    }
+
+
+TAXONOMY: Dict[str, Dict[str, List[str]]] = {
+    "service": SERVICE_KEYWORDS,
+    "style": _styles_with_categories(),
+    "color": COLOR_SERVICES,
+    "treatment": TREATMENTS,
+    "hair_service": HAIR_SERVICE_CUES,
+}
+
+# Inflections accepted on a term's last word: cuts, trimmed, cleaning, plumber, ...
+_SUFFIXES = ("s", "es", "d", "ed", "ing", "er", "ers")
+
+# Hyphens, punctuation and whitespace all separate words ("wolf-cut" ==
+# "wolf cut", "lob (long bob)" == "lob long bob"). One bytes.translate both
+# lowercases and blanks separators, so tokenizing stays in C.
+_WORD_TABLE = bytes.maketrans(
+    (string.punctuation + string.ascii_uppercase).encode(),
+    (" " * len(string.punctuation) + string.ascii_lowercase).encode(),
+)
+
+Hit = Tuple[str, str, str]  # (namespace, label, term as written in the taxonomy)
+
+
+class IntentMatch:
+    """Every distinct taxonomy hit in one text, in taxonomy order."""
+
+    __slots__ = ("hits",)
+
+    def __init__(self, hits: Sequence[Hit]):
+        self.hits: Tuple[Hit, ...] = tuple(hits)
+
+    def labels(self, namespace: str) -> List[str]:
+        """Labels hit in a namespace."""
+        return list(dict.fromkeys(label for ns, label, _ in self.hits if ns == namespace))
+
+    def terms(self, namespace: str) -> List[str]:
+        """Distinct taxonomy terms hit in a namespace."""
+        return list(dict.fromkeys(term for ns, _, term in self.hits if ns == namespace))
+
+    def has(self, namespace: str, label: str) -> bool:
+        return any(ns == namespace and lbl == label for ns, lbl, _ in self.hits)
+
+    def best(self, namespace: str) -> Optional[str]:
+        """Label with the most distinct terms hit; ties go to taxonomy order."""
+        counts: Dict[str, int] = {}
+        for ns, label, _ in self.hits:
+            if ns == namespace:
+                counts[label] = counts.get(label, 0) + 1
+        # Hits are in taxonomy order, and max keeps the first of equal counts
+        return max(counts, key=counts.get) if counts else None
+
+    def __bool__(self) -> bool:
+        return bool(self.hits)
+
+    def __repr__(self) -> str:
+        return f"IntentMatch({list(self.hits)!r})"
+
+
+def _words(text: str) -> List[bytes]:
+    return text.encode("utf-8", "ignore").translate(_WORD_TABLE).split()
+
+
+def normalize_text(text: str) -> str:
+    """The matcher's view of a text: lowercased words joined by single spaces."""
+    return b" ".join(_words(text)).decode("utf-8", "ignore")
+
+
+class IntentMatcher:
+    """
+    Taxonomy compiled into word and phrase indexes.
+
+    Every term and its inflected forms is keyed by its space-joined words.
+    Matching normalizes the text once (lowercase, separators to spaces, split
+    into words); single-word terms are then one set intersection with the
+    text's words, and a multi-word term is only tested - as one substring
+    check on the normalized text - when its last word is present. The work
+    runs in C and grows with the text, not with the size of the taxonomy.
+    """
+
+    def __init__(self, taxonomy: Dict[str, Dict[str, Iterable[str]]]):
+        # b"words" -> [(namespace, label, term)]; one term can carry several
+        # labels ("cut" is both a service and a hair_service cue)
+        index: Dict[bytes, List[Hit]] = {}
+        for namespace, labels in taxonomy.items():
+            for label, label_terms in labels.items():
+                for term in label_terms:
+                    index.setdefault(b" ".join(_words(term)), []).append((namespace, label, term))
+        self._hits = {key: tuple(dict.fromkeys(hits)) for key, hits in index.items()}
+        # Matches are reported in taxonomy order, whatever the text order
+        self._rank = {key: rank for rank, key in enumerate(index)}
+
+        # Every spelling (the term and its inflections) -> the term's key
+        spellings: Dict[bytes, bytes] = {}
+        for key in index:
+            spellings[key] = key
+        for key in index:
+            for suffix in _SUFFIXES:
+                spellings.setdefault(key + suffix.encode(), key)
+
+        self._single: Dict[bytes, bytes] = {}
+        # last word -> [(b" phrase words ", key)]
+        self._phrases: Dict[bytes, List[Tuple[bytes, bytes]]] = {}
+        for spelling, key in spellings.items():
+            if b" " in spelling:
+                self._phrases.setdefault(spelling.rsplit(b" ", 1)[1], []).append((b" " + spelling + b" ", key))
+            else:
+                self._single[spelling] = key
+        self._single_words = frozenset(self._single)
+        self._phrase_ends = frozenset(self._phrases)
+
+        # Per namespace, for best(): the same spelling tables restricted to
+        # the namespace's terms, and key -> its labels there
+        self._namespaces: Dict[str, Tuple[Dict[bytes, bytes], frozenset, Dict[bytes, Tuple[str, ...]]]] = {}
+        for namespace in taxonomy:
+            labels_of = {
+                key: tuple(dict.fromkeys(label for ns, label, _ in hits if ns == namespace))
+                for key, hits in self._hits.items()
+            }
+            labels_of = {key: labels for key, labels in labels_of.items() if labels}
+            single = {spelling: key for spelling, key in self._single.items() if key in labels_of}
+            phrase_ends = frozenset(
+                last for last, phrases in self._phrases.items() if any(key in labels_of for _, key in phrases)
+            )
+            labels_by_spelling = {spelling: labels_of[key] for spelling, key in single.items()}
+            self._namespaces[namespace] = (single, labels_by_spelling, frozenset(single), phrase_ends, labels_of)
+
+    def match(self, text: str) -> IntentMatch:
+        words = _words(text) if text else []
+        if not words:
+            return IntentMatch(())
+        single = self._single
+        keys = {single[word] for word in self._single_words.intersection(words)}
+        phrase_ends = self._phrase_ends.intersection(words)
+        if phrase_ends:
+            padded = b" " + b" ".join(words) + b" "
+            for last in phrase_ends:
+                keys.update(key for phrase, key in self._phrases[last] if phrase in padded)
+        hits = self._hits
+        return IntentMatch([hit for key in sorted(keys, key=self._rank.__getitem__) for hit in hits[key]])
+
+    def best(self, namespace: str, text: str) -> Optional[str]:
+        """
+        match(text).best(namespace) without building the match: only the
+        namespace's spellings are looked up and nothing but label counts is
+        kept. The router and the specialist registry ask just this question.
+        """
+        if not text:
+            return None
+        words = _words(text)
+        single, labels_by_spelling, single_words, phrase_ends, labels_of = self._namespaces[namespace]
+        found = single_words.intersection(words)
+        ends = phrase_ends.intersection(words) if phrase_ends else None
+        if not ends:
+            if not found:
+                return None
+            label_sets = {labels_by_spelling[word] for word in found}
+            if len(label_sets) == 1:
+                # The common case: every term hit points the same way. Equal
+                # counts, so the first of its labels in taxonomy order
+                (labels,) = label_sets
+                return labels[0]
+        keys = {single[word] for word in found}
+        if ends:
+            padded = b" " + b" ".join(words) + b" "
+            for last in ends:
+                keys.update(key for phrase, key in self._phrases[last] if key in labels_of and phrase in padded)
+        if not keys:
+            return None
+        # Most distinct terms; ties go to the label hit earliest in taxonomy order
+        counts: Dict[str, int] = {}
+        for key in sorted(keys, key=self._rank.__getitem__):
+            for label in labels_of[key]:
+                counts[label] = counts.get(label, 0) + 1
+        return max(counts, key=counts.get)
+
+
+intent_matcher = IntentMatcher(TAXONOMY)
+
+
+@lru_cache(maxsize=1024)
+def match_intents(text: str) -> IntentMatch:
+    """Memoized intent_matcher.match (callers ask several questions per text)."""
+    return intent_matcher.match(text)
+
+
+def route_service(text: str) -> Optional[str]:
+    """Service category for a message, or None (same answer as match_intents(text).best("service"))."""
+    return intent_matcher.best("service", text)
@@ -13,6 +13,7 @@ import structlog
 from typing import List, Dict, Any, Optional
 from src.platform.config import settings
 from src.platform.metrics import track_llm_usage, LLM_LATENCY_SECONDS
+from src.platform.services import turn_timing
 from src.platform.services.usage import LLMUsageService
 from src.platform.database import SessionLocal
 import time
@@ -130,6 +131,7 @@ class LLMGateway:
     ) -> Any:
         """Execute a chat completion with caching and fallback."""
         target_model = model or self.primary_model
+        turn_timing.count_llm_call()
         
         # 0. Budget Check
         with SessionLocal() as db:
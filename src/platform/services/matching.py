@@ -1,19 +1,45 @@
 import structlog
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, cast, String, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, and_, cast, String, func, select
 from src.platform.models.provider import Provider
 from src.platform.models.service import Service
 from src.platform.schemas.request import ServiceRequestCreate
 from src.platform.services.embeddings import embedding_service
+from src.platform.services.provider_index import provider_index
+from src.platform.services.provider_embeddings import index_text, index_text_hash
+from src.platform.database import run_in_session
+from src.platform.database.geo import city_key, geohash_prefixes, within_radius
+from src.platform.database.search import search_query
 
 from src.platform.config import settings
 
 logger = structlog.get_logger(__name__)
 
+# Candidates taken from each ranking before fusion, and the RRF constant
+# (60 is the value from the original paper; it damps the top ranks' lead)
+RANKING_DEPTH = 50
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(rankings: List[List[UUID]], k: int = RRF_K) -> List[UUID]:
+    """Merge rankings by sum of 1 / (k + rank); ties keep first-seen order."""
+    scores = {}
+    for ranking in rankings:
+        for rank, provider_id in enumerate(ranking, start=1):
+            scores[provider_id] = scores.get(provider_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=lambda provider_id: -scores[provider_id])
+
 class MatchingService:
-    def __init__(self, db: Session):
+    """
+    Provider matching. Works with either a sync Session or an AsyncSession -
+    the query-building code is shared and run through run_in_session, so the
+    async callers never block the event loop on the DB round-trip.
+    """
+
+    def __init__(self, db: Union[Session, AsyncSession]):
         self.db = db
 
     async def find_providers(self, request_data: ServiceRequestCreate, use_semantic: bool = True) -> List[UUID]:
@@ -22,74 +48,219 @@ class MatchingService:
         
         Logic:
         1. Hard filters: Service Category & Location (City)
-        2. Soft matching: Service Type & Requirements (Semantic Similarity)
+        2. Soft matching: Service Type & Requirements - vector similarity and
+           full-text rank, merged by reciprocal-rank fusion
         """
-        
-        # 1. Base Query with Hard Filters
-        query = self.db.query(Provider).filter(Provider.status == "active")
-        
-
         if settings.ENVIRONMENT not in ["production", "staging"]:
             # In dev/test, be lenient. Return all active providers regardless of match.
             # Order by created_at DESC so that newly created providers (like in tests) are seen first.
             logger.info("matching_filters_bypassed_for_dev")
-            providers = query.order_by(Provider.created_at.desc()).limit(20).all()
-            return [p.id for p in providers]
-
-        # Filter by City (Hard)
-        query = query.filter(
-            Provider.location.op("->>")("city") == request_data.location.city
-        )
-        
-        # Filter by Category (Hard)
-        # Assuming providers are linked to services of a specific category
-        query = query.join(Service).filter(
-            Service.category.ilike(f"%{request_data.service_category}%")
-        )
+            return await run_in_session(self.db, self._query_all_active)
 
-        # 2. Semantic Ranking
+        # Embed before touching the DB so the session isn't held across the API call
+        request_embedding = None
+        keyword_only = not use_semantic
         if use_semantic:
             try:
-                # Combine service type and requirements for a rich search query
-                search_text = f"{request_data.service_type} {request_data.requirements.description or ''}"
+                search_text = self._search_text(request_data)
                 request_embedding = await embedding_service.get_embedding(search_text)
-                
                 if request_embedding:
-                    # Use cosine distance for similarity ranking
-                    # Providers with NULL embeddings will be excluded or ranked last depending on DB
-                    query = query.filter(Provider.embedding != None)
-                    query = query.order_by(Provider.embedding.cosine_distance(request_embedding))
-                    
                     logger.info("semantic_matching_applied", search_text=search_text)
             except Exception as e:
                 logger.error("semantic_matching_failed", error=str(e))
                 # Fallback to keyword matching if semantic fails
-                query = query.filter(Service.name.ilike(f"%{request_data.service_type}%"))
-        else:
-            # Traditional keyword fallback
-            query = query.filter(Service.name.ilike(f"%{request_data.service_type}%"))
-        
-        # Execute and limit results
-        providers = query.distinct(Provider.id).limit(20).all()
-        
+                keyword_only = True
+
+        if provider_index.enabled:
+            provider_index.start_refresher()
+        if request_embedding and not keyword_only and provider_index.enabled and provider_index.ready:
+            try:
+                provider_ids = await run_in_session(self.db, self._query_index, request_data, request_embedding)
+                if provider_ids:
+                    return provider_ids
+            except Exception as e:
+                logger.error("provider_index_search_failed", error=str(e))
+
+        return await run_in_session(
+            self.db, self._query_matching, request_data, request_embedding, keyword_only
+        )
+
+    @staticmethod
+    def _query_all_active(db: Session) -> List[UUID]:
+        providers = db.query(Provider).filter(
+            Provider.status == "active"
+        ).order_by(Provider.created_at.desc()).limit(20).all()
+        return [p.id for p in providers]
+
+    @staticmethod
+    def _query_index(
+        db: Session,
+        request_data: ServiceRequestCreate,
+        request_embedding: List[float],
+    ) -> List[UUID]:
+        # Same hard filters as _query_matching, applied as bitsets in the index
+        # (kept in sync by its refresher thread, not here)
+        nearby = MatchingService._geo_candidates(db, request_data)
+        if nearby is not None and not nearby:
+            return []
+        hits = provider_index.search(
+            request_embedding,
+            city=request_data.location.city if nearby is None else None,
+            category=request_data.service_category,
+            k=RANKING_DEPTH,
+            provider_ids=nearby,
+        )
+        lexical = MatchingService._lexical_ranking(db, request_data, nearby)
+        if not hits and not lexical:
+            return []
+        ranked = reciprocal_rank_fusion([[UUID(provider_id) for provider_id, _ in hits], lexical])
+
+        # The index lags the DB by up to PROVIDER_INDEX_SYNC_SECONDS: drop
+        # providers deactivated or deleted since, keeping the fused ranking
+        active = {
+            row[0] for row in db.query(Provider.id).filter(
+                Provider.id.in_(ranked), Provider.status == "active"
+            ).all()
+        }
+        return [provider_id for provider_id in ranked if provider_id in active][:20]
+
+    @staticmethod
+    def _query_matching(
+        db: Session,
+        request_data: ServiceRequestCreate,
+        request_embedding: Optional[List[float]],
+        keyword_only: bool,
+    ) -> List[UUID]:
+        nearby = MatchingService._geo_candidates(db, request_data)
+        conditions = MatchingService._hard_filters(request_data, nearby)
+
+        if keyword_only:
+            # Full-text ranking only
+            return MatchingService._lexical_ranking(db, request_data, nearby)[:20]
+
+        if request_embedding:
+            # Hybrid: cosine-distance ranking fused with the full-text ranking
+            vector = db.query(Provider.id).filter(
+                *conditions, Provider.embedding != None
+            ).order_by(Provider.embedding.cosine_distance(request_embedding)).limit(RANKING_DEPTH).all()
+            lexical = MatchingService._lexical_ranking(db, request_data, nearby)
+            return reciprocal_rank_fusion([[row.id for row in vector], lexical])[:20]
+
+        providers = db.query(Provider.id).filter(*conditions).limit(20).all()
         return [p.id for p in providers]
 
+    @staticmethod
+    def _hard_filters(request_data: ServiceRequestCreate, nearby: Optional[List[UUID]]) -> list:
+        """Status, location and category conditions every ranking shares."""
+        conditions = [Provider.status == "active"]
+
+        # Filter by Location (Hard): radius when the request has coordinates,
+        # else the normalized city
+        if nearby is None:
+            conditions.append(Provider.city_key == city_key(request_data.location.city))
+        else:
+            conditions.append(Provider.id.in_(nearby))
+
+        # Filter by Category (Hard): any of the provider's services
+        conditions.append(Provider.id.in_(
+            select(Service.provider_id).where(Service.category.ilike(f"%{request_data.service_category}%"))
+        ))
+        return conditions
+
+    @staticmethod
+    def _lexical_ranking(
+        db: Session, request_data: ServiceRequestCreate, nearby: Optional[List[UUID]]
+    ) -> List[UUID]:
+        """Hard-filtered providers matching the request text, by ts_rank_cd (GIN-indexed @@)."""
+        query = search_query(MatchingService._search_text(request_data))
+        if query is None:
+            return []
+        rows = db.query(Provider.id).filter(
+            *MatchingService._hard_filters(request_data, nearby),
+            Provider.search_vector.op("@@")(query),
+        ).order_by(
+            func.ts_rank_cd(Provider.search_vector, query).desc(), Provider.id
+        ).limit(RANKING_DEPTH).all()
+        return [row.id for row in rows]
+
+    @staticmethod
+    def _search_text(request_data: ServiceRequestCreate) -> str:
+        # Combine service type and requirements for a rich search query
+        return f"{request_data.service_type} {request_data.requirements.description or ''}"
+
+    @staticmethod
+    def _geo_candidates(db: Session, request_data: ServiceRequestCreate) -> Optional[List[UUID]]:
+        """
+        Active providers within the request's radius, closest first, or None
+        when the request has no coordinates.
+
+        The radius is max_distance_km (MATCHING_DEFAULT_RADIUS_KM if unset),
+        narrowed per provider to its own service_radius_km. Candidates come
+        from geohash prefix scans and are refined by exact haversine distance;
+        providers without coordinates are kept when they are in the same city.
+        """
+        location = request_data.location
+        if location.lat is None or location.lng is None:
+            return None
+        radius = location.max_distance_km or settings.MATCHING_DEFAULT_RADIUS_KM
+        prefixes = geohash_prefixes(location.lat, location.lng, radius)
+        rows = db.query(
+            Provider.id, Provider.lat, Provider.lng, Provider.service_radius_km
+        ).filter(
+            Provider.status == "active",
+            or_(
+                *[Provider.geohash.like(f"{prefix}%") for prefix in prefixes],
+                and_(Provider.lat.is_(None), Provider.city_key == city_key(location.city)),
+            ),
+        ).all()
+        return within_radius(rows, location.lat, location.lng, radius)
+
     async def update_provider_embedding(self, provider_id: UUID):
-        """Update a single provider's embedding based on their profile and services."""
-        provider = self.db.query(Provider).get(provider_id)
-        if not provider:
+        """Update a single provider's embedding based on their profile and services.
+
+        Skipped when the index text (and embedding model) is unchanged since the
+        stored embedding was built. Bulk and post-update re-embedding go through
+        services/provider_embeddings.py instead.
+        """
+        loaded = await run_in_session(self.db, self._build_index_text, provider_id)
+        if loaded is None:
+            return
+        index_text, stored_hash = loaded
+        text_hash = index_text_hash(index_text, embedding_service.model, embedding_service.dimensions)
+        if stored_hash == text_hash:
+            logger.debug("provider_embedding_unchanged", provider_id=str(provider_id))
             return
-            
-        services = self.db.query(Service).filter(Service.provider_id == provider_id).all()
-        service_names = ", ".join([s.name for s in services])
-        
-        # Build index text: Bio + Business Name + Services + Specializations
-        index_text = f"{provider.business_name or ''} {provider.bio or ''} {service_names} {' '.join(provider.specializations or [])}"
         
         try:
             embedding = await embedding_service.get_embedding(index_text)
-            provider.embedding = embedding
-            self.db.commit()
+            city, categories = await run_in_session(
+                self.db, self._store_embedding, provider_id, embedding, text_hash
+            )
+            provider_index.upsert(provider_id, embedding, city, categories)
             logger.info("provider_embedding_updated", provider_id=str(provider_id))
         except Exception as e:
             logger.error("provider_embedding_update_failed", provider_id=str(provider_id), error=str(e))
+
+    @staticmethod
+    def _build_index_text(db: Session, provider_id: UUID) -> Optional[Tuple[str, Optional[str]]]:
+        """(index text, hash of the text the stored embedding was built from)."""
+        provider = db.query(Provider).get(provider_id)
+        if not provider:
+            return None
+            
+        services = db.query(Service).filter(Service.provider_id == provider_id).all()
+        stored_hash = provider.embedding_text_hash if provider.embedding is not None else None
+        return index_text(provider, services), stored_hash
+
+    @staticmethod
+    def _store_embedding(db: Session, provider_id: UUID, embedding: List[float], text_hash: Optional[str] = None):
+        """Store the embedding; returns the (city, categories) the index filters on."""
+        provider = db.query(Provider).get(provider_id)
+        provider.embedding = embedding
+        provider.embedding_text_hash = text_hash
+        db.commit()
+        categories = [
+            row[0] for row in db.query(Service.category).filter(Service.provider_id == provider_id).all()
+        ]
+        location = provider.location if isinstance(provider.location, dict) else {}
+        return location.get("city"), categories
@@ -5,11 +5,12 @@ Handles persistent context memory for consumer and provider agents.
 """
 
 import structlog
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from uuid import UUID
 from datetime import datetime
 
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 from sqlalchemy.dialects.postgresql import insert
 
@@ -18,37 +19,44 @@ from src.platform.models.booking import Booking
 from src.platform.models.request import ServiceRequest
 from src.platform.models.offer import Offer
 from src.platform.services.embeddings import embedding_service
-from src.platform.database import SessionLocal
+from src.platform.database import SessionLocal, run_in_session
 
 logger = structlog.get_logger(__name__)
 
 class MemoryService:
-    """Service for managing agent memory and context."""
+    """
+    Service for managing agent memory and context.
+
+    Accepts a sync Session or an AsyncSession; DB work goes through
+    run_in_session so async callers don't block the event loop.
+    """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Union[Session, AsyncSession]):
         self.db = db
         
     async def get_consumer_context(self, consumer_id: UUID) -> Dict[str, Any]:
         """Retrieve full context for a Personal Consumer Agent."""
-        
+        return await run_in_session(self.db, self._load_consumer_context, consumer_id)
+
+    def _load_consumer_context(self, db: Session, consumer_id: UUID) -> Dict[str, Any]:
         # 1. Get persistent memory
         stmt = select(ConsumerMemory).where(ConsumerMemory.consumer_id == consumer_id)
-        result = self.db.execute(stmt)
+        result = db.execute(stmt)
         memory = result.scalar_one_or_none()
         
         if not memory:
             # Initialize empty memory if none exists
             memory = ConsumerMemory(consumer_id=consumer_id)
-            self.db.add(memory)
-            self.db.commit()
-            self.db.refresh(memory)
+            db.add(memory)
+            db.commit()
+            db.refresh(memory)
             
         # 2. Get recent activity
-        bookings = self.db.query(Booking).filter(
+        bookings = db.query(Booking).filter(
             Booking.consumer_id == consumer_id
         ).order_by(Booking.created_at.desc()).limit(5).all()
         
-        requests = self.db.query(ServiceRequest).filter(
+        requests = db.query(ServiceRequest).filter(
             ServiceRequest.consumer_id == consumer_id
         ).order_by(ServiceRequest.created_at.desc()).limit(5).all()
         
@@ -62,7 +70,18 @@ class MemoryService:
         
     async def update_consumer_memory(self, consumer_id: UUID, interaction_data: Dict[str, Any]):
         """Update consumer memory based on an interaction."""
+        memory, interaction = await run_in_session(
+            self.db, self._record_interaction, consumer_id, interaction_data
+        )
         
+        # Embedding call happens outside the DB greenlet; only attributes
+        # are touched on the (already loaded) memory row here.
+        if interaction.tools_used:
+            await self._infer_preferences(memory, interaction)
+            
+        await run_in_session(self.db, lambda db: db.commit())
+
+    def _record_interaction(self, db: Session, consumer_id: UUID, interaction_data: Dict[str, Any]):
         # Log interaction first
         interaction = AgentInteraction(
             session_id=interaction_data.get("session_id"),
@@ -74,24 +93,21 @@ class MemoryService:
             tools_used=interaction_data.get("tools", []),
             outcome=interaction_data.get("outcome")
         )
-        self.db.add(interaction)
+        db.add(interaction)
         
         # Get memory
         stmt = select(ConsumerMemory).where(ConsumerMemory.consumer_id == consumer_id)
-        memory = self.db.execute(stmt).scalar_one_or_none()
+        memory = db.execute(stmt).scalar_one_or_none()
         
         if not memory:
             memory = ConsumerMemory(consumer_id=consumer_id)
-            self.db.add(memory)
+            db.add(memory)
             
         # Update observable stats
         if interaction.outcome == "booking_confirmed":
             memory.total_bookings += 1
-        
-        if interaction.tools_used:
-            await self._infer_preferences(memory, interaction)
-            
-        self.db.commit()
+
+        return memory, interaction
         
     async def _infer_preferences(self, memory: ConsumerMemory, interaction: AgentInteraction):
         """Analyze interaction to update learned preferences."""
@@ -172,16 +188,19 @@ class MemoryService:
 
     async def get_provider_context(self, provider_id: UUID) -> Dict[str, Any]:
         """Retrieve full context for a Personal Provider Agent."""
+        return await run_in_session(self.db, self._load_provider_context, provider_id)
+
+    def _load_provider_context(self, db: Session, provider_id: UUID) -> Dict[str, Any]:
         stmt = select(ProviderMemory).where(ProviderMemory.provider_id == provider_id)
-        memory = self.db.execute(stmt).scalar_one_or_none()
+        memory = db.execute(stmt).scalar_one_or_none()
         
         if not memory:
             memory = ProviderMemory(provider_id=provider_id)
-            self.db.add(memory)
-            self.db.commit()
+            db.add(memory)
+            db.commit()
             
         # Get recent offers
-        offers = self.db.query(Offer).filter(
+        offers = db.query(Offer).filter(
             Offer.provider_id == provider_id
         ).order_by(Offer.created_at.desc()).limit(10).all()
         
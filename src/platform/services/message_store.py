@@ -0,0 +1,166 @@
+"""
+Proxie Message Store - one canonical, incrementally converted chat history.
+
+The session persists history as LiteLLM-style dicts; the orchestrator graph
+works on LangChain messages; concierge_node needs LiteLLM dicts again for the
+gateway. Converting the whole history three times per turn is O(history) work
+that grows with every message, so:
+
+- to_llm_dict(msg) converts a LangChain message once and caches the dict
+  against the message object (freed when the message is garbage collected).
+- from_llm_dict(d) builds the LangChain message and pre-seeds that cache, so
+  the round trip back is free.
+- MessageStore keeps each active session's LangChain list between turns and
+  only converts messages appended since the last turn.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import structlog
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+
+logger = structlog.get_logger(__name__)
+
+# id(message) -> LiteLLM dict. LangChain messages are unhashable, so this is
+# keyed by identity with a finalizer instead of a WeakKeyDictionary.
+_llm_dicts: Dict[int, Dict[str, Any]] = {}
+
+
+def _remember(msg: BaseMessage, d: Dict[str, Any]) -> None:
+    key = id(msg)
+    if key not in _llm_dicts:
+        weakref.finalize(msg, _llm_dicts.pop, key, None)
+    _llm_dicts[key] = d
+
+
+def _convert_lc(m: BaseMessage) -> Optional[Dict[str, Any]]:
+    if isinstance(m, HumanMessage):
+        return {"role": "user", "content": m.content}
+    if isinstance(m, AIMessage):
+        d = {"role": "assistant", "content": m.content}
+        if "tool_calls" in m.additional_kwargs:
+            d["tool_calls"] = m.additional_kwargs["tool_calls"]
+        return d
+    if isinstance(m, ToolMessage):
+        return {"role": "tool", "tool_call_id": m.tool_call_id, "name": m.name, "content": m.content}
+    if isinstance(m, SystemMessage):
+        return {"role": "system", "content": m.content}
+    return None
+
+
+def to_llm_dict(m: BaseMessage) -> Optional[Dict[str, Any]]:
+    """LangChain message -> LiteLLM/session dict, converted once per message."""
+    d = _llm_dicts.get(id(m))
+    if d is None:
+        d = _convert_lc(m)
+        if d is not None:
+            _remember(m, d)
+    return d
+
+
+def from_llm_dict(d: Dict[str, Any]) -> Optional[BaseMessage]:
+    """Session dict -> LangChain message (and seed the reverse cache)."""
+    role = d.get("role")
+    content = d.get("content")
+    if role == "user":
+        m = HumanMessage(content=content)
+    elif role == "assistant":
+        kwargs = {}
+        if "tool_calls" in d:
+            kwargs["tool_calls"] = d["tool_calls"]
+        m = AIMessage(content=content or "", additional_kwargs=kwargs)
+    elif role == "tool":
+        m = ToolMessage(tool_call_id=d.get("tool_call_id"), name=d.get("name"), content=str(content))
+    elif role == "system":
+        m = SystemMessage(content=content)
+    else:
+        return None
+    # Tool content is stringified on the way in; cache what the message holds
+    _remember(m, d if role != "tool" or isinstance(content, str) else _convert_lc(m))
+    return m
+
+
+def llm_view(messages: Sequence[BaseMessage], skip_system: bool = True) -> List[Dict[str, Any]]:
+    """LiteLLM dicts for a LangChain history - cache lookups, no re-conversion."""
+    view = []
+    for m in messages:
+        if skip_system and isinstance(m, SystemMessage):
+            continue
+        d = to_llm_dict(m)
+        if d is not None:
+            view.append(d)
+    return view
+
+
+class MessageStore:
+    """
+    Per-process LRU of session histories in LangChain form.
+
+    sync() is called with the session's dict history at the start of a turn;
+    if the cached list is a prefix of it only the tail is converted. A session
+    served by another worker (or edited out of band) fails the prefix check and
+    is rebuilt, so the cache is never authoritative - session["messages"] is.
+    """
+
+    def __init__(self, max_sessions: int = 1000):
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, List[BaseMessage]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.converted = 0
+        self.reused = 0
+
+    def _is_prefix(self, lc: List[BaseMessage], dicts: Sequence[Dict[str, Any]]) -> bool:
+        if len(lc) > len(dicts):
+            return False
+        if not lc:
+            return True
+        # History is append-only; checking the boundary message is enough
+        return to_llm_dict(lc[-1]) == dicts[len(lc) - 1]
+
+    def sync(self, session_id: Optional[str], dicts: Sequence[Dict[str, Any]]) -> List[BaseMessage]:
+        """Return the LangChain history for these session dicts."""
+        with self._lock:
+            cached = self._sessions.get(session_id) if session_id else None
+            if cached is not None and self._is_prefix(cached, dicts):
+                self._sessions.move_to_end(session_id)
+                start = len(cached)
+                lc = list(cached)
+            else:
+                start = 0
+                lc = []
+
+        for d in dicts[start:]:
+            m = from_llm_dict(d)
+            if m is not None:
+                lc.append(m)
+        self.reused += start
+        self.converted += len(dicts) - start
+
+        self._store(session_id, lc)
+        return list(lc)
+
+    def record(self, session_id: Optional[str], lc_messages: Sequence[BaseMessage]) -> List[Dict[str, Any]]:
+        """Store the post-turn history and return it as session dicts."""
+        lc = list(lc_messages)
+        self._store(session_id, lc)
+        return [d for d in (to_llm_dict(m) for m in lc) if d is not None]
+
+    def _store(self, session_id: Optional[str], lc: List[BaseMessage]) -> None:
+        if not session_id:
+            return
+        with self._lock:
+            self._sessions[session_id] = lc
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def drop(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+
+# Global instance
+message_store = MessageStore()
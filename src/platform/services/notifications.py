@@ -0,0 +1,247 @@
+"""
+Proxie Notifications - real-time events to users over Socket.IO
+
+Every authenticated socket joins the room user:{id}, where id is the Clerk
+user id it authenticated as. notify() pushes an event there:
+
+    lead:new            -> each provider a new request was matched to
+    request:matched     -> the consumer, when matching finishes
+    offer:new           -> the consumer, when a provider makes an offer
+    booking:confirmed   -> consumer and provider, when an offer is accepted
+
+Each event is also appended to a short per-user log and carries its log id
+as "cursor". A client that reconnects sends the last cursor it saw with a
+catch_up message and gets everything it missed, so it never has to poll.
+
+Layout:
+    notifications:{user_id}   -> Redis stream of {"data": JSON {event, payload}},
+                                 capped at NOTIFICATION_LOG_MAX_EVENTS, expiring
+                                 NOTIFICATION_LOG_TTL_SECONDS after the last event
+
+Without Redis the log is kept in-process (same cursor format), which only
+covers clients reconnecting to the same process.
+
+Emits reach clients on other API replicas through the Socket.IO Redis
+manager (SOCKETIO_MESSAGE_QUEUE); Celery workers publish through a
+write-only manager set with use_emitter().
+"""
+
+import asyncio
+import itertools
+import json
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+import redis
+import structlog
+
+from src.platform.config import settings
+
+logger = structlog.get_logger(__name__)
+
+
+def user_room(user_id: Any) -> str:
+    return f"user:{user_id}"
+
+
+def user_ids_for(db: Any, provider_ids: Iterable[Any] = (), consumer_ids: Iterable[Any] = ()) -> Dict[Any, str]:
+    """
+    The socket user id (Clerk user id) of each provider / consumer id; rows
+    without a clerk_id, or not found, map to their own id.
+    """
+    from src.platform.models.consumer import Consumer
+    from src.platform.models.provider import Provider
+
+    provider_ids, consumer_ids = list(provider_ids), list(consumer_ids)
+    result = {row_id: str(row_id) for row_id in provider_ids + consumer_ids}
+    for model, ids in ((Provider, provider_ids), (Consumer, consumer_ids)):
+        if ids:
+            for row_id, clerk_id in db.query(model.id, model.clerk_id).filter(model.id.in_(ids)).all():
+                if clerk_id:
+                    result[row_id] = clerk_id
+    return result
+
+
+def offer_notifications(db: Any, offer: Any, request: Any) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """(user id, event, payload) to send when a provider makes an offer."""
+    if not request.consumer_id:
+        return []
+    user_ids = user_ids_for(db, consumer_ids=[request.consumer_id])
+    return [(user_ids[request.consumer_id], "offer:new", {
+        "offer_id": offer.id,
+        "request_id": offer.request_id,
+        "provider_id": offer.provider_id,
+        "service_name": offer.service_name,
+        "price": offer.price,
+        "currency": offer.currency,
+    })]
+
+
+def booking_notifications(db: Any, booking: Any) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """(user id, event, payload) to send to both sides of a confirmed booking."""
+    payload = {
+        "booking_id": booking.id,
+        "request_id": booking.request_id,
+        "offer_id": booking.offer_id,
+        "service_name": booking.service_name,
+        "scheduled_date": booking.scheduled_date,
+        "scheduled_start": booking.scheduled_start,
+    }
+    consumer_ids = [booking.consumer_id] if booking.consumer_id else []
+    user_ids = user_ids_for(db, provider_ids=[booking.provider_id], consumer_ids=consumer_ids)
+    return [(user_ids[row_id], "booking:confirmed", payload) for row_id in [*consumer_ids, booking.provider_id]]
+
+
+# Stream entry ids: "<ms>-<seq>" (or a bare "<ms>")
+_CURSOR = re.compile(r"\d+(-\d+)?")
+
+
+def valid_cursor(cursor: Any) -> bool:
+    return isinstance(cursor, str) and _CURSOR.fullmatch(cursor) is not None
+
+
+def _cursor_key(cursor: str) -> Tuple[int, int]:
+    ms, _, seq = cursor.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class Notifier:
+    """Pushes events to user rooms and keeps the per-user catch-up log."""
+
+    def __init__(self, max_events: Optional[int] = None, ttl: Optional[int] = None, redis_client: Any = None):
+        self.max_events = max_events or settings.NOTIFICATION_LOG_MAX_EVENTS
+        self.ttl = ttl or settings.NOTIFICATION_LOG_TTL_SECONDS
+        # In-process fallback log
+        self._local: Dict[str, Deque[Tuple[str, str]]] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        # The Socket.IO server's loop, for notify_threadsafe from sync code
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Set[asyncio.Task] = set()
+        # Publish-only Socket.IO manager, in processes without the server
+        self._emitter: Any = None
+
+        if redis_client is not None:
+            self.redis_client = redis_client
+        else:
+            try:
+                self.redis_client = redis.from_url(settings.REDIS_URL, db=settings.REDIS_CACHE_DB)
+            except Exception as e:
+                logger.error("Failed to connect to Redis for notifications", error=str(e))
+                self.redis_client = None
+
+    @staticmethod
+    def _key(user_id: str) -> str:
+        return f"notifications:{user_id}"
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def use_emitter(self, emitter: Any) -> None:
+        """Emit through a write-only client manager instead of this process's server (workers)."""
+        self._emitter = emitter
+
+    # --- log ---
+
+    def record(self, user_id: Any, event: str, payload: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Append an event to the user's log: (cursor, JSON-safe payload)."""
+        user_id = str(user_id)
+        data = json.dumps({"event": event, "payload": payload}, default=str)
+        payload = json.loads(data)["payload"]
+        if self.redis_client:
+            try:
+                key = self._key(user_id)
+                cursor = self.redis_client.xadd(key, {"data": data}, maxlen=self.max_events, approximate=True)
+                self.redis_client.expire(key, self.ttl)
+                return (cursor.decode() if isinstance(cursor, bytes) else cursor), payload
+            except redis.RedisError as e:
+                logger.warning("notification_log_redis_unavailable", error=str(e))
+        cursor = f"{int(time.time() * 1000)}-{next(self._seq)}"
+        with self._lock:
+            self._local.setdefault(user_id, deque(maxlen=self.max_events)).append((cursor, data))
+        return cursor, payload
+
+    def missed(self, user_id: Any, cursor: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Events logged for the user after cursor (all retained ones without),
+        oldest first. Raises ValueError for a cursor not issued by record().
+        """
+        if cursor and not valid_cursor(cursor):
+            raise ValueError(f"invalid notification cursor: {cursor!r}")
+        user_id = str(user_id)
+        entries: List[Tuple[str, str]] = []
+        if self.redis_client:
+            try:
+                rows = self.redis_client.xrange(self._key(user_id), min=f"({cursor}" if cursor else "-", count=limit)
+                entries = [
+                    (entry_id.decode() if isinstance(entry_id, bytes) else entry_id,
+                     (fields.get(b"data") or fields.get("data")))
+                    for entry_id, fields in rows
+                ]
+            except redis.RedisError as e:
+                logger.warning("notification_log_redis_unavailable", error=str(e))
+        if not entries:
+            with self._lock:
+                local = list(self._local.get(user_id, ()))
+            after = _cursor_key(cursor) if cursor else None
+            entries = [(c, data) for c, data in local if after is None or _cursor_key(c) > after][:limit]
+
+        events = []
+        for entry_cursor, data in entries:
+            if isinstance(data, bytes):
+                data = data.decode()
+            entry = json.loads(data)
+            events.append({"cursor": entry_cursor, "event": entry["event"], "payload": entry["payload"]})
+        return events
+
+    # --- delivery ---
+
+    async def notify(self, user_id: Any, event: str, payload: Dict[str, Any]) -> Optional[str]:
+        """Log and push an event to the user's room. Best effort: never raises."""
+        try:
+            cursor, payload = self.record(user_id, event, payload)
+            await self.emit(event, {**payload, "cursor": cursor}, room=user_room(user_id))
+            return cursor
+        except Exception as e:
+            logger.warning("notification_failed", user_id=str(user_id), notification=event, error=str(e))
+            return None
+
+    async def emit(self, event: str, data: Dict[str, Any], room: str) -> None:
+        """Emit to a room on whichever node its members are connected to."""
+        if self._emitter is not None:
+            await asyncio.to_thread(self._emitter.emit, event, data, room=room, namespace="/")
+            return
+        from src.platform.socket_io import sio
+        loop = self._loop
+        if loop is not None and loop.is_running() and loop is not asyncio.get_running_loop():
+            # Called from another thread's loop (inline matching): the server's sockets live on its own loop
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(sio.emit(event, data, room=room), loop))
+            return
+        await sio.emit(event, data, room=room)
+
+    def notify_threadsafe(self, user_id: Any, event: str, payload: Dict[str, Any]) -> None:
+        """
+        notify() from sync code: on the current thread's loop if it has one,
+        else on the Socket.IO server's loop. With neither (a worker or a
+        script) the event is only logged, for catch-up.
+        """
+        coro = self.notify(user_id, event, payload)
+        try:
+            task = asyncio.get_running_loop().create_task(coro)
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            return
+        except RuntimeError:
+            pass
+        if self._loop is not None and self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(coro, self._loop)
+            return
+        coro.close()
+        self.record(user_id, event, payload)
+
+
+# Global instance
+notifier = Notifier()
@@ -1,21 +1,100 @@
+import asyncio
 import json
+import time
 import structlog
 from typing import Annotated, Dict, List, Optional, Sequence, TypedDict, Union, Any, Tuple
 from typing_extensions import TypedDict
 
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage, ToolMessage
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage
+from langgraph.channels.base import MISSING, BaseChannel
 from langgraph.graph import StateGraph, END
 
+from src.platform.services.checkpointer import create_checkpointer
+from src.platform.services.intent_router import route_service
 from src.platform.services.llm_gateway import llm_gateway
+from src.platform.services.message_store import llm_view, to_llm_dict
+from src.platform.services import turn_timing
 from src.platform.config import settings
 
 logger = structlog.get_logger(__name__)
 
 # --- State Definition ---
 
+class MessageLog(BaseChannel[List[BaseMessage], Sequence[BaseMessage], List[BaseMessage]]):
+    """
+    Append-only messages channel (replaces the `x + y` reducer).
+
+    `x + y` copied the whole history on every node update. Here nodes' new
+    messages are appended to one buffer in place. LangGraph copies channels to
+    evaluate conditional edges; copies share the buffer and track their own
+    length, so when the real channel later applies the same writes it finds
+    them already in place and just advances. Only a copy that genuinely
+    diverges forks the buffer.
+    """
+
+    __slots__ = ("_buf", "_len")
+
+    def __init__(self, typ: Any = list, key: str = ""):
+        super().__init__(typ, key)
+        self._buf: List[BaseMessage] = []
+        self._len = 0
+
+    @property
+    def ValueType(self) -> Any:
+        return List[BaseMessage]
+
+    @property
+    def UpdateType(self) -> Any:
+        return Sequence[BaseMessage]
+
+    def copy(self) -> "MessageLog":
+        other = self.__class__(self.typ, self.key)
+        other._buf = self._buf
+        other._len = self._len
+        return other
+
+    def from_checkpoint(self, checkpoint: Any) -> "MessageLog":
+        other = self.__class__(self.typ, self.key)
+        if checkpoint is not MISSING:
+            other._buf = list(checkpoint)
+            other._len = len(other._buf)
+        return other
+
+    def _append(self, message: BaseMessage) -> None:
+        buf = self._buf
+        if self._len < len(buf):
+            if buf[self._len] is message:
+                self._len += 1
+                return
+            self._buf = buf = buf[:self._len]
+        buf.append(message)
+        self._len += 1
+
+    def update(self, values: Sequence[Sequence[BaseMessage]]) -> bool:
+        if not values:
+            return False
+        for value in values:
+            for message in ([value] if isinstance(value, BaseMessage) else value):
+                self._append(message)
+        return True
+
+    def get(self) -> List[BaseMessage]:
+        if self._len == len(self._buf):
+            return self._buf
+        return self._buf[:self._len]
+
+    def is_available(self) -> bool:
+        return True
+
+    def checkpoint(self) -> List[BaseMessage]:
+        # Runs checkpoint with durability="exit", so this snapshot is taken
+        # once per run rather than once per node
+        return self._buf[:self._len]
+
+
 class AgentState(TypedDict):
     """The state of the conversation graph."""
-    messages: Annotated[Sequence[BaseMessage], lambda x, y: x + y]
+    messages: Annotated[List[BaseMessage], MessageLog]
     context: Dict[str, Any]
     user_id: Optional[str]
     session_id: Optional[str]
@@ -26,6 +105,7 @@ class AgentState(TypedDict):
 
 # --- Node Handlers ---
 
+@turn_timing.node("router")
 async def router_node(state: AgentState):
     """Determines the intent and routes to the appropriate agent."""
     messages = state["messages"]
@@ -44,21 +124,20 @@ async def router_node(state: AgentState):
              break
             
     # Use LLM to classify if we need a specialist
-    # For now, keyword-based to keep it fast
-    keywords = {
-        "haircut": ["hair", "cut", "trim", "color", "fade", "barber", "stylist"],
-        "cleaning": ["clean", "maid", "house", "apartment"],
-        "plumbing": ["plumb", "leak", "pipe", "drain", "faucet"],
-    }
-    
-    for specialist, terms in keywords.items():
-        if any(term in last_human_message.lower() for term in terms):
-            return {"current_specialist": specialist, "next_step": "specialist"}
+    # For now, keyword-based (one compiled pass over the service taxonomy)
+    specialist = route_service(last_human_message)
+    if specialist:
+        return {"current_specialist": specialist, "next_step": "specialist"}
             
     return {"next_step": "concierge"}
 
+@turn_timing.node("concierge")
 async def concierge_node(state: AgentState):
     """Handles core interactions, onboarding, and general help."""
+    return await _concierge(state)
+
+async def _concierge(state: AgentState) -> Dict[str, Any]:
+    """One concierge LLM pass over the current state."""
     from src.platform.services.prompts import (
         CONSUMER_SYSTEM_PROMPT, 
         PROVIDER_SYSTEM_PROMPT, 
@@ -104,25 +183,9 @@ async def concierge_node(state: AgentState):
     if context.get("specialist_analysis"):
         system_prompt += f"\n\nSPECIALIST ANALYSIS:\n{context['specialist_analysis']}\nUse this analysis to guide the user and show your expertise."
 
-    # Convert messages for LiteLLM, skipping existing system messages in history
-    llm_messages = [{"role": "system", "content": system_prompt}]
-    for m in messages:
-        if isinstance(m, SystemMessage):
-            continue
-        if isinstance(m, HumanMessage):
-            llm_messages.append({"role": "user", "content": m.content})
-        elif isinstance(m, AIMessage):
-            msg_dict = {"role": "assistant", "content": m.content}
-            if "tool_calls" in m.additional_kwargs:
-                msg_dict["tool_calls"] = m.additional_kwargs["tool_calls"]
-            llm_messages.append(msg_dict)
-        elif isinstance(m, ToolMessage):
-             llm_messages.append({
-                "role": "tool",
-                "tool_call_id": m.tool_call_id,
-                "name": m.name,
-                "content": m.content
-            })
+    # LiteLLM view of the history (cached per message), skipping existing
+    # system messages in history
+    llm_messages = [{"role": "system", "content": system_prompt}] + llm_view(messages)
 
     tools = context.get("tools")
 
@@ -138,6 +201,9 @@ async def concierge_node(state: AgentState):
     
     # Check for tool calls
     if ai_msg.tool_calls:
+        if isinstance(ai_msg.content, str) and ai_msg.content:
+            # e.g. "Here are your current leads:" while the tool runs
+            turn_timing.progress("text", content=ai_msg.content)
         lc_ai_msg = AIMessage(
             content=ai_msg.content or "",
             additional_kwargs={"tool_calls": [t.to_dict() for t in ai_msg.tool_calls]}
@@ -164,37 +230,121 @@ async def concierge_node(state: AgentState):
         "next_step": "end"
     }
 
+@turn_timing.node("specialist")
 async def specialist_node(state: AgentState):
     """Handles domain-specific deep-dives."""
+    return await _specialist(state)
+
+async def _specialist(state: AgentState) -> Dict[str, Any]:
+    """Consult the routed specialist; its analysis goes into the context."""
     from src.platform.services.specialist_service import specialist_service
     
     specialist_key = state.get("current_specialist")
     last_message = state["messages"][-1].content
+    context = state.get("context") or {}
     
-    # Consult the service
-    result = specialist_service.consult(specialist_key, str(last_message), state.get("context"))
-    
-    if "error" in result:
-         content = f"I've brought in our {specialist_key} specialist, but they are currently unavailable."
+    # Same specialist, knowledge version and (normalized) question as the last
+    # consult: reuse its analysis
+    fingerprint = specialist_service.consult_fingerprint(specialist_key, str(last_message), context)
+    previous = context.get("specialist_consult") or {}
+    if fingerprint and previous.get("fingerprint") == fingerprint:
+        content = previous["content"]
     else:
-         folder_terms = ", ".join(result.get("terms_identified", []))
-         warnings = " ".join(result.get("warnings", []))
-         complexity = result.get("complexity_multiplier", 1.0)
-         
-         content = (
-             f"🕵️ **{specialist_key.title()} Specialist Analysis**\n"
-             f"- **Technical Terms**: {folder_terms if folder_terms else 'None'}\n"
-             f"- **Complexity Factor**: {complexity}x baseline\n"
-         )
-         if warnings:
-             content += f"- ⚠️ **Advisory**: {warnings}\n"
+        # Consult the service (off the event loop, so it can overlap the
+        # concierge call in speculative mode)
+        result = await asyncio.to_thread(specialist_service.consult, specialist_key, str(last_message), context)
+        content = _consult_content(specialist_key, result)
              
     return {
         "messages": [AIMessage(content=content)],
-        "context": {**state["context"], "specialist_analysis": content},
+        "context": {
+            **state["context"],
+            "specialist_analysis": content,
+            "specialist_consult": {"fingerprint": fingerprint, "content": content},
+        },
         "next_step": "concierge"
     }
 
+def _consult_content(specialist_key: str, result: Dict[str, Any]) -> str:
+    if "error" in result:
+        return f"I've brought in our {specialist_key} specialist, but they are currently unavailable."
+    folder_terms = ", ".join(result.get("terms_identified", []))
+    warnings = " ".join(result.get("warnings", []))
+    complexity = result.get("complexity_multiplier", 1.0)
+    
+    content = (
+        f"🕵️ **{specialist_key.title()} Specialist Analysis**\n"
+        f"- **Technical Terms**: {folder_terms if folder_terms else 'None'}\n"
+        f"- **Complexity Factor**: {complexity}x baseline\n"
+    )
+    if warnings:
+        content += f"- ⚠️ **Advisory**: {warnings}\n"
+    return content
+
+@turn_timing.node("speculative")
+async def speculative_node(state: AgentState):
+    """
+    Specialist and concierge in parallel (ORCHESTRATOR_SPECULATIVE_SPECIALIST).
+
+    The concierge LLM call starts without waiting for the specialist. If the
+    analysis lands within ORCHESTRATOR_SPECULATIVE_RESTART_MS the concierge
+    is restarted with it (little work is thrown away); otherwise the
+    speculative answer stands and the analysis, stored in the context, is
+    used by the next concierge pass - after a tool call, or next turn.
+    """
+    from src.platform.metrics import SPECULATIVE_OUTCOMES_TOTAL, SPECULATIVE_SAVED_SECONDS
+
+    start = time.perf_counter()
+    concierge_task = asyncio.create_task(_timed_step(_concierge, state))
+    specialist_task = asyncio.create_task(_timed_step(_specialist, state))
+
+    try:
+        await asyncio.wait({concierge_task, specialist_task}, return_when=asyncio.FIRST_COMPLETED)
+        specialist, specialist_seconds = await specialist_task
+        specialist_state = {
+            **state,
+            "messages": list(state["messages"]) + specialist["messages"],
+            "context": specialist["context"],
+        }
+
+        restart_window = settings.ORCHESTRATOR_SPECULATIVE_RESTART_MS / 1000
+        if not concierge_task.done() and time.perf_counter() - start <= restart_window:
+            concierge_task.cancel()
+            concierge, concierge_seconds = await _timed_step(_concierge, specialist_state)
+            outcome = "restarted"
+        else:
+            concierge, concierge_seconds = await concierge_task
+            outcome = "deferred"
+    finally:
+        for task in (concierge_task, specialist_task):
+            if not task.done():
+                task.cancel()
+
+    elapsed = time.perf_counter() - start
+    # What the sequential specialist -> concierge path would have taken
+    saved = specialist_seconds + concierge_seconds - elapsed
+    SPECULATIVE_OUTCOMES_TOTAL.labels(outcome=outcome).inc()
+    SPECULATIVE_SAVED_SECONDS.observe(max(saved, 0.0))
+    logger.info("speculative_specialist", outcome=outcome, saved_ms=round(saved * 1000, 1),
+                specialist_ms=round(specialist_seconds * 1000, 1), concierge_ms=round(concierge_seconds * 1000, 1))
+
+    # Keep the sequential path's history shape: analysis, then the answer
+    return {
+        **concierge,
+        "messages": specialist["messages"] + concierge["messages"],
+        "context": {
+            **concierge["context"],
+            "specialist_analysis": specialist["context"]["specialist_analysis"],
+            "specialist_consult": specialist["context"].get("specialist_consult"),
+        },
+    }
+
+async def _timed_step(step, state: AgentState) -> Tuple[Dict[str, Any], float]:
+    start = time.perf_counter()
+    result = await step(state)
+    return result, time.perf_counter() - start
+
+@turn_timing.node("tools")
 async def tool_node(state: AgentState):
     """Executes tool calls requested by the LLM."""
     # This node will be called if next_step is 'tools'
@@ -211,6 +361,7 @@ async def tool_node(state: AgentState):
     last_msg = state["messages"][-1]
     tool_calls = last_msg.additional_kwargs.get("tool_calls", [])
     
+    turn_timing.count_iteration()
     tool_messages = []
     for tc in tool_calls:
         name = tc["function"]["name"]
@@ -222,13 +373,14 @@ async def tool_node(state: AgentState):
         
         # internal method _execute_tool is now accessed directly
         # passing session context
-        res = chat_service._execute_tool(name, args, state["context"])
-        
-        import inspect
-        if inspect.isawaitable(res):
-            result = await res
-        else:
-            result = res
+        with turn_timing.tool(name):
+            res = chat_service._execute_tool(name, args, state["context"])
+
+            import inspect
+            if inspect.isawaitable(res):
+                result = await res
+            else:
+                result = res
             
         tool_messages.append(ToolMessage(
             tool_call_id=tc["id"],
@@ -246,13 +398,18 @@ async def tool_node(state: AgentState):
 
 # --- Graph Construction ---
 
-def create_orchestrator():
+def create_orchestrator(checkpointer=None, speculative: Optional[bool] = None):
+    if speculative is None:
+        speculative = settings.ORCHESTRATOR_SPECULATIVE_SPECIALIST
+
     workflow = StateGraph(AgentState)
     
     workflow.add_node("router", router_node)
     workflow.add_node("concierge", concierge_node)
     workflow.add_node("specialist", specialist_node)
     workflow.add_node("tools", tool_node)
+    if speculative:
+        workflow.add_node("speculative", speculative_node)
     
     workflow.set_entry_point("router")
     
@@ -261,10 +418,20 @@ def create_orchestrator():
         lambda x: x["next_step"],
         {
             "concierge": "concierge",
-            "specialist": "specialist"
+            "specialist": "speculative" if speculative else "specialist"
         }
     )
     
+    if speculative:
+        workflow.add_conditional_edges(
+            "speculative",
+            lambda x: x["next_step"],
+            {
+                "tools": "tools",
+                "end": END
+            }
+        )
+    
     workflow.add_conditional_edges(
         "concierge",
         lambda x: x["next_step"],
@@ -277,13 +444,45 @@ def create_orchestrator():
     workflow.add_edge("specialist", "concierge")
     workflow.add_edge("tools", "concierge")
     
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
 
 graph = create_orchestrator()
 
+# Same graph, persisted per session (thread_id = session_id)
+checkpointer = create_checkpointer()
+checkpointed_graph = create_orchestrator(checkpointer) if checkpointer is not None else None
+
+
+def _continues(stored: Sequence[BaseMessage], messages: Sequence[BaseMessage]) -> bool:
+    """True if the stored thread is a prefix of the session history."""
+    if len(stored) > len(messages):
+        return False
+    if not stored:
+        return True
+    # History is append-only; checking the boundary message is enough
+    return to_llm_dict(stored[-1]) == to_llm_dict(messages[len(stored) - 1])
+
 class ProxieOrchestrator:
     """Interface for the ChatService to interact with LangGraph."""
-    
+
+    async def _new_messages(self, session_id: str, messages: List[BaseMessage]) -> List[BaseMessage]:
+        """
+        Messages the session's thread hasn't seen yet.
+
+        Normally that's just the new user message. A missing, expired or
+        diverged thread (another worker without shared state, history edited
+        out of band) is reset and re-seeded with the full history.
+        """
+        stored_tuple = await checkpointer.aget_tuple({"configurable": {"thread_id": session_id}})
+        if stored_tuple is None:
+            return messages
+        stored = stored_tuple.checkpoint["channel_values"].get("messages") or []
+        if _continues(stored, messages):
+            return messages[len(stored):]
+        logger.info("orchestrator_thread_reseeded", session_id=session_id, stored=len(stored), history=len(messages))
+        await checkpointer.adelete_thread(session_id)
+        return messages
+
     async def run(
         self, 
         messages: List[BaseMessage], 
@@ -293,6 +492,13 @@ class ProxieOrchestrator:
         role: str = "consumer"
     ) -> Tuple[str, List[BaseMessage], Dict[str, Any]]:
         
+        config = None
+        target = graph
+        if session_id and checkpointed_graph is not None:
+            config = {"configurable": {"thread_id": session_id}}
+            target = checkpointed_graph
+            messages = await self._new_messages(session_id, messages)
+
         initial_state = {
             "messages": messages,
             "context": context,
@@ -304,7 +510,7 @@ class ProxieOrchestrator:
             "response_text": ""
         }
         
-        final_state = await graph.ainvoke(initial_state)
+        final_state = await target.ainvoke(initial_state, config, durability="exit")
         
         return (
             final_state["response_text"],
@@ -0,0 +1,197 @@
+"""
+Proxie Profile Cache - Read-through cache for consumer profile hydration
+
+Every chat turn resolves the consumer by clerk_id or id and serialises it with
+to_dict(). Profiles rarely change inside a session, so this keeps the dict in a
+two-tier cache:
+
+- In-process LRU with a short TTL (bounds staleness across uvicorn workers)
+- Redis (shared, longer TTL)
+
+Layout:
+    profile:id:{consumer_id}   -> JSON profile dict
+    profile:clerk:{clerk_id}   -> consumer_id (identity pointer)
+
+The clerk pointer never goes stale in practice (a clerk_id maps to one
+consumer for life), so invalidation only needs the consumer id.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import redis
+import structlog
+
+from src.platform.config import settings
+
+logger = structlog.get_logger(__name__)
+
+
+class ProfileCache:
+    """Two-tier (LRU + Redis) cache of Consumer.to_dict() payloads."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        local_ttl: Optional[int] = None,
+        ttl: Optional[int] = None,
+        redis_client: Any = None,
+    ):
+        self.enabled = settings.PROFILE_CACHE_ENABLED
+        self.max_entries = max_entries or settings.PROFILE_CACHE_MAX_ENTRIES
+        self.local_ttl = local_ttl if local_ttl is not None else settings.PROFILE_CACHE_LOCAL_TTL
+        self.ttl = ttl or settings.PROFILE_CACHE_TTL
+
+        self._local: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if redis_client is not None:
+            self.redis_client = redis_client
+        else:
+            try:
+                self.redis_client = redis.from_url(settings.REDIS_URL, db=settings.REDIS_CACHE_DB)
+            except Exception as e:
+                logger.error("Failed to connect to Redis for profile cache", error=str(e))
+                self.redis_client = None
+
+    # --- keys ---
+
+    @staticmethod
+    def _id_key(consumer_id: str) -> str:
+        return f"profile:id:{consumer_id}"
+
+    @staticmethod
+    def _clerk_key(clerk_id: str) -> str:
+        return f"profile:clerk:{clerk_id}"
+
+    # --- local tier ---
+
+    def _local_get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return value
+
+    def _local_set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.local_ttl, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def _local_delete(self, key: str) -> None:
+        with self._lock:
+            self._local.pop(key, None)
+
+    # --- public API ---
+
+    def resolve_consumer_id(self, clerk_id: str) -> Optional[str]:
+        """Map a clerk_id to the internal consumer id, if known."""
+        key = self._clerk_key(clerk_id)
+        consumer_id = self._local_get(key)
+        if consumer_id is not None:
+            return consumer_id
+        if self.redis_client:
+            try:
+                raw = self.redis_client.get(key)
+                if raw:
+                    consumer_id = raw.decode() if isinstance(raw, bytes) else raw
+                    self._local_set(key, consumer_id)
+                    return consumer_id
+            except Exception as e:
+                logger.error("Profile cache read error", key=key, error=str(e))
+        return None
+
+    def get(self, clerk_id: Optional[str] = None, consumer_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return a cached profile by clerk_id (preferred) or consumer id."""
+        if not self.enabled:
+            return None
+
+        if clerk_id:
+            consumer_id = self.resolve_consumer_id(clerk_id)
+        if not consumer_id:
+            self.misses += 1
+            return None
+
+        key = self._id_key(str(consumer_id))
+        profile = self._local_get(key)
+        if profile is None and self.redis_client:
+            try:
+                raw = self.redis_client.get(key)
+                if raw:
+                    profile = json.loads(raw)
+                    self._local_set(key, profile)
+            except Exception as e:
+                logger.error("Profile cache read error", key=key, error=str(e))
+
+        if profile is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # Callers mutate session context freely; hand out a copy
+        return dict(profile)
+
+    def set(self, profile: Dict[str, Any], clerk_id: Optional[str] = None) -> None:
+        """Store a profile (and the clerk_id -> id pointer when known)."""
+        if not self.enabled or not profile.get("id"):
+            return
+
+        consumer_id = str(profile["id"])
+        id_key = self._id_key(consumer_id)
+        self._local_set(id_key, dict(profile))
+        if clerk_id:
+            self._local_set(self._clerk_key(clerk_id), consumer_id)
+
+        if self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline()
+                pipe.setex(id_key, self.ttl, json.dumps(profile, default=str))
+                if clerk_id:
+                    pipe.setex(self._clerk_key(clerk_id), self.ttl, consumer_id)
+                pipe.execute()
+            except Exception as e:
+                logger.error("Profile cache write error", key=id_key, error=str(e))
+
+    def invalidate(self, consumer_id: Optional[str] = None, clerk_id: Optional[str] = None) -> None:
+        """Drop a consumer's cached profile. Either identifier is enough."""
+        if not consumer_id and clerk_id:
+            consumer_id = self.resolve_consumer_id(clerk_id)
+        if not consumer_id:
+            return
+
+        key = self._id_key(str(consumer_id))
+        self._local_delete(key)
+        if self.redis_client:
+            try:
+                self.redis_client.delete(key)
+            except Exception as e:
+                logger.error("Profile cache invalidation error", key=key, error=str(e))
+        logger.debug("profile_cache_invalidated", consumer_id=str(consumer_id))
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "local_entries": len(self._local),
+        }
+
+
+# Global instance
+profile_cache = ProfileCache()
@@ -0,0 +1,184 @@
+"""
+Proxie Provider Embeddings - incremental re-embedding pipeline
+
+A provider's embedding is a function of its index text (business name, bio,
+service names, specializations) and the embedding model. Providers store
+embedding_text_hash = sha256(model, dimensions, index text) next to the
+embedding, so re-embedding is skipped whenever none of those changed - a
+profile edit that only touches the phone number costs nothing. Service
+categories aren't embedded but do filter the provider index, so skipped
+providers are still re-indexed with their current categories and have
+updated_at touched, for the other processes' index syncs.
+
+Profile updates and service changes call schedule(provider_id), which adds
+the id to a Redis set and schedules one flush of the "reembed_providers"
+Celery task (queue EMBEDDING_QUEUE) EMBEDDING_REEMBED_DEBOUNCE_SECONDS later.
+A burst of edits to one provider is one set member; edits to many providers
+inside the window are embedded together through get_embeddings_batch.
+
+Layout:
+    provider_embedding:pending          -> set of provider ids waiting to be embedded
+    provider_embedding:flush_scheduled  -> present while a flush task is queued
+"""
+
+import hashlib
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+from uuid import UUID
+
+import redis
+import structlog
+
+from src.platform.config import settings
+
+logger = structlog.get_logger(__name__)
+
+PENDING_KEY = "provider_embedding:pending"
+SCHEDULED_KEY = "provider_embedding:flush_scheduled"
+
+
+def index_text(provider: Any, services: Iterable[Any]) -> str:
+    """The text a provider is embedded from."""
+    service_names = ", ".join([s.name for s in services])
+    # Build index text: Bio + Business Name + Services + Specializations
+    return f"{provider.business_name or ''} {provider.bio or ''} {service_names} {' '.join(provider.specializations or [])}"
+
+
+def index_text_hash(text: str, model: str, dimensions: int) -> str:
+    return hashlib.sha256(f"{model}\x00{dimensions}\x00{text}".encode()).hexdigest()
+
+
+def _load(db, provider_ids: Sequence[UUID]) -> List[Tuple[Any, str, List[str]]]:
+    """(provider, index text, service categories) for each existing provider."""
+    from src.platform.models.provider import Provider
+    from src.platform.models.service import Service
+
+    providers = db.query(Provider).filter(Provider.id.in_(provider_ids)).all()
+    services: Dict[Any, List[Any]] = {}
+    for service in db.query(Service).filter(Service.provider_id.in_(provider_ids)).all():
+        services.setdefault(service.provider_id, []).append(service)
+    return [
+        (provider, index_text(provider, services.get(provider.id, [])),
+         [s.category for s in services.get(provider.id, []) if s.category])
+        for provider in providers
+    ]
+
+
+async def reembed_providers(
+    provider_ids: Sequence[Any],
+    service: Any = None,
+    force: bool = False,
+    session_factory: Any = None,
+) -> Dict[str, int]:
+    """
+    Re-embed the given providers whose index text (or model) changed, in one
+    batched embedding call. The DB session is not held across the API call.
+    """
+    from sqlalchemy import func
+    from src.platform.database import SessionLocal
+    from src.platform.models.provider import Provider
+    from src.platform.services.embeddings import embedding_service
+    from src.platform.services.provider_index import provider_index
+
+    service = service or embedding_service
+    session_factory = session_factory or SessionLocal
+    ids = [UUID(str(provider_id)) for provider_id in provider_ids]
+    if not ids:
+        return {"embedded": 0, "skipped": 0, "missing": 0}
+
+    with session_factory() as db:
+        loaded = _load(db, ids)
+        todo, unchanged = [], []
+        for provider, text, categories in loaded:
+            text_hash = index_text_hash(text, service.model, service.dimensions)
+            location = provider.location if isinstance(provider.location, dict) else {}
+            if not force and provider.embedding is not None and provider.embedding_text_hash == text_hash:
+                unchanged.append((provider.id, provider.embedding, location.get("city"), categories))
+                continue
+            todo.append((provider.id, text, text_hash, location.get("city"), categories))
+
+        # Service categories aren't embedded, but the index filters on them: a
+        # category-only edit must still reach every process's index. Touching
+        # updated_at puts these providers in the next provider_index.sync.
+        if unchanged:
+            db.query(Provider).filter(Provider.id.in_([row[0] for row in unchanged])).update(
+                {Provider.updated_at: func.now()}, synchronize_session=False,
+            )
+            db.commit()
+
+    for provider_id, embedding, city, categories in unchanged:
+        provider_index.upsert(provider_id, embedding, city, categories)
+
+    stats = {"embedded": len(todo), "skipped": len(loaded) - len(todo), "missing": len(ids) - len(loaded)}
+    if not todo:
+        return stats
+
+    embeddings = await service.get_embeddings_batch([text for _, text, _, _, _ in todo])
+
+    with session_factory() as db:
+        for (provider_id, _, text_hash, _, _), embedding in zip(todo, embeddings):
+            db.query(Provider).filter(Provider.id == provider_id).update(
+                {Provider.embedding: embedding, Provider.embedding_text_hash: text_hash},
+                synchronize_session=False,
+            )
+        db.commit()
+
+    for (provider_id, _, _, city, categories), embedding in zip(todo, embeddings):
+        provider_index.upsert(provider_id, embedding, city, categories)
+    logger.info("providers_reembedded", **stats)
+    return stats
+
+
+class ReembedQueue:
+    """Coalesces re-embed requests per provider and schedules batched flushes."""
+
+    def __init__(self, redis_client: Any = None):
+        self.debounce = settings.EMBEDDING_REEMBED_DEBOUNCE_SECONDS
+        self.batch_size = settings.EMBEDDING_REEMBED_BATCH_SIZE
+        if redis_client is not None:
+            self.redis_client = redis_client
+        else:
+            try:
+                self.redis_client = redis.from_url(settings.REDIS_URL, db=settings.REDIS_CACHE_DB)
+            except Exception as e:
+                logger.error("Failed to connect to Redis for re-embed queue", error=str(e))
+                self.redis_client = None
+
+    def schedule(self, provider_id: Any) -> None:
+        """Queue a provider for re-embedding (cheap; safe to call on every update)."""
+        from src.platform.worker import reembed_providers_task
+
+        provider_id = str(provider_id)
+        try:
+            if self.redis_client:
+                try:
+                    self.redis_client.sadd(PENDING_KEY, provider_id)
+                    # The marker outlives a lost task at most by the task time limit
+                    if self.redis_client.set(SCHEDULED_KEY, "1", nx=True, ex=int(self.debounce) + 300):
+                        reembed_providers_task.apply_async(countdown=self.debounce)
+                    return
+                except redis.RedisError as e:
+                    logger.warning("reembed_queue_redis_unavailable", error=str(e))
+            reembed_providers_task.apply_async(args=[[provider_id]], countdown=self.debounce)
+        except Exception as e:
+            logger.error("reembed_schedule_failed", provider_id=provider_id, error=str(e))
+
+    def begin_flush(self) -> None:
+        """Clear the flush marker before popping, so ids added during the flush
+        schedule a new one instead of waiting for a flush that already ran."""
+        if self.redis_client:
+            self.redis_client.delete(SCHEDULED_KEY)
+
+    def pop_batch(self) -> List[str]:
+        if not self.redis_client:
+            return []
+        popped = self.redis_client.spop(PENDING_KEY, self.batch_size) or []
+        return [p.decode() if isinstance(p, bytes) else p for p in popped]
+
+    def requeue(self, provider_ids: Sequence[str]) -> None:
+        """Put back ids from a failed batch; the task's retry picks them up."""
+        if self.redis_client and provider_ids:
+            self.redis_client.sadd(PENDING_KEY, *provider_ids)
+
+
+# Global instance
+reembed_queue = ReembedQueue()
@@ -0,0 +1,535 @@
+"""
+Proxie Provider Index - in-process ANN index over provider embeddings.
+
+pgvector's ivfflat index can't be built on the 3072-dim embedding column (its
+limit is 2000 dimensions), so every semantic match was a sequential scan
+behind a JOIN, ILIKE and DISTINCT. This index keeps the embeddings of active
+providers in process, with city and category bitsets for the hard filters:
+
+- Base segment: the last snapshot on disk, memory-mapped, so a cold start
+  neither parses nor copies the vectors.
+- Delta segment: rows upserted since the snapshot, in RAM. A delta row (or a
+  removal) shadows the base row with the same provider id.
+
+A search ANDs the city / category / live bitsets, then scores the surviving
+rows exactly when there are few of them (the usual case with both filters),
+or only the rows in the PROVIDER_INDEX_NPROBE nearest IVF lists when there
+are many. Scores are cosine distances, the same ordering as the DB query.
+
+Snapshot layout (PROVIDER_INDEX_PATH):
+    CURRENT                    -> name of the live snapshot directory
+    snap-{ts}/vectors.npy      (rows, dim) L2-normalized, as PROVIDER_INDEX_DTYPE
+    snap-{ts}/scales.npy       per-row scale of int8 vectors
+    snap-{ts}/meta.json        ids, city and categories per row, sync watermark
+    snap-{ts}/ivf.npz          centroids + list per row (>= PROVIDER_INDEX_IVF_MIN_ROWS rows)
+
+save() writes a new snapshot directory and swaps CURRENT with os.replace, so
+any process may save and every snapshot is self-consistent. Processes catch
+up on each other's changes through sync(), which pulls providers updated
+since the watermark from the DB; the DB stays the source of truth. Syncing
+(and the saves and IVF training it can trigger) runs on a background
+refresher thread, never inside a search.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+from src.platform.config import settings
+from src.platform.database.geo import city_key as normalize_city
+
+logger = structlog.get_logger(__name__)
+
+_MISSING = object()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _quantize(vectors: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Storage form of float32 rows: float32 / float16 as is, int8 with a per-row scale."""
+    if dtype == "int8":
+        scales = np.abs(vectors).max(axis=1) / 127.0 if len(vectors) else np.zeros(0, dtype=np.float32)
+        scales[scales == 0] = 1.0
+        return np.round(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+    if dtype in ("float32", "float16"):
+        return vectors.astype(dtype), None
+    raise ValueError(f"Unknown provider index dtype {dtype!r}")
+
+
+def _city_key(city: Optional[str]) -> str:
+    # Idempotent, so snapshots written before normalization load the same way
+    return normalize_city(city)
+
+
+def _category_key(category: Optional[str]) -> str:
+    return (category or "").strip().casefold()
+
+
+class _Base:
+    """Immutable snapshot segment: vectors (possibly memory-mapped) + filter bitsets."""
+
+    def __init__(
+        self,
+        ids: List[str],
+        vectors: np.ndarray,
+        cities: List[str],
+        categories: List[List[str]],
+        centroids: Optional[np.ndarray] = None,
+        lists: Optional[np.ndarray] = None,
+        scales: Optional[np.ndarray] = None,
+    ):
+        self.ids = ids
+        self.vectors = vectors
+        self.scales = scales
+        self.cities = cities
+        self.categories = categories
+        self.centroids = centroids
+        self.lists = lists
+        self.rows = {provider_id: row for row, provider_id in enumerate(ids)}
+
+        n = len(ids)
+        self.city_bits: Dict[str, np.ndarray] = {}
+        for row, city in enumerate(cities):
+            self.city_bits.setdefault(city, np.zeros(n, dtype=bool))[row] = True
+        self.category_bits: Dict[str, np.ndarray] = {}
+        for row, row_categories in enumerate(categories):
+            for category in row_categories:
+                self.category_bits.setdefault(category, np.zeros(n, dtype=bool))[row] = True
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self.vectors.shape[1] if len(self.ids) else None
+
+    def rows_float32(self, rows: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(self.vectors[rows], dtype=np.float32)
+        return vectors * self.scales[rows, None] if self.scales is not None else vectors
+
+    def score(self, rows: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Cosine similarity of the given rows to a normalized query."""
+        if self.scales is not None:
+            return (self.vectors[rows] @ query) * self.scales[rows]
+        return self.vectors[rows] @ query
+
+    @classmethod
+    def empty(cls) -> "_Base":
+        return cls([], np.zeros((0, 0), dtype=np.float32), [], [])
+
+
+class ProviderIndex:
+    """Embeddings of active providers, filterable by city and category."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        enabled: bool = True,
+        nprobe: Optional[int] = None,
+        exact_max: Optional[int] = None,
+        ivf_min_rows: Optional[int] = None,
+        dtype: Optional[str] = None,
+        dims: Optional[int] = None,
+    ):
+        self.path = path
+        self.enabled = enabled
+        self.dtype = dtype or settings.PROVIDER_INDEX_DTYPE
+        self.dims = dims  # snapshots of another width (a re-dimensioned column) are ignored
+        self.nprobe = nprobe or settings.PROVIDER_INDEX_NPROBE
+        self.exact_max = exact_max if exact_max is not None else settings.PROVIDER_INDEX_EXACT_MAX
+        self.ivf_min_rows = ivf_min_rows if ivf_min_rows is not None else settings.PROVIDER_INDEX_IVF_MIN_ROWS
+
+        self._lock = threading.RLock()
+        self._base = _Base.empty()
+        self._live = np.zeros(0, dtype=bool)  # base rows not shadowed by the delta
+        # provider_id -> (vector, city, categories); None marks a removal
+        self._delta: Dict[str, Optional[Tuple[np.ndarray, str, List[str]]]] = {}
+        self._delta_cache: Optional[Tuple[List[str], np.ndarray, List[str], List[List[str]]]] = None
+
+        self.synced_at: Optional[datetime] = None
+        self._synced_monotonic = 0.0
+        self._loaded = False
+
+        self._refresher: Optional[threading.Thread] = None
+        self._refresher_pid: Optional[int] = None
+        self._stop_refresh = threading.Event()
+
+    # --- state ---
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._live.sum()) + sum(1 for row in self._delta.values() if row is not None)
+
+    @property
+    def dim(self) -> Optional[int]:
+        with self._lock:
+            for row in self._delta.values():
+                if row is not None:
+                    return row[0].shape[0]
+            return self._base.dim
+
+    @property
+    def delta_rows(self) -> int:
+        return len(self._delta)
+
+    @property
+    def ready(self) -> bool:
+        """Synced with the DB at least once; until then matching uses the DB query."""
+        return self._synced_monotonic > 0
+
+    # --- updates ---
+
+    def upsert(self, provider_id: Any, embedding: Sequence[float], city: Optional[str], categories: Iterable[str]):
+        """Insert or replace a provider's row (visible to the next search)."""
+        if not self.enabled:
+            return
+        vector = _normalize(np.asarray(embedding, dtype=np.float32).reshape(-1))
+        provider_id = str(provider_id)
+        row_categories = sorted({_category_key(c) for c in categories if c})
+        with self._lock:
+            dim = self.dim
+            if dim is not None and vector.shape[0] != dim:
+                raise ValueError(f"embedding has {vector.shape[0]} dims, index has {dim}")
+            self._shadow(provider_id)
+            self._delta[provider_id] = (vector, _city_key(city), row_categories)
+            self._delta_cache = None
+
+    def remove(self, provider_id: Any):
+        """Drop a provider (inactive, deleted or without an embedding)."""
+        if not self.enabled:
+            return
+        provider_id = str(provider_id)
+        with self._lock:
+            self._shadow(provider_id)
+            if provider_id in self._delta or provider_id in self._base.rows:
+                self._delta[provider_id] = None
+                self._delta_cache = None
+
+    def _shadow(self, provider_id: str):
+        row = self._base.rows.get(provider_id)
+        if row is not None:
+            self._live[row] = False
+
+    def _delta_arrays(self) -> Tuple[List[str], np.ndarray, List[str], List[List[str]]]:
+        if self._delta_cache is None:
+            rows = [(pid, row) for pid, row in self._delta.items() if row is not None]
+            vectors = np.stack([row[0] for _, row in rows]) if rows else np.zeros((0, 0), dtype=np.float32)
+            self._delta_cache = (
+                [pid for pid, _ in rows], vectors, [row[1] for _, row in rows], [row[2] for _, row in rows]
+            )
+        return self._delta_cache
+
+    # --- search ---
+
+    def _category_mask(self, bits: Dict[str, np.ndarray], n: int, category: str) -> np.ndarray:
+        # Mirrors the DB filter Service.category ILIKE %category%
+        mask = np.zeros(n, dtype=bool)
+        for name, name_bits in bits.items():
+            if category in name:
+                mask |= name_bits
+        return mask
+
+    def search(
+        self,
+        embedding: Sequence[float],
+        city: Optional[str] = None,
+        category: Optional[str] = None,
+        k: int = 20,
+        provider_ids: Optional[Iterable[Any]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Nearest providers as (provider_id, cosine distance), closest first.
+        provider_ids restricts the search to those providers (e.g. the result
+        of a radius prefilter).
+        """
+        allowed = {str(provider_id) for provider_id in provider_ids} if provider_ids is not None else None
+        query = _normalize(np.asarray(embedding, dtype=np.float32).reshape(-1))
+        with self._lock:
+            base, live = self._base, self._live.copy()
+            delta_ids, delta_vectors, delta_cities, delta_categories = self._delta_arrays()
+        city_key = _city_key(city) if city is not None else None
+        category_key = _category_key(category) if category else None
+
+        ids: List[str] = []
+        scores: List[np.ndarray] = []
+
+        if base.ids:
+            if base.dim != query.shape[0]:
+                raise ValueError(f"query has {query.shape[0]} dims, index has {base.dim}")
+            mask = live
+            if city_key is not None:
+                mask = mask & base.city_bits.get(city_key, np.zeros(len(base.ids), dtype=bool))
+            if category_key:
+                mask = mask & self._category_mask(base.category_bits, len(base.ids), category_key)
+            if allowed is not None:
+                allowed_bits = np.zeros(len(base.ids), dtype=bool)
+                allowed_bits[[base.rows[i] for i in allowed if i in base.rows]] = True
+                mask = mask & allowed_bits
+            rows = np.flatnonzero(mask)
+            if len(rows) > self.exact_max and base.centroids is not None:
+                # Too many candidates to score exactly: only the nearest IVF lists
+                probe = np.argsort(base.centroids @ query)[-self.nprobe:]
+                rows = rows[np.isin(base.lists[rows], probe)]
+            if len(rows):
+                scores.append(base.score(rows, query))
+                ids.extend(base.ids[row] for row in rows)
+
+        if delta_ids:
+            keep = [
+                i for i in range(len(delta_ids))
+                if (city_key is None or delta_cities[i] == city_key)
+                and (not category_key or any(category_key in c for c in delta_categories[i]))
+                and (allowed is None or delta_ids[i] in allowed)
+            ]
+            if keep:
+                scores.append(delta_vectors[keep] @ query)
+                ids.extend(delta_ids[i] for i in keep)
+
+        if not ids:
+            return []
+        similarity = np.concatenate(scores)
+        top = np.argpartition(-similarity, k - 1)[:k] if len(similarity) > k else np.arange(len(similarity))
+        top = top[np.argsort(-similarity[top])]
+        return [(ids[i], float(1.0 - similarity[i])) for i in top]
+
+    # --- persistence ---
+
+    def load(self) -> bool:
+        """Memory-map the current snapshot. Returns False if there is none."""
+        self._loaded = True
+        if not self.enabled or not self.path:
+            return False
+        try:
+            with open(os.path.join(self.path, "CURRENT")) as f:
+                snapshot = os.path.join(self.path, f.read().strip())
+            with open(os.path.join(snapshot, "meta.json")) as f:
+                meta = json.load(f)
+            if self.dims and meta.get("dim") not in (None, self.dims):
+                logger.warning("provider_index_snapshot_stale", snapshot=snapshot, dim=meta.get("dim"), expected=self.dims)
+                return False
+            vectors = np.load(os.path.join(snapshot, "vectors.npy"), mmap_mode="r")
+            scales_path = os.path.join(snapshot, "scales.npy")
+            scales = np.load(scales_path) if os.path.exists(scales_path) else None
+            centroids = lists = None
+            ivf_path = os.path.join(snapshot, "ivf.npz")
+            if os.path.exists(ivf_path):
+                ivf = np.load(ivf_path)
+                centroids, lists = ivf["centroids"], ivf["lists"]
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.error("provider_index_load_failed", path=self.path, error=str(e))
+            return False
+
+        cities = [_city_key(city) for city in meta["cities"]]
+        base = _Base(meta["ids"], vectors, cities, meta["categories"], centroids, lists, scales)
+        with self._lock:
+            self._base = base
+            self._live = np.ones(len(base.ids), dtype=bool)
+            self._delta = {}
+            self._delta_cache = None
+            self.synced_at = datetime.fromisoformat(meta["synced_at"]) if meta.get("synced_at") else None
+        logger.info("provider_index_loaded", rows=len(base.ids), snapshot=snapshot)
+        return True
+
+    def save(self) -> Optional[str]:
+        """Compact base + delta into a new snapshot and make it current."""
+        if not self.enabled or not self.path:
+            return None
+        with self._lock:
+            base, live = self._base, self._live.copy()
+            delta_ids, delta_vectors, delta_cities, delta_categories = self._delta_arrays()
+            saved_delta = dict(self._delta)
+            synced_at = self.synced_at
+
+        rows = np.flatnonzero(live)
+        ids = [base.ids[row] for row in rows] + delta_ids
+        parts = [base.rows_float32(rows)] if len(rows) else []
+        if delta_ids:
+            parts.append(delta_vectors)
+        vectors = np.concatenate(parts) if parts else np.zeros((0, 0), dtype=np.float32)
+        cities = [base.cities[row] for row in rows] + delta_cities
+        categories = [base.categories[row] for row in rows] + delta_categories
+
+        name = f"snap-{time.time_ns()}-{os.getpid()}"
+        snapshot = os.path.join(self.path, name)
+        os.makedirs(snapshot, exist_ok=True)
+        stored, scales = _quantize(vectors, self.dtype)
+        np.save(os.path.join(snapshot, "vectors.npy"), stored)
+        if scales is not None:
+            np.save(os.path.join(snapshot, "scales.npy"), scales)
+        if len(ids) >= self.ivf_min_rows:
+            centroids, lists = self._train_ivf(vectors)
+            np.savez(os.path.join(snapshot, "ivf.npz"), centroids=centroids, lists=lists)
+        with open(os.path.join(snapshot, "meta.json"), "w") as f:
+            json.dump({
+                "dim": vectors.shape[1] if len(ids) else None,
+                "dtype": self.dtype,
+                "ids": ids,
+                "cities": cities,
+                "categories": categories,
+                "synced_at": synced_at.isoformat() if synced_at else None,
+            }, f)
+        tmp = os.path.join(self.path, f"CURRENT.{os.getpid()}")
+        with open(tmp, "w") as f:
+            f.write(name)
+        os.replace(tmp, os.path.join(self.path, "CURRENT"))
+        self._prune(keep=name)
+        logger.info("provider_index_saved", rows=len(ids), snapshot=snapshot)
+
+        # Serve from the new snapshot; changes made while saving stay in the delta
+        with self._lock:
+            pending = [
+                (provider_id, row) for provider_id, row in self._delta.items()
+                if saved_delta.get(provider_id, _MISSING) is not row
+            ]
+            self.load()
+            for provider_id, row in pending:
+                self._shadow(provider_id)
+                self._delta[provider_id] = row
+            self._delta_cache = None
+            self.synced_at = synced_at
+        return snapshot
+
+    def _prune(self, keep: str):
+        # Readers that still map an old snapshot keep their (unlinked) files
+        for entry in os.listdir(self.path):
+            if entry.startswith("snap-") and entry != keep:
+                shutil.rmtree(os.path.join(self.path, entry), ignore_errors=True)
+
+    @staticmethod
+    def _train_ivf(vectors: np.ndarray, iterations: int = 8, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """Spherical k-means (sqrt(n) lists) on a sample, then assign every row."""
+        rng = np.random.default_rng(seed)
+        n = len(vectors)
+        nlist = max(1, int(np.sqrt(n)))
+        sample = vectors[rng.choice(n, size=min(n, nlist * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[assign == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+            centroids = _normalize(centroids)
+        lists = np.concatenate([
+            np.argmax(vectors[i:i + 8192] @ centroids.T, axis=1) for i in range(0, n, 8192)
+        ]).astype(np.int32)
+        return centroids, lists
+
+    # --- DB sync ---
+
+    def due_for_sync(self) -> bool:
+        return time.monotonic() - self._synced_monotonic >= settings.PROVIDER_INDEX_SYNC_SECONDS
+
+    def refresh(self, db) -> int:
+        """Load the snapshot on first use, then sync with the DB when due."""
+        if not self.enabled:
+            return 0
+        if not self._loaded:
+            self.load()
+        if not self.due_for_sync():
+            return 0
+        changed = self.sync(db)
+        if self.path and self.delta_rows >= settings.PROVIDER_INDEX_SAVE_DELTA_ROWS:
+            try:
+                self.save()
+            except Exception as e:
+                logger.error("provider_index_save_failed", path=self.path, error=str(e))
+        return changed
+
+    def start_refresher(self, session_factory: Any = None) -> None:
+        """
+        Keep the index in sync from a background thread, every
+        PROVIDER_INDEX_SYNC_SECONDS, so searches never pay for a sync, a
+        snapshot save or IVF training. Idempotent; a thread inherited
+        through fork is replaced.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._refresher is not None and self._refresher_pid == os.getpid() and self._refresher.is_alive():
+                return
+            self._stop_refresh.clear()
+            self._refresher = threading.Thread(
+                target=self._refresh_forever, args=(session_factory,), name="provider-index-refresh", daemon=True
+            )
+            self._refresher.start()
+            self._refresher_pid = os.getpid()
+
+    def stop_refresher(self) -> None:
+        self._stop_refresh.set()
+        if self._refresher is not None and self._refresher_pid == os.getpid():
+            self._refresher.join(timeout=10)
+        self._refresher = None
+
+    def _refresh_forever(self, session_factory: Any) -> None:
+        if session_factory is None:
+            from src.platform.database import SessionLocal
+            session_factory = SessionLocal
+        while not self._stop_refresh.is_set():
+            try:
+                with session_factory() as db:
+                    self.refresh(db)
+            except Exception as e:
+                logger.error("provider_index_refresh_failed", error=str(e))
+            self._stop_refresh.wait(settings.PROVIDER_INDEX_SYNC_SECONDS)
+
+    def sync(self, db, batch_size: int = 1000) -> int:
+        """
+        Apply providers changed since the watermark (all of them on first
+        sync). Rows up to PROVIDER_INDEX_SYNC_LAG_SECONDS behind the watermark
+        are read again: a transaction that started before the last sync but
+        committed after it carries an older timestamp. Re-applying a row is
+        harmless.
+        """
+        from sqlalchemy import func
+        from src.platform.models.provider import Provider
+        from src.platform.models.service import Service
+
+        changed_at = func.coalesce(Provider.updated_at, Provider.created_at)
+        query = db.query(Provider.id, Provider.embedding, Provider.location, Provider.status, changed_at)
+        if self.synced_at is not None:
+            query = query.filter(changed_at > self.synced_at - timedelta(seconds=settings.PROVIDER_INDEX_SYNC_LAG_SECONDS))
+        rows = query.order_by(changed_at).all()
+
+        watermark = self.synced_at
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            categories: Dict[str, List[str]] = {}
+            for provider_id, category in db.query(Service.provider_id, Service.category).filter(
+                Service.provider_id.in_([row[0] for row in batch])
+            ).all():
+                categories.setdefault(str(provider_id), []).append(category)
+
+            for provider_id, embedding, location, status, updated in batch:
+                if status != "active" or embedding is None:
+                    self.remove(provider_id)
+                else:
+                    city = (location or {}).get("city") if isinstance(location, dict) else None
+                    self.upsert(provider_id, embedding, city, categories.get(str(provider_id), []))
+                if updated is not None and (watermark is None or updated > watermark):
+                    watermark = updated
+
+        self.synced_at = watermark
+        self._synced_monotonic = time.monotonic()
+        if rows:
+            logger.info("provider_index_synced", changed=len(rows), rows=len(self))
+        return len(rows)
+
+
+# Global instance (in-memory only under test)
+provider_index = ProviderIndex(
+    path=None if settings.ENVIRONMENT == "testing" else settings.PROVIDER_INDEX_PATH,
+    enabled=settings.PROVIDER_INDEX_ENABLED and settings.ENVIRONMENT != "testing",
+    dims=settings.LLM_EMBEDDING_DIMENSIONS,
+)
@@ -0,0 +1,219 @@
+"""
+Proxie Request Matches - the provider lead inbox
+
+Matching writes one request_matches row per (request, provider) pair it
+returns; the inbox, list_requests(matching_provider_id=...) and the MCP
+get_matching_requests tool read them back with index lookups instead of
+scanning service_requests.matched_providers JSON. matched_providers is still
+written alongside, for the request response.
+
+Matching itself is off the request path: creating (or editing) a request
+stores it with status "matching" and calls schedule_matching, which queues
+the "match_request" task on MATCHING_QUEUE. The task embeds and ranks,
+records the matches, moves the request to "matched" and notifies the
+consumer (request:matched) and the matched providers (lead:new) through
+services/notifications.py; failures are retried with backoff.
+
+Inbox pages are keyset-paginated, newest match first: the cursor is the
+(matched_at, request_id) of the last row of the previous page, so a page
+costs the same however deep it is and rows matched in between don't shift
+it.
+"""
+
+import asyncio
+import base64
+import threading
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import structlog
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from src.platform.models.request import RequestMatch, ServiceRequest
+from src.platform.schemas.request import (
+    RequestBudget, RequestLocation, RequestRequirements, RequestTiming, ServiceRequestCreate,
+)
+from src.platform.services.notifications import notifier, user_ids_for
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+# Requests that can be (re)matched and are open leads for their providers
+OPEN_STATUSES = ("matching", "matched")
+
+def record_matches(db: Session, request: ServiceRequest, provider_ids: Sequence[UUID]) -> List[UUID]:
+    """
+    Make the request's match rows equal provider_ids, best first. Pairs
+    already matched keep their matched_at (a re-match doesn't move them up
+    the inbox); providers no longer matched are removed. The caller commits.
+    Returns the newly matched providers.
+    """
+    matched_at = datetime.now(timezone.utc)
+    added = []
+    existing = {
+        match.provider_id: match
+        for match in db.query(RequestMatch).filter(RequestMatch.request_id == request.id).all()
+    }
+    for rank, provider_id in enumerate(dict.fromkeys(provider_ids), start=1):
+        match = existing.pop(provider_id, None)
+        if match is None:
+            added.append(provider_id)
+            db.add(RequestMatch(
+                request_id=request.id,
+                provider_id=provider_id,
+                score=1.0 / rank,
+                matched_at=matched_at,
+                status=request.status or "pending",
+            ))
+        else:
+            match.score = 1.0 / rank
+    for match in existing.values():
+        db.delete(match)
+    request.matched_providers = [str(provider_id) for provider_id in provider_ids]
+    logger.info("request_matches_recorded", request_id=str(request.id), count=len(provider_ids), added=len(added))
+    return added
+
+
+def encode_cursor(matched_at: datetime, request_id: UUID) -> str:
+    return base64.urlsafe_b64encode(f"{matched_at.isoformat()}|{request_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Raises ValueError for a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        matched_at, request_id = raw.split("|")
+        return datetime.fromisoformat(matched_at), UUID(request_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def lead_inbox(
+    db: Session,
+    provider_id: UUID,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Tuple[List[ServiceRequest], Optional[str]]:
+    """
+    A page of the requests matched to provider_id, newest match first, and
+    the cursor of the next page (None on the last one).
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = db.query(ServiceRequest, RequestMatch.matched_at).join(
+        RequestMatch, RequestMatch.request_id == ServiceRequest.id
+    ).filter(RequestMatch.provider_id == provider_id)
+    if status:
+        query = query.filter(RequestMatch.status == status)
+    if cursor:
+        matched_at, request_id = decode_cursor(cursor)
+        query = query.filter(tuple_(RequestMatch.matched_at, RequestMatch.request_id) < tuple_(matched_at, request_id))
+    rows = query.order_by(
+        RequestMatch.matched_at.desc(), RequestMatch.request_id.desc()
+    ).limit(limit + 1).all()
+
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1][1], page[-1][0].id) if len(rows) > limit else None
+    return [request for request, _ in page], next_cursor
+
+
+def request_schema(request: ServiceRequest) -> ServiceRequestCreate:
+    """The matcher's input, rebuilt from a stored request."""
+    return ServiceRequestCreate(
+        consumer_id=request.consumer_id,
+        raw_input=request.raw_input,
+        service_category=request.service_category,
+        service_type=request.service_type,
+        requirements=RequestRequirements(**(request.requirements or {})),
+        location=RequestLocation(**(request.location or {})),
+        timing=RequestTiming(**(request.timing or {})),
+        budget=RequestBudget(**(request.budget or {})),
+        media=request.media or [],
+    )
+
+
+async def match_request(request_id: Any, session_factory: Any = None) -> List[UUID]:
+    """
+    Match a stored request and record the result. Runs on the worker; safe
+    to retry - a re-run replaces the match rows. Requests no longer open
+    (cancelled, offers received, booked) are left alone.
+    """
+    from src.platform.database import SessionLocal
+    from src.platform.services.matching import MatchingService
+
+    session_factory = session_factory or SessionLocal
+    request_id = UUID(str(request_id))
+
+    with session_factory() as db:
+        request = db.query(ServiceRequest).filter(ServiceRequest.id == request_id).first()
+        if request is None or request.status not in OPEN_STATUSES:
+            logger.info("request_matching_skipped", request_id=str(request_id),
+                        status=request.status if request else None)
+            return []
+        schema = request_schema(request)
+
+    # A fresh session: find_providers embeds first, so no connection is held across the API call
+    with session_factory() as db:
+        matched_ids = await MatchingService(db).find_providers(schema)
+        request = db.query(ServiceRequest).filter(ServiceRequest.id == request_id).first()
+        if request is None or request.status not in OPEN_STATUSES:
+            logger.info("request_matching_discarded", request_id=str(request_id))
+            return []
+        if request.status != "matched":
+            request.status = "matched"
+            request.status_history = [*(request.status_history or []), {
+                "status": "matched",
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "note": f"Matched with {len(matched_ids)} providers",
+            }]
+        new_leads = record_matches(db, request, matched_ids)
+        db.commit()
+        service_type = request.service_type
+        consumer_ids = [request.consumer_id] if request.consumer_id else []
+        try:
+            user_ids = user_ids_for(db, provider_ids=new_leads, consumer_ids=consumer_ids)
+        except Exception as e:
+            logger.warning("request_match_user_lookup_failed", request_id=str(request_id), error=str(e))
+            user_ids = {row_id: str(row_id) for row_id in [*new_leads, *consumer_ids]}
+
+    for consumer_id in consumer_ids:
+        await notifier.notify(user_ids[consumer_id], "request:matched", {
+            "request_id": request_id,
+            "status": "matched",
+            "match_count": len(matched_ids),
+        })
+    # A re-match only tells providers it newly matched
+    for provider_id in new_leads:
+        await notifier.notify(user_ids[provider_id], "lead:new", {
+            "request_id": request_id,
+            "service_type": service_type,
+        })
+    return matched_ids
+
+
+def _match_inline(request_id: Any) -> None:
+    try:
+        asyncio.run(match_request(request_id))
+    except Exception as e:
+        logger.error("request_matching_inline_failed", request_id=str(request_id), error=str(e))
+
+
+def schedule_matching(request_id: Any) -> None:
+    """
+    Queue matching for a request (returns immediately). If the broker is
+    unreachable, matching runs on a background thread instead, so the
+    request isn't left in "matching". A thread rather than the caller's
+    loop: matching uses sync sessions and may rebuild the provider index,
+    which would stall the API loop, and sync routes have no loop at all.
+    """
+    from src.platform.worker import match_request_task
+
+    try:
+        match_request_task.apply_async(args=[str(request_id)])
+    except Exception as e:
+        logger.error("request_matching_schedule_failed", request_id=str(request_id), error=str(e))
+        logger.info("request_matching_inline", request_id=str(request_id))
+        threading.Thread(target=_match_inline, args=(request_id,), name="inline-matching", daemon=True).start()
@@ -1,80 +1,188 @@
 import yaml
+import hashlib
+import json
 import os
-from typing import Dict, Any, Optional
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
 import structlog
 
+from src.platform.config import settings
+from src.platform.services.intent_router import IntentMatcher, normalize_text
+
 logger = structlog.get_logger(__name__)
 
+
+class CompiledKnowledge:
+    """
+    One knowledge file compiled for consults.
+
+    Technical terms, warning keys and priced service types become one
+    IntentMatcher (a consult is a single pass over the query, however large
+    the vocabulary); pricing factors become plain lookup tables.
+    """
+
+    def __init__(self, name: str, data: Dict[str, Any], stamp: Tuple[int, int] = (0, 0)):
+        self.name = name
+        self.data = data
+        self.stamp = stamp  # (mtime_ns, size) of the file it was compiled from
+
+        pricing = data.get("pricing_factors") or {}
+        self.service_factors: Dict[str, float] = dict(pricing.get("service_type") or {})
+        self.length_factors: Dict[str, float] = dict(pricing.get("hair_length") or {})
+        self.warnings: Dict[str, str] = dict(data.get("warnings") or {})
+
+        # Keys like "color_correction" match as the phrase "color correction"
+        self.matcher = IntentMatcher({
+            "term": {str(term): [str(term)] for term in data.get("technical_terms") or []},
+            "warning": {key: [key.replace("_", " ")] for key in self.warnings},
+            "service_type": {stype: [stype.replace("_", " ")] for stype in self.service_factors},
+        })
+
+
 class SpecialistService:
     """Manages domain specialists."""
-    
-    def __init__(self, knowledge_dir: str = "src/platform/knowledge"):
+
+    def __init__(self, knowledge_dir: str = "src/platform/knowledge", reload_interval: Optional[float] = None):
         self.knowledge_dir = knowledge_dir
-        self.specialists: Dict[str, Dict[str, Any]] = {}
-        self._load_specialists()
-        
-    def _load_specialists(self):
-        """Load all YAML files from knowledge dir."""
+        self.reload_interval = (
+            settings.SPECIALIST_KNOWLEDGE_RELOAD_SECONDS if reload_interval is None else reload_interval
+        )
+        # name -> compiled knowledge; replaced wholesale, never mutated, so a
+        # consult always sees one consistent version
+        self._compiled: Dict[str, CompiledKnowledge] = {}
+        # name -> file stamp at the last scan (including files that failed to load)
+        self._stamps: Dict[str, Tuple[int, int]] = {}
+        self._checked_at = 0.0
+        self._reload_lock = threading.Lock()
+
         if not os.path.exists(self.knowledge_dir):
             logger.warning(f"Knowledge dir {self.knowledge_dir} not found")
-            return
-            
-        for filename in os.listdir(self.knowledge_dir):
+        self.reload()
+
+    @property
+    def specialists(self) -> Dict[str, Dict[str, Any]]:
+        return {name: knowledge.data for name, knowledge in self._compiled.items()}
+
+    def _scan(self) -> Dict[str, Tuple[str, Tuple[int, int]]]:
+        """name -> (path, (mtime_ns, size)) for every YAML file in the knowledge dir."""
+        files = {}
+        if not os.path.isdir(self.knowledge_dir):
+            return files
+        for filename in sorted(os.listdir(self.knowledge_dir)):
             if filename.endswith(".yaml") or filename.endswith(".yml"):
-                name = filename.split(".")[0]
+                path = os.path.join(self.knowledge_dir, filename)
                 try:
-                    with open(os.path.join(self.knowledge_dir, filename), "r") as f:
-                        data = yaml.safe_load(f)
-                        self.specialists[name] = data
-                    logger.info("Loaded specialist", name=name)
-                except Exception as e:
-                    logger.error("Failed to load specialist", name=name, error=str(e))
-                    
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files[filename.split(".")[0]] = (path, (stat.st_mtime_ns, stat.st_size))
+        return files
+
+    def reload(self) -> bool:
+        """Recompile changed knowledge files and swap them in. Returns True if anything changed."""
+        with self._reload_lock:
+            return self._reload()
+
+    def _reload(self) -> bool:
+        files = self._scan()
+        stamps = {name: stamp for name, (_, stamp) in files.items()}
+        if stamps == self._stamps:
+            return False
+
+        current = self._compiled
+        compiled: Dict[str, CompiledKnowledge] = {}
+        for name, (path, stamp) in files.items():
+            previous = current.get(name)
+            if previous is not None and stamp == self._stamps.get(name):
+                compiled[name] = previous
+                continue
+            try:
+                with open(path, "r") as f:
+                    data = yaml.safe_load(f) or {}
+                compiled[name] = CompiledKnowledge(name, data, stamp)
+                logger.info("Loaded specialist", name=name)
+            except Exception as e:
+                logger.error("Failed to load specialist", name=name, error=str(e))
+                if previous is not None:
+                    # Keep serving the last good version until the file is fixed
+                    compiled[name] = previous
+
+        self._stamps = stamps
+        self._compiled = compiled
+        return True
+
+    def _maybe_reload(self):
+        """Pick up edited, added or removed knowledge files, at most once per interval."""
+        if self.reload_interval < 0:
+            return
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        # Another consult is already reloading: keep using the current index
+        if not self._reload_lock.acquire(blocking=False):
+            return
+        try:
+            self._checked_at = now
+            self._reload()
+        finally:
+            self._reload_lock.release()
+
+    def get_compiled(self, name: str) -> Optional[CompiledKnowledge]:
+        self._maybe_reload()
+        return self._compiled.get(name)
+
     def get_specialist(self, name: str) -> Optional[Dict[str, Any]]:
-        return self.specialists.get(name)
-        
+        knowledge = self.get_compiled(name)
+        return knowledge.data if knowledge else None
+
+    def consult_fingerprint(self, specialist_name: str, query: str, context: Dict[str, Any] = None) -> Optional[str]:
+        """
+        Fingerprint of everything consult() reads: the knowledge file version,
+        the normalized query and the priced context. None for unknown specialists.
+        """
+        knowledge = self.get_compiled(specialist_name)
+        if not knowledge:
+            return None
+        hair_length = (context or {}).get("hair_length")
+        raw = json.dumps([specialist_name, knowledge.stamp, normalize_text(query), str(hair_length)])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
     def consult(self, specialist_name: str, query: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
-        Consult a specialist. 
+        Consult a specialist.
         For MVP, this performs keyword matching against the knowledge base.
         In future, this would be an LLM call with the knowledge base as RAG context.
         """
-        knowledge = self.get_specialist(specialist_name)
+        knowledge = self.get_compiled(specialist_name)
         if not knowledge:
             return {"error": f"Specialist {specialist_name} not found"}
-            
-        # Basic logical analysis (rules engine)
-        
-        # 1. Check for technical terms
-        terms_found = []
-        for term in knowledge.get("technical_terms", []):
-            if term.lower() in query.lower():
-                terms_found.append(term)
-                
-        # 2. Check for warnings
-        warnings = []
-        for key, warning in knowledge.get("warnings", {}).items():
-            # Heuristic: match key (e.g. "color_correction") loosely in query
-            if key.replace("_", " ") in query.lower():
-                warnings.append(warning)
-                
+
+        # Basic logical analysis (rules engine): one pass over the query finds
+        # technical terms, warnings and priced service types
+        match = knowledge.matcher.match(query)
+
+        # 1. Technical terms
+        terms_found = match.labels("term")
+
+        # 2. Warnings
+        warnings = [knowledge.warnings[key] for key in match.labels("warning")]
+
         # 3. Estimate Price Multiplier
         multiplier = 1.0
         factors_found = []
-        
-        pricing = knowledge.get("pricing_factors", {})
-        
+
         # Check service type
-        for stype, factor in pricing.get("service_type", {}).items():
-            if stype.replace("_", " ") in query.lower():
-                multiplier *= factor
-                factors_found.append(f"Service: {stype} (x{factor})")
-                
+        for stype in match.labels("service_type"):
+            factor = knowledge.service_factors[stype]
+            multiplier *= factor
+            factors_found.append(f"Service: {stype} (x{factor})")
+
         # Check length (mock context check)
         if context and "hair_length" in context:
             length = context["hair_length"]
-            if length in pricing.get("hair_length", {}):
-                factor = pricing["hair_length"][length]
+            if length in knowledge.length_factors:
+                factor = knowledge.length_factors[length]
                 multiplier *= factor
                 factors_found.append(f"Length: {length} (x{factor})")
 
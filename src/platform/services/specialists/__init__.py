@@ -7,6 +7,7 @@ by the Consumer Agent to validate and enrich service requests.
 
 from src.platform.services.specialists.base import SpecialistAgent, SpecialistRegistry
 from src.platform.services.specialists.haircut import HaircutSpecialist
+from src.platform.services.specialists.analysis_cache import analysis_cache, analyze_cached
 
 # Register all specialists
 specialist_registry = SpecialistRegistry()
@@ -18,4 +19,6 @@ __all__ = [
     "SpecialistRegistry", 
     "specialist_registry",
     "HaircutSpecialist",
+    "analysis_cache",
+    "analyze_cached",
 ]
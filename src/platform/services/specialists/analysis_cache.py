@@ -0,0 +1,172 @@
+"""
+Specialist analysis cache, keyed by a fingerprint of the analysis inputs.
+
+ChatService._consult_specialist runs after every turn and the
+analyze_session_media task after every upload, but the request they analyze
+(service type, description, budget, media) usually hasn't changed since the
+last run. analyze_cached() fingerprints exactly the inputs a specialist's
+analyze() reads (SpecialistAgent.fingerprint_inputs) plus the ids of the
+attached media, and reuses the stored SpecialistAnalysis when nothing in it
+changed. Adding a photo changes the media ids - and, once described, the
+media descriptions - so it always produces a new fingerprint.
+
+Entries never go stale (the key is the content), so there is no
+invalidation: an in-process LRU in front of Redis, both bounded by TTL /
+size only. Bump SpecialistAgent.analysis_version when analyze() changes.
+
+Layout:
+    specialist:analysis:{fingerprint} -> JSON SpecialistAnalysis
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, Optional
+
+import redis
+import structlog
+
+from src.platform.config import settings
+from src.platform.services.specialists.base import SpecialistAgent, SpecialistAnalysis
+
+logger = structlog.get_logger(__name__)
+
+
+def _normalize(value: Any) -> Any:
+    """Canonical form: collapsed whitespace, numbers as floats, sorted keys (via json)."""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return str(value)
+
+
+def _media_id(item: Any) -> str:
+    if isinstance(item, dict):
+        return str(item.get("id") or item.get("url") or "")
+    return str(getattr(item, "id", None) or getattr(item, "url", None) or item)
+
+
+def analysis_fingerprint(specialist: SpecialistAgent, inputs: Dict[str, Any], media: Iterable[Any] = ()) -> str:
+    """Fingerprint of the analyze() inputs the specialist reads, plus attached media ids."""
+    payload = {
+        "specialist": type(specialist).__name__,
+        "version": specialist.analysis_version,
+        "inputs": {name: _normalize(inputs.get(name)) for name in specialist.fingerprint_inputs},
+        "media": sorted(_media_id(item) for item in media or ()),
+    }
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class AnalysisCache:
+    """Two-tier (LRU + Redis) cache of SpecialistAnalysis results by fingerprint."""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[int] = None, redis_client: Any = None):
+        self.enabled = settings.SPECIALIST_ANALYSIS_CACHE_ENABLED
+        self.max_entries = max_entries or settings.SPECIALIST_ANALYSIS_CACHE_MAX_ENTRIES
+        self.ttl = ttl or settings.SPECIALIST_ANALYSIS_CACHE_TTL
+
+        self._local: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if redis_client is not None:
+            self.redis_client = redis_client
+        else:
+            try:
+                self.redis_client = redis.from_url(settings.REDIS_URL, db=settings.REDIS_CACHE_DB)
+            except Exception as e:
+                logger.error("Failed to connect to Redis for analysis cache", error=str(e))
+                self.redis_client = None
+
+    @staticmethod
+    def _key(fingerprint: str) -> str:
+        return f"specialist:analysis:{fingerprint}"
+
+    def _local_set(self, key: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._local[key] = data
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def get(self, fingerprint: str) -> Optional[SpecialistAnalysis]:
+        if not self.enabled:
+            return None
+        key = self._key(fingerprint)
+        with self._lock:
+            data = self._local.get(key)
+            if data is not None:
+                self._local.move_to_end(key)
+        if data is None and self.redis_client:
+            try:
+                raw = self.redis_client.get(key)
+                if raw:
+                    data = json.loads(raw)
+                    self._local_set(key, data)
+            except Exception as e:
+                logger.error("Analysis cache read error", key=key, error=str(e))
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # Callers merge enriched_data into session state; hand out fresh copies
+        return SpecialistAnalysis(**json.loads(json.dumps(data)))
+
+    def set(self, fingerprint: str, analysis: SpecialistAnalysis) -> None:
+        if not self.enabled:
+            return
+        key = self._key(fingerprint)
+        data = asdict(analysis)
+        self._local_set(key, data)
+        if self.redis_client:
+            try:
+                self.redis_client.setex(key, self.ttl, json.dumps(data, default=str))
+            except Exception as e:
+                logger.error("Analysis cache write error", key=key, error=str(e))
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "local_entries": len(self._local),
+        }
+
+
+# Global instance
+analysis_cache = AnalysisCache()
+
+
+async def analyze_cached(
+    specialist: SpecialistAgent,
+    *,
+    media: Iterable[Any] = (),
+    cache: Optional[AnalysisCache] = None,
+    **inputs: Any,
+) -> SpecialistAnalysis:
+    """specialist.analyze(**inputs), reusing the result while its fingerprint is unchanged."""
+    cache = cache or analysis_cache
+    fingerprint = analysis_fingerprint(specialist, inputs, media)
+    analysis = cache.get(fingerprint)
+    if analysis is not None:
+        logger.debug("specialist_analysis_cache_hit", specialist=specialist.name, fingerprint=fingerprint[:12])
+        return analysis
+    analysis = await specialist.analyze(**inputs)
+    cache.set(fingerprint, analysis)
+    return analysis
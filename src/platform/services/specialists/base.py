@@ -5,10 +5,12 @@ Defines the interface and base class for all specialist agents.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 import logging
 
+from src.platform.services.intent_router import route_service
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +38,14 @@ class SpecialistAgent(ABC):
     - Suggest additional information needed
     """
     
+    # analyze() inputs that determine its result - the analysis cache
+    # fingerprint. Bump analysis_version whenever analyze() changes.
+    fingerprint_inputs: Tuple[str, ...] = (
+        "service_type", "description", "location", "budget", "timing",
+        "media_descriptions", "additional_context",
+    )
+    analysis_version: str = "1"
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -108,17 +118,10 @@ class SpecialistRegistry:
             if specialist.can_handle(service_type):
                 return specialist
         
-        # Check for keywords
-        keywords = {
-            "haircut": ["hair", "cut", "style", "trim", "color", "dye", "highlights", "balayage"],
-            "cleaning": ["clean", "maid", "housekeeping", "tidy"],
-            "plumbing": ["plumb", "pipe", "leak", "drain", "faucet", "toilet"],
-        }
-        
-        for category, terms in keywords.items():
-            if any(term in service_lower for term in terms):
-                if category in self._specialists:
-                    return self._specialists[category]
+        # Check for keywords (shared service taxonomy)
+        category = route_service(service_lower)
+        if category in self._specialists:
+            return self._specialists[category]
         
         return None
     
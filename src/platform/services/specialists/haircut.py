@@ -8,6 +8,7 @@ and enriches requests with professional terminology.
 from typing import Dict, Any, List, Optional
 import logging
 
+from src.platform.services.intent_router import match_intents
 from src.platform.services.specialists.base import SpecialistAgent, SpecialistAnalysis
 
 logger = logging.getLogger(__name__)
@@ -29,34 +30,8 @@ HAIR_TYPES = {
     "4C": "Type 4C - Tight Z-pattern coils",
 }
 
-# Haircut styles knowledge base
-HAIRCUT_STYLES = {
-    "bob": ["classic bob", "a-line bob", "inverted bob", "lob (long bob)", "asymmetric bob"],
-    "pixie": ["classic pixie", "long pixie", "undercut pixie", "textured pixie"],
-    "layers": ["long layers", "short layers", "face-framing layers", "choppy layers"],
-    "bangs": ["curtain bangs", "side-swept bangs", "blunt bangs", "wispy bangs", "baby bangs"],
-    "fade": ["low fade", "mid fade", "high fade", "skin fade", "drop fade"],
-    "undercut": ["disconnected undercut", "undercut with design"],
-    "shag": ["modern shag", "70s shag", "wolf cut"],
-    "other": ["trim", "shape up", "taper", "mullet", "buzz cut"],
-}
-
-# Color services
-COLOR_SERVICES = {
-    "highlights": ["foil highlights", "balayage", "babylights", "partial highlights", "full highlights"],
-    "lowlights": ["lowlights"],
-    "full_color": ["single process", "all-over color", "root touch-up"],
-    "creative": ["ombre", "sombre", "color melt", "fantasy color", "vivid color"],
-    "corrective": ["color correction", "toner", "gloss"],
-}
-
-# Treatments
-TREATMENTS = {
-    "keratin": ["keratin treatment", "Brazilian blowout", "smoothing treatment"],
-    "conditioning": ["deep conditioning", "hair mask", "hot oil treatment"],
-    "repair": ["bond repair", "Olaplex treatment", "K18 treatment"],
-    "scalp": ["scalp treatment", "scalp detox"],
-}
+# Styles, color services and treatments live in the shared intent taxonomy
+# (re-exported here); detection is one compiled pass over the text.
 
 
 class HaircutSpecialist(SpecialistAgent):
@@ -71,6 +46,9 @@ class HaircutSpecialist(SpecialistAgent):
     - Suggest helpful photos if needed
     """
     
+    # analyze() ignores location, timing and additional_context
+    fingerprint_inputs = ("service_type", "description", "budget", "media_descriptions")
+    
     @property
     def name(self) -> str:
         return "Haircut Specialist"
@@ -180,15 +158,16 @@ class HaircutSpecialist(SpecialistAgent):
     
     def _detect_service_type(self, text: str) -> str:
         """Detect the primary service type."""
-        if any(word in text for word in ["color", "dye", "highlight", "balayage", "ombre"]):
-            if any(word in text for word in ["cut", "trim", "style"]):
+        match = match_intents(text)
+        if match.has("hair_service", "color"):
+            if match.has("hair_service", "cut"):
                 return "cut_and_color"
             return "color"
-        if any(word in text for word in ["keratin", "treatment", "conditioning", "repair"]):
+        if match.has("hair_service", "treatment"):
             return "treatment"
-        if any(word in text for word in ["blowout", "blow dry", "styling"]):
+        if match.has("hair_service", "styling"):
             return "styling"
-        if any(word in text for word in ["cut", "trim", "haircut", "bob", "pixie", "layers", "fade"]):
+        if match.has("hair_service", "haircut"):
             return "haircut"
         return "unknown"
     
@@ -235,33 +214,16 @@ class HaircutSpecialist(SpecialistAgent):
         return None
     
     def _detect_styles(self, text: str) -> List[str]:
-        """Detect requested haircut styles."""
-        found = []
-        for category, styles in HAIRCUT_STYLES.items():
-            if category in text:
-                found.append(category)
-            for style in styles:
-                if style in text:
-                    found.append(style)
-        return list(set(found))
+        """Detect requested haircut styles: specific styles, and a category only when named ("a bob")."""
+        return match_intents(text).terms("style")
     
     def _detect_color_services(self, text: str) -> List[str]:
         """Detect color services."""
-        found = []
-        for category, services in COLOR_SERVICES.items():
-            for service in services:
-                if service in text:
-                    found.append(service)
-        return list(set(found))
+        return match_intents(text).terms("color")
     
     def _detect_treatments(self, text: str) -> List[str]:
         """Detect treatments."""
-        found = []
-        for category, treatments in TREATMENTS.items():
-            for treatment in treatments:
-                if treatment in text:
-                    found.append(treatment)
-        return list(set(found))
+        return match_intents(text).terms("treatment")
     
     def _estimate_complexity(
         self, 
@@ -0,0 +1,186 @@
+"""
+Proxie Turn Timing - where a chat turn spends its time.
+
+A TurnTimings object rides along with each chat turn in a ContextVar (so it
+follows the turn into LangGraph node tasks and to_thread calls). Every timed
+section:
+
+- opens an OpenTelemetry span (exported when main.py configures a provider)
+- observes its Prometheus histogram (node / tool / chat stage)
+- appends (name, seconds) to the turn, for the debug Server-Timing header
+
+LLM calls and loop iterations (concierge -> tools -> concierge rounds) are
+counted on the turn and observed once when the outermost turn() exits.
+
+A turn can also carry a listener (the Socket.IO chat handler sets one): it
+is called with ("stage", {"name": ...}) as each timed section starts and
+with ("text", {"content": ...}) for assistant text produced mid-turn, so
+progress can be streamed before the final response.
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import structlog
+from opentelemetry import trace
+
+from src.platform.metrics import (
+    CHAT_STAGE_SECONDS,
+    CHAT_TURN_LLM_CALLS,
+    CHAT_TURN_LOOP_ITERATIONS,
+    ORCHESTRATOR_NODE_SECONDS,
+    TOOL_SECONDS,
+)
+
+logger = structlog.get_logger(__name__)
+tracer = trace.get_tracer("proxie.chat")
+
+_current: ContextVar[Optional["TurnTimings"]] = ContextVar("proxie_turn_timings", default=None)
+
+
+class TurnTimings:
+    """Timing breakdown and counters for one chat turn."""
+
+    __slots__ = ("sections", "llm_calls", "iterations", "started", "finished", "listener")
+
+    def __init__(self):
+        self.sections: List[Tuple[str, float]] = []
+        self.llm_calls = 0
+        self.iterations = 0
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.listener: Optional[Callable[[str, Dict[str, Any]], None]] = None
+
+    @property
+    def total(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def add(self, name: str, seconds: float) -> None:
+        self.sections.append((name, seconds))
+
+    def breakdown(self) -> Dict[str, Any]:
+        """Per-section totals (sections that ran more than once are summed)."""
+        sections: Dict[str, Dict[str, Any]] = {}
+        for name, seconds in self.sections:
+            entry = sections.setdefault(name, {"ms": 0.0, "count": 0})
+            entry["ms"] += seconds * 1000
+            entry["count"] += 1
+        for entry in sections.values():
+            entry["ms"] = round(entry["ms"], 1)
+        return {
+            "total_ms": round(self.total * 1000, 1),
+            "llm_calls": self.llm_calls,
+            "iterations": self.iterations,
+            "sections": sections,
+        }
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, e.g. `node.concierge;dur=812.4;desc="x2"`."""
+        data = self.breakdown()
+        parts = [
+            f'{name};dur={entry["ms"]}' + (f';desc="x{entry["count"]}"' if entry["count"] > 1 else "")
+            for name, entry in data["sections"].items()
+        ]
+        parts.append(f'llm;desc="{data["llm_calls"]} calls"')
+        parts.append(f'loop;desc="{data["iterations"]} iterations"')
+        parts.append(f'total;dur={data["total_ms"]}')
+        return ", ".join(parts)
+
+
+def current_turn() -> Optional[TurnTimings]:
+    return _current.get()
+
+
+@contextmanager
+def turn(session_id: Optional[str] = None) -> Iterator[TurnTimings]:
+    """
+    Track one chat turn. Re-entrant: an inner turn() (handle_chat inside a
+    router that already opened one) joins the outer turn.
+    """
+    existing = _current.get()
+    if existing is not None:
+        yield existing
+        return
+
+    timings = TurnTimings()
+    token = _current.set(timings)
+    try:
+        with tracer.start_as_current_span("chat.turn") as span:
+            if session_id:
+                span.set_attribute("proxie.session_id", session_id)
+            try:
+                yield timings
+            finally:
+                span.set_attribute("proxie.llm_calls", timings.llm_calls)
+                span.set_attribute("proxie.loop_iterations", timings.iterations)
+    finally:
+        _current.reset(token)
+        timings.finished = time.perf_counter()
+        CHAT_TURN_LLM_CALLS.observe(timings.llm_calls)
+        CHAT_TURN_LOOP_ITERATIONS.observe(timings.iterations)
+        logger.info("chat_turn_timing", session_id=session_id, **timings.breakdown())
+
+
+def progress(kind: str, **data: Any) -> None:
+    """Report turn progress to the turn's listener, if any. Never raises."""
+    timings = _current.get()
+    if timings is None or timings.listener is None:
+        return
+    try:
+        timings.listener(kind, data)
+    except Exception as e:
+        logger.warning("turn_progress_listener_failed", kind=kind, error=str(e))
+
+
+@contextmanager
+def _timed(name: str, span_name: str, histogram: Any) -> Iterator[None]:
+    progress("stage", name=name)
+    start = time.perf_counter()
+    try:
+        with tracer.start_as_current_span(span_name):
+            yield
+    finally:
+        elapsed = time.perf_counter() - start
+        histogram.observe(elapsed)
+        timings = _current.get()
+        if timings is not None:
+            timings.add(name, elapsed)
+
+
+def stage(name: str):
+    """Time a handle_chat stage (profile, extraction, session_save, ...)."""
+    return _timed(f"chat.{name}", f"chat.{name}", CHAT_STAGE_SECONDS.labels(stage=name))
+
+
+def tool(name: str):
+    """Time one tool execution."""
+    return _timed(f"tool.{name}", f"tool.{name}", TOOL_SECONDS.labels(tool=name))
+
+
+def node(name: str) -> Callable:
+    """Decorator timing an async orchestrator node."""
+    def decorator(fn: Callable) -> Callable:
+        histogram = ORCHESTRATOR_NODE_SECONDS.labels(node=name)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with _timed(f"node.{name}", f"orchestrator.{name}", histogram):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count_llm_call() -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.llm_calls += 1
+
+
+def count_iteration() -> None:
+    """One concierge -> tools round trip."""
+    timings = _current.get()
+    if timings is not None:
+        timings.iterations += 1
@@ -1,16 +1,45 @@
+import asyncio
+from uuid import uuid4
+
 import socketio
 import structlog
-from typing import Optional, Dict, Any
+from pydantic import ValidationError
+from typing import Awaitable, Callable, Optional, Dict, Any
 from src.platform.config import settings
 from src.platform.sessions import session_manager
 from src.platform.auth import verify_token
+from src.platform.schemas.chat import ChatRequest
+from src.platform.services import turn_timing
+from src.platform.services.notifications import notifier, user_room, valid_cursor
 
 logger = structlog.get_logger()
 
+def create_client_manager(write_only: bool = False):
+    """
+    The Redis pub/sub client manager when SOCKETIO_MESSAGE_QUEUE is set, else
+    None (rooms live in this process only).
+
+    The server's manager publishes every emit and delivers what any node
+    publishes to its own clients, so a room emit reaches the room's members
+    on every API replica. write_only=True gives a synchronous, publish-only
+    manager for processes without a Socket.IO server (Celery workers).
+    """
+    url = settings.SOCKETIO_MESSAGE_QUEUE
+    if not url:
+        return None
+    try:
+        if write_only:
+            return socketio.RedisManager(url, channel=settings.SOCKETIO_CHANNEL, write_only=True)
+        return socketio.AsyncRedisManager(url, channel=settings.SOCKETIO_CHANNEL)
+    except Exception as e:
+        logger.error("socketio_client_manager_failed", error=str(e))
+        return None
+
 # Create Socket.io server
 sio = socketio.AsyncServer(
     async_mode='asgi',
-    cors_allowed_origins=settings.cors_origins_list
+    cors_allowed_origins=settings.cors_origins_list,
+    client_manager=create_client_manager()
 )
 
 # Wrapper for FastAPI integration
@@ -58,12 +87,14 @@ async def connect(sid, environ, auth: Optional[Dict[str, Any]] = None):
         if bypass_secret and environ.get("HTTP_X_LOAD_TEST_SECRET") == bypass_secret:
             logger.info("socket_auth_bypass", sid=sid, type="load_test")
             # Store test user info in session
+            user_id = environ.get("HTTP_X_TEST_USER_ID", "test_user")
             await sio.save_session(sid, {
-                "user_id": environ.get("HTTP_X_TEST_USER_ID", "test_user"),
+                "user_id": user_id,
                 "role": environ.get("HTTP_X_TEST_USER_ROLE", "consumer"),
                 "authenticated": True
             })
-            logger.info("socket_connected", sid=sid, user_id="test_user")
+            await _join_user_room(sid, user_id)
+            logger.info("socket_connected", sid=sid, user_id=user_id)
             return True
     
     # Require authentication
@@ -89,16 +120,27 @@ async def connect(sid, environ, auth: Optional[Dict[str, Any]] = None):
             "token_data": decoded_token
         })
         
-        logger.info("socket_connected", sid=sid, user_id=user_id)
-        return True  # Accept connection
-        
     except Exception as e:
         logger.error("socket_auth_failed", sid=sid, error=str(e))
         return False  # Reject connection
+
+    await _join_user_room(sid, user_id)
+    logger.info("socket_connected", sid=sid, user_id=user_id)
+    return True  # Accept connection
+
+async def _join_user_room(sid, user_id: str):
+    """Subscribe the connection to its user's notifications (services/notifications.py)."""
+    notifier.bind_loop(asyncio.get_running_loop())
+    try:
+        await sio.enter_room(sid, user_room(user_id))
+    except Exception as e:
+        logger.warning("socket_user_room_join_failed", sid=sid, user_id=user_id, error=str(e))
     
 @sio.event
 async def disconnect(sid):
     """Handle client disconnection."""
+    # Nobody is waiting for this connection's chat turns any more
+    chat_turns.cancel(sid)
     # Get session info before clearing
     session = await sio.get_session(sid)
     user_id = session.get("user_id") if session else None
@@ -120,9 +162,64 @@ async def join_session(sid, data):
         return {"status": "ok"}
     return {"status": "error", "message": "session_id required"}
 
+class ChatTurns:
+    """
+    chat_message turns per connection. One turn runs at a time and at most
+    SOCKET_CHAT_MAX_PENDING more wait behind it; further messages are
+    refused until the queue drains. A disconnect cancels the running turn
+    and drops the waiting ones.
+    """
+
+    def __init__(self):
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._pending: Dict[str, int] = {}
+
+    def submit(self, sid: str, turn: Callable[[], Awaitable[None]]) -> bool:
+        """Queue a turn for the connection; False when it already has too many."""
+        pending = self._pending.get(sid, 0)
+        if pending > settings.SOCKET_CHAT_MAX_PENDING:
+            return False
+        if sid not in self._workers:
+            self._queues[sid] = asyncio.Queue()
+            self._workers[sid] = asyncio.create_task(self._run(sid, self._queues[sid]))
+        self._pending[sid] = pending + 1
+        self._queues[sid].put_nowait(turn)
+        return True
+
+    def cancel(self, sid: str) -> None:
+        worker = self._workers.pop(sid, None)
+        self._queues.pop(sid, None)
+        self._pending.pop(sid, None)
+        if worker is not None:
+            worker.cancel()
+
+    async def _run(self, sid: str, queue: asyncio.Queue):
+        while True:
+            turn = await queue.get()
+            try:
+                await turn()
+            except Exception as e:
+                logger.error("socket_chat_turn_failed", sid=sid, error=str(e))
+            finally:
+                if sid in self._pending:
+                    self._pending[sid] -= 1
+
+
+chat_turns = ChatTurns()
+
 @sio.event
 async def chat_message(sid, data):
-    """Handle incoming chat message via WebSocket."""
+    """
+    Run a chat turn over the socket - the same turn as POST /chat/, as the
+    authenticated user. The payload is a ChatRequest ("content" is accepted
+    for "message"); without a session_id a new session is started.
+
+    The connection joins session:{session_id}, and the room gets chat:delta
+    events while the turn runs (stages as they start, interim assistant
+    text) and chat:response when it finishes, or chat:error if it fails. The ack is
+    {"status": "queued", "session_id": ...}.
+    """
     # Verify user is authenticated
     session = await sio.get_session(sid)
     if not session or not session.get("authenticated"):
@@ -130,23 +227,112 @@ async def chat_message(sid, data):
         await sio.emit("error", {"message": "Authentication required"}, room=sid)
         return
     
-    session_id = data.get("session_id")
-    content = data.get("content")
+    data = data or {}
+    try:
+        chat_request = ChatRequest(**{**data, "message": data.get("message", data.get("content"))})
+    except ValidationError as e:
+        logger.warning("socket_chat_invalid", sid=sid, error=str(e))
+        return {"status": "error", "message": "Invalid chat message"}
+    chat_request.session_id = chat_request.session_id or str(uuid4())
+    session_id = chat_request.session_id
     user_id = session.get("user_id")
     
+    await sio.enter_room(sid, f"session:{session_id}")
+    if not chat_turns.submit(sid, lambda: run_chat_turn(chat_request, user_id)):
+        logger.warning("socket_chat_backpressure", sid=sid, session_id=session_id, user_id=user_id)
+        return {"status": "error", "message": "Too many messages in flight", "session_id": session_id}
+    
     logger.info("socket_chat_message", sid=sid, session_id=session_id, user_id=user_id)
+    return {"status": "queued", "session_id": session_id}
+
+async def run_chat_turn(chat_request: ChatRequest, clerk_id: Optional[str]):
+    """One chat turn, streamed to its session room."""
+    from src.platform.services.chat import chat_service
+
+    session_id = chat_request.session_id
+    room = f"session:{session_id}"
+    loop = asyncio.get_running_loop()
+    deltas: asyncio.Queue = asyncio.Queue()
+
+    async def send_deltas():
+        while (delta := await deltas.get()) is not None:
+            kind, data = delta
+            await sio.emit("chat:delta", {"session_id": session_id, "type": kind, **data}, room=room)
+
+    # Progress can be reported from to_thread calls; keep it in order on the loop
+    def on_progress(kind: str, data: Dict[str, Any]):
+        loop.call_soon_threadsafe(deltas.put_nowait, (kind, data))
+
+    sender = asyncio.create_task(send_deltas())
+    try:
+        with turn_timing.turn(session_id) as timings:
+            timings.listener = on_progress
+            _, content, data, draft, awaiting_approval = await chat_service.handle_chat(
+                message=chat_request.message,
+                session_id=session_id,
+                role=chat_request.role,
+                consumer_id=chat_request.consumer_id,
+                provider_id=chat_request.provider_id,
+                enrollment_id=chat_request.enrollment_id,
+                media=chat_request.media,
+                action=chat_request.action,
+                clerk_id=clerk_id
+            )
+    except Exception as e:
+        sender.cancel()
+        logger.error("socket_chat_turn_failed", session_id=session_id, error=str(e))
+        # The client is waiting for chat:response; tell it the turn is over
+        await sio.emit("chat:error", {
+            "session_id": session_id,
+            "message": "Sorry, something went wrong handling your message. Please try again."
+        }, room=room)
+        return
+    except BaseException:
+        sender.cancel()
+        raise
+    loop.call_soon(deltas.put_nowait, None)
+    await sender
     
-    # Broadcast echo (for testing) or send to agent logic
-    await sio.emit("chat:echo", data, room=f"session:{session_id}")
+    await broadcast_agent_response(
+        session_id, content, data,
+        draft=draft.model_dump(mode="json") if hasattr(draft, "model_dump") else draft,
+        awaiting_approval=awaiting_approval
+    )
 
-async def broadcast_agent_response(session_id: str, content: str, data: dict = None):
+async def broadcast_agent_response(
+    session_id: str,
+    content: str,
+    data: dict = None,
+    draft: Optional[dict] = None,
+    awaiting_approval: bool = False
+):
     """Utility to send agent response to all clients in a session room."""
     await sio.emit("chat:response", {
         "session_id": session_id,
         "content": content,
-        "data": data
+        "data": data,
+        "draft": draft,
+        "awaiting_approval": awaiting_approval
     }, room=f"session:{session_id}")
 
+@sio.event
+async def catch_up(sid, data):
+    """
+    Events the user missed while disconnected. The client sends the last
+    cursor it saw ({"cursor": ...}) after reconnecting; the reply lists the
+    newer events oldest first, each with its own cursor.
+    """
+    session = await sio.get_session(sid)
+    if not session or not session.get("authenticated"):
+        logger.warning("socket_unauthorized_action", sid=sid, action="catch_up")
+        return {"status": "error", "message": "Authentication required"}
+
+    cursor = (data or {}).get("cursor")
+    if cursor and not valid_cursor(cursor):
+        return {"status": "error", "message": "Invalid cursor"}
+    events = notifier.missed(session.get("user_id"), cursor)
+    return {"status": "ok", "events": events, "cursor": events[-1]["cursor"] if events else cursor}
+
 async def emit_notification(user_id: str, event: str, payload: dict):
-    """Utility to send notification to a specific user (future logic)."""
-    await sio.emit(event, payload, room=f"user:{user_id}")
+    """Send a notification to a specific user's room, logged for catch-up."""
+    await notifier.notify(user_id, event, payload)
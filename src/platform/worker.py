@@ -2,11 +2,24 @@
 Proxie Celery Worker - Background Task Processing
 
 Handles offloading of heavy processing, such as LLM specialist analysis.
+
+Tasks are sync but most of the work is async. Each worker process runs one
+event loop for its lifetime, on a background thread started in
+worker_process_init, and tasks submit their coroutines to it through
+_run_async. Loop-bound clients therefore stay warm across tasks instead of
+being rebuilt per task: the asyncpg pool, LiteLLM's HTTP clients, the
+embedding batcher.
 """
 
+import asyncio
+import os
+import threading
 from celery import Celery
+from celery.signals import (
+    worker_init, worker_process_init, worker_process_shutdown, worker_shutdown,
+)
 import structlog
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 from src.platform.config import settings
 
 logger = structlog.get_logger()
@@ -27,18 +40,134 @@ celery_app.conf.update(
     enable_utc=True,
     task_track_started=True,
     task_time_limit=300,  # 5 minutes max
-    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    # Embedding and matching work have their own queues so a backlog there
+    # never delays chat
+    task_routes={
+        "reembed_providers": {"queue": settings.EMBEDDING_QUEUE},
+        "match_request": {"queue": settings.MATCHING_QUEUE},
+    },
 )
 
+
+@worker_init.connect
+@worker_process_init.connect
+def _init_socketio_emitter(**kwargs):
+    """Workers have no Socket.IO server: publish notifications through Redis to the API nodes."""
+    from src.platform.services.notifications import notifier
+    from src.platform.socket_io import create_client_manager
+
+    emitter = create_client_manager(write_only=True)
+    if emitter is not None:
+        notifier.use_emitter(emitter)
+        logger.info("worker_socketio_emitter_ready", channel=settings.SOCKETIO_CHANNEL)
+
+
+class WorkerLoop:
+    """The worker process's event loop, running on its own thread."""
+
+    def __init__(self):
+        self.enabled = False  # set on worker start; elsewhere _run_async keeps asyncio.run
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        # A loop inherited through fork has no thread in this process
+        return self.loop is not None and self._pid == os.getpid() and self._thread.is_alive()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if not self.running:
+                self.loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self.loop.run_forever, name="worker-event-loop", daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+                logger.info("worker_event_loop_started", pid=self._pid)
+            return self.loop
+
+    def run(self, coro) -> Any:
+        """Run a coroutine on the loop and wait for its result."""
+        future = asyncio.run_coroutine_threadsafe(coro, self.start())
+        try:
+            return future.result()
+        except BaseException:
+            # Time limit or shutdown while waiting: don't leave the coroutine running
+            future.cancel()
+            raise
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        loop = self.loop
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_clients(), loop).result(timeout=10)
+        except Exception as e:
+            logger.warning("worker_event_loop_cleanup_failed", error=str(e))
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=10)
+        loop.close()
+        self.loop = None
+        logger.info("worker_event_loop_stopped", pid=self._pid)
+
+    @staticmethod
+    async def _close_clients():
+        from src.platform.database import async_engine
+        await async_engine.dispose()
+        await asyncio.get_running_loop().shutdown_asyncgens()
+
+
+worker_loop = WorkerLoop()
+
+
+@worker_init.connect
+def _enable_worker_loop(**kwargs):
+    # solo / threads pools run tasks in this process: the loop starts with the first task
+    worker_loop.enabled = True
+
+
+@worker_process_init.connect
+def _start_worker_loop(**kwargs):
+    worker_loop.enabled = True
+    worker_loop.start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _stop_worker_loop(**kwargs):
+    worker_loop.stop()
+
+
+@worker_process_init.connect
+def _start_provider_index_refresh(**kwargs):
+    # Matching runs here: have the index loaded and synced before the first task
+    from src.platform.services.provider_index import provider_index
+    provider_index.start_refresher()
+
+
+def _run_async(coro):
+    """Run a coroutine to completion from a task, whether or not a loop is running."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        if worker_loop.enabled:
+            return worker_loop.run(coro)
+        return asyncio.run(coro)
+    # Eager mode inside an async caller: run on a separate thread's loop
+    import concurrent.futures
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
 @celery_app.task(name="analyze_session_media")
 def analyze_session_media(session_id: str):
     """
     Background task to analyze media in a session and consult specialists.
     """
     from src.platform.sessions import session_manager
-    from src.platform.services.specialists import specialist_registry
+    from src.platform.services.specialists import analyze_cached, specialist_registry
     from src.platform.services.llm_gateway import llm_gateway
-    import asyncio
 
     logger.info("Starting background media analysis", session_id=session_id)
     
@@ -74,10 +203,12 @@ def analyze_session_media(session_id: str):
         # Run async analysis - handle both sync and async contexts
         try:
             from dataclasses import asdict
-            import asyncio
             
             async def run_analysis():
-                return await specialist.analyze(
+                # Retries and repeat runs over an unchanged request reuse the analysis
+                return await analyze_cached(
+                    specialist,
+                    media=media,
                     service_type=service_type or "haircut",
                     description=context.get("gathered_info", {}).get("description", "Media analysis"),
                     location=context.get("gathered_info", {}).get("location", {}),
@@ -87,16 +218,7 @@ def analyze_session_media(session_id: str):
                     additional_context={"is_background": True}
                 )
             
-            # Try to get existing loop or create new one
-            try:
-                loop = asyncio.get_running_loop()
-                # We're in an async context, use nest_asyncio or run_coroutine_threadsafe
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    analysis = pool.submit(asyncio.run, run_analysis()).result()
-            except RuntimeError:
-                # No running loop, we can use asyncio.run
-                analysis = asyncio.run(run_analysis())
+            analysis = _run_async(run_analysis())
             
             # Update session
             context["specialist_analysis"] = asdict(analysis)
@@ -137,7 +259,8 @@ def process_chat_message_task(
     1. Load/create session
     2. Process message through orchestrator
     3. Handle tool calls
-    4. Return response
+    4. Publish the outcome to waiters and the session room
+    5. Return response
     
     Returns:
         dict: {
@@ -148,13 +271,14 @@ def process_chat_message_task(
             "awaiting_approval": bool
         }
     """
-    import asyncio
     from src.platform.services.chat import chat_service
+    from src.platform.services.chat_tasks import chat_task_results, outcome
     from src.platform.schemas.media import MediaAttachment
     
+    task_id = self.request.id
     logger.info(
         "Processing chat message task",
-        task_id=self.request.id,
+        task_id=task_id,
         session_id=session_id,
         role=role
     )
@@ -168,62 +292,41 @@ def process_chat_message_task(
                 for m in media
             ]
         
-        # Run async chat handler
-        # Handle both sync and async contexts
-        try:
-            loop = asyncio.get_running_loop()
-            # We're in an async context, need to use nest_asyncio or run in thread
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(
-                    asyncio.run,
-                    chat_service.handle_chat(
-                        message=message,
-                        session_id=session_id,
-                        role=role,
-                        consumer_id=consumer_id,
-                        provider_id=provider_id,
-                        enrollment_id=enrollment_id,
-                        media=media_attachments,
-                        action=action,
-                        clerk_id=clerk_id
-                    )
-                )
-                result = future.result()
-        except RuntimeError:
-            # No running loop, we can use asyncio.run directly
-            result = asyncio.run(
-                chat_service.handle_chat(
-                    message=message,
-                    session_id=session_id,
-                    role=role,
-                    consumer_id=consumer_id,
-                    provider_id=provider_id,
-                    enrollment_id=enrollment_id,
-                    media=media_attachments,
-                    action=action,
-                    clerk_id=clerk_id
-                )
+        session_id_result, response_msg, data, draft, awaiting_approval = _run_async(
+            chat_service.handle_chat(
+                message=message,
+                session_id=session_id,
+                role=role,
+                consumer_id=consumer_id,
+                provider_id=provider_id,
+                enrollment_id=enrollment_id,
+                media=media_attachments,
+                action=action,
+                clerk_id=clerk_id
             )
+        )
         
-        session_id_result, response_msg, data, draft, awaiting_approval = result
-        
-        return {
+        result = {
             "status": "completed",
             "session_id": session_id_result,
             "message": response_msg,
             "data": data,
-            "draft": draft.model_dump() if draft else None,
+            "draft": draft.model_dump(mode="json") if draft else None,
             "awaiting_approval": awaiting_approval
         }
+        # Push completion instead of waiting to be polled (services/chat_tasks.py)
+        _run_async(chat_task_results.publish(task_id, session_id_result, outcome(task_id, result=result)))
+        return result
         
     except Exception as e:
         logger.error(
             "Chat message processing failed",
-            task_id=self.request.id,
+            task_id=task_id,
             error=str(e),
             exc_info=True
         )
+        # Waiters and the session room learn about the failure too
+        _run_async(chat_task_results.publish(task_id, session_id, outcome(task_id, error=str(e))))
         # Update task state
         self.update_state(
             state="FAILURE",
@@ -232,6 +335,62 @@ def process_chat_message_task(
         raise
 
 
+@celery_app.task(name="reembed_providers", bind=True, max_retries=5, default_retry_delay=30)
+def reembed_providers_task(self, provider_ids: Optional[List[str]] = None, force: bool = False):
+    """
+    Re-embed providers whose index text changed.
+
+    With provider_ids, embeds exactly those (the fallback when Redis is
+    unavailable); without, drains the coalesced pending set in batches.
+    """
+    from src.platform.services.provider_embeddings import reembed_providers, reembed_queue
+
+    totals = {"embedded": 0, "skipped": 0, "missing": 0}
+
+    def add(stats):
+        for key, value in stats.items():
+            totals[key] += value
+
+    if provider_ids is not None:
+        try:
+            add(_run_async(reembed_providers(provider_ids, force=force)))
+        except Exception as e:
+            logger.error("reembed_providers_failed", count=len(provider_ids), error=str(e))
+            raise self.retry(exc=e)
+        return totals
+
+    reembed_queue.begin_flush()
+    while True:
+        batch = reembed_queue.pop_batch()
+        if not batch:
+            break
+        try:
+            add(_run_async(reembed_providers(batch, force=force)))
+        except Exception as e:
+            logger.error("reembed_providers_failed", count=len(batch), error=str(e))
+            reembed_queue.requeue(batch)
+            raise self.retry(exc=e)
+    logger.info("reembed_providers_flushed", **totals)
+    return totals
+
+
+@celery_app.task(name="match_request", bind=True, max_retries=settings.MATCHING_MAX_RETRIES)
+def match_request_task(self, request_id: str):
+    """
+    Match a new or edited service request, record the matches, mark it
+    "matched" and notify the consumer and providers. Retried with
+    exponential backoff (5s, 10s, 20s, ... capped at 5 minutes).
+    """
+    from src.platform.services.request_matches import match_request
+
+    try:
+        matched_ids = _run_async(match_request(request_id))
+    except Exception as e:
+        logger.error("match_request_failed", request_id=request_id, attempt=self.request.retries + 1, error=str(e))
+        raise self.retry(exc=e, countdown=min(5 * 2 ** self.request.retries, 300))
+    return {"request_id": request_id, "matched": len(matched_ids)}
+
+
 @celery_app.task(name="process_llm_inference")
 def process_llm_inference(messages: list, context: dict):
     """
@@ -33,3 +33,26 @@ async def test_specialist_node_execution():
     specialist_msgs = [m for m in final_messages if "Specialist" in m.content]
     assert len(specialist_msgs) > 0
     assert "Haircut Specialist" in specialist_msgs[0].content
+
+
+@pytest.mark.asyncio
+async def test_specialist_node_reuses_unchanged_consult(monkeypatch):
+    """The same question (after normalization) isn't consulted twice."""
+    from src.platform.services import orchestrator
+    from src.platform.services.specialist_service import specialist_service
+
+    calls = []
+    real = specialist_service.consult
+    monkeypatch.setattr(specialist_service, "consult", lambda *args: calls.append(args) or real(*args))
+
+    state = {"messages": [HumanMessage(content="I need a fade")], "context": {}, "current_specialist": "haircut"}
+    first = await orchestrator._specialist(state)
+    again = {**state, "messages": [HumanMessage(content="i need a FADE!")], "context": first["context"]}
+    second = await orchestrator._specialist(again)
+
+    assert len(calls) == 1
+    assert second["messages"][0].content == first["messages"][0].content
+
+    changed = {**state, "messages": [HumanMessage(content="I need a taper")], "context": second["context"]}
+    await orchestrator._specialist(changed)
+    assert len(calls) == 2
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.platform.config import settings
+from src.platform.services import orchestrator as orchestrator_module
+from src.platform.services.orchestrator import create_orchestrator
+
+
+def _fake_specialist(delay):
+    async def specialist(state):
+        await asyncio.sleep(delay)
+        return {
+            "messages": [AIMessage(content="analysis")],
+            "context": {**state["context"], "specialist_analysis": "analysis"},
+            "next_step": "concierge",
+        }
+    return specialist
+
+
+def _fake_concierge(delay, seen):
+    async def concierge(state):
+        seen.append(state["context"].get("specialist_analysis"))
+        await asyncio.sleep(delay)
+        return {
+            "messages": [AIMessage(content="answer")],
+            "response_text": "answer",
+            "context": state["context"],
+            "next_step": "end",
+        }
+    return concierge
+
+
+async def _run(monkeypatch, specialist_delay, concierge_delay, window_ms):
+    seen = []
+    monkeypatch.setattr(orchestrator_module, "_specialist", _fake_specialist(specialist_delay))
+    monkeypatch.setattr(orchestrator_module, "_concierge", _fake_concierge(concierge_delay, seen))
+    monkeypatch.setattr(settings, "ORCHESTRATOR_SPECULATIVE_RESTART_MS", window_ms)
+    graph = create_orchestrator(speculative=True)
+    state = await graph.ainvoke({"messages": [HumanMessage(content="I need a haircut")], "context": {}})
+    return state, seen
+
+
+@pytest.mark.asyncio
+async def test_speculative_restarts_when_analysis_is_early(monkeypatch):
+    """Analysis inside the restart window restarts the concierge with it."""
+    state, seen = await _run(monkeypatch, specialist_delay=0.01, concierge_delay=0.2, window_ms=100)
+
+    assert seen == [None, "analysis"]
+    assert [m.content for m in state["messages"]] == ["I need a haircut", "analysis", "answer"]
+
+
+@pytest.mark.asyncio
+async def test_speculative_defers_late_analysis(monkeypatch):
+    """Late analysis keeps the speculative answer and is stored for the next pass."""
+    start = asyncio.get_running_loop().time()
+    state, seen = await _run(monkeypatch, specialist_delay=0.15, concierge_delay=0.15, window_ms=10)
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert seen == [None]
+    assert state["response_text"] == "answer"
+    assert state["context"]["specialist_analysis"] == "analysis"
+    assert [m.content for m in state["messages"]] == ["I need a haircut", "analysis", "answer"]
+    # Ran in parallel, not back to back
+    assert elapsed < 0.28
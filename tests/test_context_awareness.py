@@ -77,3 +77,44 @@ class TestContextAwareness:
         assert "name" in summary
         assert "service_type" in summary
         assert "location" not in summary
+
+    def test_facts_log_dedup(self):
+        """Re-loading the same profile every turn doesn't grow the facts log"""
+        context = ConversationContext()
+        profile = {"name": "Maya", "email": "maya@test.com"}
+        for _ in range(10):
+            context.update_from_profile(profile)
+
+        assert len(context.facts_log) == 2
+
+    def test_facts_log_capped(self):
+        """Facts log is a ring buffer; oldest facts fall off"""
+        from src.platform.services.context_tracker import FACTS_LOG_MAX
+        context = ConversationContext()
+        for i in range(FACTS_LOG_MAX + 25):
+            context.update_from_extraction({"service_type": f"service-{i}"}, ContextSource.CURRENT_MESSAGE)
+
+        assert len(context.facts_log) == FACTS_LOG_MAX
+        assert context.facts_log[-1].value == f"service-{FACTS_LOG_MAX + 24}"
+        assert context.facts_log[0].value == "service-25"
+
+    def test_summary_memo_invalidated_on_update(self):
+        """Memoized summary/missing fields refresh when a field changes"""
+        context = ConversationContext()
+        assert "service_type" in context.get_missing_required("service_request")
+
+        context.service_type = "haircut"
+        assert "service_type" in context.get_known_summary()
+        assert "service_type" not in context.get_missing_required("service_request")
+
+    def test_session_round_trip(self):
+        """dict() output rebuilds an equivalent context; unknown session keys are ignored"""
+        context = ConversationContext()
+        context.update_from_extraction({"service_type": "haircut", "budget_max": "80"}, ContextSource.CURRENT_MESSAGE)
+        session_context = {**context.dict(), "session_id": "abc", "media": []}
+
+        rebuilt = ConversationContext(**session_context)
+
+        assert rebuilt.get_known_summary() == context.get_known_summary()
+        assert rebuilt.budget_max == 80.0
+        assert len(rebuilt.facts_log) == len(context.facts_log)
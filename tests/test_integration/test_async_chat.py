@@ -159,6 +159,54 @@ class TestAsyncChatProcessing:
                 assert data["status"] == "FAILURE"
                 assert data["error"] == "Task failed: Error message"
     
+    def test_wait_returns_published_result(self, client: TestClient, auth_headers, mock_user):
+        """Long-poll returns the result the worker published, without a backend lookup."""
+        published = {
+            "task_id": "test_task_123",
+            "status": "SUCCESS",
+            "result": {"session_id": "session_123", "message": "Response message"},
+            "error": None
+        }
+        with patch('src.platform.auth.get_optional_user', return_value=mock_user):
+            with patch('src.platform.routers.chat.chat_task_results.stored', return_value=None):
+                with patch('src.platform.routers.chat.chat_task_results.wait_for_result',
+                           new=AsyncMock(return_value=published)) as wait:
+                    mock_result = Mock()
+                    mock_result.state = "STARTED"
+                    mock_result.ready.return_value = False
+                    with patch('src.platform.routers.chat.AsyncResult', return_value=mock_result):
+                        response = client.get(
+                            "/chat/task/test_task_123/wait?timeout=120",
+                            headers=auth_headers
+                        )
+                    
+                    assert response.status_code == status.HTTP_200_OK
+                    data = response.json()
+                    assert data["status"] == "SUCCESS"
+                    assert data["result"]["message"] == "Response message"
+                    # Capped at CHAT_TASK_WAIT_MAX_SECONDS
+                    assert wait.await_args.args == ("test_task_123", settings.CHAT_TASK_WAIT_MAX_SECONDS)
+    
+    def test_wait_timeout_returns_current_state(self, client: TestClient, auth_headers, mock_user):
+        """When nothing is published in time, the task's current state is returned."""
+        with patch('src.platform.auth.get_optional_user', return_value=mock_user):
+            with patch('src.platform.routers.chat.chat_task_results.stored', return_value=None):
+                with patch('src.platform.routers.chat.chat_task_results.wait_for_result',
+                           new=AsyncMock(return_value=None)):
+                    mock_result = Mock()
+                    mock_result.state = "STARTED"
+                    mock_result.ready.return_value = False
+                    with patch('src.platform.routers.chat.AsyncResult', return_value=mock_result):
+                        response = client.get(
+                            "/chat/task/test_task_123/wait?timeout=1",
+                            headers=auth_headers
+                        )
+                    
+                    assert response.status_code == status.HTTP_200_OK
+                    data = response.json()
+                    assert data["status"] == "STARTED"
+                    assert data["result"] is None
+    
     def test_celery_task_processes_chat(self):
         """Test that Celery task properly processes chat messages."""
         from src.platform.worker import process_chat_message_task
@@ -0,0 +1,149 @@
+"""
+Multi-process test for Socket.IO fan-out through the Redis client manager.
+
+Starts two Socket.IO server processes sharing SOCKETIO_MESSAGE_QUEUE and
+checks that room emits cross between them, and that a worker-style
+write-only manager reaches clients on either node. Needs a reachable Redis
+(SOCKETIO_TEST_REDIS_URL, default REDIS_URL); skipped otherwise.
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from uuid import uuid4
+
+import pytest
+import redis
+import socketio
+
+from src.platform.config import settings
+
+REDIS_URL = os.environ.get("SOCKETIO_TEST_REDIS_URL", settings.REDIS_URL)
+
+# One API node: the app's Socket.IO server plus a "relay" event that emits
+# to any room, so a client on one node can trigger a room emit there
+NODE_SCRIPT = """
+import sys
+import uvicorn
+from src.platform.socket_io import sio, socket_app
+
+@sio.on("relay")
+async def relay(sid, data):
+    await sio.emit("relayed", data["payload"], room=data["room"])
+
+uvicorn.run(socket_app, host="127.0.0.1", port=int(sys.argv[1]), log_level="warning")
+"""
+
+
+def _redis_available() -> bool:
+    try:
+        return redis.from_url(REDIS_URL, socket_connect_timeout=1).ping()
+    except redis.RedisError:
+        return False
+
+
+pytestmark = pytest.mark.skipif(not _redis_available(), reason="Redis not reachable")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Socket.IO node on port {port} did not start")
+
+
+@pytest.fixture(scope="module")
+def channel():
+    return f"proxie-socketio-test-{uuid4().hex[:8]}"
+
+
+@pytest.fixture(scope="module")
+def nodes(channel):
+    """Two API processes sharing one message queue."""
+    env = {
+        **os.environ,
+        "ENVIRONMENT": "testing",
+        "SOCKETIO_MESSAGE_QUEUE": REDIS_URL,
+        "SOCKETIO_CHANNEL": channel,
+        "LITELLM_LOCAL_MODEL_COST_MAP": "True",
+    }
+    ports = [_free_port(), _free_port()]
+    processes = [
+        subprocess.Popen([sys.executable, "-c", NODE_SCRIPT, str(port)], env=env)
+        for port in ports
+    ]
+    try:
+        for port in ports:
+            _wait_for_port(port)
+        yield [f"http://127.0.0.1:{port}" for port in ports]
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+
+async def _connect(url: str, user_id: str) -> socketio.AsyncClient:
+    client = socketio.AsyncClient()
+    await client.connect(
+        url,
+        headers={"X-Load-Test-Secret": settings.LOAD_TEST_SECRET, "X-Test-User-ID": user_id},
+        transports=["websocket"],
+    )
+    return client
+
+
+def _collect(client: socketio.AsyncClient, event: str) -> asyncio.Queue:
+    received: asyncio.Queue = asyncio.Queue()
+    client.on(event, received.put_nowait)
+    return received
+
+
+class TestCrossNodeDelivery:
+    """Emits reach room members connected to another process."""
+
+    @pytest.mark.asyncio
+    async def test_room_emit_crosses_nodes(self, nodes):
+        """A session-room emit on node B is delivered to the room member on node A."""
+        listener = await _connect(nodes[0], "user_a")
+        sender = await _connect(nodes[1], "user_b")
+        try:
+            received = _collect(listener, "relayed")
+            assert (await listener.call("join_session", {"session_id": "s1"}))["status"] == "ok"
+
+            await sender.emit("relay", {"room": "session:s1", "payload": {"content": "hello"}})
+            assert await asyncio.wait_for(received.get(), timeout=10) == {"content": "hello"}
+        finally:
+            await listener.disconnect()
+            await sender.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_write_only_emitter_reaches_every_node(self, nodes, channel):
+        """A worker's write-only manager reaches user rooms on both nodes."""
+        clients = [await _connect(url, "user_w") for url in nodes]
+        try:
+            queues = [_collect(client, "lead:new") for client in clients]
+            # Rooms are joined during connect; give the subscriber a moment
+            await asyncio.sleep(0.5)
+
+            emitter = socketio.RedisManager(REDIS_URL, channel=channel, write_only=True)
+            emitter.emit("lead:new", {"request_id": "r1"}, room="user:user_w", namespace="/")
+
+            for queue in queues:
+                assert await asyncio.wait_for(queue.get(), timeout=10) == {"request_id": "r1"}
+        finally:
+            for client in clients:
+                await client.disconnect()
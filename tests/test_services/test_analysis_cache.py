@@ -0,0 +1,152 @@
+"""
+Unit tests for the specialist analysis cache.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.platform.services.specialists import HaircutSpecialist
+from src.platform.services.specialists.analysis_cache import (
+    AnalysisCache,
+    analysis_fingerprint,
+    analyze_cached,
+)
+
+
+def _inputs(**overrides):
+    inputs = {
+        "service_type": "haircut",
+        "description": "Balayage and a trim",
+        "location": {"city": "Brooklyn"},
+        "budget": {"min": 100, "max": 250},
+        "timing": "Saturday",
+        "media_descriptions": [],
+        "additional_context": {"assistant_message": "Got it!"},
+    }
+    inputs.update(overrides)
+    return inputs
+
+
+class CountingHaircut(HaircutSpecialist):
+    def __init__(self):
+        self.calls = 0
+
+    async def analyze(self, **inputs):
+        self.calls += 1
+        return await super().analyze(**inputs)
+
+
+@pytest.fixture
+def fake_redis():
+    """Dict-backed stand-in for the Redis client."""
+    store = {}
+    client = MagicMock()
+    client.get.side_effect = lambda key: store.get(key)
+    client.setex.side_effect = lambda key, ttl, value: store.__setitem__(key, value.encode())
+    client.store = store
+    return client
+
+
+@pytest.fixture
+def cache(fake_redis):
+    c = AnalysisCache(max_entries=10, ttl=600, redis_client=fake_redis)
+    c.enabled = True
+    return c
+
+
+class TestFingerprint:
+    """What does and doesn't change the fingerprint."""
+
+    def test_normalized(self):
+        """Whitespace and number types don't change it."""
+        specialist = HaircutSpecialist()
+        a = analysis_fingerprint(specialist, _inputs())
+        b = analysis_fingerprint(specialist, _inputs(description="  Balayage and\na trim ", budget={"max": 250.0, "min": 100}))
+        assert a == b
+
+    def test_ignores_inputs_the_specialist_does_not_read(self):
+        """HaircutSpecialist doesn't read the assistant message, location or timing."""
+        specialist = HaircutSpecialist()
+        a = analysis_fingerprint(specialist, _inputs())
+        b = analysis_fingerprint(specialist, _inputs(
+            additional_context={"assistant_message": "Anything else?"}, timing="Sunday", location={},
+        ))
+        assert a == b
+
+    def test_request_changes(self):
+        """Description, budget and media descriptions are part of it."""
+        specialist = HaircutSpecialist()
+        base = analysis_fingerprint(specialist, _inputs())
+        assert analysis_fingerprint(specialist, _inputs(description="Balayage")) != base
+        assert analysis_fingerprint(specialist, _inputs(budget={"min": 100, "max": 120})) != base
+        assert analysis_fingerprint(specialist, _inputs(media_descriptions=["curly 3B hair"])) != base
+
+    def test_added_media_changes_it(self):
+        """A new photo invalidates, even before it has a description."""
+        specialist = HaircutSpecialist()
+        one = [{"id": "m1", "url": "/media/m1.jpg"}]
+        two = one + [{"id": "m2", "url": "/media/m2.jpg"}]
+        assert analysis_fingerprint(specialist, _inputs(), one) != analysis_fingerprint(specialist, _inputs(), two)
+
+
+class TestAnalyzeCached:
+    """analyze_cached() skips unchanged requests."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_request_is_not_reanalyzed(self, cache):
+        """The second turn with the same request reuses the analysis."""
+        specialist = CountingHaircut()
+        first = await analyze_cached(specialist, cache=cache, **_inputs())
+        second = await analyze_cached(
+            specialist, cache=cache, **_inputs(additional_context={"assistant_message": "What budget?"})
+        )
+
+        assert specialist.calls == 1
+        assert second == first
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_new_media_is_analyzed(self, cache):
+        """Adding media re-runs the analysis."""
+        specialist = CountingHaircut()
+        await analyze_cached(specialist, cache=cache, **_inputs())
+        analysis = await analyze_cached(
+            specialist, cache=cache, media=[{"id": "m1"}],
+            **_inputs(media_descriptions=["Shoulder-length type 3B curls"]),
+        )
+
+        assert specialist.calls == 2
+        assert analysis.hair_type == "3B"
+
+    @pytest.mark.asyncio
+    async def test_shared_through_redis(self, cache, fake_redis):
+        """Another process (the worker) finds the analysis in Redis."""
+        await analyze_cached(CountingHaircut(), cache=cache, **_inputs())
+
+        other = AnalysisCache(max_entries=10, ttl=600, redis_client=fake_redis)
+        other.enabled = True
+        specialist = CountingHaircut()
+        analysis = await analyze_cached(specialist, cache=other, **_inputs())
+
+        assert specialist.calls == 0
+        assert analysis.enriched_data["color_services"] == ["balayage"]
+
+    @pytest.mark.asyncio
+    async def test_hits_are_copies(self, cache):
+        """Mutating a returned analysis doesn't corrupt the cache."""
+        specialist = CountingHaircut()
+        first = await analyze_cached(specialist, cache=cache, **_inputs())
+        first.enriched_data["complexity"] = "mutated"
+
+        second = await analyze_cached(specialist, cache=cache, **_inputs())
+        assert second.enriched_data["complexity"] != "mutated"
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, cache):
+        """With the cache off, every call analyzes."""
+        cache.enabled = False
+        specialist = CountingHaircut()
+        await analyze_cached(specialist, cache=cache, **_inputs())
+        await analyze_cached(specialist, cache=cache, **_inputs())
+        assert specialist.calls == 2
@@ -0,0 +1,167 @@
+"""
+Unit tests for async chat result delivery (publish + long-poll wait).
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+import redis
+
+from src.platform.config import settings
+from src.platform.services.chat_tasks import ChatTaskResults, outcome
+
+
+class FakePubSub:
+    """Async pub/sub stand-in delivering one queued message."""
+
+    def __init__(self, messages=()):
+        self.messages = list(messages)
+        self.subscribed = []
+
+    async def subscribe(self, channel):
+        self.subscribed.append(channel)
+
+    async def get_message(self, timeout=None):
+        if self.messages:
+            return self.messages.pop(0)
+        await asyncio.sleep(timeout)
+        return None
+
+    async def aclose(self):
+        pass
+
+
+def _async_client(pubsub):
+    client = MagicMock()
+    client.pubsub.return_value = pubsub
+    return client
+
+
+class TestPublish:
+    """The worker side."""
+
+    @pytest.mark.asyncio
+    async def test_publish_stores_publishes_and_pushes(self):
+        """The outcome is stored for late waiters, published once and pushed to the session room."""
+        client = MagicMock()
+        results = ChatTaskResults(redis_client=client)
+        data = outcome("t1", result={"message": "Hi"})
+        with patch("src.platform.services.chat_tasks.notifier.emit", new=AsyncMock()) as emit:
+            await results.publish("t1", "s1", data)
+
+        pipe = client.pipeline.return_value
+        pipe.set.assert_called_once_with("chat_task_result:t1", json.dumps(data), ex=settings.CHAT_TASK_RESULT_TTL)
+        pipe.publish.assert_called_once_with("chat_task:t1", json.dumps(data))
+        emit.assert_awaited_once_with("chat:task", {**data, "session_id": "s1"}, room="session:s1")
+
+    @pytest.mark.asyncio
+    async def test_publish_survives_redis_outage(self):
+        """A Redis failure is logged; the socket push still happens."""
+        client = MagicMock()
+        client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+        with patch("src.platform.services.chat_tasks.notifier.emit", new=AsyncMock()) as emit:
+            await ChatTaskResults(redis_client=client).publish("t1", "s1", outcome("t1", error="boom"))
+        emit.assert_awaited_once()
+
+    def test_worker_publishes_result(self):
+        """process_chat_message publishes its result when the turn completes."""
+        from src.platform.worker import process_chat_message_task
+
+        with patch("src.platform.services.chat.chat_service.handle_chat",
+                   new=AsyncMock(return_value=("s1", "Hi", None, None, False))), \
+             patch("src.platform.services.chat_tasks.chat_task_results.publish", new=AsyncMock()) as publish:
+            result = process_chat_message_task.run(message="hello", session_id="s1")
+
+        task_id, session_id, data = publish.await_args.args
+        assert session_id == "s1"
+        assert data["status"] == "SUCCESS" and data["result"] == result
+
+    def test_worker_publishes_failure(self):
+        """A failed turn is published as FAILURE before the task fails."""
+        from src.platform.worker import process_chat_message_task
+
+        with patch("src.platform.services.chat.chat_service.handle_chat",
+                   new=AsyncMock(side_effect=RuntimeError("LLM down"))), \
+             patch("src.platform.services.chat_tasks.chat_task_results.publish", new=AsyncMock()) as publish, \
+             patch.object(process_chat_message_task, "update_state"):
+            with pytest.raises(RuntimeError):
+                process_chat_message_task.run(message="hello", session_id="s1")
+
+        data = publish.await_args.args[2]
+        assert data["status"] == "FAILURE" and data["error"] == "LLM down"
+
+
+class TestWait:
+    """The long-poll side."""
+
+    @pytest.mark.asyncio
+    async def test_returns_published_message(self):
+        """The waiter returns the outcome published on the task's channel."""
+        client = MagicMock()
+        client.get.return_value = None
+        data = outcome("t1", result={"message": "Hi"})
+        pubsub = FakePubSub([{"type": "message", "data": json.dumps(data).encode()}])
+        results = ChatTaskResults(redis_client=client, async_client=_async_client(pubsub))
+        assert await results.wait_for_result("t1", timeout=1) == data
+        assert pubsub.subscribed == ["chat_task:t1"]
+
+    @pytest.mark.asyncio
+    async def test_result_stored_before_subscribe(self):
+        """A result published just before the subscribe is picked up from the result key."""
+        client = MagicMock()
+        data = outcome("t1", result={"message": "Hi"})
+        client.get.return_value = json.dumps(data).encode()
+        results = ChatTaskResults(redis_client=client, async_client=_async_client(FakePubSub()))
+        assert await results.wait_for_result("t1", timeout=1) == data
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        """Nothing published within the timeout: None, so the caller reports the current state."""
+        client = MagicMock()
+        client.get.return_value = None
+        results = ChatTaskResults(redis_client=client, async_client=_async_client(FakePubSub()))
+        assert await results.wait_for_result("t1", timeout=0.05) is None
+
+    @pytest.mark.asyncio
+    async def test_waiters_share_one_client(self):
+        """Concurrent waiters open pub/subs on one client instead of a client (and pool) each."""
+        client = MagicMock()
+        client.get.return_value = None
+        async_client = MagicMock()
+        async_client.pubsub.side_effect = lambda **kwargs: FakePubSub()
+        with patch("src.platform.services.chat_tasks.aioredis.from_url", return_value=async_client) as from_url:
+            results = ChatTaskResults(redis_client=client)
+            await asyncio.gather(*(results.wait_for_result(f"t{i}", timeout=0.05) for i in range(3)))
+        from_url.assert_called_once()
+        assert async_client.pubsub.call_count == 3
+
+
+def _redis_available() -> bool:
+    try:
+        return redis.from_url(settings.REDIS_URL, socket_connect_timeout=1).ping()
+    except redis.RedisError:
+        return False
+
+
+@pytest.mark.skipif(not _redis_available(), reason="Redis not reachable")
+class TestRedisDelivery:
+    """Against a real Redis."""
+
+    @pytest.mark.asyncio
+    async def test_waiter_wakes_on_publish(self):
+        """A waiter blocked on the channel returns within milliseconds of the publish."""
+        results = ChatTaskResults()
+        task_id = str(uuid4())
+        data = outcome(task_id, result={"message": "Hi"})
+
+        waiter = asyncio.create_task(results.wait_for_result(task_id, timeout=5))
+        await asyncio.sleep(0.2)
+        published_at = time.perf_counter()
+        with patch("src.platform.services.chat_tasks.notifier.emit", new=AsyncMock()):
+            await results.publish(task_id, None, data)
+        assert await waiter == data
+        assert time.perf_counter() - published_at < 0.5
@@ -0,0 +1,200 @@
+"""
+Unit tests for the orchestrator checkpointer and incremental graph turns.
+"""
+
+import fnmatch
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src.platform.services import orchestrator as orchestrator_module
+from src.platform.services.checkpointer import RedisCheckpointSaver, create_checkpointer
+from src.platform.services.orchestrator import MessageLog, create_orchestrator, proxie_orchestrator
+
+
+class FakeRedis:
+    """Just the hash/pipeline subset RedisCheckpointSaver uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    @staticmethod
+    def _b(v):
+        return v if isinstance(v, bytes) else str(v).encode()
+
+    def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update({self._b(k): self._b(v) for k, v in mapping.items()})
+
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(self._b(field))
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def expire(self, key, ttl):
+        pass
+
+    def scan_iter(self, match):
+        return [k for k in list(self.data) if fnmatch.fnmatch(k, match)]
+
+    def pipeline(self):
+        redis = self
+
+        class Pipe:
+            def __init__(self):
+                self.ops = []
+
+            def __getattr__(self, name):
+                return lambda *a, **kw: self.ops.append((name, a, kw))
+
+            def execute(self):
+                for name, a, kw in self.ops:
+                    getattr(redis, name)(*a, **kw)
+
+        return Pipe()
+
+
+def _llm_response(text):
+    message = MagicMock(content=text, tool_calls=None)
+    return MagicMock(choices=[MagicMock(message=message)])
+
+
+@pytest.fixture
+def checkpointed(monkeypatch):
+    saver = InMemorySaver()
+    monkeypatch.setattr(orchestrator_module, "checkpointer", saver)
+    monkeypatch.setattr(orchestrator_module, "checkpointed_graph", create_orchestrator(saver))
+    return saver
+
+
+class TestMessageLog:
+    """Append-only messages channel."""
+
+    def test_appends_in_place(self):
+        """Updates extend the same buffer instead of copying it."""
+        log = MessageLog()
+        log.update([[HumanMessage(content="hi")]])
+        buf = log.get()
+        log.update([[AIMessage(content="hello")]])
+        assert log.get() is buf
+        assert [m.content for m in buf] == ["hi", "hello"]
+
+    def test_copy_applying_same_writes_shares_buffer(self):
+        """A conditional-edge copy applying the node's writes doesn't duplicate them."""
+        log = MessageLog()
+        log.update([[HumanMessage(content="hi")]])
+        write = [AIMessage(content="hello")]
+        log.copy().update([write])
+        log.update([write])
+        assert [m.content for m in log.get()] == ["hi", "hello"]
+
+    def test_diverging_copy_forks(self):
+        """A copy that appends something else doesn't leak into the original."""
+        log = MessageLog()
+        log.update([[HumanMessage(content="hi")]])
+        log.copy().update([[AIMessage(content="other")]])
+        log.update([[AIMessage(content="hello")]])
+        assert [m.content for m in log.get()] == ["hi", "hello"]
+
+    def test_input_list_not_mutated(self):
+        """The caller's message list is copied into the channel, not aliased."""
+        messages = [HumanMessage(content="hi")]
+        log = MessageLog()
+        log.update([messages])
+        log.update([[AIMessage(content="hello")]])
+        assert len(messages) == 1
+        assert log.checkpoint() is not log.get()
+
+
+class TestRedisCheckpointSaver:
+    """Latest-checkpoint saver with local tier."""
+
+    @pytest.fixture
+    def redis_client(self):
+        return FakeRedis()
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_redis_on_other_worker(self, redis_client):
+        """A second saver (another worker) loads the thread from Redis."""
+        graph = create_orchestrator(RedisCheckpointSaver(redis_client=redis_client))
+        config = {"configurable": {"thread_id": "s1"}}
+        with patch.object(orchestrator_module.llm_gateway, "chat_completion",
+                          AsyncMock(return_value=_llm_response("Hello!"))):
+            await graph.ainvoke({"messages": [HumanMessage(content="hello there")], "context": {}}, config, durability="exit")
+
+        other = RedisCheckpointSaver(redis_client=redis_client)
+        stored = other.get_tuple(config)
+
+        assert other.redis_loads == 1
+        assert [m.content for m in stored.checkpoint["channel_values"]["messages"]] == ["hello there", "Hello!"]
+
+    def test_local_copy_used_when_current(self, redis_client):
+        """The same worker serves reads from its local copy after one HGET."""
+        saver = RedisCheckpointSaver(redis_client=redis_client)
+        config = {"configurable": {"thread_id": "s1", "checkpoint_ns": ""}}
+        checkpoint = {"v": 1, "id": "c1", "ts": "", "channel_values": {"messages": [HumanMessage(content="hi")]},
+                      "channel_versions": {}, "versions_seen": {}}
+        saver.put(config, checkpoint, {}, {})
+
+        first = saver.get_tuple(config)
+        first.checkpoint["channel_values"]["messages"].append(AIMessage(content="mutated"))
+        second = saver.get_tuple(config)
+
+        assert saver.local_hits == 2
+        assert saver.redis_loads == 0
+        assert len(second.checkpoint["channel_values"]["messages"]) == 1
+
+    def test_degrades_without_redis(self):
+        """With no Redis the saver still works from the local tier."""
+        saver = RedisCheckpointSaver(redis_client=None)
+        saver.redis_client = None
+        config = {"configurable": {"thread_id": "s1", "checkpoint_ns": ""}}
+        checkpoint = {"v": 1, "id": "c1", "ts": "", "channel_values": {}, "channel_versions": {}, "versions_seen": {}}
+        saver.put(config, checkpoint, {}, {})
+        assert saver.get_tuple(config).checkpoint["id"] == "c1"
+        saver.delete_thread("s1")
+        assert saver.get_tuple(config) is None
+
+    def test_memory_backend_for_tests(self):
+        """Test environments always get the in-memory saver."""
+        assert isinstance(create_checkpointer(), InMemorySaver)
+        assert create_checkpointer("none") is None
+
+
+class TestIncrementalTurns:
+    """ProxieOrchestrator.run with a session thread."""
+
+    @pytest.mark.asyncio
+    async def test_second_turn_sends_only_new_message(self, checkpointed):
+        """The stored thread is resumed; only the new user message is fed in."""
+        llm = AsyncMock(side_effect=[_llm_response("Hi! How can I help?"), _llm_response("Sure.")])
+        with patch.object(orchestrator_module.llm_gateway, "chat_completion", llm):
+            _, history, _ = await proxie_orchestrator.run(
+                messages=[HumanMessage(content="hello")], context={}, session_id="s1")
+            new_messages = await proxie_orchestrator._new_messages(
+                "s1", history + [HumanMessage(content="thanks")])
+            _, history2, _ = await proxie_orchestrator.run(
+                messages=history + [HumanMessage(content="thanks")], context={}, session_id="s1")
+
+        assert [m.content for m in new_messages] == ["thanks"]
+        assert [m.content for m in history2] == ["hello", "Hi! How can I help?", "thanks", "Sure."]
+        # The LLM still saw the whole conversation
+        sent = llm.call_args.kwargs["messages"]
+        assert [m["content"] for m in sent[1:]] == ["hello", "Hi! How can I help?", "thanks"]
+
+    @pytest.mark.asyncio
+    async def test_diverged_thread_reseeded(self, checkpointed):
+        """A thread that doesn't match the session history is reset."""
+        with patch.object(orchestrator_module.llm_gateway, "chat_completion",
+                          AsyncMock(return_value=_llm_response("Hi!"))):
+            await proxie_orchestrator.run(messages=[HumanMessage(content="hello")], context={}, session_id="s1")
+            _, history, _ = await proxie_orchestrator.run(
+                messages=[HumanMessage(content="edited"), AIMessage(content="ok"), HumanMessage(content="next")],
+                context={}, session_id="s1")
+
+        assert [m.content for m in history] == ["edited", "ok", "next", "Hi!"]
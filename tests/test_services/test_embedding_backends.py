@@ -0,0 +1,123 @@
+"""
+Unit tests for the pluggable embedding backends.
+"""
+
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.platform.services.embedding_backends import (
+    HashingBackend, LiteLLMBackend, SentenceTransformerBackend, get_backend,
+)
+from src.platform.services.embedding_cache import EmbeddingCache
+from src.platform.services.embeddings import EmbeddingService
+
+
+def _cosine(a, b):
+    return float(np.dot(a, b))
+
+
+@pytest.fixture
+def local_service():
+    s = EmbeddingService(model="local/hashing", dimensions=256)
+    s.cache = EmbeddingCache(redis_client=False)
+    s.cache.enabled = False
+    s.batcher = None
+    return s
+
+
+class TestBackendSelection:
+    """LLM_EMBEDDING_MODEL picks the backend."""
+
+    def test_prefixes(self):
+        """local/hashing, local/<model> and hosted models map to their backends."""
+        assert isinstance(get_backend("local/hashing"), HashingBackend)
+        assert isinstance(get_backend("local/sentence-transformers/all-MiniLM-L6-v2"), SentenceTransformerBackend)
+        assert isinstance(get_backend("openai/text-embedding-3-large"), LiteLLMBackend)
+
+    def test_switching_model_switches_backend(self, local_service):
+        """Changing service.model rebuilds the backend."""
+        assert isinstance(local_service.backend, HashingBackend)
+        local_service.model = "openai/text-embedding-3-small"
+        assert isinstance(local_service.backend, LiteLLMBackend)
+
+
+class TestHashingBackend:
+    """Offline hashing vectorizer."""
+
+    def test_deterministic_unit_vectors(self):
+        """Same text, same vector, in any process; rows are L2-normalized."""
+        backend = HashingBackend("local/hashing")
+        first, second = backend.embed_sync(["Box braids and twists", "Box braids and twists"], 128)
+        assert first == second
+        assert len(first) == 128
+        assert np.linalg.norm(first) == pytest.approx(1.0, abs=1e-5)
+
+    def test_similarity_follows_shared_words(self):
+        """A braiding provider is closer to a braids query than a nail salon is."""
+        backend = HashingBackend("local/hashing")
+        query, braider, nails = backend.embed_sync([
+            "knotless box braids",
+            "Braid Bar - box braids, knotless braiding, twists and locs",
+            "Nail Studio - gel manicure, pedicure and nail art",
+        ], 512)
+        assert _cosine(query, braider) > _cosine(query, nails) + 0.2
+
+    def test_empty_text_is_zero_vector(self):
+        """No features: a zero vector rather than NaNs."""
+        assert HashingBackend("local/hashing").embed_sync(["  "], 16) == [[0.0] * 16]
+
+
+class TestSentenceTransformerBackend:
+    """Local sentence-transformers models."""
+
+    def test_encodes_batch_once(self):
+        """A batch is one encode call, normalized, on CPU."""
+        model = MagicMock()
+        model.encode.return_value = np.ones((3, 384), dtype=np.float32)
+        module = SimpleNamespace(SentenceTransformer=MagicMock(return_value=model))
+        backend = SentenceTransformerBackend("local/test-model-a")
+
+        with patch.dict(sys.modules, {"sentence_transformers": module}):
+            vectors = backend.embed_sync(["a", "b", "c"], 384)
+
+        assert len(vectors) == 3
+        module.SentenceTransformer.assert_called_once_with("test-model-a", device="cpu")
+        assert model.encode.call_args.kwargs["normalize_embeddings"] is True
+
+    def test_too_narrow_for_configured_dimensions(self):
+        """A model narrower than LLM_EMBEDDING_DIMENSIONS is a configuration error."""
+        model = MagicMock()
+        model.encode.return_value = np.ones((1, 384), dtype=np.float32)
+        module = SimpleNamespace(SentenceTransformer=MagicMock(return_value=model))
+        backend = SentenceTransformerBackend("local/test-model-b")
+
+        with patch.dict(sys.modules, {"sentence_transformers": module}), pytest.raises(ValueError):
+            backend.embed_sync(["a"], 3072)
+
+    def test_missing_package(self):
+        """Without sentence-transformers installed the error says what to install."""
+        backend = SentenceTransformerBackend("local/test-model-c")
+        with patch.dict(sys.modules, {"sentence_transformers": None}), \
+                pytest.raises(RuntimeError, match="sentence-transformers"):
+            backend.embed_sync(["a"], 8)
+
+
+class TestEmbeddingServiceLocal:
+    """EmbeddingService on a local backend never touches the network."""
+
+    @pytest.mark.asyncio
+    async def test_no_api_call_or_usage_record(self, local_service):
+        """Local embeddings don't call litellm and record no spend."""
+        with patch("src.platform.services.embedding_backends.litellm.aembedding", AsyncMock()) as call, \
+                patch("src.platform.services.embeddings.SessionLocal") as session:
+            embedding = await local_service.get_embedding("silk press")
+            batch = await local_service.get_embeddings_batch(["silk press", "fade"])
+
+        call.assert_not_called()
+        session.assert_not_called()
+        assert len(embedding) == 256
+        assert batch[0] == embedding
@@ -0,0 +1,119 @@
+"""
+Unit tests for the embedding micro-batcher.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.platform.services.embedding_batcher import EmbeddingBatcher
+from src.platform.services.embedding_cache import EmbeddingCache
+from src.platform.services.embeddings import EmbeddingService
+
+
+class FakeAPI:
+    """embed_many stand-in recording each call; texts containing 'bad' fail their call."""
+
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+
+    async def __call__(self, texts):
+        self.calls.append(list(texts))
+        await asyncio.sleep(self.delay)
+        if any("bad" in text for text in texts):
+            raise ValueError("input too long")
+        return [[float(len(text))] for text in texts]
+
+
+class TestEmbeddingBatcher:
+    """Collecting, fanning out and isolating errors."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_request(self):
+        """Calls arriving within the window go out as one batch, in order."""
+        api = FakeAPI()
+        batcher = EmbeddingBatcher(api, max_items=64, max_wait_ms=20)
+
+        results = await asyncio.gather(*(batcher.submit("x" * n) for n in range(1, 11)))
+
+        assert len(api.calls) == 1
+        assert results == [[float(n)] for n in range(1, 11)]
+
+    @pytest.mark.asyncio
+    async def test_flushes_at_max_items(self):
+        """A full batch is sent without waiting for the window."""
+        api = FakeAPI()
+        batcher = EmbeddingBatcher(api, max_items=4, max_wait_ms=10_000)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(f"text {n}") for n in range(8))), timeout=1
+        )
+
+        assert [len(call) for call in api.calls] == [4, 4]
+        assert len(results) == 8
+
+    @pytest.mark.asyncio
+    async def test_duplicate_texts_are_sent_once(self):
+        """Identical texts in a batch share one slot."""
+        api = FakeAPI()
+        batcher = EmbeddingBatcher(api, max_items=64, max_wait_ms=5)
+
+        a, b = await asyncio.gather(batcher.submit("haircut"), batcher.submit("haircut"))
+
+        assert api.calls == [["haircut"]]
+        assert a == b
+
+    @pytest.mark.asyncio
+    async def test_errors_are_isolated_per_item(self):
+        """A failing input fails only its own caller."""
+        api = FakeAPI()
+        batcher = EmbeddingBatcher(api, max_items=64, max_wait_ms=5)
+
+        results = await asyncio.gather(
+            batcher.submit("fine"), batcher.submit("bad input"), batcher.submit("also fine"),
+            return_exceptions=True,
+        )
+
+        assert results[0] == [4.0]
+        assert isinstance(results[1], ValueError)
+        assert results[2] == [9.0]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_break_the_batch(self):
+        """Cancelling one waiter leaves the others' results intact."""
+        api = FakeAPI(delay=0.01)
+        batcher = EmbeddingBatcher(api, max_items=64, max_wait_ms=5)
+
+        keep = asyncio.ensure_future(batcher.submit("keep"))
+        drop = asyncio.ensure_future(batcher.submit("drop"))
+        await asyncio.sleep(0)
+        drop.cancel()
+
+        assert await keep == [4.0]
+        assert drop.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_embedding_service_batches_concurrent_calls():
+    """Concurrent get_embedding calls become one aembedding request."""
+    service = EmbeddingService()
+    service.model, service.dimensions = "openai/text-embedding-3-large", 4
+    service.cache = EmbeddingCache(redis_client=False)
+    service.cache.enabled = False
+    service.batcher = EmbeddingBatcher(service._embed_many, max_items=64, max_wait_ms=20)
+
+    def respond(model, input, **kwargs):
+        # Out of order, like the API is allowed to be
+        return SimpleNamespace(
+            usage=None,
+            data=[{"index": i, "embedding": [float(i)] * 4} for i in reversed(range(len(input)))],
+        )
+
+    with patch("src.platform.services.embedding_backends.litellm.aembedding", AsyncMock(side_effect=respond)) as call:
+        results = await asyncio.gather(*(service.get_embedding(f"request {n}") for n in range(5)))
+
+    assert call.await_count == 1
+    assert results == [[float(n)] * 4 for n in range(5)]
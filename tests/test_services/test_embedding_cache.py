@@ -0,0 +1,134 @@
+"""
+Unit tests for the embedding cache in front of EmbeddingService.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.platform.services.embedding_cache import EmbeddingCache, pack_embedding, unpack_embedding
+from src.platform.services.embeddings import EmbeddingService
+
+MODEL = "openai/text-embedding-3-large"
+
+
+@pytest.fixture
+def fake_redis():
+    """Dict-backed stand-in for the Redis client."""
+    store = {}
+    client = MagicMock()
+    client.mget.side_effect = lambda keys: [store.get(key) for key in keys]
+
+    def pipeline():
+        pipe = MagicMock()
+        pipe.setex.side_effect = lambda key, ttl, value: store.__setitem__(key, value)
+        return pipe
+
+    client.pipeline.side_effect = pipeline
+    client.store = store
+    return client
+
+
+@pytest.fixture
+def cache(fake_redis):
+    c = EmbeddingCache(max_entries=10, ttl=600, redis_client=fake_redis)
+    c.enabled = True
+    return c
+
+
+def _vector(seed, dim=8):
+    v = np.random.default_rng(seed).standard_normal(dim)
+    return (v / np.linalg.norm(v)).tolist()
+
+
+def _response(texts, tokens_per_text=10):
+    return SimpleNamespace(
+        usage=SimpleNamespace(prompt_tokens=tokens_per_text * len(texts)),
+        data=[{"embedding": _vector(len(text))} for text in texts],
+    )
+
+
+@pytest.fixture
+def service(cache):
+    s = EmbeddingService()
+    s.model, s.dimensions, s.cache = MODEL, 8, cache
+    return s
+
+
+def _fake_aembedding():
+    return AsyncMock(side_effect=lambda model, input, **kwargs: _response(input))
+
+
+class TestEmbeddingCache:
+    """Storage format and tiers."""
+
+    def test_float16_round_trip(self):
+        """Packed float16 keeps the vector to ~1e-3 and the token count exactly."""
+        vector = _vector(1, dim=3072)
+        raw = pack_embedding(vector, tokens=42)
+        restored, tokens = unpack_embedding(raw)
+
+        assert len(raw) == 4 + 2 * 3072
+        assert tokens == 42
+        assert np.allclose(restored, vector, atol=1e-3)
+        assert np.dot(restored, vector) > 0.9999
+
+    def test_key_covers_model_and_dimensions(self):
+        """The same text under another model or width is a different entry."""
+        key = EmbeddingCache.key(MODEL, 3072, "haircut curly hair")
+        assert key != EmbeddingCache.key(MODEL, 1024, "haircut curly hair")
+        assert key != EmbeddingCache.key("openai/text-embedding-3-small", 3072, "haircut curly hair")
+        assert key.startswith("embedding:")
+
+    def test_shared_through_redis(self, cache, fake_redis):
+        """Another worker finds the embedding in Redis."""
+        cache.set(MODEL, 8, "haircut", _vector(1), tokens=3)
+
+        other = EmbeddingCache(max_entries=10, ttl=600, redis_client=fake_redis)
+        other.enabled = True
+        assert np.allclose(other.get(MODEL, 8, "haircut"), _vector(1), atol=1e-3)
+        assert other.stats()["tokens_saved"] == 3
+
+
+class TestEmbeddingServiceCaching:
+    """EmbeddingService only calls the API for texts it hasn't embedded."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_text_is_not_reembedded(self, service, cache):
+        """The second identical request is a hit, and its spend is counted as saved."""
+        with patch("src.platform.services.embedding_backends.litellm.aembedding", _fake_aembedding()) as call, \
+                patch("src.platform.services.embeddings.SessionLocal"):
+            first = await service.get_embedding("haircut curly hair specialist")
+            second = await service.get_embedding("haircut curly hair specialist")
+
+        assert call.await_count == 1
+        assert np.allclose(first, second, atol=1e-3)
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["tokens_saved"] == 10
+        assert stats["spend_saved_usd"] > 0
+
+    @pytest.mark.asyncio
+    async def test_batch_embeds_only_misses(self, service):
+        """A batch sends each uncached text once and keeps the input order."""
+        service.cache.set(MODEL, 8, "cached", _vector(0), 5)
+        with patch("src.platform.services.embedding_backends.litellm.aembedding", _fake_aembedding()) as call, \
+                patch("src.platform.services.embeddings.SessionLocal"):
+            embeddings = await service.get_embeddings_batch(["new one", "cached", "new one", "another"])
+
+        assert call.call_args.kwargs["input"] == ["new one", "another"]
+        assert len(embeddings) == 4
+        assert np.allclose(embeddings[1], _vector(0), atol=1e-3)
+        assert embeddings[0] == embeddings[2]
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, service, cache):
+        """With the cache off every call goes to the API."""
+        cache.enabled = False
+        with patch("src.platform.services.embedding_backends.litellm.aembedding", _fake_aembedding()) as call, \
+                patch("src.platform.services.embeddings.SessionLocal"):
+            await service.get_embedding("haircut")
+            await service.get_embedding("haircut")
+        assert call.await_count == 2
@@ -0,0 +1,163 @@
+"""
+Unit tests for configurable embedding dimensions and storage.
+"""
+
+import importlib.util
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+from pgvector.sqlalchemy import HALFVEC, Vector
+
+from src.platform.database.vectors import (
+    EMBEDDING_COLUMNS,
+    check_embedding_columns,
+    convert_embedding_columns,
+    embedding_type,
+    is_indexable,
+    truncate_embedding,
+    vector_index_sql,
+)
+from src.platform.services.embedding_cache import EmbeddingCache
+from src.platform.services.embeddings import EmbeddingService
+
+
+class TestEmbeddingColumns:
+    """Column type and index for the configured width."""
+
+    def test_column_type(self):
+        """Storage picks vector or halfvec with the configured width."""
+        assert isinstance(embedding_type(1024, "halfvec"), HALFVEC)
+        assert embedding_type(1024, "halfvec").dim == 1024
+        assert isinstance(embedding_type(512, "vector"), Vector)
+        with pytest.raises(ValueError):
+            embedding_type(512, "int8")
+
+    def test_indexable_widths(self):
+        """pgvector indexes vector up to 2000 dims and halfvec up to 4000."""
+        assert not is_indexable(3072, "vector")
+        assert is_indexable(3072, "halfvec")
+        assert is_indexable(1024, "vector")
+        assert "halfvec_cosine_ops" in vector_index_sql("providers", "embedding", "halfvec")
+
+    def test_truncation_is_normalized_prefix(self):
+        """Matryoshka truncation keeps the direction of the leading dims."""
+        full = np.random.default_rng(0).standard_normal(3072)
+        short = np.asarray(truncate_embedding(full, 256))
+        assert short.shape == (256,)
+        assert np.isclose(np.linalg.norm(short), 1.0)
+        assert np.allclose(short, full[:256] / np.linalg.norm(full[:256]), atol=1e-6)
+
+
+class FakeConnection:
+    """Answers catalog lookups from declared types; records every other statement."""
+
+    def __init__(self, declared):
+        self.declared = declared
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        if "pg_attribute" in sql:
+            return SimpleNamespace(scalar=lambda: self.declared.get((params["table"], params["column"])))
+        self.statements.append(sql)
+
+
+class TestColumnConversion:
+    """Re-runnable conversion of the DB columns to the configured type."""
+
+    def test_matching_columns_untouched(self):
+        """Columns already declared as configured: nothing is altered (safe to re-run)."""
+        conn = FakeConnection({("providers", "embedding"): "vector(1024)",
+                               ("consumer_memories", "preference_embedding"): "public.vector(1024)"})
+        assert convert_embedding_columns(conn, 1024, "vector") == []
+        assert conn.statements == []
+
+    def test_shrink_keeps_prefix_and_rebuilds_index(self):
+        """Shrinking converts in place, and the providers index is rebuilt for the new type."""
+        conn = FakeConnection({("providers", "embedding"): "vector(3072)",
+                               ("consumer_memories", "preference_embedding"): "vector(3072)"})
+        converted = convert_embedding_columns(conn, 1024, "halfvec")
+
+        assert converted == EMBEDDING_COLUMNS
+        assert conn.statements[0] == "DROP INDEX IF EXISTS idx_providers_embedding"
+        assert "TYPE halfvec(1024) USING l2_normalize(subvector(embedding::vector, 1, 1024))" in conn.statements[1]
+        assert "halfvec_cosine_ops" in conn.statements[-1]
+
+    def test_grow_clears_column(self):
+        """Growing can't be derived from stored values: the column is cleared for re-embedding."""
+        conn = FakeConnection({("providers", "embedding"): "vector(3072)",
+                               ("consumer_memories", "preference_embedding"): "halfvec(1024)"})
+        assert convert_embedding_columns(conn, 3072, "vector") == [("consumer_memories", "preference_embedding")]
+        assert conn.statements == [
+            "ALTER TABLE consumer_memories ALTER COLUMN preference_embedding TYPE vector(3072) USING NULL::vector(3072)"
+        ]
+
+    def test_startup_check_reports_mismatch(self):
+        """The startup check lists columns whose declared width differs from the settings."""
+        conn = FakeConnection({("providers", "embedding"): "vector(1024)",
+                               ("consumer_memories", "preference_embedding"): "vector(3072)"})
+        engine = MagicMock()
+        engine.dialect.name = "postgresql"
+        engine.connect.return_value.__enter__.return_value = conn
+        with patch("src.platform.database.vectors.settings",
+                   SimpleNamespace(LLM_EMBEDDING_DIMENSIONS=3072, EMBEDDING_STORAGE="vector")):
+            assert check_embedding_columns(engine) == [("providers", "embedding", ("vector", 1024))]
+
+        engine.dialect.name = "sqlite"
+        assert check_embedding_columns(engine) == []
+
+    def test_migration_ignores_environment(self):
+        """002_embedding_storage converts to its fixed target whatever the settings say."""
+        path = Path(__file__).parents[2] / "alembic" / "versions" / "002_embedding_storage.py"
+        spec = importlib.util.spec_from_file_location("migration_002", path)
+        migration = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(migration)
+
+        op = MagicMock()
+        op.get_bind.return_value.execute.return_value.scalar.return_value = 3072
+        with patch.object(migration, "op", op), \
+             patch("src.platform.config.settings.LLM_EMBEDDING_DIMENSIONS", 512), \
+             patch("src.platform.config.settings.EMBEDDING_STORAGE", "halfvec"):
+            migration.upgrade()
+
+        altered = [c.args[0] for c in op.execute.call_args_list if c.args[0].startswith("ALTER")]
+        assert len(altered) == 2
+        assert all(f"TYPE vector({migration.TARGET_DIMENSIONS})" in sql for sql in altered)
+
+
+def _service(model, dimensions):
+    service = EmbeddingService()
+    service.model, service.dimensions = model, dimensions
+    service.cache = EmbeddingCache(redis_client=False)
+    service.cache.enabled = False
+    return service
+
+
+def _response(width, count=1):
+    return SimpleNamespace(usage=None, data=[{"embedding": [0.5] * width} for _ in range(count)])
+
+
+class TestEmbeddingServiceDimensions:
+    """EmbeddingService returns embeddings of the configured width."""
+
+    @pytest.mark.asyncio
+    async def test_requests_dimensions_from_text_embedding_3(self):
+        """text-embedding-3 models are asked for the configured width."""
+        service = _service("openai/text-embedding-3-large", 1024)
+        with patch("src.platform.services.embedding_backends.litellm.aembedding", AsyncMock(return_value=_response(1024))) as call:
+            embedding = await service.get_embedding("curly hair specialist")
+        assert call.call_args.kwargs["dimensions"] == 1024
+        assert len(embedding) == 1024
+
+    @pytest.mark.asyncio
+    async def test_truncates_other_models(self):
+        """Models without a dimensions option are truncated client-side."""
+        service = _service("gemini/text-embedding-004", 256)
+        with patch("src.platform.services.embedding_backends.litellm.aembedding", AsyncMock(return_value=_response(768, 2))) as call:
+            embeddings = await service.get_embeddings_batch(["a", "b"])
+        assert "dimensions" not in call.call_args.kwargs
+        assert [len(e) for e in embeddings] == [256, 256]
+        assert np.isclose(np.linalg.norm(embeddings[0]), 1.0)
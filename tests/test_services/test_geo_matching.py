@@ -0,0 +1,140 @@
+"""
+Unit tests for location columns and radius matching.
+"""
+
+from unittest.mock import Mock
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from src.platform.database.geo import (
+    MAX_PREFIXES, city_key, geohash_encode, geohash_prefixes, haversine_km, location_columns, within_radius,
+)
+from src.platform.models.provider import Provider
+from src.platform.models.request import ServiceRequest
+from src.platform.schemas.request import (
+    RequestBudget, RequestLocation, RequestRequirements, RequestTiming, ServiceRequestCreate,
+)
+from src.platform.services.matching import MatchingService
+
+# Lower Manhattan and a few points around it
+NYC = (40.7128, -74.0060)
+WILLIAMSBURG = (40.7081, -73.9571)   # ~4 km
+JERSEY_CITY = (40.7178, -74.0431)    # ~3 km, another city
+STAMFORD = (41.0534, -73.5387)       # ~54 km
+
+
+def _request(lat=None, lng=None, max_distance_km=None, city="New York"):
+    return ServiceRequestCreate(
+        consumer_id=str(uuid4()),
+        raw_input="fade",
+        service_category="barber",
+        service_type="fade",
+        requirements=RequestRequirements(),
+        location=RequestLocation(city=city, lat=lat, lng=lng, max_distance_km=max_distance_km),
+        timing=RequestTiming(),
+        budget=RequestBudget(),
+    )
+
+
+class TestGeoHelpers:
+    """Normalization, geohash cover and haversine refine."""
+
+    def test_city_key(self):
+        """Case, accents, punctuation and spacing don't matter."""
+        assert city_key("  São Paulo ") == city_key("sao-paulo") == "sao paulo"
+        assert city_key(None) == ""
+
+    def test_geohash_reference_value(self):
+        """Matches the reference encoding."""
+        assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+    def test_prefixes_cover_the_circle(self):
+        """Every point within the radius falls in one of the prefixes."""
+        rng = np.random.default_rng(0)
+        for radius in (1, 10, 25, 80):
+            prefixes = geohash_prefixes(*NYC, radius)
+            assert len(prefixes) <= MAX_PREFIXES
+            for _ in range(200):
+                bearing, distance = rng.uniform(0, 2 * np.pi), rng.uniform(0, radius)
+                lat = NYC[0] + distance / 111.32 * np.cos(bearing)
+                lng = NYC[1] + distance / (111.32 * np.cos(np.radians(NYC[0]))) * np.sin(bearing)
+                assert any(geohash_encode(lat, lng).startswith(p) for p in prefixes)
+
+    def test_haversine(self):
+        """Manhattan to Williamsburg is about 4 km."""
+        distance = haversine_km(*NYC, np.array([WILLIAMSBURG[0]]), np.array([WILLIAMSBURG[1]]))
+        assert distance[0] == pytest.approx(4.1, abs=0.2)
+
+    def test_within_radius(self):
+        """Closest first, own radius narrows, unlocated rows last."""
+        rows = [
+            ("far", *STAMFORD, None),
+            ("jersey", *JERSEY_CITY, None),
+            ("williamsburg", *WILLIAMSBURG, None),
+            ("homebody", *WILLIAMSBURG, 2.0),
+            ("no-coords", None, None, None),
+        ]
+        assert within_radius(rows, *NYC, 10) == ["jersey", "williamsburg", "no-coords"]
+
+    def test_location_columns(self):
+        """Provider coordinates live under "coordinates", request ones at the top level."""
+        provider = location_columns(
+            {"city": "Brooklyn", "coordinates": {"lat": 40.7, "lng": -73.9}, "service_radius_km": 5},
+            "service_radius_km",
+        )
+        assert provider["city_key"] == "brooklyn"
+        assert provider["geohash"].startswith("dr5r")
+        assert provider["service_radius_km"] == 5.0
+
+        request = location_columns({"city": "Brooklyn", "lat": "bad", "lng": 1}, "max_distance_km")
+        assert request["lat"] is None and request["geohash"] is None
+
+
+class TestModelColumns:
+    """Location columns follow the JSON on write."""
+
+    def test_provider_columns_set_on_assignment(self):
+        """Constructor and later assignment both refresh the columns."""
+        provider = Provider(name="A", email="a@example.com", location={"city": "New York"})
+        assert provider.city_key == "new york" and provider.lat is None
+
+        provider.location = {"city": "Brooklyn", "coordinates": {"lat": WILLIAMSBURG[0], "lng": WILLIAMSBURG[1]}}
+        assert provider.city_key == "brooklyn"
+        assert provider.geohash == geohash_encode(*WILLIAMSBURG)
+
+    def test_request_columns(self):
+        """Requests keep max_distance_km."""
+        request = ServiceRequest(location={"city": "New York", "lat": NYC[0], "lng": NYC[1], "max_distance_km": 5})
+        assert request.max_distance_km == 5.0
+        assert request.geohash == geohash_encode(*NYC)
+
+
+class TestRadiusMatching:
+    """MatchingService's location hard filter."""
+
+    @pytest.fixture
+    def db(self):
+        return Mock(spec=Session)
+
+    def test_no_coordinates_means_city_filter(self, db):
+        """Without coordinates there is no radius query."""
+        assert MatchingService._geo_candidates(db, _request()) is None
+        db.query.assert_not_called()
+
+    def test_radius_prefilter_then_refine(self, db):
+        """Prefix-scanned candidates are refined by distance and the request's radius."""
+        db.query.return_value.filter.return_value.all.return_value = [
+            ("far", *STAMFORD, None),
+            ("jersey", *JERSEY_CITY, None),
+            ("williamsburg", *WILLIAMSBURG, None),
+        ]
+        ids = MatchingService._geo_candidates(db, _request(*NYC, max_distance_km=5))
+        assert ids == ["jersey", "williamsburg"]
+
+    def test_neighbouring_city_is_matched(self, db):
+        """A Jersey City provider 3 km away matches a New York request by radius."""
+        db.query.return_value.filter.return_value.all.return_value = [("jersey", *JERSEY_CITY, 10.0)]
+        assert MatchingService._geo_candidates(db, _request(*NYC)) == ["jersey"]
@@ -0,0 +1,119 @@
+"""
+Unit tests for full-text + vector (hybrid) matching.
+"""
+
+from unittest.mock import Mock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from src.platform.database.search import SEARCH_VECTOR_DDL, search_query
+from src.platform.schemas.request import (
+    RequestBudget, RequestLocation, RequestRequirements, RequestTiming, ServiceRequestCreate,
+)
+from src.platform.services.matching import MatchingService, reciprocal_rank_fusion
+
+
+def _sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def request_data():
+    return ServiceRequestCreate(
+        consumer_id=str(uuid4()),
+        raw_input="knotless braids",
+        service_category="hairstylist",
+        service_type="box braids",
+        requirements=RequestRequirements(description="knotless, mid-back"),
+        location=RequestLocation(city="Brooklyn"),
+        timing=RequestTiming(),
+        budget=RequestBudget(),
+    )
+
+
+def _ranked_db(vector_ids, lexical_ids):
+    """Session whose ordered queries return vector_ids for cosine ordering, lexical_ids for ts_rank."""
+    db = Mock(spec=Session)
+    query = Mock()
+    db.query.return_value = query
+    query.filter.return_value = query
+    calls = []
+
+    def order_by(*clauses):
+        ordered = Mock()
+        ids = lexical_ids if "ts_rank_cd" in _sql(clauses[0]) else vector_ids
+        ordered.limit.return_value.all.return_value = [Mock(id=i) for i in ids]
+        calls.append(clauses)
+        return ordered
+
+    query.order_by.side_effect = order_by
+    return db, query, calls
+
+
+class TestReciprocalRankFusion:
+    """Merging rankings."""
+
+    def test_agreement_wins(self):
+        """An item high in both rankings beats one that tops only one."""
+        a, b, c, d = uuid4(), uuid4(), uuid4(), uuid4()
+        fused = reciprocal_rank_fusion([[a, b, c], [b, d, a]])
+        assert fused[0] == b
+        assert fused.index(a) < fused.index(d)
+        assert set(fused) == {a, b, c, d}
+
+    def test_single_ranking_is_unchanged(self):
+        """One non-empty ranking passes through in order."""
+        ids = [uuid4() for _ in range(5)]
+        assert reciprocal_rank_fusion([ids, []]) == ids
+
+
+class TestSearchQuery:
+    """Request text to tsquery."""
+
+    def test_words_are_ored(self):
+        """Any word may match; punctuation and operators are dropped."""
+        query = search_query("Box braids, -knotless OR 'twists' | !")
+        params = query.compile(dialect=postgresql.dialect()).params
+        assert list(params.values()) == ["english", "box or braids or knotless or twists"]
+
+    def test_no_words(self):
+        """Nothing to search for."""
+        assert search_query("  ?! ") is None
+        assert search_query(None) is None
+
+    def test_triggers_cover_provider_and_service_writes(self):
+        """Both tables carry a trigger that rebuilds the document."""
+        ddl = "\n".join(SEARCH_VECTOR_DDL)
+        assert "BEFORE INSERT OR UPDATE OF business_name, bio, specializations ON providers" in ddl
+        assert "AFTER INSERT OR UPDATE OF name, provider_id OR DELETE ON services" in ddl
+
+
+class TestHybridRanking:
+    """MatchingService._query_matching."""
+
+    def test_keyword_only_is_full_text(self, request_data):
+        """Without embeddings, providers come ranked by ts_rank_cd over the GIN-indexed @@ match."""
+        lexical = [uuid4(), uuid4()]
+        db, query, calls = _ranked_db([], lexical)
+
+        result = MatchingService._query_matching(db, request_data, None, keyword_only=True)
+
+        assert result == lexical
+        conditions = " ".join(_sql(c) for c in query.filter.call_args.args)
+        assert "providers.search_vector @@ websearch_to_tsquery" in conditions
+        assert "ILIKE" not in conditions.split("services.category")[0]
+        assert len(calls) == 1
+
+    def test_vector_and_text_are_fused(self, request_data):
+        """Both rankings run; a provider both agree on comes first."""
+        both, vector_only, text_only = uuid4(), uuid4(), uuid4()
+        db, _, calls = _ranked_db([vector_only, both], [both, text_only])
+
+        result = MatchingService._query_matching(db, request_data, [0.1] * 8, keyword_only=False)
+
+        assert result[0] == both
+        assert set(result) == {both, vector_only, text_only}
+        assert len(calls) == 2
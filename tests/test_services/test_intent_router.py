@@ -0,0 +1,99 @@
+"""
+Unit tests for the compiled intent router and its consumers.
+"""
+
+import pytest
+
+from src.platform.services.intent_router import IntentMatcher, match_intents, route_service
+from src.platform.services.specialists import specialist_registry
+from src.platform.services.specialists.haircut import HaircutSpecialist
+
+
+class TestIntentMatcher:
+    """Single-pass matching over the taxonomy."""
+
+    def test_word_boundaries(self):
+        """Terms inside other words don't fire."""
+        assert route_service("I'm an executive looking for a new chair") is None
+        assert route_service("lifestyle blog") is None
+
+    def test_inflections(self):
+        """Plural / verb forms of a term still match."""
+        assert route_service("my pipes are leaking") == "plumbing"
+        assert route_service("need a plumber") == "plumbing"
+        assert route_service("house cleaning on friday") == "cleaning"
+
+    def test_all_hits_in_one_pass(self):
+        """Every namespace, label and term is reported from one match."""
+        match = match_intents("balayage and a classic bob with curtain bangs")
+        assert match.terms("color") == ["balayage"]
+        assert set(match.labels("style")) == {"bob", "bangs"}
+        assert "classic bob" in match.terms("style")
+        assert match.has("hair_service", "color")
+        # Terms inside a matched phrase count too ("bob" in "classic bob")
+        assert match.has("hair_service", "haircut")
+
+    def test_best_prefers_most_hits(self):
+        """The category with the most hits wins; ties go to taxonomy order."""
+        assert route_service("leaky pipe under the sink in my house") == "plumbing"
+        assert route_service("my house needs cleaning") == "cleaning"
+
+    def test_case_and_whitespace_insensitive(self):
+        """Phrases match across case and extra whitespace; taxonomy spelling is returned."""
+        match = match_intents("Brazilian   BLOWOUT please")
+        assert match.terms("treatment") == ["Brazilian blowout"]
+
+    @pytest.mark.parametrize("text", [
+        "", "what's the weather like?", "a haircut please", "hair color and a trim",
+        "clean the house, then fix the leaky pipe and the drain", "my house needs cleaning",
+        "tidy apartment with a clogged toilet", "cut the pipe",
+    ])
+    def test_fast_best_agrees_with_match(self, text):
+        """route_service's word-set fast path answers exactly as the full match does."""
+        assert route_service(text) == match_intents(text).best("service")
+
+    def test_fast_best_with_phrases(self):
+        """Multi-word terms and labels sharing a term count in the fast path too."""
+        matcher = IntentMatcher({"pet": {"dog": ["dog walking", "walk"], "cat": ["cat sitting", "walk"]}})
+        for text in ("dog walking", "cat sitting and a walk", "walk", "dog walking then cat sitting", "fish"):
+            assert matcher.best("pet", text) == matcher.match(text).best("pet")
+
+    def test_custom_taxonomy(self):
+        """The matcher compiles any namespace -> label -> terms mapping."""
+        matcher = IntentMatcher({"pet": {"dog": ["dog walking", "dog"], "cat": ["cat sitting"]}})
+        match = matcher.match("Dog walking and cat sitting")
+        assert match.labels("pet") == ["dog", "cat"]
+
+
+class TestConsumers:
+    """router_node, the registry and the haircut detectors share the matcher."""
+
+    @pytest.mark.asyncio
+    async def test_router_node_ignores_substrings(self):
+        """'executive' no longer routes to the haircut specialist."""
+        from langchain_core.messages import HumanMessage
+        from src.platform.services.orchestrator import router_node
+
+        result = await router_node({"messages": [HumanMessage(content="I'm an executive, book me a meeting room")]})
+        assert result["next_step"] == "concierge"
+
+    def test_registry_keyword_fallback(self):
+        """find_for_service falls back to the taxonomy."""
+        assert isinstance(specialist_registry.find_for_service("balayage touch up"), HaircutSpecialist)
+        assert specialist_registry.find_for_service("executive coaching") is None
+
+    def test_haircut_detectors(self):
+        """Styles, colors and treatments come from the shared match."""
+        specialist = HaircutSpecialist()
+        text = "cut and balayage, plus an olaplex treatment"
+        assert specialist._detect_service_type(text) == "cut_and_color"
+        assert specialist._detect_color_services(text) == ["balayage"]
+        assert specialist._detect_treatments(text) == ["Olaplex treatment"]
+        assert specialist._detect_service_type("an executive blowout") == "styling"
+
+    def test_style_category_only_when_named(self):
+        """A specific style doesn't add its category; naming the category does."""
+        specialist = HaircutSpecialist()
+        assert specialist._detect_styles("i want a wolf cut") == ["wolf cut"]
+        assert sorted(specialist._detect_styles("a low fade")) == ["fade", "low fade"]
+        assert specialist._detect_styles("a trim please") == ["trim"]
@@ -116,6 +116,7 @@ class TestMatchingService:
                 matching_service.db.query.return_value = mock_query
                 mock_query.filter.return_value = mock_query
                 mock_query.join.return_value = mock_query
+                mock_query.order_by.return_value = mock_query  # full-text rank
                 mock_query.distinct.return_value = mock_query
                 mock_query.limit.return_value.all.return_value = mock_providers
                 
@@ -135,6 +136,7 @@ class TestMatchingService:
             matching_service.db.query.return_value = mock_query
             mock_query.filter.return_value = mock_query
             mock_query.join.return_value = mock_query
+            mock_query.order_by.return_value = mock_query  # full-text rank
             mock_query.distinct.return_value = mock_query
             mock_query.limit.return_value.all.return_value = mock_providers
             
@@ -209,3 +211,61 @@ class TestMatchingService:
         """Test MatchingService initialization."""
         service = MatchingService(mock_db)
         assert service.db == mock_db
+
+
+class TestMatchingServiceAsyncSession:
+    """MatchingService on an AsyncSession routes queries through run_sync."""
+
+    @pytest.fixture
+    def sync_db(self):
+        return Mock(spec=Session)
+
+    @pytest.fixture
+    def async_db(self, sync_db):
+        from sqlalchemy.ext.asyncio import AsyncSession
+        db = Mock(spec=AsyncSession)
+        db.run_sync = AsyncMock(side_effect=lambda fn, *args, **kwargs: fn(sync_db, *args, **kwargs))
+        return db
+
+    @pytest.mark.asyncio
+    async def test_find_providers_uses_run_sync(self, async_db, sync_db, sample_request, mock_providers):
+        """Semantic path embeds first, then runs the query on the sync facade."""
+        with patch('src.platform.services.matching.settings') as mock_settings:
+            mock_settings.ENVIRONMENT = "production"
+
+            with patch('src.platform.services.matching.embedding_service') as mock_embedding:
+                mock_embedding.get_embedding = AsyncMock(return_value=[0.1] * 3072)
+
+                mock_query = Mock()
+                sync_db.query.return_value = mock_query
+                mock_query.filter.return_value = mock_query
+                mock_query.join.return_value = mock_query
+                mock_query.order_by.return_value = mock_query
+                mock_query.distinct.return_value = mock_query
+                mock_query.limit.return_value.all.return_value = mock_providers
+
+                result = await MatchingService(async_db).find_providers(sample_request)
+
+                assert result == [p.id for p in mock_providers]
+                async_db.run_sync.assert_awaited_once()
+                # Vector and full-text rankings, fused
+                assert mock_query.order_by.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_update_provider_embedding_uses_run_sync(self, async_db, sync_db):
+        """Load and store happen in separate run_sync calls around the embedding call."""
+        mock_provider = Mock()
+        mock_provider.business_name = "Test Salon"
+        mock_provider.bio = "Expert hairstylist"
+        mock_provider.specializations = []
+        sync_db.query.return_value.get.return_value = mock_provider
+        sync_db.query.return_value.filter.return_value.all.return_value = []
+
+        with patch('src.platform.services.matching.embedding_service') as mock_embedding:
+            mock_embedding.get_embedding = AsyncMock(return_value=[0.2] * 3072)
+
+            await MatchingService(async_db).update_provider_embedding(uuid4())
+
+        assert async_db.run_sync.await_count == 2
+        assert mock_provider.embedding == [0.2] * 3072
+        sync_db.commit.assert_called_once()
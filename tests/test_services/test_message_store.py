@@ -0,0 +1,91 @@
+"""
+Unit tests for the message store (incremental dict <-> LangChain history).
+"""
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from src.platform.services.message_store import (
+    MessageStore,
+    from_llm_dict,
+    llm_view,
+    to_llm_dict,
+)
+
+
+@pytest.fixture
+def store():
+    return MessageStore(max_sessions=2)
+
+
+@pytest.fixture
+def history():
+    return [
+        {"role": "system", "content": "[SYSTEM EVENT]: handoff"},
+        {"role": "user", "content": [{"type": "text", "text": "I need a haircut"}]},
+        {"role": "assistant", "content": "", "tool_calls": [{"id": "c1", "type": "function", "function": {"name": "get_offers", "arguments": "{}"}}]},
+        {"role": "tool", "tool_call_id": "c1", "name": "get_offers", "content": "{\"offers\": []}"},
+        {"role": "assistant", "content": "No offers yet."},
+    ]
+
+
+class TestConversion:
+    """Per-message conversion and caching."""
+
+    def test_round_trip(self, history):
+        """dict -> LangChain -> dict is lossless for every role."""
+        for d in history:
+            assert to_llm_dict(from_llm_dict(d)) == d
+
+    def test_conversion_cached_per_message(self):
+        """Converting the same message twice returns the cached dict."""
+        msg = AIMessage(content="hi")
+        assert to_llm_dict(msg) is to_llm_dict(msg)
+
+    def test_llm_view_skips_system(self, history):
+        """Concierge view drops system messages from history."""
+        lc = [from_llm_dict(d) for d in history]
+        view = llm_view(lc)
+        assert [d["role"] for d in view] == ["user", "assistant", "tool", "assistant"]
+
+
+class TestMessageStore:
+    """Incremental sync between turns."""
+
+    def test_only_new_messages_converted(self, store, history):
+        """Second turn converts just the appended user message."""
+        lc = store.sync("s1", history)
+        dicts = store.record("s1", lc + [AIMessage(content="Anything else?")])
+        assert store.converted == len(history)
+
+        dicts.append({"role": "user", "content": "No thanks"})
+        lc2 = store.sync("s1", dicts)
+
+        assert store.converted == len(history) + 1
+        assert store.reused == len(history) + 1
+        assert isinstance(lc2[-1], HumanMessage)
+        assert lc2[:len(lc)] == lc
+
+    def test_diverged_history_rebuilt(self, store, history):
+        """A history that no longer matches the cached prefix is rebuilt."""
+        store.sync("s1", history)
+        edited = [dict(d) for d in history]
+        edited[-1]["content"] = "Edited elsewhere"
+
+        lc = store.sync("s1", edited)
+
+        assert lc[-1].content == "Edited elsewhere"
+        assert store.converted == 2 * len(history)
+
+    def test_lru_bound(self, store, history):
+        """Old sessions are evicted past max_sessions."""
+        for sid in ("a", "b", "c"):
+            store.sync(sid, history)
+        assert list(store._sessions) == ["b", "c"]
+
+    def test_record_returns_session_dicts(self, store):
+        """record() yields plain dicts suitable for the session store."""
+        lc = [HumanMessage(content="hi"), AIMessage(content="hello"),
+              ToolMessage(tool_call_id="c1", name="x", content="{}"), SystemMessage(content="sys")]
+        dicts = store.record("s1", lc)
+        assert [d["role"] for d in dicts] == ["user", "assistant", "tool", "system"]
@@ -0,0 +1,189 @@
+"""
+Unit tests for real-time notifications and reconnect catch-up.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+import redis
+
+from src.platform.services.notifications import Notifier, booking_notifications, user_room
+
+
+@pytest.fixture
+def notifier():
+    """A notifier on the in-process log (Redis unreachable)."""
+    client = MagicMock()
+    client.xadd.side_effect = redis.ConnectionError("down")
+    client.xrange.side_effect = redis.ConnectionError("down")
+    return Notifier(max_events=3, redis_client=client)
+
+
+class TestNotificationLog:
+    """The per-user log behind catch_up."""
+
+    def test_missed_after_cursor(self, notifier):
+        """Only events after the cursor come back, oldest first, each with its own cursor."""
+        first, _ = notifier.record("user_1", "lead:new", {"request_id": uuid4()})
+        second, _ = notifier.record("user_1", "offer:new", {"offer_id": "o1"})
+        notifier.record("user_2", "lead:new", {"request_id": "r2"})
+
+        events = notifier.missed("user_1", first)
+        assert [(e["cursor"], e["event"]) for e in events] == [(second, "offer:new")]
+        assert events[0]["payload"] == {"offer_id": "o1"}
+        assert len(notifier.missed("user_1")) == 2
+
+    def test_malformed_cursor_rejected(self, notifier):
+        """missed() refuses a malformed cursor up front, before Redis or the local log see it."""
+        with pytest.raises(ValueError):
+            notifier.missed("user_1", "not-a-cursor")
+        notifier.redis_client.xrange.assert_not_called()
+
+    def test_log_is_capped(self, notifier):
+        """Only the newest max_events events are kept."""
+        for i in range(5):
+            notifier.record("user_1", "lead:new", {"n": i})
+        assert [e["payload"]["n"] for e in notifier.missed("user_1")] == [2, 3, 4]
+
+    def test_redis_stream_used(self):
+        """With Redis the log is a capped, expiring stream read from after the cursor."""
+        client = MagicMock()
+        client.xadd.return_value = b"1700000000000-0"
+        client.xrange.return_value = [(b"1700000000001-0", {b"data": b'{"event": "lead:new", "payload": {}}'})]
+        notifier = Notifier(max_events=50, ttl=60, redis_client=client)
+
+        cursor, _ = notifier.record("user_1", "lead:new", {})
+        assert cursor == "1700000000000-0"
+        assert client.xadd.call_args.kwargs["maxlen"] == 50
+        client.expire.assert_called_once_with("notifications:user_1", 60)
+
+        events = notifier.missed("user_1", cursor)
+        assert client.xrange.call_args.kwargs["min"] == "(1700000000000-0"
+        assert events == [{"cursor": "1700000000001-0", "event": "lead:new", "payload": {}}]
+
+
+class TestDelivery:
+    """Pushing events to user rooms."""
+
+    @pytest.mark.asyncio
+    async def test_notify_emits_to_user_room(self, notifier):
+        """The event goes to the user's room with its log cursor; UUIDs are serialized."""
+        request_id = uuid4()
+        with patch("src.platform.socket_io.sio.emit", new=AsyncMock()) as emit:
+            cursor = await notifier.notify("user_1", "lead:new", {"request_id": request_id})
+
+        emit.assert_awaited_once_with(
+            "lead:new", {"request_id": str(request_id), "cursor": cursor}, room="user:user_1"
+        )
+
+    @pytest.mark.asyncio
+    async def test_notify_never_raises(self, notifier):
+        """A failed emit is logged, not raised into the caller."""
+        with patch("src.platform.socket_io.sio.emit", new=AsyncMock(side_effect=RuntimeError("boom"))):
+            assert await notifier.notify("user_1", "lead:new", {}) is None
+
+    @pytest.mark.asyncio
+    async def test_worker_emitter_used(self, notifier):
+        """With a write-only manager set, events are published through it instead of the local server."""
+        emitter = MagicMock()
+        notifier.use_emitter(emitter)
+        with patch("src.platform.socket_io.sio.emit", new=AsyncMock()) as local_emit:
+            cursor = await notifier.notify("user_1", "lead:new", {})
+
+        local_emit.assert_not_awaited()
+        emitter.emit.assert_called_once_with("lead:new", {"cursor": cursor}, room="user:user_1", namespace="/")
+
+    @pytest.mark.asyncio
+    async def test_emit_from_another_loop_runs_on_server_loop(self, notifier):
+        """An emit from another thread's loop (inline matching) is handed to the server's loop."""
+        server_loop = asyncio.get_running_loop()
+        notifier.bind_loop(server_loop)
+        emitted_on = []
+
+        async def emit(*args, **kwargs):
+            emitted_on.append(asyncio.get_running_loop())
+
+        with patch("src.platform.socket_io.sio.emit", new=emit):
+            await asyncio.to_thread(asyncio.run, notifier.notify("user_1", "lead:new", {}))
+        assert emitted_on == [server_loop]
+
+    def test_threadsafe_without_loop_only_logs(self, notifier):
+        """From sync code with no loop the event is still logged for catch-up."""
+        notifier.notify_threadsafe("user_1", "booking:confirmed", {"booking_id": "b1"})
+        assert [e["event"] for e in notifier.missed("user_1")] == ["booking:confirmed"]
+
+    def test_booking_notifies_both_sides(self):
+        """Consumer and provider are addressed by their Clerk ids when they have one."""
+        consumer_id, provider_id = uuid4(), uuid4()
+        booking = MagicMock(consumer_id=consumer_id, provider_id=provider_id)
+        with patch("src.platform.services.notifications.user_ids_for",
+                   return_value={consumer_id: "user_c", provider_id: str(provider_id)}):
+            notifications = booking_notifications(MagicMock(), booking)
+        assert [(user, event) for user, event, _ in notifications] == [
+            ("user_c", "booking:confirmed"), (str(provider_id), "booking:confirmed"),
+        ]
+
+
+class TestSocketRooms:
+    """Socket connections and the catch_up event."""
+
+    @pytest.mark.asyncio
+    async def test_connect_joins_user_room(self):
+        """An authenticated connection joins user:{sub}."""
+        from src.platform.socket_io import connect
+
+        with patch("src.platform.socket_io.verify_token", return_value={"sub": "user_123"}), \
+             patch("src.platform.socket_io.sio.save_session", new=AsyncMock()), \
+             patch("src.platform.socket_io.sio.enter_room", new=AsyncMock()) as enter:
+            assert await connect("sid_1", {}, {"token": "valid.jwt.token"}) is True
+        enter.assert_awaited_once_with("sid_1", user_room("user_123"))
+
+    def test_client_manager_from_settings(self):
+        """No message queue means single-process; a Redis URL gives the pub/sub managers."""
+        import socketio
+        from src.platform.socket_io import create_client_manager
+
+        with patch("src.platform.config.settings.SOCKETIO_MESSAGE_QUEUE", ""):
+            assert create_client_manager() is None
+        with patch("src.platform.config.settings.SOCKETIO_MESSAGE_QUEUE", "redis://localhost:6379/0"):
+            assert isinstance(create_client_manager(), socketio.AsyncRedisManager)
+            writer = create_client_manager(write_only=True)
+            assert isinstance(writer, socketio.RedisManager) and writer.write_only
+
+    @pytest.mark.asyncio
+    async def test_catch_up_returns_missed_events(self, notifier):
+        """catch_up replies with the events after the client's cursor and the newest cursor."""
+        from src.platform.socket_io import catch_up
+
+        first, _ = notifier.record("user_123", "lead:new", {})
+        second, _ = notifier.record("user_123", "offer:new", {})
+        with patch("src.platform.socket_io.notifier", notifier), \
+             patch("src.platform.socket_io.sio.get_session",
+                   new=AsyncMock(return_value={"user_id": "user_123", "authenticated": True})):
+            reply = await catch_up("sid_1", {"cursor": first})
+        assert reply["status"] == "ok"
+        assert [e["event"] for e in reply["events"]] == ["offer:new"]
+        assert reply["cursor"] == second
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("cursor", ["abc", "12-x", "(0", 42])
+    async def test_catch_up_rejects_malformed_cursor(self, notifier, cursor):
+        """A cursor record() never issued is refused in the reply instead of raising."""
+        from src.platform.socket_io import catch_up
+
+        with patch("src.platform.socket_io.notifier", notifier), \
+             patch("src.platform.socket_io.sio.get_session",
+                   new=AsyncMock(return_value={"user_id": "user_123", "authenticated": True})):
+            reply = await catch_up("sid_1", {"cursor": cursor})
+        assert reply == {"status": "error", "message": "Invalid cursor"}
+
+    @pytest.mark.asyncio
+    async def test_catch_up_requires_auth(self):
+        """Unauthenticated connections get an error, not someone's events."""
+        from src.platform.socket_io import catch_up
+
+        with patch("src.platform.socket_io.sio.get_session", new=AsyncMock(return_value={})):
+            reply = await catch_up("sid_1", {})
+        assert reply["status"] == "error"
@@ -0,0 +1,104 @@
+"""
+Unit tests for ProfileCache (chat hydration profile cache).
+"""
+
+import json
+import pytest
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+from src.platform.services.profile_cache import ProfileCache
+
+
+@pytest.fixture
+def fake_redis():
+    """Dict-backed stand-in for the Redis client."""
+    store = {}
+    client = MagicMock()
+    client.get.side_effect = lambda key: store.get(key)
+    client.delete.side_effect = lambda key: store.pop(key, None)
+
+    def pipeline():
+        pipe = MagicMock()
+        pipe.setex.side_effect = lambda key, ttl, value: store.__setitem__(
+            key, value.encode() if isinstance(value, str) else value
+        )
+        return pipe
+
+    client.pipeline.side_effect = pipeline
+    client.store = store
+    return client
+
+
+@pytest.fixture
+def cache(fake_redis):
+    c = ProfileCache(max_entries=3, local_ttl=30, ttl=600, redis_client=fake_redis)
+    c.enabled = True
+    return c
+
+
+@pytest.fixture
+def profile():
+    return {"id": str(uuid4()), "name": "Sarah", "default_location": {"city": "Brooklyn"}}
+
+
+class TestProfileCache:
+    """Test ProfileCache functionality."""
+
+    def test_miss_then_hit_by_clerk_id(self, cache, profile):
+        """A set under clerk_id is resolvable by clerk_id and by consumer id."""
+        assert cache.get(clerk_id="user_1") is None
+
+        cache.set(profile, clerk_id="user_1")
+
+        assert cache.get(clerk_id="user_1") == profile
+        assert cache.get(consumer_id=profile["id"]) == profile
+        assert cache.hits == 2
+        assert cache.misses == 1
+
+    def test_redis_tier_survives_local_eviction(self, cache, fake_redis, profile):
+        """A cold process (empty LRU) still hits via Redis."""
+        cache.set(profile, clerk_id="user_1")
+        cache.clear_local()
+
+        assert cache.get(clerk_id="user_1") == profile
+        assert json.loads(fake_redis.store[f"profile:id:{profile['id']}"])["name"] == "Sarah"
+
+    def test_invalidate_drops_both_tiers(self, cache, profile):
+        """Invalidation by consumer id forces the next read to miss."""
+        cache.set(profile, clerk_id="user_1")
+        cache.invalidate(consumer_id=profile["id"])
+
+        assert cache.get(clerk_id="user_1") is None
+
+    def test_invalidate_by_clerk_id(self, cache, profile):
+        """clerk_id alone is enough to invalidate via the identity pointer."""
+        cache.set(profile, clerk_id="user_1")
+        cache.invalidate(clerk_id="user_1")
+
+        assert cache.get(consumer_id=profile["id"]) is None
+
+    def test_lru_bound(self, fake_redis):
+        """Local tier never grows past max_entries."""
+        c = ProfileCache(max_entries=2, local_ttl=30, ttl=600, redis_client=fake_redis)
+        for _ in range(5):
+            c.set({"id": str(uuid4())})
+        assert c.stats()["local_entries"] == 2
+
+    def test_returns_copy(self, cache, profile):
+        """Callers mutating the result don't corrupt the cache."""
+        cache.set(profile)
+        got = cache.get(consumer_id=profile["id"])
+        got["name"] = "Changed"
+        assert cache.get(consumer_id=profile["id"])["name"] == "Sarah"
+
+    def test_redis_errors_degrade_gracefully(self, profile):
+        """A broken Redis falls back to the local tier."""
+        broken = MagicMock()
+        broken.get.side_effect = Exception("connection refused")
+        broken.pipeline.side_effect = Exception("connection refused")
+        c = ProfileCache(max_entries=10, local_ttl=30, ttl=600, redis_client=broken)
+        c.enabled = True
+
+        c.set(profile, clerk_id="user_1")
+        assert c.get(clerk_id="user_1") == profile
@@ -0,0 +1,219 @@
+"""
+Unit tests for incremental provider re-embedding.
+"""
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from src.platform.models.provider import Provider
+from src.platform.models.service import Service
+from src.platform.services.provider_embeddings import (
+    PENDING_KEY, ReembedQueue, index_text, index_text_hash, reembed_providers,
+)
+
+MODEL = "openai/text-embedding-3-large"
+
+
+class FakeRedis:
+    """The set / string commands ReembedQueue uses."""
+
+    def __init__(self):
+        self.sets, self.strings = {}, {}
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value
+        return True
+
+    def delete(self, key):
+        self.strings.pop(key, None)
+
+    def spop(self, key, count):
+        members = self.sets.get(key, set())
+        return [members.pop() for _ in range(min(count, len(members)))]
+
+
+def _provider(bio="Curly hair specialist", embedding=None, text_hash=None):
+    return SimpleNamespace(
+        id=uuid4(), business_name="Curl Studio", bio=bio, specializations=["curly hair"],
+        location={"city": "Brooklyn"}, embedding=embedding, embedding_text_hash=text_hash,
+    )
+
+
+def _session_factory(providers, services):
+    """Sessions whose queries return the given rows; updates are recorded."""
+    updates = []
+
+    def query(model):
+        q = MagicMock()
+        if model is Provider:
+            q.filter.return_value.all.return_value = providers
+            q.filter.return_value.update.side_effect = lambda values, **kwargs: updates.append(values)
+        elif model is Service:
+            q.filter.return_value.all.return_value = services
+        return q
+
+    @contextmanager
+    def factory():
+        db = MagicMock()
+        db.query.side_effect = query
+        yield db
+
+    factory.updates = updates
+    return factory
+
+
+@pytest.fixture
+def service():
+    s = MagicMock()
+    s.model, s.dimensions = MODEL, 8
+    s.get_embeddings_batch = AsyncMock(side_effect=lambda texts: [[0.1] * 8 for _ in texts])
+    return s
+
+
+@pytest.fixture
+def queue():
+    q = ReembedQueue(redis_client=FakeRedis())
+    q.debounce, q.batch_size = 5, 2
+    return q
+
+
+def _current_hash(provider, services=()):
+    return index_text_hash(index_text(provider, services), MODEL, 8)
+
+
+class TestReembedProviders:
+    """Only providers whose index text or model changed are embedded."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_provider_is_skipped(self, service):
+        """A stored hash matching the current text costs no embedding call and rewrites no embedding."""
+        provider = _provider(embedding=[0.3] * 8)
+        provider.embedding_text_hash = _current_hash(provider)
+        factory = _session_factory([provider], [])
+
+        with patch("src.platform.services.provider_index.provider_index"):
+            stats = await reembed_providers([provider.id], service=service, session_factory=factory)
+
+        assert stats == {"embedded": 0, "skipped": 1, "missing": 0}
+        service.get_embeddings_batch.assert_not_called()
+        assert [list(u) for u in factory.updates] == [[Provider.updated_at]]
+
+    @pytest.mark.asyncio
+    async def test_category_change_reaches_index(self, service):
+        """A category-only edit re-indexes the stored embedding with the new categories, without embedding."""
+        provider = _provider(embedding=[0.3] * 8)
+        services = [SimpleNamespace(provider_id=provider.id, name="Silk press", category="Barber")]
+        provider.embedding_text_hash = _current_hash(provider, services)
+        factory = _session_factory([provider], services)
+
+        with patch("src.platform.services.provider_index.provider_index") as index:
+            await reembed_providers([provider.id], service=service, session_factory=factory)
+
+        service.get_embeddings_batch.assert_not_called()
+        index.upsert.assert_called_once_with(provider.id, [0.3] * 8, "Brooklyn", ["Barber"])
+        # Other processes pick it up from updated_at on their next sync
+        assert [list(u) for u in factory.updates] == [[Provider.updated_at]]
+
+    @pytest.mark.asyncio
+    async def test_changed_text_is_reembedded_in_one_batch(self, service):
+        """Edited and never-embedded providers go out in one call with their new hash."""
+        unchanged = _provider(embedding=[0.3] * 8)
+        unchanged.embedding_text_hash = _current_hash(unchanged)
+        edited = _provider(bio="Now also braids", embedding=[0.3] * 8, text_hash="stale")
+        new = _provider()
+        factory = _session_factory([unchanged, edited, new], [])
+
+        with patch("src.platform.services.provider_index.provider_index") as index:
+            stats = await reembed_providers(
+                [unchanged.id, edited.id, new.id, uuid4()], service=service, session_factory=factory
+            )
+
+        assert stats == {"embedded": 2, "skipped": 1, "missing": 1}
+        service.get_embeddings_batch.assert_awaited_once()
+        assert len(service.get_embeddings_batch.call_args.args[0]) == 2
+        # The unchanged provider is only touched; the other two get new embeddings and hashes
+        assert [list(u) for u in factory.updates[:1]] == [[Provider.updated_at]]
+        assert [list(u.values())[1] for u in factory.updates[1:]] == [_current_hash(edited), _current_hash(new)]
+        assert index.upsert.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_model_change_invalidates_hash(self, service):
+        """The same text under another model is re-embedded."""
+        provider = _provider(embedding=[0.3] * 8)
+        provider.embedding_text_hash = _current_hash(provider)
+        service.model = "openai/text-embedding-3-small"
+
+        with patch("src.platform.services.provider_index.provider_index"):
+            stats = await reembed_providers(
+                [provider.id], service=service, session_factory=_session_factory([provider], [])
+            )
+        assert stats["embedded"] == 1
+
+    def test_hash_covers_services(self):
+        """Adding a service changes the index text and so the hash."""
+        provider = _provider()
+        assert _current_hash(provider) != _current_hash(provider, [SimpleNamespace(name="Silk press")])
+
+
+class TestReembedQueue:
+    """Bursts of updates coalesce into one flush task."""
+
+    def test_burst_schedules_one_task(self, queue):
+        """Repeated updates to several providers queue each id once and one task."""
+        with patch("src.platform.worker.reembed_providers_task") as task:
+            for provider_id in ["a", "b", "a", "c", "a"]:
+                queue.schedule(provider_id)
+
+        task.apply_async.assert_called_once_with(countdown=5)
+        assert queue.redis_client.sets[PENDING_KEY] == {"a", "b", "c"}
+
+    def test_flush_drains_in_batches_and_requeues(self, queue):
+        """pop_batch respects the batch size; a failed batch can be put back."""
+        with patch("src.platform.worker.reembed_providers_task"):
+            for provider_id in ["a", "b", "c"]:
+                queue.schedule(provider_id)
+
+        queue.begin_flush()
+        first = queue.pop_batch()
+        assert len(first) == 2
+        queue.requeue(first)
+        assert len(queue.pop_batch()) + len(queue.pop_batch()) + len(queue.pop_batch()) == 3
+        assert queue.pop_batch() == []
+
+    def test_update_during_flush_schedules_next(self, queue):
+        """Once a flush has started, a new update schedules another task."""
+        with patch("src.platform.worker.reembed_providers_task") as task:
+            queue.schedule("a")
+            queue.begin_flush()
+            queue.schedule("b")
+        assert task.apply_async.call_count == 2
+
+    def test_without_redis_embeds_directly(self):
+        """No Redis: each update is its own delayed task carrying the id."""
+        queue = ReembedQueue(redis_client=False)
+        with patch("src.platform.worker.reembed_providers_task") as task:
+            queue.schedule("a")
+        task.apply_async.assert_called_once_with(args=[["a"]], countdown=queue.debounce)
+
+    def test_task_drains_pending_set(self, queue):
+        """The flush task embeds every queued id, batch by batch."""
+        from src.platform.worker import reembed_providers_task
+
+        for provider_id in ["a", "b", "c"]:
+            queue.redis_client.sadd(PENDING_KEY, provider_id)
+        embed = AsyncMock(side_effect=lambda ids, force=False: {"embedded": len(ids), "skipped": 0, "missing": 0})
+        with patch("src.platform.services.provider_embeddings.reembed_queue", queue), \
+                patch("src.platform.services.provider_embeddings.reembed_providers", embed):
+            totals = reembed_providers_task.apply().get()
+
+        assert totals["embedded"] == 3
+        assert embed.await_count == 2
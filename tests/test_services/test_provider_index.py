@@ -0,0 +1,359 @@
+"""
+Unit tests for the in-process provider embedding index.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from src.platform.config import settings
+from src.platform.schemas.request import (
+    RequestBudget,
+    RequestLocation,
+    RequestRequirements,
+    RequestTiming,
+    ServiceRequestCreate,
+)
+from src.platform.services.matching import MatchingService
+from src.platform.services.provider_index import ProviderIndex
+
+DIM = 32
+CITIES = ["Brooklyn", "Queens", "Manhattan"]
+CATEGORIES = ["hairstylist", "barber", "nail technician"]
+
+
+def _populate(index, n, seed=0):
+    """n random providers; returns {id: (vector, city, categories)}."""
+    rng = np.random.default_rng(seed)
+    rows = {}
+    for i in range(n):
+        provider_id = str(uuid4())
+        row = (rng.standard_normal(DIM).astype(np.float32), CITIES[i % 3], [CATEGORIES[i % 3].title()])
+        index.upsert(provider_id, *row)
+        rows[provider_id] = row
+    return rows
+
+
+def _brute_force(rows, query, city=None, category=None, k=20):
+    query = query / np.linalg.norm(query)
+    scored = []
+    for provider_id, (vector, row_city, categories) in rows.items():
+        if city is not None and row_city != city:
+            continue
+        if category and not any(category.lower() in c.lower() for c in categories):
+            continue
+        scored.append((1 - float(vector @ query / np.linalg.norm(vector)), provider_id))
+    return [provider_id for _, provider_id in sorted(scored)[:k]]
+
+
+@pytest.fixture
+def index(tmp_path):
+    return ProviderIndex(path=str(tmp_path), enabled=True, exact_max=10_000, ivf_min_rows=10_000)
+
+
+class TestProviderIndexSearch:
+    """Exact search and filters."""
+
+    def test_matches_brute_force(self, index):
+        """Filtered top-k matches a brute-force cosine ranking."""
+        rows = _populate(index, 300)
+        query = np.random.default_rng(1).standard_normal(DIM)
+
+        hits = index.search(query, city="Brooklyn", category="hair", k=10)
+
+        assert [pid for pid, _ in hits] == _brute_force(rows, query, "Brooklyn", "hair", k=10)
+        assert all(0.0 <= distance <= 2.0 for _, distance in hits)
+
+    def test_filters_mirror_the_db_query(self, index):
+        """City matches by normalized key; category is a case-insensitive substring."""
+        rows = _populate(index, 60)
+        query = np.ones(DIM)
+
+        hits = index.search(query, city="Queens", category="BARB", k=100)
+        assert {pid for pid, _ in hits} == {
+            pid for pid, (_, city, cats) in rows.items() if city == "Queens" and cats == ["Barber"]
+        }
+        assert index.search(query, city=" queens", category="BARB", k=100) == hits
+        assert index.search(query, city="Queen", k=100) == []
+
+    def test_restricted_to_provider_ids(self, index):
+        """provider_ids (a radius prefilter) limits base and delta rows."""
+        rows = _populate(index, 40)
+        index.save()
+        delta_id = str(uuid4())
+        index.upsert(delta_id, np.ones(DIM), "Brooklyn", ["Hair"])
+        allowed = list(rows)[:5] + [delta_id]
+
+        hits = index.search(np.ones(DIM), k=100, provider_ids=allowed)
+        assert {pid for pid, _ in hits} == set(allowed)
+
+    def test_upsert_and_remove(self, index):
+        """Upserts replace a provider's row; removed providers disappear."""
+        rows = _populate(index, 20)
+        provider_id = next(iter(rows))
+        query = np.random.default_rng(2).standard_normal(DIM)
+
+        index.upsert(provider_id, query, "Brooklyn", ["Barber"])
+        assert index.search(query, city="Brooklyn", category="barber", k=1)[0][0] == provider_id
+        assert len(index) == 20
+
+        index.remove(provider_id)
+        assert provider_id not in {pid for pid, _ in index.search(query, k=100)}
+        assert len(index) == 19
+
+    def test_dimension_mismatch_raises(self, index):
+        """A query from a different embedding model is rejected, not mis-scored."""
+        _populate(index, 5)
+        index.save()
+        with pytest.raises(ValueError):
+            index.search(np.ones(DIM + 1))
+
+
+class TestProviderIndexPersistence:
+    """Snapshots, memory-mapping and IVF."""
+
+    def test_save_and_load_round_trip(self, index, tmp_path):
+        """A new process memory-maps the snapshot and answers the same queries."""
+        rows = _populate(index, 200)
+        query = np.random.default_rng(3).standard_normal(DIM)
+        expected = index.search(query, category="nail", k=5)
+        index.save()
+
+        cold = ProviderIndex(path=str(tmp_path), enabled=True)
+        assert cold.load()
+        assert isinstance(cold._base.vectors, np.memmap)
+        assert len(cold) == len(rows)
+        assert [pid for pid, _ in cold.search(query, category="nail", k=5)] == [pid for pid, _ in expected]
+
+    def test_updates_after_save_shadow_the_snapshot(self, index):
+        """Delta rows win over the snapshot until the next save compacts them."""
+        rows = _populate(index, 50)
+        index.save()
+        provider_id = next(iter(rows))
+        query = np.random.default_rng(4).standard_normal(DIM)
+
+        index.upsert(provider_id, query, "Queens", ["Barber"])
+        hits = index.search(query, k=100)
+        assert [pid for pid, _ in hits].count(provider_id) == 1
+        assert hits[0][0] == provider_id
+
+        index.save()
+        assert index.delta_rows == 0
+        assert index.search(query, k=1)[0][0] == provider_id
+
+    def test_ivf_recall(self, tmp_path):
+        """With IVF lists, an unfiltered search over many rows keeps high recall."""
+        index = ProviderIndex(path=str(tmp_path), enabled=True, exact_max=100, ivf_min_rows=1000, nprobe=12)
+        # Clustered data, like real embeddings
+        rng = np.random.default_rng(5)
+        centers = rng.standard_normal((40, DIM))
+        rows = {}
+        for i in range(4000):
+            vector = centers[i % 40] + 0.3 * rng.standard_normal(DIM)
+            rows[str(uuid4())] = (vector.astype(np.float32), "Brooklyn", ["Hairstylist"])
+        for provider_id, row in rows.items():
+            index.upsert(provider_id, *row)
+        index.save()
+        assert index._base.centroids is not None
+
+        recall = []
+        for q in range(20):
+            query = centers[q] + 0.3 * rng.standard_normal(DIM)
+            found = {pid for pid, _ in index.search(query, k=10)}
+            recall.append(len(found & set(_brute_force(rows, query, k=10))) / 10)
+        assert np.mean(recall) >= 0.9
+
+
+class TestProviderIndexSync:
+    """sync() pulls provider changes from the DB."""
+
+    def test_sync_applies_changes(self, index):
+        """Active providers with embeddings are indexed; inactive ones removed."""
+        active, inactive = uuid4(), uuid4()
+        index.upsert(inactive, np.ones(DIM), "Brooklyn", ["Barber"])
+
+        db = Mock(spec=Session)
+        providers = Mock()
+        providers.filter.return_value = providers
+        providers.order_by.return_value.all.return_value = [
+            (active, [0.5] * DIM, {"city": "Brooklyn"}, "active", None),
+            (inactive, [0.5] * DIM, {"city": "Brooklyn"}, "suspended", None),
+        ]
+        services = Mock()
+        services.filter.return_value.all.return_value = [(active, "Hairstylist")]
+        db.query.side_effect = [providers, services]
+
+        assert index.sync(db) == 2
+        assert [pid for pid, _ in index.search(np.ones(DIM), city="Brooklyn", category="hair")] == [str(active)]
+        assert len(index) == 1
+
+    def test_sync_rereads_rows_behind_watermark(self, index):
+        """A row committed late, stamped below a watermark that already moved on, is still indexed."""
+        watermark = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+        index.synced_at = watermark
+        late = uuid4()
+
+        db = Mock(spec=Session)
+        providers = Mock()
+        providers.filter.return_value = providers
+        # Its transaction started 10s before the last sync and committed after it
+        providers.order_by.return_value.all.return_value = [
+            (late, [0.5] * DIM, {"city": "Brooklyn"}, "active", watermark - timedelta(seconds=10)),
+        ]
+        services = Mock()
+        services.filter.return_value.all.return_value = [(late, "Barber")]
+        db.query.side_effect = [providers, services]
+
+        assert index.sync(db) == 1
+        lower_bound = providers.filter.call_args.args[0].right.value
+        assert lower_bound == watermark - timedelta(seconds=settings.PROVIDER_INDEX_SYNC_LAG_SECONDS)
+        assert [pid for pid, _ in index.search(np.ones(DIM), city="Brooklyn")] == [str(late)]
+        # The watermark never moves backwards
+        assert index.synced_at == watermark
+
+    def test_refresher_syncs_in_background(self, index):
+        """The refresher thread syncs on start and is started only once per process."""
+        db = Mock(spec=Session)
+        session_factory = Mock()
+        session_factory.return_value.__enter__ = Mock(return_value=db)
+        session_factory.return_value.__exit__ = Mock(return_value=False)
+
+        with patch.object(index, "sync", return_value=0) as sync:
+            index.start_refresher(session_factory)
+            thread = index._refresher
+            index.start_refresher(session_factory)
+            assert index._refresher is thread
+            for _ in range(200):
+                if index.ready or sync.called:
+                    break
+                time.sleep(0.01)
+            index.stop_refresher()
+
+        sync.assert_called_once_with(db)
+        assert not thread.is_alive()
+
+
+@pytest.fixture
+def sample_request():
+    return ServiceRequestCreate(
+        consumer_id=str(uuid4()),
+        raw_input="I need a haircut for curly hair in Brooklyn",
+        service_category="hairstylist",
+        service_type="haircut",
+        requirements=RequestRequirements(description="curly hair specialist"),
+        location=RequestLocation(city="Brooklyn", neighborhood="Bed-Stuy"),
+        timing=RequestTiming(urgency="specific_date"),
+        budget=RequestBudget(min=60, max=80, currency="USD"),
+    )
+
+
+class TestFindProvidersWithIndex:
+    """MatchingService.find_providers ranks from the index, with the DB as fallback."""
+
+    @pytest.mark.asyncio
+    async def test_uses_index_and_drops_inactive(self, sample_request):
+        """Index hits are re-checked against the DB and keep their ranking."""
+        first, second, gone = uuid4(), uuid4(), uuid4()
+        index = Mock(enabled=True)
+        index.search.return_value = [(str(first), 0.1), (str(gone), 0.2), (str(second), 0.3)]
+
+        db = Mock(spec=Session)
+        db.query.return_value.filter.return_value.all.return_value = [(second,), (first,)]
+        # No full-text matches: the fused ranking is the index's
+        db.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = []
+
+        with patch('src.platform.services.matching.settings') as mock_settings, \
+                patch('src.platform.services.matching.provider_index', index), \
+                patch('src.platform.services.matching.embedding_service') as mock_embedding:
+            mock_settings.ENVIRONMENT = "production"
+            mock_embedding.get_embedding = AsyncMock(return_value=[0.1] * DIM)
+
+            result = await MatchingService(db).find_providers(sample_request)
+
+        assert result == [first, second]
+        # The query only searches; syncing is the refresher thread's job
+        index.refresh.assert_not_called()
+        index.start_refresher.assert_called_once_with()
+        assert index.search.call_args.kwargs["city"] == "Brooklyn"
+        assert index.search.call_args.kwargs["category"] == "hairstylist"
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_db_on_index_error(self, sample_request):
+        """A failing index search falls back to the pgvector query."""
+        index = Mock(enabled=True)
+        index.search.side_effect = ValueError("query has 3072 dims, index has 1536")
+        provider = Mock(id=uuid4())
+
+        db = Mock(spec=Session)
+        query = Mock()
+        db.query.return_value = query
+        query.filter.return_value = query
+        query.join.return_value = query
+        query.order_by.return_value = query
+        query.distinct.return_value = query
+        query.limit.return_value.all.return_value = [provider]
+
+        with patch('src.platform.services.matching.settings') as mock_settings, \
+                patch('src.platform.services.matching.provider_index', index), \
+                patch('src.platform.services.matching.embedding_service') as mock_embedding:
+            mock_settings.ENVIRONMENT = "production"
+            mock_embedding.get_embedding = AsyncMock(return_value=[0.1] * DIM)
+
+            result = await MatchingService(db).find_providers(sample_request)
+
+        assert result == [provider.id]
+        # pgvector and full-text rankings
+        assert query.order_by.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_db_query_until_index_synced(self, sample_request):
+        """Before the refresher's first sync the index isn't searched."""
+        index = Mock(enabled=True, ready=False)
+        db = Mock(spec=Session)
+
+        with patch('src.platform.services.matching.settings') as mock_settings, \
+                patch('src.platform.services.matching.provider_index', index), \
+                patch('src.platform.services.matching.embedding_service') as mock_embedding, \
+                patch.object(MatchingService, '_query_matching', return_value=[]) as query_matching:
+            mock_settings.ENVIRONMENT = "production"
+            mock_embedding.get_embedding = AsyncMock(return_value=[0.1] * DIM)
+
+            await MatchingService(db).find_providers(sample_request)
+
+        index.search.assert_not_called()
+        query_matching.assert_called_once()
+
+
+class TestProviderIndexStorage:
+    """Quantized snapshots and re-dimensioned embeddings."""
+
+    @pytest.mark.parametrize("dtype", ["float16", "int8"])
+    def test_quantized_snapshot_keeps_ranking(self, tmp_path, dtype):
+        """float16 / int8 snapshots return (nearly) the float32 top-k."""
+        index = ProviderIndex(path=str(tmp_path), enabled=True, dtype=dtype, exact_max=10_000, ivf_min_rows=10_000)
+        rows = _populate(index, 500)
+        index.save()
+        assert index._base.vectors.dtype == np.dtype(dtype)
+
+        rng = np.random.default_rng(6)
+        recall = []
+        for _ in range(10):
+            query = rng.standard_normal(DIM)
+            found = {pid for pid, _ in index.search(query, k=10)}
+            recall.append(len(found & set(_brute_force(rows, query, k=10))) / 10)
+        assert np.mean(recall) >= 0.9
+
+    def test_snapshot_of_another_width_is_ignored(self, index, tmp_path):
+        """After LLM_EMBEDDING_DIMENSIONS changes, the old snapshot isn't served."""
+        _populate(index, 10)
+        index.save()
+
+        resized = ProviderIndex(path=str(tmp_path), enabled=True, dims=DIM // 2)
+        assert not resized.load()
+        assert len(resized) == 0
+        assert ProviderIndex(path=str(tmp_path), enabled=True, dims=DIM).load()
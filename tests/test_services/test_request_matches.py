@@ -0,0 +1,204 @@
+"""
+Unit tests for the request_matches table and the provider lead inbox.
+
+Runs against in-memory SQLite with just the two tables involved.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.platform.database import Base
+from src.platform.models.request import RequestMatch, ServiceRequest
+from src.platform.services.request_matches import (
+    decode_cursor, lead_inbox, match_request, record_matches, schedule_matching,
+)
+from src.platform.worker import match_request_task
+
+
+def _wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[ServiceRequest.__table__, RequestMatch.__table__])
+    return sessionmaker(engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    with session_factory() as session:
+        yield session
+
+
+def _matched_request(db, provider_ids, status="matching"):
+    request = ServiceRequest(status=status, service_type="fade", location={"city": "New York"})
+    db.add(request)
+    db.flush()
+    record_matches(db, request, provider_ids)
+    db.commit()
+    return request
+
+
+class TestRecordMatches:
+    """Matching writes one row per matched provider."""
+
+    def test_rows_and_json_written(self, db):
+        """Rows carry reciprocal-rank scores and the request status; matched_providers stays in step."""
+        first, second = uuid4(), uuid4()
+        request = _matched_request(db, [first, second])
+
+        rows = {m.provider_id: m for m in db.query(RequestMatch).all()}
+        assert rows[first].score == 1.0 and rows[second].score == 0.5
+        assert {m.status for m in rows.values()} == {"matching"}
+        assert request.matched_providers == [str(first), str(second)]
+
+    def test_rematch_replaces_rows(self, db):
+        """Dropped providers are removed; kept ones keep matched_at and get the new score."""
+        kept, dropped, added = uuid4(), uuid4(), uuid4()
+        request = _matched_request(db, [dropped, kept])
+        matched_at = db.get(RequestMatch, (request.id, kept)).matched_at
+
+        record_matches(db, request, [added, kept])
+        db.commit()
+
+        rows = {m.provider_id: m for m in db.query(RequestMatch).all()}
+        assert set(rows) == {kept, added}
+        assert rows[kept].score == 0.5
+        assert rows[kept].matched_at == matched_at
+
+    def test_status_follows_request(self, db):
+        """Changing the request's status updates its match rows."""
+        request = _matched_request(db, [uuid4(), uuid4()])
+        request.status = "booked"
+        db.commit()
+
+        assert {m.status for m in db.query(RequestMatch).all()} == {"booked"}
+
+
+class TestLeadInbox:
+    """Keyset-paginated inbox reads."""
+
+    def test_pages_cover_every_lead_once(self, db):
+        """Newest first, no duplicates or gaps across pages, no cursor after the last."""
+        provider = uuid4()
+        created = [_matched_request(db, [provider, uuid4()]).id for _ in range(5)]
+        _matched_request(db, [uuid4()])  # someone else's lead
+
+        seen, cursor = [], None
+        for _ in range(3):
+            page, cursor = lead_inbox(db, provider, cursor=cursor, limit=2)
+            seen.extend(r.id for r in page)
+            if cursor is None:
+                break
+        assert seen == created[::-1]
+        assert cursor is None
+
+    def test_status_filter(self, db):
+        """Only leads whose request still has the status are returned."""
+        provider = uuid4()
+        open_lead = _matched_request(db, [provider])
+        booked = _matched_request(db, [provider])
+        booked.status = "booked"
+        db.commit()
+
+        page, cursor = lead_inbox(db, provider, status="matching")
+        assert [r.id for r in page] == [open_lead.id]
+        assert cursor is None
+
+    def test_bad_cursor(self, db):
+        """A malformed cursor is a ValueError, not a query error."""
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+        with pytest.raises(ValueError):
+            lead_inbox(db, uuid4(), cursor="bm9wZQ")
+
+
+class TestMatchingPipeline:
+    """Matching off the request path."""
+
+    def _stored_request(self, db, status="matching"):
+        request = ServiceRequest(
+            consumer_id=uuid4(),
+            raw_input="fade",
+            service_category="barber",
+            service_type="fade",
+            requirements={},
+            location={"city": "New York"},
+            timing={},
+            budget={},
+            status=status,
+            status_history=[],
+        )
+        db.add(request)
+        db.commit()
+        return request
+
+    @pytest.mark.asyncio
+    async def test_match_request(self, session_factory, db):
+        """Matches are recorded, the request moves to matched, consumer and providers are notified."""
+        request = self._stored_request(db)
+        providers = [uuid4(), uuid4()]
+        with patch("src.platform.services.matching.MatchingService.find_providers",
+                   new=AsyncMock(return_value=providers)), \
+             patch("src.platform.services.request_matches.notifier.notify", new=AsyncMock()) as emit:
+            result = await match_request(request.id, session_factory=session_factory)
+
+        assert result == providers
+        db.expire_all()
+        stored = db.get(ServiceRequest, request.id)
+        assert stored.status == "matched"
+        assert stored.status_history[-1]["status"] == "matched"
+        assert {m.provider_id for m in db.query(RequestMatch).all()} == set(providers)
+        assert {m.status for m in db.query(RequestMatch).all()} == {"matched"}
+        events = [(c.args[0], c.args[1]) for c in emit.await_args_list]
+        assert events == [(str(stored.consumer_id), "request:matched")] + [(str(p), "lead:new") for p in providers]
+
+    @pytest.mark.asyncio
+    async def test_closed_request_not_matched(self, session_factory, db):
+        """A request cancelled before the task runs is left alone."""
+        request = self._stored_request(db, status="cancelled")
+        with patch("src.platform.services.matching.MatchingService.find_providers", new=AsyncMock()) as find:
+            assert await match_request(request.id, session_factory=session_factory) == []
+        find.assert_not_awaited()
+
+    def test_task_retries_on_failure(self):
+        """A failing attempt is retried with backoff rather than dropped."""
+        with patch("src.platform.services.request_matches.match_request", new=AsyncMock(side_effect=RuntimeError("down"))), \
+             patch.object(match_request_task, "retry", side_effect=RuntimeError("retry")) as retry:
+            with pytest.raises(RuntimeError, match="retry"):
+                match_request_task.run(str(uuid4()))
+        assert retry.call_args.kwargs["countdown"] == 5
+
+    @pytest.mark.asyncio
+    async def test_schedule_falls_back_inline(self):
+        """With the broker down, matching runs on a background thread, off the API loop."""
+        ran_on = []
+
+        async def run(request_id):
+            ran_on.append(threading.current_thread().name)
+
+        with patch.object(match_request_task, "apply_async", side_effect=ConnectionError("broker down")), \
+             patch("src.platform.services.request_matches.match_request", new=run):
+            schedule_matching(uuid4())
+            await asyncio.to_thread(_wait_until, lambda: ran_on)
+        assert ran_on == ["inline-matching"]
+
+    def test_schedule_falls_back_inline_from_sync_route(self):
+        """Sync routes run in the threadpool with no event loop; the fallback still runs."""
+        run = AsyncMock(return_value=[])
+        with patch.object(match_request_task, "apply_async", side_effect=ConnectionError("broker down")), \
+             patch("src.platform.services.request_matches.match_request", new=run):
+            schedule_matching(uuid4())
+            _wait_until(lambda: run.await_count)
+        run.assert_awaited_once()
@@ -0,0 +1,127 @@
+"""
+Unit tests for SpecialistService: compiled knowledge and hot reload.
+"""
+
+import os
+
+import pytest
+
+from src.platform.services.specialist_service import SpecialistService, specialist_service
+
+KNOWLEDGE = """
+technical_terms:
+  - "balayage"
+  - "process time"
+  - "4C"
+warnings:
+  color_correction: "Consult first."
+pricing_factors:
+  hair_length:
+    long: 1.5
+  service_type:
+    cut: 1.0
+    color_correction: 3.0
+"""
+
+
+def _write(path, text, bump=0):
+    path.write_text(text)
+    # mtime resolution can be coarse; make every rewrite visible
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump * 1_000_000_000))
+
+
+@pytest.fixture
+def knowledge_dir(tmp_path):
+    _write(tmp_path / "haircut.yaml", KNOWLEDGE)
+    return tmp_path
+
+
+class TestConsult:
+    """Consults against the compiled knowledge base."""
+
+    def test_terms_warnings_and_pricing(self, knowledge_dir):
+        """One pass finds terms, warnings and priced service types."""
+        service = SpecialistService(str(knowledge_dir), reload_interval=-1)
+        result = service.consult("haircut", "Color correction and balayage on my 4C hair", {"hair_length": "long"})
+
+        assert result["terms_identified"] == ["balayage", "4C"]
+        assert result["warnings"] == ["Consult first."]
+        assert result["complexity_multiplier"] == 4.5
+        assert result["pricing_factors"] == ["Service: color_correction (x3.0)", "Length: long (x1.5)"]
+
+    def test_whole_words_only(self, knowledge_dir):
+        """Vocabulary matches words, not substrings of other words."""
+        service = SpecialistService(str(knowledge_dir), reload_interval=-1)
+        result = service.consult("haircut", "an executive haircut")
+        assert result["pricing_factors"] == []
+
+    def test_unknown_specialist(self, knowledge_dir):
+        """Unknown names report an error, as before."""
+        service = SpecialistService(str(knowledge_dir), reload_interval=-1)
+        assert "error" in service.consult("plumbing", "leak")
+
+    def test_large_vocabulary(self, tmp_path):
+        """Thousands of terms compile into the same single-pass matcher."""
+        terms = "\n".join(f'  - "term {i}"' for i in range(5000))
+        _write(tmp_path / "big.yaml", f"technical_terms:\n{terms}\n")
+        service = SpecialistService(str(tmp_path), reload_interval=-1)
+        assert service.consult("big", "about term 4321 and term 7")["terms_identified"] == ["term 7", "term 4321"]
+
+    def test_bundled_knowledge(self):
+        """The shipped haircut knowledge still drives the module singleton."""
+        result = specialist_service.consult("haircut", "I need a color correction for my 4C hair")
+        assert "4C" in result["terms_identified"]
+        assert result["complexity_multiplier"] >= 3.0
+
+
+class TestHotReload:
+    """Knowledge files are watched by mtime and swapped in atomically."""
+
+    def test_edit_is_picked_up(self, knowledge_dir):
+        """An edited file is recompiled on the next check."""
+        service = SpecialistService(str(knowledge_dir), reload_interval=0)
+        before = service.get_compiled("haircut")
+        assert service.consult("haircut", "needs porosity check")["terms_identified"] == []
+
+        _write(knowledge_dir / "haircut.yaml", KNOWLEDGE.replace('"4C"', '"porosity"'), bump=1)
+
+        assert service.consult("haircut", "needs porosity check")["terms_identified"] == ["porosity"]
+        # The old compiled version is untouched (in-flight consults keep using it)
+        assert before.matcher.match("porosity").labels("term") == []
+
+    def test_unchanged_files_are_reused(self, knowledge_dir):
+        """Adding a file compiles only that file."""
+        service = SpecialistService(str(knowledge_dir), reload_interval=0)
+        haircut = service.get_compiled("haircut")
+
+        _write(knowledge_dir / "plumbing.yaml", 'technical_terms: ["p-trap"]\n')
+
+        assert service.consult("plumbing", "replace the p-trap")["terms_identified"] == ["p-trap"]
+        assert service.get_compiled("haircut") is haircut
+
+    def test_broken_file_keeps_last_good_version(self, knowledge_dir):
+        """A file that fails to parse doesn't take its specialist down."""
+        service = SpecialistService(str(knowledge_dir), reload_interval=0)
+
+        _write(knowledge_dir / "haircut.yaml", "technical_terms: [unclosed\n", bump=1)
+
+        assert service.consult("haircut", "balayage")["terms_identified"] == ["balayage"]
+        assert service.reload() is False  # Not retried until the file changes again
+
+    def test_removed_file_is_dropped(self, knowledge_dir):
+        """Deleting a knowledge file removes its specialist."""
+        service = SpecialistService(str(knowledge_dir), reload_interval=0)
+        os.remove(knowledge_dir / "haircut.yaml")
+        assert service.get_specialist("haircut") is None
+
+    def test_reload_interval_throttles_checks(self, knowledge_dir):
+        """Between checks, consults don't touch the filesystem."""
+        service = SpecialistService(str(knowledge_dir), reload_interval=3600)
+        service.consult("haircut", "warm up")
+
+        _write(knowledge_dir / "haircut.yaml", KNOWLEDGE.replace('"4C"', '"porosity"'), bump=1)
+
+        assert service.consult("haircut", "porosity")["terms_identified"] == []
+        assert service.reload() is True
+        assert service.consult("haircut", "porosity")["terms_identified"] == ["porosity"]
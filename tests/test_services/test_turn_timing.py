@@ -0,0 +1,104 @@
+"""
+Unit tests for per-turn timing (spans, histograms, debug breakdown).
+"""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from prometheus_client import REGISTRY
+
+from src.platform.services import turn_timing
+from src.platform.services.orchestrator import router_node, tool_node
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestTurnTimings:
+    """TurnTimings bookkeeping."""
+
+    def test_breakdown_sums_repeated_sections(self):
+        """Sections that run more than once are summed with a count."""
+        timings = turn_timing.TurnTimings()
+        timings.add("node.concierge", 0.2)
+        timings.add("node.concierge", 0.3)
+        timings.add("tool.get_offers", 0.05)
+
+        sections = timings.breakdown()["sections"]
+
+        assert sections["node.concierge"] == {"ms": 500.0, "count": 2}
+        assert sections["tool.get_offers"]["count"] == 1
+
+    def test_server_timing_header(self):
+        """Header lists sections, LLM calls, loop iterations and total."""
+        timings = turn_timing.TurnTimings()
+        timings.add("node.concierge", 0.2)
+        timings.add("node.concierge", 0.1)
+        timings.llm_calls = 3
+        timings.iterations = 1
+
+        header = timings.server_timing()
+
+        assert 'node.concierge;dur=300.0;desc="x2"' in header
+        assert 'llm;desc="3 calls"' in header
+        assert 'loop;desc="1 iterations"' in header
+        assert "total;dur=" in header
+
+    def test_nested_turn_joins_outer(self):
+        """handle_chat's turn() inside the router's joins the same timings."""
+        with turn_timing.turn("s1") as outer:
+            with turn_timing.turn("s1") as inner:
+                turn_timing.count_llm_call()
+        assert inner is outer
+        assert outer.llm_calls == 1
+        assert turn_timing.current_turn() is None
+
+    def test_turn_observes_counts(self):
+        """LLM calls and loop iterations are observed once per turn."""
+        before = _sample("proxie_chat_turn_llm_calls_count")
+        with turn_timing.turn():
+            turn_timing.count_llm_call()
+            turn_timing.count_iteration()
+        assert _sample("proxie_chat_turn_llm_calls_count") == before + 1
+
+    def test_counters_noop_outside_turn(self):
+        """Counting without an active turn is harmless."""
+        turn_timing.count_llm_call()
+        turn_timing.count_iteration()
+
+
+class TestNodeInstrumentation:
+    """Orchestrator nodes and tools report into the turn."""
+
+    @pytest.mark.asyncio
+    async def test_node_timed(self):
+        """Decorated nodes observe the node histogram and record a section."""
+        before = _sample("proxie_orchestrator_node_seconds_count", node="router")
+        with turn_timing.turn() as timings:
+            await router_node({"messages": [HumanMessage(content="hello")]})
+
+        assert _sample("proxie_orchestrator_node_seconds_count", node="router") == before + 1
+        assert "node.router" in timings.breakdown()["sections"]
+
+    @pytest.mark.asyncio
+    async def test_tool_timed_and_iteration_counted(self):
+        """tool_node times each tool and counts one loop iteration."""
+        tool_calls = [
+            {"id": "c1", "type": "function", "function": {"name": "get_offers", "arguments": json.dumps({})}},
+            {"id": "c2", "type": "function", "function": {"name": "recall_preferences", "arguments": "{}"}},
+        ]
+        state = {"messages": [AIMessage(content="", additional_kwargs={"tool_calls": tool_calls})], "context": {}}
+        before = _sample("proxie_tool_seconds_count", tool="get_offers")
+
+        with patch("src.platform.services.chat.chat_service._execute_tool", AsyncMock(return_value={"ok": True})):
+            with turn_timing.turn() as timings:
+                result = await tool_node(state)
+
+        assert len(result["messages"]) == 2
+        assert timings.iterations == 1
+        sections = timings.breakdown()["sections"]
+        assert {"tool.get_offers", "tool.recall_preferences", "node.tools"} <= set(sections)
+        assert _sample("proxie_tool_seconds_count", tool="get_offers") == before + 1
@@ -0,0 +1,89 @@
+"""
+Unit tests for the Celery worker's persistent event loop.
+"""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.platform.worker import WorkerLoop, _run_async, worker_loop
+
+
+@pytest.fixture
+def loop_runner():
+    runner = WorkerLoop()
+    runner.enabled = True
+    with patch("src.platform.database.async_engine", new=AsyncMock()):
+        yield runner
+        runner.stop()
+
+
+class TestWorkerLoop:
+    """One loop per worker process, shared by every task."""
+
+    def test_tasks_share_one_loop(self, loop_runner):
+        """Consecutive tasks run on the same loop, off the calling thread."""
+        async def where():
+            return asyncio.get_running_loop(), threading.current_thread().name
+
+        first, second = loop_runner.run(where()), loop_runner.run(where())
+        assert first == second
+        assert first[1] == "worker-event-loop"
+
+    def test_loop_bound_clients_survive_between_tasks(self, loop_runner):
+        """Something created on the loop by one task is usable by the next (a warm client)."""
+        clients = {}
+
+        async def get_client():
+            if "queue" not in clients:
+                clients["queue"] = asyncio.Queue()
+            await clients["queue"].put(1)
+            return clients["queue"].qsize()
+
+        assert [loop_runner.run(get_client()) for _ in range(3)] == [1, 2, 3]
+
+    def test_errors_propagate(self, loop_runner):
+        """A failing coroutine raises in the task, and the loop keeps serving."""
+        async def fail():
+            raise ValueError("boom")
+
+        async def ok():
+            return "ok"
+
+        with pytest.raises(ValueError, match="boom"):
+            loop_runner.run(fail())
+        assert loop_runner.run(ok()) == "ok"
+
+    def test_loop_from_another_process_replaced(self, loop_runner):
+        """A loop inherited through fork is not reused; a new one is started."""
+        loop_runner.start()
+        inherited = loop_runner.loop
+        loop_runner._pid = -1
+        assert loop_runner.start() is not inherited
+        inherited.call_soon_threadsafe(inherited.stop)
+
+    def test_stop_disposes_async_clients(self, loop_runner):
+        """Shutdown closes the asyncpg pool on the loop that owns it and stops the thread."""
+        async def noop():
+            return None
+
+        loop_runner.run(noop())
+        thread = loop_runner._thread
+        with patch("src.platform.database.async_engine", new=AsyncMock()) as engine:
+            loop_runner.stop()
+        engine.dispose.assert_awaited_once()
+        assert not thread.is_alive() and not loop_runner.running
+
+    def test_run_async_uses_worker_loop_when_enabled(self):
+        """Tasks go through the worker loop once the worker has started it."""
+        async def loop_id():
+            return id(asyncio.get_running_loop())
+
+        with patch.object(worker_loop, "enabled", True), \
+             patch("src.platform.database.async_engine", new=AsyncMock()):
+            try:
+                assert _run_async(loop_id()) == _run_async(loop_id()) == id(worker_loop.loop)
+            finally:
+                worker_loop.stop()
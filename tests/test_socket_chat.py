@@ -0,0 +1,147 @@
+"""
+Tests for chat turns over the WebSocket (chat_message).
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from src.platform.services import turn_timing
+
+
+AUTHENTICATED = {"user_id": "user_123", "authenticated": True}
+
+
+@pytest.fixture
+def socket_env():
+    """Authenticated socket session with emits and room joins captured."""
+    from src.platform.socket_io import chat_turns
+
+    with patch('src.platform.socket_io.sio.get_session', new=AsyncMock(return_value=AUTHENTICATED)), \
+         patch('src.platform.socket_io.sio.enter_room', new=AsyncMock()) as enter_room, \
+         patch('src.platform.socket_io.sio.emit', new=AsyncMock()) as emit:
+        yield emit, enter_room
+    for sid in ("sid_1", "sid_2"):
+        chat_turns.cancel(sid)
+
+
+async def _wait_for(emit, event, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while asyncio.get_running_loop().time() < deadline:
+        for call in emit.call_args_list:
+            if call.args[0] == event:
+                return call
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"{event} not emitted")
+
+
+class TestSocketChat:
+    """chat_message runs a real chat turn and streams it to the session room."""
+
+    @pytest.mark.asyncio
+    async def test_turn_streams_deltas_then_response(self, socket_env):
+        """Deltas reach the session room before the final chat:response."""
+        from src.platform.socket_io import chat_message
+        emit, enter_room = socket_env
+
+        async def handle_chat(**kwargs):
+            with turn_timing.stage("extraction"):
+                pass
+            turn_timing.progress("text", content="Here are your current leads:")
+            return kwargs["session_id"], "Here are your current leads.", {"leads": []}, None, False
+
+        with patch('src.platform.services.chat.chat_service.handle_chat', new=AsyncMock(side_effect=handle_chat)) as chat:
+            ack = await chat_message("sid_1", {"session_id": "s1", "content": "show me leads"})
+            assert ack == {"status": "queued", "session_id": "s1"}
+            await _wait_for(emit, "chat:response")
+
+        assert chat.call_args.kwargs["message"] == "show me leads"
+        assert chat.call_args.kwargs["clerk_id"] == "user_123"
+        enter_room.assert_awaited_once_with("sid_1", "session:s1")
+        events = [(c.args[0], c.args[1].get("type"), c.kwargs["room"]) for c in emit.call_args_list]
+        assert events == [
+            ("chat:delta", "stage", "session:s1"),
+            ("chat:delta", "text", "session:s1"),
+            ("chat:response", None, "session:s1"),
+        ]
+        response = emit.call_args_list[-1].args[1]
+        assert response["content"] == "Here are your current leads."
+        assert response["data"] == {"leads": []}
+
+    @pytest.mark.asyncio
+    async def test_failed_turn_emits_error(self, socket_env):
+        """A turn that raises ends with chat:error in the session room, not silence."""
+        from src.platform.socket_io import chat_message
+        emit, _ = socket_env
+
+        with patch('src.platform.services.chat.chat_service.handle_chat',
+                   new=AsyncMock(side_effect=RuntimeError("LLM down"))):
+            ack = await chat_message("sid_1", {"session_id": "s1", "content": "hello"})
+            assert ack["status"] == "queued"
+            error = await _wait_for(emit, "chat:error")
+
+        assert error.kwargs["room"] == "session:s1"
+        assert error.args[1]["session_id"] == "s1" and error.args[1]["message"]
+        assert "chat:response" not in [c.args[0] for c in emit.call_args_list]
+
+    @pytest.mark.asyncio
+    async def test_new_session_id_assigned(self, socket_env):
+        """Without a session_id the turn gets a new session, returned in the ack."""
+        from src.platform.socket_io import chat_message
+
+        with patch('src.platform.services.chat.chat_service.handle_chat',
+                   new=AsyncMock(return_value=("x", "Hi", None, None, False))):
+            ack = await chat_message("sid_1", {"message": "hello"})
+            await _wait_for(socket_env[0], "chat:response")
+        assert ack["status"] == "queued" and ack["session_id"]
+
+    @pytest.mark.asyncio
+    async def test_backpressure_per_connection(self, socket_env):
+        """One running turn plus SOCKET_CHAT_MAX_PENDING waiting; the next is refused."""
+        from src.platform.socket_io import chat_message
+        release = asyncio.Event()
+
+        async def handle_chat(**kwargs):
+            await release.wait()
+            return kwargs["session_id"], "done", None, None, False
+
+        with patch('src.platform.config.settings.SOCKET_CHAT_MAX_PENDING', 1), \
+             patch('src.platform.services.chat.chat_service.handle_chat', new=AsyncMock(side_effect=handle_chat)):
+            acks = [await chat_message("sid_1", {"session_id": "s1", "message": str(i)}) for i in range(3)]
+            # Another connection has its own budget
+            other = await chat_message("sid_2", {"session_id": "s2", "message": "hi"})
+            release.set()
+
+        assert [ack["status"] for ack in acks] == ["queued", "queued", "error"]
+        assert other["status"] == "queued"
+
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_running_turn(self, socket_env):
+        """A disconnect cancels the turn in flight; nothing is sent for it."""
+        from src.platform.socket_io import chat_message, disconnect
+        started, cancelled = asyncio.Event(), asyncio.Event()
+
+        async def handle_chat(**kwargs):
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with patch('src.platform.services.chat.chat_service.handle_chat', new=AsyncMock(side_effect=handle_chat)):
+            await chat_message("sid_1", {"session_id": "s1", "message": "hello"})
+            await asyncio.wait_for(started.wait(), timeout=2)
+            await disconnect("sid_1")
+            await asyncio.wait_for(cancelled.wait(), timeout=2)
+
+        assert "chat:response" not in [c.args[0] for c in socket_env[0].call_args_list]
+
+    @pytest.mark.asyncio
+    async def test_invalid_payload(self, socket_env):
+        """A payload that isn't a ChatRequest is refused in the ack."""
+        from src.platform.socket_io import chat_message
+
+        ack = await chat_message("sid_1", {"session_id": "s1", "role": "consumer", "consumer_id": "not-a-uuid"})
+        assert ack["status"] == "error"
@@ -87,7 +87,7 @@ export default function DashboardPage() {
 
         const [provRes, reqRes] = await Promise.all([
           getProviders(),
-          getRequests({ status: "matching" })
+          getRequests({ status: "matched" })
         ]);
 
         setProviders(provRes.data.slice(0, 5));
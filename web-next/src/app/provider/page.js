@@ -92,7 +92,7 @@ export default function ProviderDashboard() {
             if (!selectedProvider) return;
             try {
                 const reqRes = await getRequests({
-                    status: 'matching',
+                    status: 'matched',
                     matching_provider_id: selectedProvider.id
                 });
                 setRequests(reqRes.data);
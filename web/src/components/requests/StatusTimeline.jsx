@@ -6,7 +6,8 @@ const StatusTimeline = ({ history = [] }) => {
 
     const getIcon = (status) => {
         switch (status) {
-            case 'matching': return <Clock size={16} className="text-amber-400" />;
+            case 'matching':
+            case 'matched': return <Clock size={16} className="text-amber-400" />;
             case 'pending': return <MessageSquare size={16} className="text-blue-400" />;
             case 'upcoming': return <Clock size={16} className="text-purple-400" />;
             case 'completed': return <CheckCircle2 size={16} className="text-green-400" />;
@@ -68,7 +68,7 @@ const DashboardPage = () => {
                 const provRes = await getProviders();
                 setProviders(provRes.data.slice(0, 5));
 
-                const reqRes = await getRequests({ status: 'matching' });
+                const reqRes = await getRequests({ status: 'matched' });
                 setRequests(reqRes.data.slice(0, 5));
 
                 const conRes = await getConsumerRequests(consumerId);
@@ -36,7 +36,7 @@ const ProviderDashboardPage = () => {
             if (!selectedProvider) return;
             try {
                 const reqRes = await getRequests({
-                    status: 'matching',
+                    status: 'matched',
                     matching_provider_id: selectedProvider.id
                 });
                 setRequests(reqRes.data);
@@ -51,8 +51,8 @@ const RequestDetailView = () => {
         }
     };
 
-    const canEdit = request?.status === 'matching' && (!request?.offer_count || request?.offer_count === 0);
-    const canCancel = ['matching', 'pending'].includes(request?.status);
+    const canEdit = ['matching', 'matched'].includes(request?.status) && (!request?.offer_count || request?.offer_count === 0);
+    const canCancel = ['matching', 'matched', 'pending'].includes(request?.status);
 
     if (loading) return <div className="min-h-screen bg-zinc-950 flex items-center justify-center"><LoadingSpinner /></div>;
     if (error) return (
@@ -83,7 +83,7 @@ const RequestDetailView = () => {
                 {/* Status Hero */}
                 <section>
                     <div className="flex items-center gap-3 mb-4">
-                        <span className={`px-4 py-1.5 rounded-full text-[10px] font-black uppercase tracking-widest border ${request.status === 'matching' ? 'bg-amber-500/10 text-amber-500 border-amber-500/20' :
+                        <span className={`px-4 py-1.5 rounded-full text-[10px] font-black uppercase tracking-widest border ${['matching', 'matched'].includes(request.status) ? 'bg-amber-500/10 text-amber-500 border-amber-500/20' :
                                 request.status === 'pending' ? 'bg-blue-500/10 text-blue-500 border-blue-500/20' :
                                     request.status === 'completed' ? 'bg-green-500/10 text-green-500 border-green-500/20' :
                                         'bg-zinc-800 text-zinc-400 border-white/5'